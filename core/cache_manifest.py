@@ -0,0 +1,356 @@
+"""Persistent symbol -> file manifest of the OHLCV CSV cache.
+
+Resolving a symbol used to glob the cache directories (up to three scans per
+symbol, more per SECURITY_ID candidate when the symbol had to be looked up in
+the scrip master). The manifest lists every cache file once, with::
+
+    symbol, secid, interval, source, location, path, rows, first, last,
+    size, mtime_ns
+
+and is kept in ``<cache_dir>/manifest/manifest.json``. Lookups are dict hits:
+
+    >>> manifest = get_manifest()
+    >>> manifest.resolve("RELIANCE", "1d")
+    '.../data/cache/dhan/daily/dhan_2885_RELIANCE_1d.csv'
+
+The manifest also records the modification time of each scanned directory.
+A lookup that misses rescans only when one of them has changed since (a file
+was added or removed), so a basket load scans the cache at most once and a
+warm manifest never scans. The fetch scripts call :func:`record_file` after
+writing a CSV to keep the row counts and date ranges current.
+
+Locations, in resolution order (as the loader globbed them):
+
+- ``dhan_daily``: ``DATA_DIR/cache/dhan/daily/dhan_<SECID>_<SYMBOL>_1d.csv``
+- ``groww_weekly``: ``DATA_DIR/cache/groww/weekly/groww_<TOKEN>_<SYMBOL>_1w.csv``
+- ``cache``: ``<cache_dir>/dhan_<SECID>_<SYMBOL>_<interval>.csv``
+- ``historical`` / ``historical_cache``: ``dhan_historical_<SECID>.csv`` in
+  ``DATA_DIR`` / ``<cache_dir>`` (found by SECURITY_ID only)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from config import CACHE_DIR, DATA_DIR
+
+from .ohlcv_store import symbol_key
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+_DATED = re.compile(r"^(dhan|groww)_([^_]+)_(.+)_([^_]+)\.csv$")
+_HISTORICAL = re.compile(r"^dhan_historical_(\d+)\.csv$")
+
+# Fields read from the file itself; kept across scans while size/mtime match
+_SUMMARY = ("rows", "first", "last", "size", "mtime_ns")
+
+# (cache_dir, data_dir) -> CacheManifest
+_MANIFESTS: dict[tuple[str, str], "CacheManifest"] = {}
+
+
+def _summarize(path: str) -> dict:
+    """Row count and first/last value of the first column of a CSV file."""
+    st = os.stat(path)
+    with open(path, "rb") as f:
+        lines = f.read().splitlines()
+    rows = [line for line in lines[1:] if line.strip()]
+
+    def first_field(line: bytes) -> str:
+        return line.split(b",", 1)[0].decode(errors="replace")
+
+    return {
+        "rows": len(rows),
+        "first": first_field(rows[0]) if rows else None,
+        "last": first_field(rows[-1]) if rows else None,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+    }
+
+
+class CacheManifest:
+    """Index of the cache files under ``data_dir`` and ``cache_dir``."""
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path, None] = None,
+        data_dir: Union[str, Path, None] = None,
+    ):
+        self.cache_dir = os.path.abspath(cache_dir or CACHE_DIR)
+        self.data_dir = os.path.abspath(data_dir or DATA_DIR)
+        # In a subdirectory: writing it must not touch the scanned cache_dir
+        self.path = os.path.join(self.cache_dir, "manifest", MANIFEST_NAME)
+        cache_root = os.path.join(self.data_dir, "cache")
+        # name -> (folder, rank); a lower rank wins when a symbol is in several
+        self.locations = {
+            "dhan_daily": (os.path.join(cache_root, "dhan", "daily"), 0),
+            "groww_weekly": (os.path.join(cache_root, "groww", "weekly"), 0),
+            "cache": (self.cache_dir, 1),
+            "historical": (self.data_dir, 0),
+            "historical_cache": (self.cache_dir, 1),
+        }
+        self.entries: list[dict] = []
+        self.folders: dict[str, Optional[int]] = {}
+        self.scans = 0
+        # scan/record_file from the load_many_india thread pool run one at a time
+        self._lock = threading.RLock()
+        if not self._load():
+            self.scan()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __repr__(self) -> str:
+        return f"CacheManifest({self.cache_dir!r}, files={len(self)})"
+
+    # -- persistence -------------------------------------------------------
+
+    def _load(self) -> bool:
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return False
+        if (
+            saved.get("version") != MANIFEST_VERSION
+            or saved.get("cache_dir") != self.cache_dir
+            or saved.get("data_dir") != self.data_dir
+        ):
+            return False
+        self.entries = saved["entries"]
+        self.folders = saved["folders"]
+        self._reindex()
+        return True
+
+    def save(self) -> None:
+        """Write the manifest (best effort: a read-only cache still works)."""
+        saved = {
+            "version": MANIFEST_VERSION,
+            "cache_dir": self.cache_dir,
+            "data_dir": self.data_dir,
+            "folders": self.folders,
+            "entries": self.entries,
+        }
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp, "w") as f:
+                json.dump(saved, f, indent=1)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    # -- scanning ----------------------------------------------------------
+
+    def _classify(self, location: str, name: str) -> Optional[dict]:
+        """Manifest fields derived from the file name, or None if it does not
+        belong to ``location``."""
+        if location.startswith("historical"):
+            m = _HISTORICAL.match(name)
+            if m is None:
+                return None
+            return {
+                "symbol": None,
+                "secid": m.group(1),
+                "interval": "1d",
+                "source": "dhan_historical",
+            }
+        m = _DATED.match(name)
+        if m is None:
+            return None
+        source, secid, symbol, interval = m.groups()
+        expected = {
+            "dhan_daily": ("dhan", "1d"),
+            "groww_weekly": ("groww", "1w"),
+            "cache": ("dhan", interval),
+        }[location]
+        if (source, interval) != expected:
+            return None
+        return {
+            "symbol": symbol,
+            "secid": secid,
+            "interval": interval,
+            "source": source,
+        }
+
+    @staticmethod
+    def _folder_mtime(folder: str) -> Optional[int]:
+        try:
+            return os.stat(folder).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def scan(self) -> None:
+        """List every location once; files whose size and mtime are unchanged
+        keep their summary, new or changed files are summarized again."""
+        with self._lock:
+            self._scan()
+
+    def _scan(self) -> None:
+        try:  # create the manifest directory before cache_dir's mtime is taken
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        except OSError:
+            pass
+        known = {e["path"]: e for e in self.entries}
+        by_folder: dict[str, list[str]] = {}
+        for location, (folder, _) in self.locations.items():
+            by_folder.setdefault(folder, []).append(location)
+
+        entries, folders = [], {}
+        for folder, locations in by_folder.items():
+            folders[folder] = self._folder_mtime(folder)
+            if folders[folder] is None:
+                continue
+            with os.scandir(folder) as it:
+                for item in it:
+                    for location in locations:
+                        fields = self._classify(location, item.name)
+                        if fields is None or not item.is_file():
+                            continue
+                        old = known.get(item.path)
+                        st = item.stat()
+                        if (
+                            old is not None
+                            and old["size"] == st.st_size
+                            and old["mtime_ns"] == st.st_mtime_ns
+                        ):
+                            summary = {k: old[k] for k in _SUMMARY}
+                        else:
+                            summary = _summarize(item.path)
+                        entries.append(
+                            {**fields, "location": location, "path": item.path}
+                            | summary
+                        )
+                        break
+        self.entries, self.folders = entries, folders
+        self.scans += 1
+        self._reindex()
+        self.save()
+
+    def is_stale(self) -> bool:
+        """True when a scanned directory changed (files added or removed)."""
+        return any(
+            self._folder_mtime(folder) != mtime
+            for folder, mtime in self.folders.items()
+        )
+
+    def refresh(self) -> bool:
+        """Rescan if stale; returns whether a scan happened."""
+        with self._lock:
+            if self.is_stale():
+                self.scan()
+                return True
+            return False
+
+    def record_file(self, path: Union[str, Path]) -> Optional[dict]:
+        """Add or update one file (after a fetch wrote it) and save."""
+        path = os.path.abspath(path)
+        folder, name = os.path.split(path)
+        with self._lock:
+            return self._record_file(path, folder, name)
+
+    def _record_file(self, path: str, folder: str, name: str) -> Optional[dict]:
+        for location, (loc_folder, _) in self.locations.items():
+            if loc_folder != folder:
+                continue
+            fields = self._classify(location, name)
+            if fields is None:
+                continue
+            entry = {**fields, "location": location, "path": path} | _summarize(path)
+            self.entries = [e for e in self.entries if e["path"] != path]
+            self.entries.append(entry)
+            self._reindex()
+            self.save()
+            return entry
+        return None
+
+    # -- lookups -----------------------------------------------------------
+
+    def _reindex(self) -> None:
+        by_symbol: dict[tuple[str, str], dict] = {}
+        by_secid: dict[tuple[str, str], dict] = {}
+        ranked = sorted(
+            self.entries, key=lambda e: self.locations[e["location"]][1]
+        )  # stable: scan order within a rank
+        for e in ranked:
+            if e["symbol"] is not None:
+                by_symbol.setdefault((e["interval"], e["symbol"]), e)
+            by_secid.setdefault((e["location"], e["secid"]), e)
+        # Swapped in whole: lookups on other threads never see a partial index
+        self._by_symbol, self._by_secid = by_symbol, by_secid
+
+    def _lookup(self, index: str, key: tuple) -> Optional[dict]:
+        """Entry ``key`` of ``index`` ("_by_symbol" or "_by_secid"); a miss
+        or a vanished file rescans if the cache directories changed."""
+        entry = getattr(self, index).get(key)
+        if entry is None or not os.path.exists(entry["path"]):
+            # Another thread may have rescanned already: look again either way
+            self.refresh()
+            entry = getattr(self, index).get(key)
+        if entry is None or not os.path.exists(entry["path"]):
+            return None
+        return entry
+
+    def entry(self, sym: str, interval: str = "1d") -> Optional[dict]:
+        """Manifest entry of the file the loader reads for ``sym``."""
+        return self._lookup("_by_symbol", (interval, symbol_key(sym)))
+
+    def resolve(self, sym: str, interval: str = "1d") -> Optional[str]:
+        """Path of the cache file for ``sym`` at ``interval``, or None."""
+        entry = self.entry(sym, interval)
+        return entry["path"] if entry else None
+
+    def secid_path(
+        self,
+        secid: Union[int, str],
+        locations: Iterable[str] = ("dhan_daily", "historical", "historical_cache"),
+    ) -> Optional[str]:
+        """First file for SECURITY_ID ``secid`` among ``locations`` (in order)."""
+        for location in locations:
+            entry = self._lookup("_by_secid", (location, str(secid)))
+            if entry is not None:
+                return entry["path"]
+        return None
+
+    def files(self, location: str) -> list[dict]:
+        """Entries of one location, in scan order."""
+        return [e for e in self.entries if e["location"] == location]
+
+
+def get_manifest(
+    cache_dir: Union[str, Path, None] = None, data_dir: Union[str, Path, None] = None
+) -> CacheManifest:
+    """The process-wide :class:`CacheManifest` for ``cache_dir``/``data_dir``."""
+    key = (
+        os.path.abspath(cache_dir or CACHE_DIR),
+        os.path.abspath(data_dir or DATA_DIR),
+    )
+    manifest = _MANIFESTS.get(key)
+    if manifest is None:
+        manifest = _MANIFESTS[key] = CacheManifest(*key)
+    return manifest
+
+
+def record_file(
+    path: Union[str, Path],
+    cache_dir: Union[str, Path, None] = None,
+    data_dir: Union[str, Path, None] = None,
+) -> Optional[dict]:
+    """Record a freshly written cache file in the manifest (for fetch scripts).
+
+    Never raises: a file that could not be recorded is picked up by the next
+    scan instead.
+    """
+    try:
+        return get_manifest(cache_dir, data_dir).record_file(path)
+    except Exception:
+        return None
+
+
+def clear_manifest_cache() -> None:
+    _MANIFESTS.clear()
@@ -4,13 +4,24 @@ Ensures that historical data used in backtests is valid, complete, and matches
 what's expected. Prevents data quality issues like stale caches or corrupted files.
 """
 
+import copy
 import hashlib
 import os
+from collections import OrderedDict
 from datetime import datetime
 from typing import Any, Optional
 
+import numpy as np
 import pandas as pd
 
+VALIDATION_MODES = ("cached", "always", "never")
+
+# validate_all() results and fingerprints by data_key(); see validate_cached()
+_VALIDATION_CACHE: "OrderedDict[tuple, tuple[dict, str]]" = OrderedDict()
+VALIDATION_CACHE_SIZE = 4096
+
+_OHLCV = ("open", "high", "low", "close", "volume")
+
 
 class DataValidation:
     """Validate historical OHLCV data before backtesting."""
@@ -342,3 +353,64 @@ class DataValidation:
 
         lines.append(f"\n{'='*70}\n")
         return "\n".join(lines)
+
+
+def data_key(df: pd.DataFrame, symbol: str, cache_file: Optional[str] = None) -> tuple:
+    """
+    Identity of a frame's validation inputs.
+
+    With a ``cache_file`` that exists, its path, mtime and size plus the frame's
+    length and date range identify the data (no pass over the values).
+    Otherwise the key is a SHA-256 of the index and the OHLCV columns. Other
+    columns (indicators added by strategies) do not affect validation.
+    """
+    present = tuple(c for c in df.columns if str(c).lower() in _OHLCV)
+    shape = (symbol, present, type(df.index).__name__, len(df))
+    if cache_file and os.path.exists(cache_file):
+        st = os.stat(cache_file)
+        span = (str(df.index[0]), str(df.index[-1])) if len(df) else ()
+        path = os.path.abspath(cache_file)
+        return ("file", path, st.st_mtime_ns, st.st_size, *shape, *span)
+
+    h = hashlib.sha256()
+    if isinstance(df.index, pd.DatetimeIndex):
+        h.update(str(df.index.dtype).encode())
+        h.update(memoryview(np.ascontiguousarray(df.index.asi8)))
+    else:
+        hashed = pd.util.hash_pandas_object(df.index, index=False).to_numpy()
+        h.update(memoryview(np.ascontiguousarray(hashed)))
+    for col in present:
+        values = df[col].to_numpy()
+        if values.dtype == object:
+            values = pd.util.hash_pandas_object(df[col], index=False).to_numpy()
+        h.update(str(values.dtype).encode())
+        h.update(memoryview(np.ascontiguousarray(values)))
+    return ("content", h.hexdigest(), cache_file, *shape)
+
+
+def validate_cached(
+    df: pd.DataFrame, symbol: str, cache_file: Optional[str] = None
+) -> tuple[dict, str]:
+    """
+    ``DataValidation(df, symbol, cache_file).validate_all()`` and the data
+    fingerprint, computed once per :func:`data_key` per process.
+
+    Returns a copy of the cached results, so callers may modify them.
+    """
+    key = data_key(df, symbol, cache_file)
+    hit = _VALIDATION_CACHE.get(key)
+    if hit is None:
+        validator = DataValidation(df, symbol, cache_file)
+        results = validator.validate_all()
+        hit = (results, validator.fingerprint)
+        _VALIDATION_CACHE[key] = hit
+        if len(_VALIDATION_CACHE) > VALIDATION_CACHE_SIZE:
+            _VALIDATION_CACHE.popitem(last=False)
+    else:
+        _VALIDATION_CACHE.move_to_end(key)
+    results, fingerprint = hit
+    return copy.deepcopy(results), fingerprint
+
+
+def clear_validation_cache() -> None:
+    _VALIDATION_CACHE.clear()
@@ -0,0 +1,632 @@
+"""Declarative strategy specs compiled to vectorized signal arrays.
+
+Many strategies are a conjunction of indicator comparisons and crossovers.
+Instead of a hand-written ``on_bar``, such a strategy can be written as
+expressions over the price columns and :mod:`utils.indicators`:
+
+    >>> fast, slow = param("fast_length", 25), param("slow_length", 100)
+    >>> TemaLsma = spec_strategy(
+    ...     "TemaLsma",
+    ...     entry=crossover(TEMA(close, fast), LSMA(close, slow)) & (ATR(14) / close > 0.035),
+    ...     exit=crossunder(TEMA(close, fast), LSMA(close, slow)),
+    ...     entry_reason="Bull Cross",
+    ...     exit_reason="XDN",
+    ... )
+    >>> register_strategy("tema_lsma_spec", TemaLsma)  # core.registry
+
+or as text (e.g. from a config file), with the same names:
+
+    >>> spec_strategy(
+    ...     "TemaLsma",
+    ...     entry="crossover(TEMA(close, fast), LSMA(close, slow)) & (ATR(14) / close > 0.035)",
+    ...     exit="crossunder(TEMA(close, fast), LSMA(close, slow))",
+    ...     params={"fast": 25, "slow": 100},
+    ... )
+
+The resulting :class:`SpecStrategy` implements ``signals()`` (the engine's
+vectorized path) and ``sweep_signals()`` (:mod:`core.sweep`) from the compiled
+arrays; ``on_bar_idx`` reads the same arrays, so the per-bar loop agrees.
+
+Indicators take their price inputs from the data unless they are passed
+explicitly: ``ATR(14)`` is ``ATR(high, low, close, 14)`` and ``EMA(20)`` is
+``EMA(close, 20)``, while ``EMA(RSI(close, 14), 9)`` smooths the RSI.
+Indicators returning several arrays are indexed by key, e.g.
+``MACD(12, 26, 9)["histogram"]``. Nodes are memoized by their (parameter-
+resolved) structure, and indicators over the price columns are computed in
+one :class:`utils.feature_plan.FeaturePlan`, so shared intermediates (true
+range, EMA chains, rolling extremes) are built once per evaluation.
+"""
+
+from __future__ import annotations
+
+import ast
+import inspect
+from typing import Any, Callable, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from utils import indicators
+from utils.feature_plan import FeaturePlan
+
+from .strategy import Strategy
+from .strategy import crossover as _cross
+
+_INPUTS = ("open", "high", "low", "close", "volume")
+# Leading indicator parameters that take a price series
+_SERIES_PARAMS = _INPUTS + ("values", "series", "rsi")
+
+# Node evaluators: op -> func(evaluation, *args)
+_OPS: Dict[str, Callable] = {}
+
+
+def _op(func: Callable) -> Callable:
+    _OPS[func.__name__.lstrip("_")] = func
+    return func
+
+
+class Expr:
+    """A node of a spec expression; combine with arithmetic, comparisons and
+    ``&`` / ``|`` / ``~``."""
+
+    __slots__ = ("op", "args")
+
+    def __init__(self, op: str, *args):
+        self.op = op
+        self.args = args
+
+    def __repr__(self) -> str:
+        return f"Expr({self.op!r}, {', '.join(map(repr, self.args))})"
+
+    def __bool__(self):
+        raise TypeError(
+            "Spec expressions have no truth value; use & | ~ instead of and/or/not"
+        )
+
+    def __getitem__(self, key: str) -> Expr:
+        return Expr("pick", self, key)
+
+    def shift(self, bars: int = 1) -> Expr:
+        """Value ``bars`` bars earlier (NaN / False before the first)."""
+        return Expr("shift", self, int(bars))
+
+    def __add__(self, other):
+        return Expr("add", self, other)
+
+    def __radd__(self, other):
+        return Expr("add", other, self)
+
+    def __sub__(self, other):
+        return Expr("sub", self, other)
+
+    def __rsub__(self, other):
+        return Expr("sub", other, self)
+
+    def __mul__(self, other):
+        return Expr("mul", self, other)
+
+    def __rmul__(self, other):
+        return Expr("mul", other, self)
+
+    def __truediv__(self, other):
+        return Expr("div", self, other)
+
+    def __rtruediv__(self, other):
+        return Expr("div", other, self)
+
+    def __neg__(self):
+        return Expr("neg", self)
+
+    def __lt__(self, other):
+        return Expr("lt", self, other)
+
+    def __le__(self, other):
+        return Expr("le", self, other)
+
+    def __gt__(self, other):
+        return Expr("gt", self, other)
+
+    def __ge__(self, other):
+        return Expr("ge", self, other)
+
+    def __and__(self, other):
+        return Expr("and", self, other)
+
+    def __rand__(self, other):
+        return Expr("and", other, self)
+
+    def __or__(self, other):
+        return Expr("or", self, other)
+
+    def __ror__(self, other):
+        return Expr("or", other, self)
+
+    def __invert__(self):
+        return Expr("not", self)
+
+
+open_, high, low, close, volume = (Expr("column", name) for name in _INPUTS)
+# Bar position (0, 1, 2, ...), e.g. ``bar >= 100`` to skip a warm-up period
+bar = Expr("bar")
+
+
+def param(name: str, default: Any = None) -> Expr:
+    """A strategy parameter: the attribute ``name`` of the strategy instance
+    (``default`` on the class)."""
+    return Expr("param", name, default)
+
+
+def crossover(a, b) -> Expr:
+    """True on the bar where ``a`` crosses above ``b`` (:func:`core.strategy.crossover`)."""
+    return Expr("crossover", a, b)
+
+
+def crossunder(a, b) -> Expr:
+    """True on the bar where ``a`` crosses below ``b``."""
+    return Expr("crossover", b, a)
+
+
+def _series_params(name: str) -> list:
+    """Names of the leading price-series parameters of indicator ``name``."""
+    func = getattr(indicators, name, None)
+    if not callable(func) or name.startswith("_"):
+        raise ValueError(f"Unknown indicator: {name}")
+    names = []
+    for p in inspect.signature(func).parameters:
+        if p not in _SERIES_PARAMS:
+            break
+        names.append(p)
+    return names
+
+
+def _default_columns(name: str) -> list:
+    """Columns an indicator reads when no series are passed (``values`` etc. read close)."""
+    return [p if p in _INPUTS else "close" for p in _series_params(name)]
+
+
+def _plannable(name: str) -> bool:
+    """Whether FeaturePlan takes indicator ``name`` (its series are OHLCV inputs)."""
+    names = _series_params(name)
+    return bool(names) and all(p in _INPUTS + ("values", "series") for p in names)
+
+
+def indicator(name: str, *args, **kwargs) -> Expr:
+    """Call the :mod:`utils.indicators` function ``name``.
+
+    Leading expression arguments are its price series; without any, the
+    series are taken from the data by parameter name (``values``/``series``
+    read ``close``). The remaining arguments are its parameters and may be
+    :func:`param` nodes.
+    """
+    names = _series_params(name)
+    series = []
+    for arg in args:
+        if not isinstance(arg, Expr) or arg.op == "param":
+            break
+        series.append(arg)
+    if series and len(series) != len(names):
+        raise ValueError(
+            f"{name} takes {len(names)} price series ({', '.join(names)}); got {len(series)}"
+        )
+    return Expr(
+        "indicator",
+        name,
+        tuple(series),
+        tuple(args[len(series) :]),
+        tuple(sorted(kwargs.items())),
+    )
+
+
+def _indicator_factory(name: str) -> Callable[..., Expr]:
+    def make(*args, **kwargs) -> Expr:
+        return indicator(name, *args, **kwargs)
+
+    make.__name__ = make.__qualname__ = name
+    make.__doc__ = f"Spec node for :func:`utils.indicators.{name}`."
+    return make
+
+
+INDICATORS = (
+    "SMA", "EMA", "WMA", "DEMA", "TEMA", "HMA", "LSMA", "KAMA", "RSI", "MACD",
+    "BollingerBands", "ATR", "ADX", "Aroon", "CCI", "CHOP", "CMF", "MFI",
+    "Stochastic", "StochasticRSI", "WilliamsR", "DonchianChannels",
+    "KeltnerChannels", "Supertrend", "BullBearPower", "Momentum", "VWMA", "OBV",
+    "kaufman_efficiency_ratio", "percent_rank", "rolling_max", "rolling_min",
+)  # fmt: skip
+INDICATORS = tuple(
+    name for name in INDICATORS if callable(getattr(indicators, name, None))
+)
+globals().update({name: _indicator_factory(name) for name in INDICATORS})
+
+# Names available to text specs (besides the spec's params)
+NAMESPACE: Dict[str, Any] = {
+    "open": open_,
+    "high": high,
+    "low": low,
+    "close": close,
+    "volume": volume,
+    "bar": bar,
+    "crossover": crossover,
+    "crossunder": crossunder,
+    **{name: globals()[name] for name in INDICATORS},
+}
+
+_AST_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call, ast.Name,
+    ast.Load, ast.Constant, ast.Subscript, ast.Attribute, ast.keyword,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.USub, ast.UAdd, ast.Invert,
+    ast.BitAnd, ast.BitOr, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+)  # fmt: skip
+
+
+def parse(text: str, params: Optional[Dict[str, Any]] = None) -> Expr:
+    """Build an expression from text using :data:`NAMESPACE` and ``params``
+    (each name becomes a :func:`param` with that default).
+
+    Only arithmetic, comparisons, ``& | ~``, calls of the namespace functions,
+    ``[...]`` output keys and ``.shift(n)`` are accepted.
+    """
+    names = {**NAMESPACE, **{k: param(k, v) for k, v in (params or {}).items()}}
+    tree = ast.parse(text, mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _AST_NODES):
+            raise ValueError(f"Unsupported syntax in spec: {ast.unparse(node)!r}")
+        if isinstance(node, ast.Name) and node.id not in names:
+            raise ValueError(f"Unknown name in spec: {node.id!r}")
+        if isinstance(node, ast.Attribute) and node.attr != "shift":
+            raise ValueError(f"Unsupported attribute in spec: {node.attr!r}")
+        if isinstance(node, ast.Compare) and len(node.ops) > 1:
+            raise ValueError(
+                "Chained comparisons are not supported; combine them with &"
+            )
+    expr = eval(compile(tree, "<spec>", "eval"), {"__builtins__": {}}, names)
+    if not isinstance(expr, Expr):
+        raise ValueError(f"Spec {text!r} is not an expression over the data")
+    return expr
+
+
+def _walk(value):
+    """Every Expr node in ``value`` (nested in args and tuples)."""
+    if isinstance(value, Expr):
+        yield value
+        for arg in value.args:
+            yield from _walk(arg)
+    elif isinstance(value, tuple):
+        for item in value:
+            yield from _walk(item)
+
+
+def spec_params(*exprs) -> Dict[str, Any]:
+    """``{name: default}`` of the :func:`param` nodes in ``exprs``."""
+    return {node.args[0]: node.args[1] for node in _walk(exprs) if node.op == "param"}
+
+
+class _Evaluation:
+    """Memoized evaluation of spec nodes over one DataFrame.
+
+    Nodes are keyed by their structure with parameters resolved, so one
+    evaluation can serve several parameter sets and computes each distinct
+    indicator once.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.n = len(df)
+        self.memo: Dict[tuple, Any] = {}
+        self.params: Dict[str, Any] = {}
+
+    def key(self, value):
+        if isinstance(value, Expr):
+            if value.op == "param":
+                return ("const", self.params.get(value.args[0], value.args[1]))
+            return (value.op,) + tuple(self.key(arg) for arg in value.args)
+        if isinstance(value, tuple):
+            return tuple(self.key(item) for item in value)
+        return value
+
+    def value(self, value, outputs: bool = False):
+        """Array (or scalar) of an argument; ``outputs`` also accepts the dict of
+        a multi-output indicator."""
+        if not isinstance(value, Expr):
+            return value
+        key = self.key(value)
+        if key not in self.memo:
+            self.memo[key] = _OPS[value.op](self, *value.args)
+        out = self.memo[key]
+        if isinstance(out, dict) and not outputs:
+            raise ValueError(
+                f"{value.args[0]} returns {sorted(out)}; select one with [...]"
+            )
+        return out
+
+    def plan(self, exprs) -> None:
+        """Compute the indicators over price columns in ``exprs`` in one FeaturePlan."""
+        plan, keys = FeaturePlan(), {}
+        for node in _walk(exprs):
+            if node.op != "indicator" or self.key(node) in self.memo:
+                continue
+            name, series, params, kwargs = node.args
+            # FeaturePlan reads the default columns; other inputs are called directly
+            sources = [s.args[0] if s.op == "column" else None for s in series]
+            if (
+                kwargs
+                or not _plannable(name)
+                or (series and sources != _default_columns(name))
+            ):
+                continue
+            feature = str(len(keys))
+            plan.add(feature, name, *(self.value(p) for p in params))
+            keys[feature] = self.key(node)
+        if keys:
+            for feature, output in plan.compute(self.df).items():
+                self.memo[keys[feature]] = output
+
+    def evaluate(self, exprs, params: Optional[Dict[str, Any]] = None) -> list:
+        self.params = dict(params or {})
+        with np.errstate(all="ignore"):
+            self.plan(exprs)
+            return [None if e is None else self.array(e) for e in exprs]
+
+    def array(self, expr) -> np.ndarray:
+        return np.broadcast_to(np.asarray(self.value(expr)), (self.n,))
+
+
+def _bool(values, op: str) -> np.ndarray:
+    values = np.asarray(values)
+    if values.dtype != bool:
+        raise ValueError(f"'{op}' needs boolean operands (comparisons or crossovers)")
+    return values
+
+
+@_op
+def _column(ev, name):
+    if name not in ev.df.columns:
+        raise ValueError(f"Spec needs a '{name}' column")
+    return ev.df[name].to_numpy(dtype=float)
+
+
+@_op
+def _bar(ev):
+    return np.arange(ev.n)
+
+
+@_op
+def _param(ev, name, default):
+    return ev.params.get(name, default)
+
+
+@_op
+def _indicator(ev, name, series, params, kwargs):
+    func = getattr(indicators, name)
+    columns = series or [Expr("column", c) for c in _default_columns(name)]
+    inputs = [ev.value(s) for s in columns]
+    kwargs = {k: ev.value(v) for k, v in kwargs}
+    return func(*inputs, *(ev.value(p) for p in params), **kwargs)
+
+
+@_op
+def _pick(ev, node, key):
+    out = ev.value(node, outputs=True)
+    if not isinstance(out, dict) or key not in out:
+        raise ValueError(f"{node.args[0]} has no output {key!r}")
+    return np.asarray(out[key], dtype=float)
+
+
+@_op
+def _add(ev, a, b):
+    return ev.value(a) + ev.value(b)
+
+
+@_op
+def _sub(ev, a, b):
+    return ev.value(a) - ev.value(b)
+
+
+@_op
+def _mul(ev, a, b):
+    return ev.value(a) * ev.value(b)
+
+
+@_op
+def _div(ev, a, b):
+    return np.true_divide(ev.value(a), ev.value(b))
+
+
+@_op
+def _neg(ev, a):
+    return -ev.value(a)
+
+
+@_op
+def _lt(ev, a, b):
+    return np.less(ev.value(a), ev.value(b))
+
+
+@_op
+def _le(ev, a, b):
+    return np.less_equal(ev.value(a), ev.value(b))
+
+
+@_op
+def _gt(ev, a, b):
+    return np.greater(ev.value(a), ev.value(b))
+
+
+@_op
+def _ge(ev, a, b):
+    return np.greater_equal(ev.value(a), ev.value(b))
+
+
+@_op
+def _and(ev, a, b):
+    return _bool(ev.value(a), "&") & _bool(ev.value(b), "&")
+
+
+@_op
+def _or(ev, a, b):
+    return _bool(ev.value(a), "|") | _bool(ev.value(b), "|")
+
+
+@_op
+def _not(ev, a):
+    return ~_bool(ev.value(a), "~")
+
+
+@_op
+def _crossover(ev, a, b):
+    out = np.zeros(ev.n, dtype=bool)
+    a, b = ev.value(a), ev.value(b)
+    if ev.n:
+        out[1:] = _cross(np.broadcast_to(a, (ev.n,)), np.broadcast_to(b, (ev.n,)))
+    return out
+
+
+@_op
+def _shift(ev, a, bars):
+    values = np.broadcast_to(np.asarray(ev.value(a)), (ev.n,))
+    fill = False if values.dtype == bool else np.nan
+    out = np.full(ev.n, fill, dtype=values.dtype if values.dtype == bool else float)
+    if bars < ev.n:
+        out[bars:] = values[: ev.n - bars]
+    return out
+
+
+class SpecStrategy(Strategy):
+    """
+    Strategy defined by ``entry`` / ``exit`` expressions (and an optional
+    absolute ``stop`` level for each entry bar). Build subclasses with
+    :func:`spec_strategy`.
+
+    ``entry`` is only acted on when flat and ``exit`` when in a position; on a
+    bar where both hold, the exit reason is recorded (as in
+    :meth:`core.vectorized.SweepSignals.row`).
+    """
+
+    entry: Optional[Expr] = None
+    exit: Optional[Expr] = None
+    stop: Optional[Expr] = None
+    entry_reason = "Entry"
+    exit_reason = "Exit"
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        for key, value in kwargs.items():
+            if key not in self.params():
+                raise ValueError(f"{type(self).__name__} has no parameter '{key}'")
+            setattr(self, key, value)
+
+    @classmethod
+    def params(cls) -> Dict[str, Any]:
+        """``{name: default}`` of the spec's parameters."""
+        return spec_params(cls.entry, cls.exit, cls.stop)
+
+    def param_values(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.params()}
+
+    def compile(self, df: pd.DataFrame, evaluation: Optional[_Evaluation] = None):
+        """Evaluate the spec on ``df``: ``(enter_long, exit_long, stop)``."""
+        if self.entry is None or self.exit is None:
+            raise ValueError(
+                f"{type(self).__name__} needs both an entry and an exit spec"
+            )
+        evaluation = evaluation or _Evaluation(df)
+        enter, exit_, stop = evaluation.evaluate(
+            (self.entry, self.exit, self.stop), self.param_values()
+        )
+        enter = _bool(enter, "entry")
+        exit_ = _bool(exit_, "exit")
+        stop = (
+            np.full(len(df), np.nan) if stop is None else np.asarray(stop, dtype=float)
+        )
+        return enter, exit_, stop
+
+    def prepare(self, df: pd.DataFrame) -> pd.DataFrame:
+        self.data = df
+        self.enter_long, self.exit_long, self.stop_level = self.compile(df)
+        self.signal_reason = np.where(
+            self.exit_long,
+            self.exit_reason,
+            np.where(self.enter_long, self.entry_reason, ""),
+        ).astype(object)
+        return super().prepare(df)
+
+    def signals(self, df: pd.DataFrame):
+        """Compiled signal arrays for the engine's vectorized path."""
+        return self.enter_long, self.exit_long, self.stop_level, self.signal_reason
+
+    @classmethod
+    def sweep_signals(cls, df: pd.DataFrame, grid: pd.DataFrame):
+        """signals() for every row of ``grid``, sharing one evaluation (each
+        distinct indicator is computed once across the grid)."""
+        from .vectorized import SweepSignals
+
+        evaluation = _Evaluation(df)
+        strategies, enters, exits = [], [], []
+        for row in grid.to_dict("records"):
+            strategy = cls(**row)
+            strategy.data = df
+            enter, exit_, strategy.stop_level = strategy.compile(df, evaluation)
+            strategy.enter_long, strategy.exit_long = enter, exit_
+            enters.append(enter)
+            exits.append(exit_)
+            strategies.append(strategy)
+        n = len(df)
+        return SweepSignals(
+            np.asarray(enters, dtype=bool).reshape(len(strategies), n),
+            np.asarray(exits, dtype=bool).reshape(len(strategies), n),
+            strategies,
+            entry_reason=cls.entry_reason,
+            exit_reason=cls.exit_reason,
+        )
+
+    def on_bar_idx(self, idx, ts, row, state):
+        in_position = state.get("qty", 0) > 0
+        enter_long = bool(self.enter_long[idx]) and not in_position
+        exit_long = bool(self.exit_long[idx]) and in_position
+        action = {
+            "enter_long": enter_long,
+            "exit_long": exit_long,
+            "signal_reason": self.signal_reason[idx],
+        }
+        if enter_long and not np.isnan(self.stop_level[idx]):
+            action["stop"] = float(self.stop_level[idx])
+        return action
+
+
+def spec_strategy(
+    name: str,
+    entry: Union[Expr, str],
+    exit: Union[Expr, str],
+    stop: Union[Expr, str, None] = None,
+    params: Optional[Dict[str, Any]] = None,
+    entry_reason: str = "Entry",
+    exit_reason: str = "Exit",
+) -> type:
+    """Build a :class:`SpecStrategy` subclass.
+
+    Args:
+        name: Class name
+        entry, exit: Boolean expressions (or text, see :func:`parse`)
+        stop: Optional absolute stop price for an entry signalled on a bar
+        params: Defaults of the parameters used as names in text specs
+            (expressions declare theirs with :func:`param`)
+        entry_reason, exit_reason: Signal reasons recorded on trades
+
+    Returns:
+        The class; register it with :func:`core.registry.register_strategy`.
+    """
+
+    def build(spec):
+        return parse(spec, params) if isinstance(spec, str) else spec
+
+    entry, exit, stop = build(entry), build(exit), build(stop)
+    attrs = {
+        "entry": entry,
+        "exit": exit,
+        "stop": stop,
+        "entry_reason": entry_reason,
+        "exit_reason": exit_reason,
+        "__module__": __name__,
+    }
+    attrs.update(spec_params(entry, exit, stop))
+    return type(name, (SpecStrategy,), attrs)
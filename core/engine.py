@@ -1,13 +1,116 @@
 """Backtesting engine for executing trading strategies on historical OHLC data."""
 
-from typing import Any, Optional
+import copy
+import math
+import warnings
+from dataclasses import asdict
+from typing import Any, Iterator, Optional, Union
 
 import numpy as np
 import pandas as pd
 
 from .config import BrokerConfig
-from .data_validation import DataValidation
-from .strategy import Strategy
+from .data_validation import VALIDATION_MODES, DataValidation, validate_cached
+from .positions import LotBook
+from .records import (
+    OPEN_TRADE,
+    PARTIAL_EXIT,
+    SIGNAL_EXIT,
+    STOP_EXIT,
+    BarBuffers,
+    TradeLog,
+    TradeRecord,
+)
+from .snapshot import (
+    EngineSnapshot,
+    changed_state,
+    history_hash,
+    strategy_params,
+    strategy_state,
+)
+from .strategy import Strategy, indexed_hooks
+from .streaming import ColumnarSink, EquityCheckpoint
+from .vectorized import normalize_signals, simulate_next_open, supports_vectorized
+
+
+ENGINE_MODES = ("series", "array", "auto", "vectorized")
+
+
+class BarView:
+    """
+    Lightweight read-only view of a single bar backed by column arrays.
+
+    Used by the ``"array"`` execution mode instead of ``data.iloc[i]``. It supports
+    the parts of the ``pd.Series`` row API that strategies rely on:
+    ``row.close``, ``row["close"]``, ``row.get("india_vix", np.nan)``,
+    ``"india_vix" in row.index`` and ``row.name`` (the bar timestamp).
+    """
+
+    __slots__ = ("_columns", "_labels", "_i", "name")
+
+    def __init__(self, columns: dict[str, np.ndarray], labels: pd.Index, i: int, name: Any):
+        self._columns = columns
+        self._labels = labels
+        self._i = i
+        self.name = name
+
+    def __getattr__(self, key: str) -> Any:
+        try:
+            return self._columns[key][self._i]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __getitem__(self, key: str) -> Any:
+        return self._columns[key][self._i]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._columns
+
+    def get(self, key: str, default: Any = None) -> Any:
+        col = self._columns.get(key)
+        return default if col is None else col[self._i]
+
+    @property
+    def index(self) -> pd.Index:
+        """Column labels, mirroring ``Series.index`` for a DataFrame row."""
+        return self._labels
+
+    def keys(self) -> pd.Index:
+        return self._labels
+
+    def to_dict(self) -> dict[str, Any]:
+        return {k: col[self._i] for k, col in self._columns.items()}
+
+    def __repr__(self) -> str:
+        return f"BarView(name={self.name!r}, {self.to_dict()!r})"
+
+
+def _copy_on_write() -> bool:
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return bool(getattr(pd.options.mode, "copy_on_write", False))
+
+
+def _working_copy(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The engine's own frame, which ``prepare()`` may add columns to.
+
+    Under pandas copy-on-write, or when every column is backed by a read-only
+    array (e.g. a memory-mapped store), a shallow copy already isolates the
+    caller's frame: new columns stay on the copy and writes to shared data
+    copy (or fail) instead of leaking back. Otherwise the data is copied.
+    """
+    if _copy_on_write():
+        return df.copy(deep=False)
+    arrays = [col.to_numpy() for _, col in df.items()]
+    if arrays and all(not a.flags.writeable for a in arrays):
+        return df.copy(deep=False)
+    return df.copy()
+
+
+def _column_arrays(df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Extract every column of ``df`` into a contiguous NumPy array (once per run)."""
+    return {col: np.ascontiguousarray(df[col].to_numpy()) for col in df.columns}
 
 
 class BacktestEngine:
@@ -18,26 +121,66 @@ class BacktestEngine:
         cfg: BrokerConfig,
         symbol: Optional[str] = None,
         cache_file: Optional[str] = None,
+        mode: str = "series",
+        validate: str = "cached",
     ):
+        """
+        Args:
+            df: OHLC(V) DataFrame with at least open/high/low/close columns
+            strategy: Strategy instance
+            cfg: Broker configuration
+            symbol: Symbol name (for logging and strategy context)
+            cache_file: Path of the cache file the data came from (for validation)
+            mode: Execution mode. ``"series"`` hands strategies a ``pd.Series`` per
+                bar (``data.iloc[i]``); ``"array"`` extracts all columns into NumPy
+                arrays once and hands strategies a :class:`BarView`. ``"auto"``
+                uses the bulk simulator in :mod:`core.vectorized` when the
+                strategy implements ``signals()`` and the configuration allows it
+                (next-open fills, ``pyramiding=1``), and the array loop otherwise;
+                ``"vectorized"`` requires the bulk simulator. All modes produce
+                identical trades and equity; the bulk simulator reports
+                position-aware signal rows, which can differ from the raw
+                ``on_bar`` output of the loops (see :mod:`core.vectorized`).
+            validate: ``"cached"`` runs :class:`DataValidation` once per data
+                content (or cache file version) per process, ``"always"`` on
+                every construction, ``"never"`` skips it (``validation_results``
+                and ``data_fingerprint`` are then None).
+        """
         req = {"open", "high", "low", "close"}
         if not req.issubset(df.columns):
             raise ValueError(f"DataFrame must include {req}")
-        self.df = df.copy()
+        if mode not in ENGINE_MODES:
+            raise ValueError(f"Unknown engine mode '{mode}'. Available: {list(ENGINE_MODES)}")
+        if validate not in VALIDATION_MODES:
+            raise ValueError(
+                f"Unknown validate mode '{validate}'. Available: {list(VALIDATION_MODES)}"
+            )
+        self.df = _working_copy(df)
+        self.mode = mode
         self.strategy = strategy
         self.cfg = cfg
         self.symbol = symbol or "UNKNOWN"
         self.cache_file = cache_file
+        # Set by run(snapshot=True)
+        self.last_snapshot: Optional[EngineSnapshot] = None
 
         # Validate data integrity
-        validator = DataValidation(self.df, self.symbol, cache_file)
-        validator.compute_fingerprint()
-        validation_results = validator.validate_all()
-        self.data_fingerprint = validator.fingerprint
+        if validate == "never":
+            self.data_fingerprint = None
+            self.validation_results = None
+            return
+        if validate == "cached":
+            validation_results, fingerprint = validate_cached(
+                self.df, self.symbol, cache_file
+            )
+        else:
+            validator = DataValidation(self.df, self.symbol, cache_file)
+            validation_results = validator.validate_all()
+            fingerprint = validator.fingerprint
+        self.data_fingerprint = fingerprint
         self.validation_results = validation_results
 
         if not validation_results.get("passed", False):
-            import warnings
-
             warnings.warn(
                 f"Data validation failed for {self.symbol}: {validation_results.get('errors', [])}",
                 RuntimeWarning,
@@ -50,7 +193,7 @@ class BacktestEngine:
         return buy, sell
 
     def _validate_state(
-        self, cash: float, qty: float, equity: float, open_trade
+        self, cash: float, qty: float, equity: float, lots: LotBook
     ) -> None:
         """
         STATE VALIDATION: Defensive checks to catch state corruption early.
@@ -59,8 +202,8 @@ class BacktestEngine:
         - cash >= 0 (never negative)
         - qty >= 0 (never negative)
         - equity >= 0 (never negative)
-        - If qty == 0, then open_trade must be None
-        - If qty > 0, then open_trade must be dict
+        - If qty == 0, then there are no open lots
+        - If qty > 0, then qty is the sum of the open lots
         """
         assert cash >= 0, f"❌ INVARIANT VIOLATION: cash={cash} < 0"
         assert qty >= 0, f"❌ INVARIANT VIOLATION: qty={qty} < 0"
@@ -68,14 +211,15 @@ class BacktestEngine:
 
         if qty == 0:
             assert (
-                open_trade is None
-            ), f"❌ INVARIANT VIOLATION: qty=0 but open_trade={open_trade} (should be None)"
+                len(lots) == 0
+            ), f"❌ INVARIANT VIOLATION: qty=0 but {len(lots)} open lots (should be 0)"
         else:
             assert (
-                open_trade is not None
-            ), f"❌ INVARIANT VIOLATION: qty={qty} > 0 but open_trade=None (should be dict)"
+                lots.total_qty() == qty
+            ), f"❌ INVARIANT VIOLATION: qty={qty} but lots hold {lots.total_qty()}"
 
-    def _consolidate_partial_exits(self, trades_df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _consolidate_partial_exits(trades_df: pd.DataFrame) -> pd.DataFrame:
         """
         Consolidate partial exits (TP1, TP2, signal) into single trade rows.
         
@@ -96,7 +240,12 @@ class BacktestEngine:
         
         if closed_trades.empty:
             return trades_df
-        
+
+        # Fast path: no entry has more than one exit leg, so there is nothing to merge
+        if not closed_trades['entry_time'].duplicated().any():
+            result = pd.concat([closed_trades, open_trades]) if not open_trades.empty else closed_trades
+            return result.sort_values('entry_time').reset_index(drop=True)
+
         # Group closed trades by entry_time (same entry = same logical trade)
         consolidated = []
         for entry_time, group in closed_trades.groupby('entry_time', sort=False):
@@ -171,47 +320,244 @@ class BacktestEngine:
         else:
             return trades_df
 
-    def run(self):
+    def _run_vectorized(self, trades_only: bool = False):
+        """Run via ``Strategy.signals()``; None when the per-bar loop is needed."""
+        sig = self.strategy.signals(self.df) if supports_vectorized(self) else None
+        if sig is None:
+            if self.mode == "vectorized":
+                raise ValueError(
+                    f"Vectorized mode unavailable for {type(self.strategy).__name__}: "
+                    "requires signals(), execute_on_next_open and pyramiding=1"
+                )
+            return None
+        signals = normalize_signals(sig, len(self.df))
+        trades, equity_df, signals_df = simulate_next_open(
+            self, signals, trades_only=trades_only
+        )
+        trades_df = trades.to_frame()
+        if not trades_df.empty:
+            trades_df = self._consolidate_partial_exits(trades_df)
+        return trades_df, equity_df, signals_df
+
+    def _prepare_strategy(self) -> None:
         self.strategy.prepare(self.df)  # side-effects only
         # Pass symbol to strategy if it has _set_symbol method
         if hasattr(self.strategy, '_set_symbol'):
             self.strategy._set_symbol(self.symbol)
+
+    def run(
+        self,
+        resume_from: Optional[EngineSnapshot] = None,
+        snapshot: bool = False,
+        trades_only: bool = False,
+    ):
+        """
+        Args:
+            resume_from: Snapshot from an earlier run on a prefix of this data;
+                only the bars from the snapshot onwards are simulated. Ignored
+                (with a warning) if the history, configuration, strategy or its
+                parameters changed. See :mod:`core.snapshot`.
+            snapshot: Record the state at the start of the last bar in
+                ``self.last_snapshot`` for a later ``resume_from``.
+            trades_only: Screening mode: skip the per-bar equity and signal
+                rows and return ``(trades_df, None, None)``. Trades are the same
+                as in a full run.
+
+        ``resume_from`` and ``snapshot`` use the per-bar loop (``"auto"`` skips
+        the bulk simulator) and cannot be combined with ``trades_only``.
+        """
+        incremental = snapshot or resume_from is not None
+        if trades_only and incremental:
+            raise ValueError("trades_only cannot be combined with snapshots")
+        self._prepare_strategy()
+        baseline = params = None
+        if incremental:
+            # Strategy state is whatever changes after prepare()
+            baseline = strategy_state(self.strategy)
+            params = strategy_params(self.strategy)
+        if resume_from is not None:
+            reason = resume_from.mismatch(self)
+            if reason is not None:
+                warnings.warn(
+                    f"Snapshot not used for {self.symbol}: {reason}; running all bars",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+                resume_from = None
+        if self.mode in ("auto", "vectorized") and not incremental:
+            result = self._run_vectorized(trades_only)
+            if result is not None:
+                return result
+
+        # Without a chunk size the loop never yields; it returns the full output
+        loop = self._bar_loop(
+            resume_from, snapshot, baseline, params, keep_bars=not trades_only
+        )
+        try:
+            next(loop)
+        except StopIteration as done:
+            trades, bars, idx = done.value
+
+        if trades_only:
+            equity_df = signals_df = None
+        else:
+            equity_df, signals_df = bars.to_frames(idx)
+        trades_df = trades.to_frame()
+        
+        # Consolidate partial exits into single trade rows
+        # This groups all exit legs (TP1, TP2, signal) from the same entry into one trade
+        if not trades_df.empty and len(trades_df) > 0:
+            trades_df = self._consolidate_partial_exits(trades_df)
+
+        return trades_df, equity_df, signals_df
+
+    def stream(
+        self, checkpoint_every: int = 10_000, sink: Optional[ColumnarSink] = None
+    ) -> Iterator[Union[TradeRecord, EquityCheckpoint]]:
+        """
+        Run the per-bar loop as a generator with bounded output memory.
+
+        Yields each trade record as it is recorded and an
+        :class:`~core.streaming.EquityCheckpoint` with the equity/signal rows
+        of every ``checkpoint_every`` bars (and of the final partial chunk).
+        Rows are not kept after they are yielded; ``sink`` also appends them
+        to disk. See :mod:`core.streaming`.
+        """
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be a positive number of bars")
+        self._prepare_strategy()
+        for event in self._bar_loop(chunk=checkpoint_every):
+            if sink is not None and isinstance(event, EquityCheckpoint):
+                sink.write(event.equity_rows, event.signal_rows)
+            yield event
+
+    @staticmethod
+    def _checkpoint(bars: BarBuffers, idx: list, lo: int, hi: int) -> EquityCheckpoint:
+        equity_rows, signal_rows = bars.head(hi - lo).to_frames(idx[lo:hi])
+        last = hi - lo - 1
+        return EquityCheckpoint(
+            bar=hi - 1,
+            time=idx[hi - 1],
+            equity=float(bars.equity[last]),
+            cash=float(bars.cash[last]),
+            qty=int(bars.qty[last]),
+            equity_rows=equity_rows,
+            signal_rows=signal_rows,
+        )
+
+    def _bar_loop(
+        self,
+        resume_from: Optional[EngineSnapshot] = None,
+        snapshot: bool = False,
+        baseline: Optional[dict] = None,
+        params: Optional[dict] = None,
+        chunk: Optional[int] = None,
+        keep_bars: bool = True,
+    ):
+        """
+        The per-bar simulation, after ``prepare()``.
+
+        With ``chunk`` it yields trade records and an equity checkpoint every
+        ``chunk`` bars, holding only one chunk of rows (``stream``); otherwise
+        it yields nothing and returns ``(trades, bars, idx)`` (``run``).
+        Without ``keep_bars`` no equity/signal rows are recorded.
+        """
         data = self.df  # iterate the original df
         # we'll iterate by integer position so we can reference next-row opens for fills
         idx = list(data.index)
         n = len(idx)
+        # Price columns are read once; per-bar access is a plain list lookup
+        opens = data["open"].to_numpy(dtype=float, na_value=np.nan).tolist()
+        lows = data["low"].to_numpy(dtype=float, na_value=np.nan).tolist()
+        closes = data["close"].to_numpy(dtype=float, na_value=np.nan).tolist()
+        # Array mode: strategy columns (added by prepare()) are extracted after prepare
+        columns = _column_arrays(data) if self.mode != "series" else None
+        labels = data.columns
         comm = self.cfg.commission_pct / 100.0
         cash = self.cfg.initial_capital
         equity = cash
         qty = 0
-        # open_trade now supports multiple lots for pyramiding
-        open_trade = None
+        # Lots of the open position (multiple lots when pyramiding)
+        pyramiding = int(getattr(self.strategy, "pyramiding", 1))
+        # Strategy hooks receive the bar position, so they need no index lookups
+        on_bar, on_entry = indexed_hooks(self.strategy)
+        lots = LotBook(capacity=pyramiding)
         entries_count = 0
         # Persistent state that survives across bars (for trailing stops, etc.)
         persistent_state = {}
-        # open_trade may include optional keys: per-lot 'stop_price', and aggregate fields
-        eq_rows, tr_rows, sig_rows = [], [], []
-        for i, ts in enumerate(idx):
-            row = data.iloc[i]
-            close = float(row["close"])
-
-            if np.isnan(close):
-                eq_rows.append(
-                    {
-                        "time": ts,
-                        "equity": equity,
-                        "cash": cash,
-                        "qty": qty,
-                        "price": np.nan,
-                    }
+        # Each lot carries an optional stop price (NaN in the book = no stop)
+        # Per-bar equity/signal columns are preallocated; trades are slotted records
+        streaming = chunk is not None
+        if not streaming:
+            chunk = n + 1  # never reached
+        # Rows of bars [base, base + chunk) live in the buffers
+        base = 0
+        bars = BarBuffers(min(n, chunk) if keep_bars else 0)
+        trades = TradeLog()
+        start = 0
+        if resume_from is not None:
+            start = resume_from.bar
+            cash, equity, qty = resume_from.cash, resume_from.equity, resume_from.qty
+            entries_count = resume_from.entries_count
+            persistent_state = copy.deepcopy(resume_from.persistent_state)
+            lots = resume_from.lots.copy()
+            trades = resume_from.trades.copy()
+            bars = resume_from.bars.extend(n)
+            for key, value in copy.deepcopy(resume_from.strategy_state).items():
+                setattr(self.strategy, key, value)
+        # A signal on the last bar fills at the next bar's open, so the last bar
+        # is replayed when the run is resumed with more data
+        checkpoint = n - 1 if snapshot else -1
+        for i in range(start, n):
+            ts = idx[i]
+            if streaming:
+                if trades.records:
+                    yield from trades.records
+                    trades.records.clear()
+                if i - base == chunk:
+                    yield self._checkpoint(bars, idx, base, i)
+                    base = i
+                    bars = BarBuffers(chunk)
+            k = i - base
+            if i == checkpoint:
+                self.last_snapshot = EngineSnapshot(
+                    bar=i,
+                    bar_time=ts,
+                    history_hash=history_hash(data, i),
+                    symbol=self.symbol,
+                    strategy=type(self.strategy).__qualname__,
+                    params=params,
+                    cfg=asdict(self.cfg),
+                    cash=cash,
+                    equity=equity,
+                    qty=qty,
+                    entries_count=entries_count,
+                    persistent_state=copy.deepcopy(persistent_state),
+                    lots=lots.copy(),
+                    trades=trades.copy(),
+                    bars=bars.head(i),
+                    strategy_state=changed_state(self.strategy, baseline),
                 )
+            close = closes[i]
+
+            if math.isnan(close):
+                if keep_bars:
+                    bars.equity[k] = equity
+                    bars.cash[k] = cash
+                    bars.qty[k] = qty
+                    bars.price[k] = np.nan
                 continue
 
+            if columns is not None:
+                row = BarView(columns, labels, i, ts)
+            else:
+                row = data.iloc[i]
+
             # Signals are determined on current bar
             # Merge persistent state with current bar state
             state = {"qty": qty, "cash": cash, "equity": equity, "symbol": self.symbol, "position": qty}
             state.update(persistent_state)  # Include persistent values (entry_price, highest_high, etc.)
-            act: dict[str, Any] = self.strategy.on_bar(ts, row, state)
+            act: dict[str, Any] = on_bar(i, ts, row, state)
             # Update persistent state with any changes made by strategy
             for key in ["entry_price", "highest_high", "tp1_hit", "tp2_hit"]:
                 if key in state:
@@ -232,36 +578,20 @@ class BacktestEngine:
 
             # ===== UPDATE TRAILING STOP IF PROVIDED =====
             # Strategy can return 'updated_stop' to update stop price for existing positions (TSL)
-            if qty > 0 and open_trade is not None:
+            if qty > 0 and lots.size:
                 updated_stop = act.get("updated_stop", None)
                 if updated_stop is not None:
                     try:
-                        new_stop = float(updated_stop)
                         # Update stop price for all lots (trailing stop can only move up)
-                        for lot in open_trade.get("lots", []):
-                            current_stop = lot.get("stop_price")
-                            if current_stop is not None:
-                                current_stop = float(current_stop)
-                                # TSL: only update if new stop is higher
-                                if new_stop > current_stop:
-                                    lot["stop_price"] = new_stop
+                        lots.raise_stops(float(updated_stop))
                     except Exception:
                         pass  # Ignore errors in stop updates
 
             # stop detection: if any lot has a stop and low <= that stop, trigger full exit
-            if qty > 0 and open_trade is not None:
-                # gather stop prices from lots (if present)
-                stop_prices = []
-                for lot in open_trade.get("lots", []):
-                    sp = lot.get("stop_price")
-                    if sp is not None:
-                        try:
-                            stop_prices.append(float(sp))
-                        except Exception:
-                            pass
-                if stop_prices:
-                    min_sp = min(stop_prices)
-                    current_low = float(row["low"])
+            if qty > 0 and lots.size:
+                min_sp = lots.min_stop()
+                if min_sp is not None:
+                    current_low = lows[i]
                     if current_low <= min_sp:
                         stop_hit = True
                         stop_reason = "stop"
@@ -276,38 +606,23 @@ class BacktestEngine:
                 # record each lot as its own trade row (so pyramiding counted as multiple trades)
                 gross_pnl = 0.0
                 comm_entry = 0.0
-                for lot in open_trade.get("lots", []):
-                    lp = float(lot.get("entry_price", 0.0))
-                    lq = int(lot.get("entry_qty", 0))
-                    l_comm = float(lot.get("commission_entry", 0.0))
+                for bar, lp, lq, l_comm, lot_stop in lots.lots():
                     lot_gross = (sell_fill - lp) * lq
                     exit_comm = (sell_fill * lq) * comm
                     lot_net = lot_gross - l_comm - exit_comm
 
-                    tr_rows.append(
-                        {
-                            "entry_time": lot.get("entry_time"),
-                            "entry_price": lp,
-                            "entry_qty": lq,
-                            "exit_time": ts,
-                            "exit_price": sell_fill,
-                            "commission_entry": l_comm,
-                            "commission_exit": exit_comm,
-                            "gross_pnl": lot_gross,
-                            "net_pnl": lot_net,
-                            "exit_reason": stop_reason,
-                            "entry_signal_reason": open_trade.get(
-                                "entry_signal_reason", ""
-                            ),  # Store entry signal reason
-                            "exit_signal_reason": "Stop Loss",  # Store signal reason for stop exits
-                            # Diagnostic: record the per-lot stop price (if any) reported by strategy
-                            "stop_price": lot.get("stop_price", None),
-                        }
+                    # exit signal reason is "Stop Loss"; stop_price records the
+                    # per-lot stop (if any) reported by the strategy
+                    trades.append(
+                        STOP_EXIT,
+                        idx[bar], lp, lq, ts, sell_fill, l_comm, exit_comm,
+                        lot_gross, lot_net, stop_reason,
+                        lots.entry_signal_reason, "Stop Loss", lot_stop,
                     )
                     gross_pnl += lot_gross
                     comm_entry += l_comm
                 qty = 0
-                open_trade = None
+                lots.clear()
                 persistent_state = {}  # Clear trailing stop state
                 entries_count = 0
                 did_exit = True
@@ -318,7 +633,7 @@ class BacktestEngine:
             # IMPORTANT: We calculate total exit commission ONCE and split it proportionally
             # across all exit legs to avoid double-charging commission
             partial_exits = act.get("partial_exits", [])
-            if qty > 0 and open_trade is not None and partial_exits and not did_exit:
+            if qty > 0 and lots.size and partial_exits and not did_exit:
                 # First pass: calculate total qty being exited and total notional value
                 exit_notional_total = 0.0
                 exit_details = []  # Store {exit_qty, fill_price, reason, fill_time} for later
@@ -349,75 +664,37 @@ class BacktestEngine:
                 
                 # Second pass: execute exits with proportional commission allocation
                 if exit_details and exit_notional_total > 0:
-                    total_exited_qty = 0
-                    remaining_to_exit = sum(ed["exit_qty"] for ed in exit_details)
-                    new_lots = []
-                    exit_idx = 0
-                    
-                    for lot in open_trade.get("lots", []):
-                        lq = int(lot.get("entry_qty", 0))
-                        lp = float(lot.get("entry_price", 0.0))
-                        l_comm = float(lot.get("commission_entry", 0.0))
-                        lot_remaining_qty = lq
-                        
-                        # Allocate exits to this lot from each exit detail
-                        while exit_idx < len(exit_details) and lot_remaining_qty > 0:
-                            exit_detail = exit_details[exit_idx]
-                            lot_exit_qty = min(exit_detail["exit_qty"], lot_remaining_qty)
-                            
-                            if lot_exit_qty > 0:
-                                # Proportional entry commission for exited portion
-                                exit_entry_comm = l_comm * (lot_exit_qty / lq) if lq > 0 else 0
-                                
-                                # Proportional exit commission: split total_exit_comm by notional value
-                                lot_notional = exit_detail["fill_price"] * lot_exit_qty
-                                exit_comm = (lot_notional / exit_notional_total) * total_exit_comm if exit_notional_total > 0 else 0
-                                
-                                lot_gross = (exit_detail["fill_price"] - lp) * lot_exit_qty
-                                lot_net = lot_gross - exit_entry_comm - exit_comm
-                                
-                                tr_rows.append({
-                                    "entry_time": lot.get("entry_time"),
-                                    "entry_price": lp,
-                                    "entry_qty": lot_exit_qty,
-                                    "exit_time": exit_detail["fill_time"],
-                                    "exit_price": exit_detail["fill_price"],
-                                    "commission_entry": exit_entry_comm,
-                                    "commission_exit": exit_comm,
-                                    "gross_pnl": lot_gross,
-                                    "net_pnl": lot_net,
-                                    "exit_reason": exit_detail["reason"],
-                                    "entry_signal_reason": open_trade.get("entry_signal_reason", ""),
-                                    "exit_signal_reason": exit_detail["reason"],
-                                    "stop_price": lot.get("stop_price"),
-                                    "exit_qty": lot_exit_qty,
-                                    "trade_status": "partial",
-                                })
-                                
-                                # Add proceeds to cash (with proportional commission)
-                                cash += lot_notional - exit_comm
-                                total_exited_qty += lot_exit_qty
-                                lot_remaining_qty -= lot_exit_qty
-                                exit_detail["exit_qty"] -= lot_exit_qty
-                            
-                            # Move to next exit if this one is done
-                            if exit_detail["exit_qty"] <= 0:
-                                exit_idx += 1
-                        
-                        # Keep remaining portion of lot
-                        if lot_remaining_qty > 0:
-                            new_lot = lot.copy()
-                            new_lot["entry_qty"] = lot_remaining_qty
-                            new_lot["commission_entry"] = l_comm * (lot_remaining_qty / lq) if lq > 0 else 0
-                            new_lots.append(new_lot)
-                    
-                    # Update open_trade with remaining lots
-                    open_trade["lots"] = new_lots
-                    qty = sum(int(lot.get("entry_qty", 0)) for lot in new_lots)
-                    
+                    legs = lots.allocate_exits(
+                        [ed["exit_qty"] for ed in exit_details],
+                        [ed["fill_price"] for ed in exit_details],
+                        exit_notional_total,
+                        total_exit_comm,
+                    )
+                    for (
+                        bar, lp, lot_stop, j, lot_exit_qty, exit_entry_comm, exit_comm, lot_notional
+                    ) in legs:
+                        exit_detail = exit_details[j]
+                        lot_gross = (exit_detail["fill_price"] - lp) * lot_exit_qty
+                        lot_net = lot_gross - exit_entry_comm - exit_comm
+
+                        trades.append(
+                            PARTIAL_EXIT,
+                            idx[bar], lp, lot_exit_qty,
+                            exit_detail["fill_time"], exit_detail["fill_price"],
+                            exit_entry_comm, exit_comm, lot_gross, lot_net,
+                            exit_detail["reason"], lots.entry_signal_reason,
+                            exit_detail["reason"], lot_stop, lot_exit_qty, "partial",
+                        )
+
+                        # Add proceeds to cash (with proportional commission)
+                        cash += lot_notional - exit_comm
+
+                    # Lots with quantity left stay open
+                    qty = lots.total_qty()
+
                     # If no qty left, close the trade
                     if qty <= 0:
-                        open_trade = None
+                        lots.clear()
                         persistent_state = {}
                         entries_count = 0
                         did_exit = True
@@ -426,49 +703,31 @@ class BacktestEngine:
                 if self.cfg.execute_on_next_open:
                     # ensure next bar exists
                     if i + 1 < n:
-                        next_row = data.iloc[i + 1]
-                        next_open = float(next_row["open"])
+                        next_time = idx[i + 1]
+                        next_open = opens[i + 1]
                         sell_fill = self._fills(next_open)[1]
                         notional = sell_fill * qty
                         fee = notional * (comm)
                         # compute pnl across lots
                         gross_pnl = 0.0
                         comm_entry = 0.0
-                        for lot in open_trade.get("lots", []):
-                            lp = lot.get("entry_price", 0.0)
-                            lq = lot.get("entry_qty", 0)
+                        for _, lp, lq, l_comm, _ in lots.lots():
                             gross_pnl += (sell_fill - lp) * lq
-                            comm_entry += float(lot.get("commission_entry", 0.0))
+                            comm_entry += l_comm
                         gross_pnl - comm_entry - fee
                         cash += notional - fee
                         # record each lot as individual trade rows on signal exit
-                        for lot in open_trade.get("lots", []):
-                            lp = float(lot.get("entry_price", 0.0))
-                            lq = int(lot.get("entry_qty", 0))
-                            l_comm = float(lot.get("commission_entry", 0.0))
+                        for bar, lp, lq, l_comm, lot_stop in lots.lots():
                             lot_gross = (sell_fill - lp) * lq
                             lot_net = lot_gross - l_comm - (sell_fill * lq) * comm
-                            tr_rows.append(
-                                {
-                                    "entry_time": lot.get("entry_time"),
-                                    "entry_price": lp,
-                                    "entry_qty": lq,
-                                    "exit_time": next_row.name,
-                                    "exit_price": sell_fill,
-                                    "exit_reason": "signal",
-                                    "entry_signal_reason": open_trade.get(
-                                        "entry_signal_reason", ""
-                                    ),  # Store entry signal reason
-                                    "exit_signal_reason": signal_reason,  # Store signal reason
-                                    "stop_price": lot.get("stop_price", None),
-                                    "commission_entry": l_comm,
-                                    "commission_exit": (sell_fill * lq) * comm,
-                                    "gross_pnl": lot_gross,
-                                    "net_pnl": lot_net,
-                                }
+                            trades.append(
+                                SIGNAL_EXIT,
+                                idx[bar], lp, lq, next_time, sell_fill, "signal",
+                                lots.entry_signal_reason, signal_reason, lot_stop,
+                                l_comm, (sell_fill * lq) * comm, lot_gross, lot_net,
                             )
                         qty = 0
-                        open_trade = None
+                        lots.clear()
                         persistent_state = {}  # Clear trailing stop state
                         entries_count = 0
                         did_exit = True
@@ -483,53 +742,34 @@ class BacktestEngine:
                     # compute pnl across lots
                     gross_pnl = 0.0
                     comm_entry = 0.0
-                    for lot in open_trade.get("lots", []):
-                        lp = lot.get("entry_price", 0.0)
-                        lq = lot.get("entry_qty", 0)
+                    for _, lp, lq, l_comm, _ in lots.lots():
                         gross_pnl += (sell_fill - lp) * lq
-                        comm_entry += float(lot.get("commission_entry", 0.0))
+                        comm_entry += l_comm
                     gross_pnl - comm_entry - fee
                     cash += notional - fee
                     # record each lot as its own trade on same-bar close
-                    for lot in open_trade.get("lots", []):
-                        lp = float(lot.get("entry_price", 0.0))
-                        lq = int(lot.get("entry_qty", 0))
-                        l_comm = float(lot.get("commission_entry", 0.0))
+                    for bar, lp, lq, l_comm, lot_stop in lots.lots():
                         lot_gross = (sell_fill - lp) * lq
                         lot_net = lot_gross - l_comm - (sell_fill * lq) * comm
-                        tr_rows.append(
-                            {
-                                "entry_time": lot.get("entry_time"),
-                                "entry_price": lp,
-                                "entry_qty": lq,
-                                "exit_time": ts,
-                                "exit_price": sell_fill,
-                                "exit_reason": "signal",
-                                "entry_signal_reason": open_trade.get(
-                                    "entry_signal_reason", ""
-                                ),  # Store entry signal reason
-                                "exit_signal_reason": signal_reason,  # Store signal reason
-                                "stop_price": lot.get("stop_price", None),
-                                "commission_entry": l_comm,
-                                "commission_exit": (sell_fill * lq) * comm,
-                                "gross_pnl": lot_gross,
-                                "net_pnl": lot_net,
-                            }
+                        trades.append(
+                            SIGNAL_EXIT,
+                            idx[bar], lp, lq, ts, sell_fill, "signal",
+                            lots.entry_signal_reason, signal_reason, lot_stop,
+                            l_comm, (sell_fill * lq) * comm, lot_gross, lot_net,
                         )
                     qty = 0
-                    open_trade = None
+                    lots.clear()
                     persistent_state = {}  # Clear trailing stop state
                     did_exit = True
 
             did_entry = False
             # allow pyramiding: only add entry if current entries_count < strategy.pyramiding
-            pyramiding = int(getattr(self.strategy, "pyramiding", 1))
             if entries_count < pyramiding and enter:
                 if self.cfg.execute_on_next_open:
                     # ensure next bar exists for entry fill
                     if i + 1 < n:
-                        next_row = data.iloc[i + 1]
-                        next_open = float(next_row["open"])
+                        next_time = idx[i + 1]
+                        next_open = opens[i + 1]
                         buy_fill = self._fills(next_open)[0]
                         # Position sizing: use current equity if compounding, else initial capital
                         sizing_equity = equity if self.cfg.compounding else self.cfg.initial_capital
@@ -544,13 +784,9 @@ class BacktestEngine:
                             total = notional + fee
                             if total <= cash:
                                 cash -= total
-                                # add this lot to open_trade (create if needed)
-                                if open_trade is None:
-                                    open_trade = {
-                                        "lots": [],
-                                        "first_entry_time": next_row.name,
-                                        "entry_signal_reason": signal_reason,  # Store entry signal reason
-                                    }
+                                # the first lot of a position records the entry signal reason
+                                if not lots.size:
+                                    lots.entry_signal_reason = signal_reason
                                 # capture per-entry stop if provided by strategy (absolute price)
                                 stop_price = None
                                 if intended_stop is not None:
@@ -559,17 +795,10 @@ class BacktestEngine:
                                     except Exception:
                                         stop_price = None
 
-                                lot = {
-                                    "entry_time": next_row.name,
-                                    "entry_price": buy_fill,
-                                    "entry_qty": shares,
-                                    "commission_entry": fee,
-                                    "stop_price": stop_price,
-                                }
                                 # allow strategy to augment the lot (compute ATR-based stops etc.)
                                 try:
-                                    meta = self.strategy.on_entry(
-                                        lot["entry_time"], lot["entry_price"], state
+                                    meta = on_entry(
+                                        i + 1, next_time, buy_fill, state
                                     )
                                     # Sync state changes from on_entry to persistent_state
                                     for key in ["entry_price", "highest_high"]:
@@ -580,7 +809,7 @@ class BacktestEngine:
                                         and meta.get("stop") is not None
                                     ):
                                         try:
-                                            lot["stop_price"] = float(meta.get("stop"))
+                                            stop_price = float(meta.get("stop"))
                                         except Exception:
                                             pass
                                 except Exception:
@@ -597,25 +826,8 @@ class BacktestEngine:
                                     persistent_state["tp2_price"] = buy_fill * (1 + tp2_pct)
                                     persistent_state["tp2_hit"] = False
                                 
-                                open_trade["lots"].append(lot)
-                                # recompute aggregate qty and avg entry price/commissions
-                                qty = sum(
-                                    int(lot.get("entry_qty", 0))
-                                    for lot in open_trade["lots"]
-                                )
-                                total_cost = sum(
-                                    float(lot.get("entry_price", 0.0))
-                                    * int(lot.get("entry_qty", 0))
-                                    for lot in open_trade["lots"]
-                                )
-                                total_comm = sum(
-                                    float(lot.get("commission_entry", 0.0))
-                                    for lot in open_trade["lots"]
-                                )
-                                open_trade["avg_entry_price"] = (
-                                    (total_cost / qty) if qty else None
-                                )
-                                open_trade["commission_entry"] = total_comm
+                                lots.add(i + 1, buy_fill, shares, fee, stop_price)
+                                qty = lots.total_qty()
                                 entries_count += 1
                                 did_entry = True
                     else:
@@ -636,18 +848,9 @@ class BacktestEngine:
                         if total <= cash:
                             cash -= total
                             qty = shares
-                            open_trade = {
-                                "entry_time": ts,
-                                "entry_price": buy_fill,
-                                "entry_qty": shares,
-                                "commission_entry": fee,
-                                "lots": [{
-                                    "entry_time": ts,
-                                    "entry_price": buy_fill,
-                                    "entry_qty": shares,
-                                    "commission_entry": fee,
-                                }],
-                            }
+                            # same-bar fills hold a single lot (no stop)
+                            lots.clear()
+                            lots.add(i, buy_fill, shares, fee, None)
                             # ===== SET TP PRICES FOR PARTIAL EXITS =====
                             tp1_pct = getattr(self.strategy, "tp1_pct", None)
                             tp2_pct = getattr(self.strategy, "tp2_pct", None)
@@ -663,87 +866,37 @@ class BacktestEngine:
 
             # STATE VALIDATION: Check invariants (optional defensive check)
             # Uncomment to enable runtime state validation during backtest
-            # self._validate_state(cash, qty, equity, open_trade)
-
-            eq_rows.append(
-                {"time": ts, "equity": equity, "cash": cash, "qty": qty, "price": close}
-            )
-            sig_rows.append(
-                {
-                    "time": ts,
-                    "enter_long": enter,
-                    "exit_long": exit_,
-                    "did_entry": did_entry,
-                    "did_exit": did_exit,
-                }
-            )
-            # increment time_in_trade for open position bookkeeping (useful for time stops)
-            if qty > 0 and open_trade is not None:
-                try:
-                    open_trade["time_in_trade"] = (
-                        int(open_trade.get("time_in_trade", 0)) + 1
-                    )
-                except Exception:
-                    open_trade["time_in_trade"] = 0
+            # self._validate_state(cash, qty, equity, lots)
+
+            if keep_bars:
+                bars.equity[k] = equity
+                bars.cash[k] = cash
+                bars.qty[k] = qty
+                bars.price[k] = close
+                bars.valid[k] = True
+                bars.enter_long[k] = enter
+                bars.exit_long[k] = exit_
+                bars.did_entry[k] = did_entry
+                bars.did_exit[k] = did_exit
 
         # CORRECT HANDLING: Export open trades WITHOUT forcing them to close
         # Open trades should remain open in real trading - not artificially closed at backtest end
-        if qty > 0 and open_trade is not None:
+        if qty > 0 and lots.size:
             # Export open trade with exit_time = NaN to indicate it's still open
-
-            if hasattr(open_trade, "get") and "lots" in open_trade:
-                # Handle pyramiding case (multiple lots)
-                for lot in open_trade["lots"]:
-                    entry_qty = int(lot.get("entry_qty", 0))
-                    entry_price = float(lot.get("entry_price", 0))
-                    if entry_qty > 0 and entry_price > 0:
-                        # Export as open trade - no artificial exit
-                        tr_rows.append(
-                            {
-                                "entry_time": lot.get("entry_time"),
-                                "exit_time": None,  # Open trade - no exit
-                                "entry_price": entry_price,
-                                "exit_price": None,  # Open trade - no exit price
-                                "entry_qty": entry_qty,
-                                "exit_qty": None,  # Open trade - no exit
-                                "commission_entry": lot.get("commission_entry", 0),
-                                "commission_exit": 0,  # No exit commission for open trade
-                                "gross_pnl": None,  # Open trade - unrealized P&L tracked in equity curve
-                                "net_pnl": None,  # Open trade - unrealized P&L tracked in equity curve
-                                "trade_status": "OPEN",  # Mark as open trade
-                                "stop_price": lot.get("stop_price", None),
-                            }
-                        )
-            else:
-                # Handle simple case (single position)
-                entry_price = float(open_trade.get("entry_price", 0))
-                entry_qty = int(open_trade.get("entry_qty", 0))
+            # (one row per lot when pyramiding)
+            for bar, entry_price, entry_qty, l_comm, lot_stop in lots.lots():
                 if entry_qty > 0 and entry_price > 0:
-                    # Export as open trade - no artificial exit
-                    tr_rows.append(
-                        {
-                            "entry_time": open_trade.get("entry_time"),
-                            "exit_time": None,  # Open trade - no exit
-                            "entry_price": entry_price,
-                            "exit_price": None,  # Open trade - no exit price
-                            "entry_qty": entry_qty,
-                            "exit_qty": None,  # Open trade - no exit
-                            "commission_entry": open_trade.get("commission_entry", 0),
-                            "commission_exit": 0,  # No exit commission for open trade
-                            "gross_pnl": None,  # Open trade - unrealized P&L tracked in equity curve
-                            "net_pnl": None,  # Open trade - unrealized P&L tracked in equity curve
-                            "trade_status": "OPEN",  # Mark as open trade
-                        }
+                    # Export as open trade - no artificial exit: no exit time/price/qty,
+                    # no exit commission, and P&L left to the equity curve (unrealized)
+                    trades.append(
+                        OPEN_TRADE,
+                        idx[bar], None, entry_price, None, entry_qty, None,
+                        l_comm, 0, None, None, "OPEN", lot_stop,
                     )
 
-        equity_df = pd.DataFrame(eq_rows).set_index("time")
-        trades_df = pd.DataFrame(tr_rows)
-        
-        # Consolidate partial exits into single trade rows
-        # This groups all exit legs (TP1, TP2, signal) from the same entry into one trade
-        if not trades_df.empty and len(trades_df) > 0:
-            trades_df = self._consolidate_partial_exits(trades_df)
-        
-        signals_df = pd.DataFrame(sig_rows).set_index("time")
-
-        return trades_df, equity_df, signals_df
+        if streaming:
+            yield from trades.records
+            trades.records.clear()
+            if n > base:
+                yield self._checkpoint(bars, idx, base, n)
+        return trades, bars, idx
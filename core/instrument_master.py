@@ -0,0 +1,284 @@
+"""Indexed Dhan instrument master, parsed once per file version.
+
+The scrip master (``data/dhan-scrip-master-detailed.csv``, the API parquet
+``api-scrip-master-detailed.parquet`` or the webhook's
+``security_id_list.csv``) has hundreds of thousands of rows; filtering it with
+a boolean mask per symbol costs seconds for a basket. :class:`InstrumentMaster`
+keeps only the columns needed to resolve instruments, as parallel lists, plus
+dict indexes:
+
+    >>> master = get_instrument_master()
+    >>> master.security_id("RELIANCE")
+    2885
+    >>> master.symbol(2885), master.segment(2885), master.lot_size(2885)
+
+The parsed index is pickled to ``<source dir>/.instrument_index/<name>.pkl``
+with the source's size and mtime; it is reused until the source file changes
+and shared per process by :func:`get_instrument_master`.
+
+Both master layouts are understood:
+
+- compact (``SEM_*`` columns): symbols are ``SEM_TRADING_SYMBOL``
+- detailed (``SECURITY_ID``, ``SYMBOL_NAME``, ``UNDERLYING_SYMBOL``, ...):
+  a symbol matches either ``SYMBOL_NAME`` or ``UNDERLYING_SYMBOL``
+
+Only the standard library is needed for CSV masters (the webhook service uses
+this module without pandas); parquet masters need pyarrow.
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+INDEX_VERSION = 1
+INDEX_DIR = ".instrument_index"
+DEFAULT_MASTER = "dhan-scrip-master-detailed.csv"
+
+# layout -> {field: column}; "keys" are the columns a symbol is matched against
+LAYOUTS = {
+    "compact": {
+        "keys": ("SEM_TRADING_SYMBOL",),
+        "secid": "SEM_SMST_SECURITY_ID",
+        "symbol": "SEM_TRADING_SYMBOL",
+        "exchange": "SEM_EXM_EXCH_ID",
+        "segment": "SEM_SEGMENT",
+        "lot_size": "SEM_LOT_UNITS",
+    },
+    "detailed": {
+        "keys": ("SYMBOL_NAME", "UNDERLYING_SYMBOL"),
+        "secid": "SECURITY_ID",
+        "symbol": "UNDERLYING_SYMBOL",
+        "exchange": "EXCH_ID",
+        "segment": "SEGMENT",
+        "lot_size": "LOT_SIZE",
+    },
+}
+
+_FIELDS = ("secid", "symbol", "exchange", "segment", "lot_size")
+
+# absolute source path -> InstrumentMaster
+_MASTERS: dict[str, "InstrumentMaster"] = {}
+_MASTERS_LOCK = threading.Lock()  # one parse per file across loader threads
+
+
+def _layout(columns) -> str:
+    return "compact" if LAYOUTS["compact"]["secid"] in columns else "detailed"
+
+
+def _parquet_rows(path: str) -> tuple[list[str], Iterator[dict]]:
+    """Header and rows (dicts of strings) of a parquet master."""
+    import pyarrow.parquet as pq
+
+    data = pq.read_table(path).to_pydict()
+    columns = list(data)
+    rows = (
+        {c: "" if v is None else str(v) for c, v in zip(columns, values)}
+        for values in zip(*data.values())
+    )
+    return columns, rows
+
+
+def _to_int(value: str) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _compact(index: dict) -> dict:
+    """Single positions as ints, repeated keys as tuples (5x faster unpickling
+    than a list per key)."""
+    return {k: v[0] if len(v) == 1 else tuple(v) for k, v in index.items()}
+
+
+def _stat(path: str) -> dict:
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+class InstrumentMaster:
+    """Symbol <-> SECURITY_ID index of one instrument master file.
+
+    Rows keep the master's order: :meth:`security_ids` lists every match in
+    file order and :meth:`symbol_map` resolves duplicates to the last row, as
+    the per-caller parsers did.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = os.path.abspath(path)
+        self.source = _stat(self.path)
+        if self.path.lower().endswith(".parquet"):
+            self._build(*_parquet_rows(self.path))
+        else:
+            with open(self.path, newline="", encoding="utf-8-sig") as f:
+                reader = csv.DictReader(f)
+                self._build(reader.fieldnames or [], reader)
+        by_secid: dict[int, list[int]] = {}
+        for pos, secid in enumerate(self.columns["secid"]):
+            by_secid.setdefault(secid, []).append(pos)
+        self._by_secid = _compact(by_secid)
+
+    def _build(self, columns, rows) -> None:
+        self.layout = _layout(columns)
+        spec = LAYOUTS[self.layout]
+        self.columns: dict[str, list] = {field: [] for field in _FIELDS}
+        self._by_symbol: dict[str, list[int]] = {}
+        for row in rows:
+            secid = _to_int(row.get(spec["secid"], ""))
+            if secid is None:
+                continue
+            pos = len(self.columns["secid"])
+            self.columns["secid"].append(secid)
+            for field in ("symbol", "exchange", "segment"):
+                self.columns[field].append((row.get(spec[field]) or "").strip())
+            self.columns["lot_size"].append(_to_int(row.get(spec["lot_size"], "")))
+            keys = {(row.get(col) or "").strip() for col in spec["keys"]}
+            for key in keys - {""}:
+                self._by_symbol.setdefault(key, []).append(pos)
+        self._by_symbol = _compact(self._by_symbol)
+
+    def __len__(self) -> int:
+        return len(self.columns["secid"])
+
+    def __repr__(self) -> str:
+        return f"InstrumentMaster({self.path!r}, {self.layout}, rows={len(self)})"
+
+    # -- lookups -----------------------------------------------------------
+
+    def _filter(
+        self, positions, exchange: Optional[str], segment: Optional[str]
+    ) -> list[int]:
+        if isinstance(positions, int):
+            positions = (positions,)
+        cols = self.columns
+        return [
+            p
+            for p in positions
+            if (exchange is None or cols["exchange"][p] == exchange)
+            and (segment is None or cols["segment"][p] == segment)
+        ]
+
+    def security_ids(
+        self,
+        symbol: str,
+        exchange: Optional[str] = None,
+        segment: Optional[str] = None,
+    ) -> list[int]:
+        """SECURITY_IDs of every row matching ``symbol``, in file order."""
+        secids = self.columns["secid"]
+        positions = self._by_symbol.get(symbol, ())
+        return [secids[p] for p in self._filter(positions, exchange, segment)]
+
+    def security_id(
+        self,
+        symbol: str,
+        exchange: Optional[str] = None,
+        segment: Optional[str] = None,
+    ) -> Optional[int]:
+        """SECURITY_ID of the first row matching ``symbol``, or None."""
+        positions = self._by_symbol.get(symbol, ())
+        positions = self._filter(positions, exchange, segment)
+        return self.columns["secid"][positions[0]] if positions else None
+
+    def _field(self, secid: int, field: str, exchange: Optional[str]):
+        # SECURITY_IDs are only unique within an exchange
+        positions = self._filter(self._by_secid.get(int(secid), ()), exchange, None)
+        return self.columns[field][positions[0]] if positions else None
+
+    def symbol(self, secid: int, exchange: Optional[str] = None) -> Optional[str]:
+        return self._field(secid, "symbol", exchange)
+
+    def exchange(self, secid: int) -> Optional[str]:
+        return self._field(secid, "exchange", None)
+
+    def segment(self, secid: int, exchange: Optional[str] = None) -> Optional[str]:
+        return self._field(secid, "segment", exchange)
+
+    def lot_size(self, secid: int, exchange: Optional[str] = None) -> Optional[int]:
+        return self._field(secid, "lot_size", exchange)
+
+    def symbol_map(
+        self,
+        exchange: Optional[str] = None,
+        segment: Optional[str] = None,
+        with_exchange: bool = False,
+    ) -> dict[str, int]:
+        """Symbol (or ``"<symbol>_<exchange>"``) -> SECURITY_ID over the rows
+        of ``exchange``/``segment``; the last row wins for duplicates."""
+        cols = self.columns
+        out: dict[str, int] = {}
+        for p, secid in enumerate(cols["secid"]):
+            if exchange is not None and cols["exchange"][p] != exchange:
+                continue
+            if segment is not None and cols["segment"][p] != segment:
+                continue
+            symbol = cols["symbol"][p]
+            if not symbol:
+                continue
+            out[f"{symbol}_{cols['exchange'][p]}" if with_exchange else symbol] = secid
+        return out
+
+
+def _index_path(path: str) -> str:
+    folder, name = os.path.split(path)
+    return os.path.join(folder, INDEX_DIR, f"{name}.pkl")
+
+
+def load_instrument_master(path: Union[str, Path]) -> InstrumentMaster:
+    """Load the index of ``path`` from its pickle, or parse and pickle it."""
+    path = os.path.abspath(path)
+    index_path = _index_path(path)
+    source = _stat(path)
+    try:
+        with open(index_path, "rb") as f:
+            version, master = pickle.load(f)
+        if version == INDEX_VERSION and master.source == source:
+            master.path = path
+            return master
+    except Exception:
+        pass  # missing, stale or unreadable: parse the source again
+    master = InstrumentMaster(path)
+    try:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        tmp = f"{index_path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((INDEX_VERSION, master), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, index_path)
+    except OSError:
+        pass  # read-only location: the index still works in memory
+    return master
+
+
+def default_master_path() -> Path:
+    from config import DATA_DIR
+
+    return DATA_DIR / DEFAULT_MASTER
+
+
+def get_instrument_master(
+    path: Union[str, Path, None] = None,
+) -> Optional[InstrumentMaster]:
+    """The process-wide index of ``path`` (default: the Dhan CSV master in
+    DATA_DIR), reloaded when the file changes; None if it does not exist."""
+    path = os.path.abspath(path or default_master_path())
+    master = _MASTERS.get(path)
+    try:
+        source = _stat(path)
+    except FileNotFoundError:
+        _MASTERS.pop(path, None)
+        return None
+    if master is None or master.source != source:
+        with _MASTERS_LOCK:
+            master = _MASTERS.get(path)
+            if master is None or master.source != source:
+                master = _MASTERS[path] = load_instrument_master(path)
+    return master
+
+
+def clear_instrument_cache() -> None:
+    _MASTERS.clear()
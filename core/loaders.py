@@ -3,42 +3,35 @@
 from __future__ import annotations
 
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 
 from config import CACHE_DIR, DATA_DIR
 
+from . import cache_manifest, ohlcv_store
+from .instrument_master import get_instrument_master
 
-def _guess_cache_filename(sym: str, cache_dir: str, interval: str = "1d") -> str:
+
+def _guess_cache_filename(
+    sym: str,
+    cache_dir: str,
+    interval: str = "1d",
+    manifest: cache_manifest.CacheManifest | None = None,
+) -> str:
     # Normalize symbol to match cache filenames
     base = sym.replace("NSE:", "").replace(":", "_").replace("/", "_")
 
-    # Try new dhan format: dhan_<SECID>_<SYMBOL>_<TIMEFRAME>.csv
-    # First, try to find any dhan file matching the symbol and timeframe
-    import glob
-
-    # Check in organized cache directory structure
+    # Dhan/Groww CSVs are resolved through the cache manifest (core/cache_manifest.py):
     # Daily files: data/cache/dhan/daily/dhan_{SECID}_{SYMBOL}_1d.csv
     # Weekly files: data/cache/groww/weekly/groww_{TOKEN}_{SYMBOL}_1w.csv
-    
-    if interval == "1d":
-        dhan_daily_dir = os.path.join(DATA_DIR, "cache", "dhan", "daily")
-        pattern = os.path.join(dhan_daily_dir, f"dhan_*_{base}_1d.csv")
-        matches = glob.glob(pattern)
-        if matches:
-            return matches[0]
-    elif interval == "1w":
-        groww_weekly_dir = os.path.join(DATA_DIR, "cache", "groww", "weekly")
-        pattern = os.path.join(groww_weekly_dir, f"groww_*_{base}_1w.csv")
-        matches = glob.glob(pattern)
-        if matches:
-            return matches[0]
-    
-    # Also check the generic cache_dir for any dhan files
-    pattern = os.path.join(cache_dir, f"dhan_*_{base}_{interval}.csv")
-    matches = glob.glob(pattern)
-    if matches:
-        return matches[0]
+    # then any dhan_{SECID}_{SYMBOL}_{interval}.csv in the generic cache_dir
+    if manifest is None:
+        manifest = cache_manifest.get_manifest(cache_dir, DATA_DIR)
+    path = manifest.resolve(base, interval)
+    if path is not None:
+        return path
 
     # Fallback to old parquet formats
     # common cache naming used earlier: <SYMBOL>_NS.parquet
@@ -53,6 +46,179 @@ def _guess_cache_filename(sym: str, cache_dir: str, interval: str = "1d") -> str
     return os.path.join(cache_dir, f"dhan_*_{base}_{interval}.csv")
 
 
+def read_cache_file(path: str) -> pd.DataFrame:
+    """Read one cached OHLCV file (CSV or parquet) into a sorted frame with a
+    tz-naive DatetimeIndex and the standard lowercase columns."""
+    if str(path).lower().endswith(".csv"):
+        # Try to read CSV with different date column formats
+        try:
+            # Try with 'time' column (Dhan format)
+            df = pd.read_csv(path, parse_dates=["time"], index_col="time")
+            # Normalize column names to lowercase
+            df.columns = df.columns.str.lower()
+        except (ValueError, KeyError):
+            try:
+                # Try with 'Date' column (old yfinance format)
+                df = pd.read_csv(path, parse_dates=["Date"], index_col="Date")
+                # Normalize column names to lowercase
+                df.columns = df.columns.str.lower()
+            except (ValueError, KeyError):
+                # Try with 'date' column (new format)
+                df = pd.read_csv(path, parse_dates=["date"], index_col="date")
+    else:
+        df = pd.read_parquet(path)
+
+    if not isinstance(df.index, pd.DatetimeIndex):
+        if "date" in df.columns:
+            df["date"] = pd.to_datetime(df["date"], errors="coerce")
+            df = df.set_index("date")
+        else:
+            df.index = pd.to_datetime(df.index)
+
+    # CRITICAL: Normalize timezone-aware datetimes to tz-naive (local time)
+    # This fixes compatibility issues between UTC (1d) and IST (intraday) cache files
+    if df.index.tz is not None:
+        df.index = df.index.tz_localize(None)
+
+    # ensure standard columns exist
+    for c in ["open", "high", "low", "close", "volume"]:
+        if c not in df.columns:
+            df[c] = pd.NA
+
+    return df.sort_index()
+
+
+def is_epoch_corrupted(df: pd.DataFrame) -> bool:
+    """True when all dates are in 1970 (Unix epoch bug in some Dhan CSV files)."""
+    return not df.empty and df.index[0].year == 1970 and df.index[-1].year == 1970
+
+
+def _load_each(load_one, symbols, max_workers, timings):
+    """Yield ``(sym, load_one(sym))`` in ``symbols`` order.
+
+    With ``max_workers`` > 1 the symbols are loaded on a thread pool (file reads
+    and CSV parsing release the GIL); results and the first error are still
+    produced in symbol order. ``timings`` (if given) receives each symbol's
+    load time in seconds.
+    """
+
+    def timed(sym):
+        start = time.perf_counter()
+        result = load_one(sym)
+        return result, time.perf_counter() - start
+
+    if not max_workers or max_workers <= 1 or len(symbols) <= 1:
+        results = (timed(sym) for sym in symbols)
+        for sym, (result, elapsed) in zip(symbols, results):
+            if timings is not None:
+                timings[sym] = elapsed
+            yield sym, result
+        return
+
+    with ThreadPoolExecutor(max_workers, thread_name_prefix="load_many") as pool:
+        futures = [pool.submit(timed, sym) for sym in symbols]
+        try:
+            for sym, future in zip(symbols, futures):
+                result, elapsed = future.result()
+                if timings is not None:
+                    timings[sym] = elapsed
+                yield sym, result
+        finally:
+            # On the first error (or an abandoned generator) skip what has not started
+            for future in futures:
+                future.cancel()
+
+
+def _load_india_symbol(
+    sym: str,
+    interval: str,
+    cache_dir: str,
+    use_cache_only: bool,
+    manifest: cache_manifest.CacheManifest,
+) -> tuple[pd.DataFrame, str | None]:
+    """One symbol of :func:`load_many_india`: its frame and the cache file it
+    was read from (None when it came from the columnar store)."""
+    # The store only stands in for the CSV the manifest resolves right now
+    source = manifest.resolve(ohlcv_store.symbol_key(sym), interval)
+    if source is not None:
+        store_root = os.path.join(cache_dir, "columnar")
+        try:
+            df = ohlcv_store.read_frame(sym, interval, root=store_root, source=source)
+        except Exception as e:
+            raise RuntimeError(f"Failed to read columnar store for {sym}: {e}")
+        if df is not None:
+            return df, None
+    path = _guess_cache_filename(sym, cache_dir, interval, manifest)
+    if not os.path.exists(path):
+        # Try to find a Dhan-historical CSV we may have already saved under data/dhan_historical_<SECID>.csv
+        # First attempt: map symbol to SECURITY_ID using instrument parquet or CSV
+        secid = None
+        # try parquet in cache
+        pq_path = os.path.join(cache_dir, "api-scrip-master-detailed.parquet")
+        try:
+            master = get_instrument_master(pq_path)
+            if master is not None:
+                base_name = sym.replace("NSE:", "").replace(".NS", "").split(".")[0]
+                cand_ids = master.security_ids(base_name)
+                if cand_ids:
+                    # If there are multiple matching rows, prefer a SECURITY_ID
+                    # for which we already have a data/dhan_historical_<SECID>.csv file.
+                    secid = None
+                    for cid in cand_ids:
+                        # Check both data/ and cache/ directories
+                        alt = manifest.secid_path(
+                            cid, ("historical", "historical_cache")
+                        )
+                        if alt is not None:
+                            secid = cid
+                            path = alt
+                            break
+                    if secid is None:
+                        secid = cand_ids[0]
+        except Exception:
+            secid = None
+
+        # fallback: try data CSV of instrument list
+        if secid is None:
+            csv_inst = DATA_DIR / "dhan-scrip-master-detailed.csv"
+            try:
+                # SEM_TRADING_SYMBOL, or SYMBOL_NAME / UNDERLYING_SYMBOL in the
+                # older layout (core/instrument_master.py)
+                master = get_instrument_master(csv_inst)
+                if master is not None:
+                    base_name = sym.replace("NSE:", "").replace(".NS", "").split(".")[0]
+                    cand_ids = master.security_ids(base_name)
+                    if cand_ids:
+                        secid = None
+                        for cid in cand_ids:
+                            # Organized cache structure first, then old locations
+                            alt = manifest.secid_path(cid)
+                            if alt is not None:
+                                secid = cid
+                                path = alt
+                                break
+                        if secid is None:
+                            secid = cand_ids[0]
+            except Exception:
+                secid = None
+
+        if secid is not None:
+            # Organized cache structure first, then old locations
+            path = manifest.secid_path(secid) or path
+
+        if not os.path.exists(path):
+            if use_cache_only:
+                raise FileNotFoundError(f"Cache missing for {sym}: looked for {path}")
+            else:
+                raise FileNotFoundError(
+                    f"Cache missing for {sym}: {path}. Enable caching or provide data/loaders implementation."
+                )
+    try:
+        return read_cache_file(path), path
+    except Exception as e:
+        raise RuntimeError(f"Failed to read cached data for {sym} from {path}: {e}")
+
+
 def load_many_india(
     symbols: list[str],
     interval: str = "1d",
@@ -60,6 +226,8 @@ def load_many_india(
     cache: bool = True,
     cache_dir: str | None = None,
     use_cache_only: bool = False,
+    max_workers: int | None = None,
+    timings: dict[str, float] | None = None,
 ) -> dict[str, pd.DataFrame]:
     """Load OHLC data for a list of Indian symbols from local cache parquet files.
 
@@ -68,189 +236,31 @@ def load_many_india(
 
     Returns a dict mapping the original symbol string to a pandas DataFrame with a DatetimeIndex.
 
+    Symbols migrated to the columnar store under `<cache_dir>/columnar`
+    (core/ohlcv_store.py) are read from it without parsing; all others, and
+    symbols whose CSV changed since migration, are read from the CSV cache.
+
+    `max_workers` > 1 loads the symbols on that many threads; the result keeps
+    the order of `symbols` and the error raised is that of the first failing
+    symbol, as in a sequential load. `timings`, if given, is filled with the
+    load time in seconds of each symbol.
+
     Raises FileNotFoundError if `use_cache_only` is True and a symbol's cache file is missing.
     """
     if cache_dir is None:
         cache_dir = str(CACHE_DIR)
     out = {}
     os.makedirs(cache_dir, exist_ok=True)
-    for sym in symbols:
-        path = _guess_cache_filename(sym, cache_dir, interval)
-        if not os.path.exists(path):
-            # Try to find a Dhan-historical CSV we may have already saved under data/dhan_historical_<SECID>.csv
-            # First attempt: map symbol to SECURITY_ID using instrument parquet or CSV
-            secid = None
-            # try parquet in cache
-            pq_path = os.path.join(cache_dir, "api-scrip-master-detailed.parquet")
-            try:
-                if os.path.exists(pq_path):
-                    import pyarrow.parquet as pq
+    manifest = cache_manifest.get_manifest(cache_dir, DATA_DIR)
 
-                    tbl = pq.read_table(pq_path)
-                    df_inst = tbl.to_pandas()
-                    base_name = sym.replace("NSE:", "").replace(".NS", "").split(".")[0]
-                    row = df_inst[
-                        (df_inst["SYMBOL_NAME"] == base_name)
-                        | (df_inst["UNDERLYING_SYMBOL"] == base_name)
-                    ]
-                    if not row.empty:
-                        # If there are multiple matching rows, prefer a SECURITY_ID
-                        # for which we already have a data/dhan_historical_<SECID>.csv file.
-                        secid = None
-                        try:
-                            cand_ids = [int(x) for x in row["SECURITY_ID"].tolist()]
-                        except Exception:
-                            cand_ids = [int(row.iloc[0]["SECURITY_ID"])]
-                        for cid in cand_ids:
-                            # Check both data/ and cache/ directories
-                            alt_data = DATA_DIR / f"dhan_historical_{cid}.csv"
-                            alt_cache = os.path.join(
-                                cache_dir, f"dhan_historical_{cid}.csv"
-                            )
-                            if alt_data.exists():
-                                secid = cid
-                                path = str(alt_data)
-                                break
-                            elif os.path.exists(alt_cache):
-                                secid = cid
-                                path = alt_cache
-                                break
-                        if secid is None:
-                            secid = int(row.iloc[0]["SECURITY_ID"])
-            except Exception:
-                secid = None
+    def load_one(sym):
+        return _load_india_symbol(sym, interval, cache_dir, use_cache_only, manifest)
 
-            # fallback: try data CSV of instrument list
-            if secid is None:
-                csv_inst = DATA_DIR / "dhan-scrip-master-detailed.csv"
-                try:
-                    if csv_inst.exists():
-                        df_inst = pd.read_csv(csv_inst, low_memory=False)
-                        base_name = (
-                            sym.replace("NSE:", "").replace(".NS", "").split(".")[0]
-                        )
-                        # Try new column names first (SEM_TRADING_SYMBOL)
-                        if "SEM_TRADING_SYMBOL" in df_inst.columns:
-                            row = df_inst[df_inst["SEM_TRADING_SYMBOL"] == base_name]
-                            sec_id_col = "SEM_SMST_SECURITY_ID"
-                        else:
-                            # Fallback to old column names
-                            row = df_inst[
-                                (df_inst["SYMBOL_NAME"] == base_name)
-                                | (df_inst["UNDERLYING_SYMBOL"] == base_name)
-                            ]
-                            sec_id_col = "SECURITY_ID"
-                        if not row.empty:
-                            secid = None
-                            try:
-                                cand_ids = [int(x) for x in row[sec_id_col].tolist()]
-                            except Exception:
-                                cand_ids = [int(row.iloc[0][sec_id_col])]
-                            for cid in cand_ids:
-                                # Check new organized cache structure first
-                                import glob
-                                dhan_daily_dir = os.path.join(DATA_DIR, "cache", "dhan", "daily")
-                                pattern = os.path.join(dhan_daily_dir, f"dhan_{cid}_*_1d.csv")
-                                matches = glob.glob(pattern)
-                                if matches:
-                                    secid = cid
-                                    path = matches[0]
-                                    break
-                                # Fallback to old locations
-                                alt_data = DATA_DIR / f"dhan_historical_{cid}.csv"
-                                alt_cache = os.path.join(
-                                    cache_dir, f"dhan_historical_{cid}.csv"
-                                )
-                                if alt_data.exists():
-                                    secid = cid
-                                    path = str(alt_data)
-                                    break
-                                elif os.path.exists(alt_cache):
-                                    secid = cid
-                                    path = alt_cache
-                                    break
-                            if secid is None:
-                                secid = int(row.iloc[0][sec_id_col])
-                except Exception:
-                    secid = None
-
-            if secid is not None:
-                # Check new organized cache structure first
-                import glob
-                dhan_daily_dir = os.path.join(DATA_DIR, "cache", "dhan", "daily")
-                pattern = os.path.join(dhan_daily_dir, f"dhan_{secid}_*_1d.csv")
-                matches = glob.glob(pattern)
-                if matches:
-                    path = matches[0]
-                else:
-                    # Fallback to old locations
-                    alt_data = DATA_DIR / f"dhan_historical_{secid}.csv"
-                    alt_cache = os.path.join(cache_dir, f"dhan_historical_{secid}.csv")
-                    if alt_data.exists():
-                        path = str(alt_data)
-                    elif os.path.exists(alt_cache):
-                        path = alt_cache
-
-            if not os.path.exists(path):
-                if use_cache_only:
-                    raise FileNotFoundError(
-                        f"Cache missing for {sym}: looked for {path}"
-                    )
-                else:
-                    raise FileNotFoundError(
-                        f"Cache missing for {sym}: {path}. Enable caching or provide data/loaders implementation."
-                    )
-        try:
-            if str(path).lower().endswith(".csv"):
-                # Try to read CSV with different date column formats
-                try:
-                    # Try with 'time' column (Dhan format)
-                    df = pd.read_csv(path, parse_dates=["time"], index_col="time")
-                    # Normalize column names to lowercase
-                    df.columns = df.columns.str.lower()
-                except (ValueError, KeyError):
-                    try:
-                        # Try with 'Date' column (old yfinance format)
-                        df = pd.read_csv(path, parse_dates=["Date"], index_col="Date")
-                        # Normalize column names to lowercase
-                        df.columns = df.columns.str.lower()
-                    except (ValueError, KeyError):
-                        # Try with 'date' column (new format)
-                        df = pd.read_csv(path, parse_dates=["date"], index_col="date")
-            else:
-                df = pd.read_parquet(path)
-
-            if not isinstance(df.index, pd.DatetimeIndex):
-                if "date" in df.columns:
-                    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-                    df = df.set_index("date")
-                else:
-                    df.index = pd.to_datetime(df.index)
-
-            # CRITICAL: Normalize timezone-aware datetimes to tz-naive (local time)
-            # This fixes compatibility issues between UTC (1d) and IST (intraday) cache files
-            if df.index.tz is not None:
-                df.index = df.index.tz_localize(None)
-
-            # Check for corrupted timestamps (1970-01-01 epoch bug in some Dhan CSV files)
-            if not df.empty:
-                first_date = df.index[0]
-                last_date = df.index[-1]
-                # If all dates are in 1970 (Unix epoch), the data is corrupted
-                if first_date.year == 1970 and last_date.year == 1970:
-                    print(
-                        f"ERROR: Corrupted timestamps in {path}. Skipping symbol {sym}."
-                    )
-                    continue  # Skip this symbol and continue with others
-
-            # ensure standard columns exist
-            for c in ["open", "high", "low", "close", "volume"]:
-                if c not in df.columns:
-                    df[c] = pd.NA
-
-            out[sym] = df.sort_index()
-        except Exception as e:
-            raise RuntimeError(f"Failed to read cached data for {sym} from {path}: {e}")
+    for sym, (df, path) in _load_each(load_one, symbols, max_workers, timings):
+        if path is not None and is_epoch_corrupted(df):
+            print(f"ERROR: Corrupted timestamps in {path}. Skipping symbol {sym}.")
+            continue  # Skip this symbol and continue with others
+        out[sym] = df
     return out
 
 
@@ -299,6 +309,8 @@ def load_many_india_weekly(
     cache_dir: str | None = None,
     use_cache_only: bool = False,
     groww_api=None,
+    max_workers: int | None = None,
+    timings: dict[str, float] | None = None,
 ) -> dict[str, pd.DataFrame]:
     """Load weekly OHLC data for Indian symbols.
     
@@ -314,6 +326,8 @@ def load_many_india_weekly(
         cache_dir: Directory to cache weekly data
         use_cache_only: If True, only load from cache
         groww_api: Optional Groww API instance for direct weekly bar fetching
+        max_workers: Load symbols on this many threads (result order unchanged)
+        timings: Optional dict filled with each symbol's load time in seconds
     
     Returns:
         Dict[symbol, DataFrame] with weekly OHLC data
@@ -321,50 +335,65 @@ def load_many_india_weekly(
     if cache_dir is None:
         cache_dir = str(CACHE_DIR)
     os.makedirs(cache_dir, exist_ok=True)
-    
-    out = {}
-    for sym in symbols:
-        # Try to load weekly cache first
-        weekly_cache_path = os.path.join(
-            cache_dir, 
-            f"weekly_{sym.replace('NSE:', '').replace(':', '_').replace('/', '_')}_1w.csv"
+
+    def load_one(sym):
+        return _load_india_weekly_symbol(
+            sym, period, cache, cache_dir, use_cache_only, groww_api
         )
-        
-        if os.path.exists(weekly_cache_path):
-            try:
-                df_weekly = pd.read_csv(weekly_cache_path, parse_dates=[0], index_col=0)
-                df_weekly.index = pd.to_datetime(df_weekly.index)
-                if df_weekly.index.tz is not None:
-                    df_weekly.index = df_weekly.index.tz_localize(None)
-                out[sym] = df_weekly.sort_index()
-                continue
-            except Exception:
-                pass  # Fall through to fetch fresh data
-        
-        if use_cache_only:
-            # Cache only mode, skip symbol if not in cache
-            continue
-        
-        # Try Groww API first if available
-        df_weekly = None
-        if groww_api is not None:
-            df_weekly = _fetch_weekly_from_groww(sym, groww_api)
-        
-        # Fall back to aggregating daily data if Groww failed
-        if df_weekly is None:
-            df_weekly = _fetch_weekly_from_daily_aggregation(
-                sym, period, cache, cache_dir
-            )
-        
-        # Cache the weekly data
-        if df_weekly is not None and cache:
-            try:
-                df_weekly.to_csv(weekly_cache_path)
-            except Exception:
-                pass  # Continue even if caching fails
-            out[sym] = df_weekly
-    
-    return out
+
+    return {
+        sym: df_weekly
+        for sym, df_weekly in _load_each(load_one, symbols, max_workers, timings)
+        if df_weekly is not None
+    }
+
+
+def _load_india_weekly_symbol(
+    sym: str,
+    period: str,
+    cache: bool,
+    cache_dir: str,
+    use_cache_only: bool,
+    groww_api,
+) -> pd.DataFrame | None:
+    """One symbol of :func:`load_many_india_weekly`, or None if skipped."""
+    # Try to load weekly cache first
+    weekly_cache_path = os.path.join(
+        cache_dir,
+        f"weekly_{sym.replace('NSE:', '').replace(':', '_').replace('/', '_')}_1w.csv",
+    )
+
+    if os.path.exists(weekly_cache_path):
+        try:
+            df_weekly = pd.read_csv(weekly_cache_path, parse_dates=[0], index_col=0)
+            df_weekly.index = pd.to_datetime(df_weekly.index)
+            if df_weekly.index.tz is not None:
+                df_weekly.index = df_weekly.index.tz_localize(None)
+            return df_weekly.sort_index()
+        except Exception:
+            pass  # Fall through to fetch fresh data
+
+    if use_cache_only:
+        # Cache only mode, skip symbol if not in cache
+        return None
+
+    # Try Groww API first if available
+    df_weekly = None
+    if groww_api is not None:
+        df_weekly = _fetch_weekly_from_groww(sym, groww_api)
+
+    # Fall back to aggregating daily data if Groww failed
+    if df_weekly is None:
+        df_weekly = _fetch_weekly_from_daily_aggregation(sym, period, cache, cache_dir)
+
+    # Cache the weekly data
+    if df_weekly is not None and cache:
+        try:
+            df_weekly.to_csv(weekly_cache_path)
+        except Exception:
+            pass  # Continue even if caching fails
+        return df_weekly
+    return None
 
 
 def _fetch_weekly_from_groww(sym: str, groww_api) -> pd.DataFrame | None:
@@ -873,35 +902,18 @@ def _symbol_to_security_id(symbol: str, cache_dir: str | None = None) -> int | N
     # Normalize symbol
     base_name = symbol.replace("NSE:", "").replace(".NS", "").split(".")[0]
 
-    # Try parquet first
-    pq_path = os.path.join(cache_dir, "api-scrip-master-detailed.parquet")
-    if os.path.exists(pq_path):
+    # Try parquet first, then the CSV master
+    for master_path in (
+        os.path.join(cache_dir, "api-scrip-master-detailed.parquet"),
+        DATA_DIR / "dhan-scrip-master-detailed.csv",
+    ):
         try:
-            import pyarrow.parquet as pq
-
-            tbl = pq.read_table(pq_path)
-            df_inst = tbl.to_pandas()
-            row = df_inst[
-                (df_inst["SYMBOL_NAME"] == base_name)
-                | (df_inst["UNDERLYING_SYMBOL"] == base_name)
-            ]
-            if not row.empty:
-                return int(row.iloc[0]["SECURITY_ID"])
+            master = get_instrument_master(master_path)
         except Exception:
-            pass
-
-    # Try CSV
-    csv_path = DATA_DIR / "dhan-scrip-master-detailed.csv"
-    if csv_path.exists():
-        try:
-            df_inst = pd.read_csv(csv_path)
-            row = df_inst[
-                (df_inst["SYMBOL_NAME"] == base_name)
-                | (df_inst["UNDERLYING_SYMBOL"] == base_name)
-            ]
-            if not row.empty:
-                return int(row.iloc[0]["SECURITY_ID"])
-        except Exception:
-            pass
+            continue
+        if master is not None:
+            secid = master.security_id(base_name)
+            if secid is not None:
+                return secid
 
     return None
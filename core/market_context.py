@@ -0,0 +1,192 @@
+"""Process-wide cache of the market series used as regime filters.
+
+India VIX and the NIFTY 50 / NIFTY 200 indices are read by several strategies
+(``prepare``) and by the runners' enrichment steps, once for every symbol of a
+basket. :func:`market_series` loads each of them once per process (each worker
+of a multiprocessing run loads it once) and keeps the derived indicators it is
+asked for, such as the NIFTY 200 EMA:
+
+    >>> nifty = market_series("nifty200")
+    >>> above = nifty.align(df.index, nifty.above_ema(50))
+
+:meth:`MarketSeries.align` maps values onto a symbol's trading calendar with one
+``searchsorted`` on the market index, either exactly (``how="exact"``, like a
+left join on the dates) or as of the last market bar at or before each date
+(``how="asof"``, like ``reindex(method="ffill")``). Dates without a value get
+NaN, so callers keep their own fill rules.
+
+Loader failures are cached as well and raised again on every call until
+:func:`clear_market_cache`; a missing data file therefore costs one lookup per
+process, not one per symbol.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Union
+
+import numpy as np
+import pandas as pd
+
+from . import loaders
+
+# name -> loader(interval=...) returning an OHLC DataFrame indexed by date
+MARKET_LOADERS: dict[str, Callable[..., pd.DataFrame]] = {
+    "india_vix": loaders.load_india_vix,
+    "nifty50": loaders.load_nifty50,
+    "nifty200": loaders.load_nifty200,
+}
+
+# MarketSeries (or the loader's exception) by (name, interval)
+_MARKET_CACHE: dict[tuple[str, str], Union["MarketSeries", Exception]] = {}
+
+ALIGN_MODES = ("exact", "asof")
+
+
+class MarketSeries:
+    """One market series with cached indicators and calendar alignment.
+
+    ``frame`` is shared by every caller in the process and must not be
+    modified.
+    """
+
+    def __init__(self, name: str, frame: pd.DataFrame):
+        self.name = name
+        self.frame = frame
+        self.index = pd.DatetimeIndex(frame.index)
+        self.close = frame["close"].to_numpy(dtype=float)
+        self._derived: dict[tuple, np.ndarray] = {}
+        self._indexes: dict[tuple[bool, bool], pd.DatetimeIndex] = {}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __repr__(self) -> str:
+        return f"MarketSeries({self.name!r}, bars={len(self)})"
+
+    def column(self, name: str) -> np.ndarray:
+        """A column of ``frame`` as a float array."""
+        key = ("column", name)
+        if key not in self._derived:
+            self._derived[key] = self.frame[name].to_numpy(dtype=float)
+        return self._derived[key]
+
+    def ema(self, period: int) -> np.ndarray:
+        """EMA of the close, computed once per period."""
+        key = ("ema", period)
+        if key not in self._derived:
+            from utils.indicators import EMA
+
+            self._derived[key] = EMA(self.close, period)
+        return self._derived[key]
+
+    def above_ema(self, period: int) -> np.ndarray:
+        """Boolean array: close above its EMA (False while the EMA is NaN)."""
+        key = ("above_ema", period)
+        if key not in self._derived:
+            self._derived[key] = self.close > self.ema(period)
+        return self._derived[key]
+
+    def calendar(
+        self, normalize: bool = False, naive: bool = False
+    ) -> pd.DatetimeIndex:
+        """The market index, optionally tz-stripped (``naive``) and/or normalized."""
+        key = (normalize, naive)
+        index = self._indexes.get(key)
+        if index is None:
+            index = self.index
+            if naive and index.tz is not None:
+                index = index.tz_localize(None)
+            if normalize:
+                index = index.normalize()
+            self._indexes[key] = index
+        return index
+
+    def align(
+        self,
+        dates,
+        values: Union[str, np.ndarray] = "close",
+        how: str = "exact",
+        normalize: bool = False,
+        naive: bool = False,
+        strict: bool = True,
+    ) -> np.ndarray:
+        """Map ``values`` (a column name or an array along the market index)
+        onto ``dates``.
+
+        Args:
+            dates: Trading calendar to align to (anything ``pd.DatetimeIndex``
+                accepts)
+            values: Column of ``frame`` or array with one value per market bar
+            how: ``"exact"`` takes the market bar on the same timestamp,
+                ``"asof"`` the last market bar at or before it
+            normalize: Compare dates only (both sides normalized)
+            naive: Drop the market index timezone (wall time) before comparing
+            strict: When exactly one side is tz-aware, raise ``TypeError`` (as a
+                join or reindex does); with ``strict=False`` nothing matches,
+                as with a dict lookup
+
+        Returns:
+            Float array of len(dates), NaN where no market bar matches.
+        """
+        if how not in ALIGN_MODES:
+            raise ValueError(
+                f"Unknown align mode {how!r}; expected one of {ALIGN_MODES}"
+            )
+        data = self.column(values) if isinstance(values, str) else np.asarray(values)
+        if len(data) != len(self.index):
+            raise ValueError(
+                f"{len(data)} values for {len(self.index)} {self.name} bars"
+            )
+
+        dates = pd.DatetimeIndex(dates)
+        if normalize:
+            dates = dates.normalize()
+        index = self.calendar(normalize=normalize, naive=naive)
+        out = np.full(len(dates), np.nan)
+        if (index.tz is None) != (dates.tz is None):
+            if strict:
+                raise TypeError(
+                    f"Cannot align tz-naive and tz-aware dates ({self.name}: {index.tz}, "
+                    f"calendar: {dates.tz})"
+                )
+            return out
+        if len(index) == 0 or len(dates) == 0:
+            return out
+
+        pos = index.searchsorted(dates, side="right") - 1
+        found = pos >= 0
+        if how == "exact":
+            found &= np.asarray(index[np.maximum(pos, 0)] == dates)
+        out[found] = data[pos[found]]
+        return out
+
+
+def market_series(name: str, interval: str = "1d") -> MarketSeries:
+    """The :class:`MarketSeries` ``name`` (a key of ``MARKET_LOADERS``), loaded
+    once per process.
+
+    Raises:
+        ValueError: Unknown series name
+        Exception: Whatever the loader raised (FileNotFoundError for a missing
+            file), on this and every later call
+    """
+    key = (name, interval)
+    hit = _MARKET_CACHE.get(key)
+    if hit is None:
+        loader = MARKET_LOADERS.get(name)
+        if loader is None:
+            raise ValueError(
+                f"Unknown market series {name!r}; expected one of {sorted(MARKET_LOADERS)}"
+            )
+        try:
+            hit = MarketSeries(name, loader(interval=interval))
+        except Exception as e:
+            hit = e
+        _MARKET_CACHE[key] = hit
+    if isinstance(hit, Exception):
+        raise hit.with_traceback(None)
+    return hit
+
+
+def clear_market_cache() -> None:
+    _MARKET_CACHE.clear()
@@ -0,0 +1,228 @@
+"""Columnar on-disk store for cached OHLCV bars.
+
+Reading a symbol from the Dhan/Groww CSV cache parses every timestamp and
+number again on each run. The store keeps the frame :func:`core.loaders.
+load_many_india` builds from those CSVs (tz-naive, sorted, lowercase columns)
+as typed binary columns, partitioned by interval and symbol::
+
+    <root>/<interval>/<SYMBOL>/meta.json
+    <root>/<interval>/<SYMBOL>/time.npy     int64 epoch in the index unit
+    <root>/<interval>/<SYMBOL>/col<i>.npy   one array per column (float64 OHLC)
+
+Loading is a handful of ``np.load`` calls with no parsing. Only NumPy is
+needed (the layout follows :class:`core.streaming.ColumnarSink`).
+
+``meta.json`` records the CSV a partition was migrated from with its size and
+modification time. The loader only uses a partition migrated from the CSV the
+cache manifest resolves for the symbol now; when the manifest points at a
+different file, or that file has changed (a fetch script rewrote it) or is
+gone, :func:`read_frame` returns None and the loader reads the CSV as before,
+so unmigrated and stale symbols fall back transparently. Populate or refresh
+the store with :func:`migrate_csv_cache` (``scripts/migrate_ohlcv_store.py``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from config import CACHE_DIR, DATA_DIR
+
+STORE_DIR = CACHE_DIR / "columnar"
+
+# interval -> cache manifest location of the CSV layout (core/cache_manifest.py)
+CSV_LAYOUT = {"1d": "dhan_daily", "1w": "groww_weekly"}
+
+FORMAT_VERSION = 1
+
+
+def symbol_key(sym: str) -> str:
+    """Cache file name of ``sym`` (as used in the CSV file names)."""
+    return sym.replace("NSE:", "").replace(":", "_").replace("/", "_")
+
+
+def store_path(
+    sym: str, interval: str = "1d", root: Union[str, Path, None] = None
+) -> Path:
+    return Path(root or STORE_DIR) / interval / symbol_key(sym)
+
+
+def _source_stat(source: Optional[str]) -> Optional[dict]:
+    if source is None:
+        return None
+    st = os.stat(source)
+    return {"path": str(source), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def write_frame(
+    sym: str,
+    df: pd.DataFrame,
+    interval: str = "1d",
+    source: Optional[str] = None,
+    root: Union[str, Path, None] = None,
+) -> Path:
+    """Store ``df`` for ``sym``, replacing any existing partition.
+
+    ``df`` must have a tz-naive DatetimeIndex and numeric columns (frames with
+    other columns stay on the CSV path). ``source`` is the CSV it was read
+    from, used to detect a stale partition.
+    """
+    index = df.index
+    if not isinstance(index, pd.DatetimeIndex) or index.tz is not None:
+        raise ValueError(f"{sym}: the store needs a tz-naive DatetimeIndex")
+    columns = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if values.dtype.kind not in "biuf":
+            raise ValueError(f"{sym}: column {col!r} is not numeric ({values.dtype})")
+        columns[col] = values
+
+    path = store_path(sym, interval, root)
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    np.save(tmp / "time.npy", index.asi8)
+    for i, values in enumerate(columns.values()):
+        np.save(tmp / f"col{i}.npy", np.ascontiguousarray(values))
+    meta = {
+        "version": FORMAT_VERSION,
+        "symbol": sym,
+        "interval": interval,
+        "rows": len(df),
+        "index": index.name,
+        "unit": index.unit,
+        "columns": {col: values.dtype.str for col, values in columns.items()},
+        "source": _source_stat(source),
+    }
+    with open(tmp / "meta.json", "w") as f:
+        json.dump(meta, f, indent=2)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    return path
+
+
+def read_meta(
+    sym: str, interval: str = "1d", root: Union[str, Path, None] = None
+) -> Optional[dict]:
+    """The partition's metadata, or None when ``sym`` is not in the store."""
+    try:
+        with open(store_path(sym, interval, root) / "meta.json") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def is_current(meta: dict, source: Optional[str] = None) -> bool:
+    """Whether the partition still matches the CSV it was migrated from.
+
+    False when that CSV has changed since or no longer exists, when the
+    partition records no source, and when ``source`` (the CSV the loader would
+    read now) is a different file.
+    """
+    recorded = meta.get("source")
+    if not recorded:
+        return False
+    if source is not None and os.path.abspath(recorded["path"]) != os.path.abspath(
+        source
+    ):
+        return False
+    try:
+        now = _source_stat(recorded["path"])
+    except FileNotFoundError:
+        return False
+    return now["size"] == recorded["size"] and now["mtime_ns"] == recorded["mtime_ns"]
+
+
+def read_frame(
+    sym: str,
+    interval: str = "1d",
+    root: Union[str, Path, None] = None,
+    source: Optional[str] = None,
+) -> Optional[pd.DataFrame]:
+    """Load ``sym`` from the store; None when it is not migrated or stale.
+
+    ``source`` is the CSV the caller would otherwise read; a partition
+    migrated from another file counts as stale.
+    """
+    meta = read_meta(sym, interval, root)
+    if (
+        meta is None
+        or meta.get("version") != FORMAT_VERSION
+        or not is_current(meta, source)
+    ):
+        return None
+    path = store_path(sym, interval, root)
+    time = np.load(path / "time.npy")
+    index = pd.DatetimeIndex(time.view(f"M8[{meta['unit']}]"), name=meta["index"])
+    data = {col: np.load(path / f"col{i}.npy") for i, col in enumerate(meta["columns"])}
+    return pd.DataFrame(data, index=index)
+
+
+def find_csv_files(
+    interval: str, data_dir: Union[str, Path, None] = None
+) -> dict[str, str]:
+    """Symbol -> CSV path of the Dhan (1d) / Groww (1w) cache layout, as the
+    loader resolves them (from the cache manifest)."""
+    from core.cache_manifest import get_manifest
+
+    data_dir = Path(data_dir or DATA_DIR)
+    manifest = get_manifest(data_dir / "cache", data_dir)
+    manifest.refresh()
+    return {
+        sym: manifest.resolve(sym, interval)
+        for sym in dict.fromkeys(
+            e["symbol"] for e in manifest.files(CSV_LAYOUT[interval])
+        )
+    }
+
+
+def migrate_csv_cache(
+    intervals: Iterable[str] = ("1d", "1w"),
+    symbols: Optional[Iterable[str]] = None,
+    data_dir: Union[str, Path, None] = None,
+    root: Union[str, Path, None] = None,
+    force: bool = False,
+) -> dict[str, list]:
+    """Convert the Dhan/Groww CSV cache into the store.
+
+    Each CSV is read exactly as :func:`core.loaders.load_many_india` reads it.
+    Partitions that are already current are skipped unless ``force``.
+
+    Returns:
+        {"written": [...], "current": [...], "skipped": [(key, reason), ...]}
+        with keys like ``"1d/RELIANCE"``.
+    """
+    from core.loaders import is_epoch_corrupted, read_cache_file
+
+    wanted = None if symbols is None else {symbol_key(s) for s in symbols}
+    report: dict[str, list] = {"written": [], "current": [], "skipped": []}
+    for interval in intervals:
+        for sym, csv_path in find_csv_files(interval, data_dir).items():
+            if wanted is not None and sym not in wanted:
+                continue
+            key = f"{interval}/{sym}"
+            meta = read_meta(sym, interval, root)
+            if (
+                not force
+                and meta is not None
+                and meta.get("version") == FORMAT_VERSION
+                and is_current(meta, csv_path)
+            ):
+                report["current"].append(key)
+                continue
+            try:
+                df = read_cache_file(csv_path)
+                if is_epoch_corrupted(df):
+                    raise ValueError("corrupted timestamps")
+                write_frame(sym, df, interval, source=csv_path, root=root)
+            except Exception as e:
+                report["skipped"].append((key, str(e)))
+                continue
+            report["written"].append(key)
+    return report
@@ -0,0 +1,254 @@
+"""Array-backed position state for the backtesting engine.
+
+``BacktestEngine`` keeps the lots of the open position in a :class:`LotBook`:
+parallel NumPy arrays preallocated to ``pyramiding`` slots instead of a list of
+dicts. The per-bar state machine (trailing-stop updates, the stop scan and the
+partial-exit commission allocation) runs as small kernels over those arrays.
+
+When Numba is installed the kernels are JIT-compiled (``pip install numba``);
+otherwise the same functions run as plain Python over the arrays. Set
+``NUMBA_DISABLE_JIT=1`` to force the fallback. Both paths are exact: they
+perform the same floating-point operations in the same order as the original
+dict-based engine.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import numpy as np
+
+from utils.jit import NUMBA_AVAILABLE, _kernel
+
+
+@_kernel
+def raise_stops(stops: np.ndarray, n: int, new_stop: float) -> None:
+    """Trailing stop: move every set stop up to ``new_stop`` (never down)."""
+    for k in range(n):
+        if not np.isnan(stops[k]) and new_stop > stops[k]:
+            stops[k] = new_stop
+
+
+@_kernel
+def min_stop(stops: np.ndarray, n: int) -> float:
+    """Tightest (lowest) stop across lots; NaN when no lot has a stop."""
+    out = np.nan
+    for k in range(n):
+        s = stops[k]
+        if not np.isnan(s) and (np.isnan(out) or s < out):
+            out = s
+    return out
+
+
+@_kernel
+def allocate_exits(
+    lot_bar: np.ndarray,
+    lot_price: np.ndarray,
+    lot_qty: np.ndarray,
+    lot_comm: np.ndarray,
+    lot_stop: np.ndarray,
+    n: int,
+    exit_qty: np.ndarray,
+    exit_price: np.ndarray,
+    total_notional: float,
+    total_comm: float,
+    leg_lot: np.ndarray,
+    leg_exit: np.ndarray,
+    leg_qty: np.ndarray,
+    leg_entry_comm: np.ndarray,
+    leg_exit_comm: np.ndarray,
+    leg_notional: np.ndarray,
+) -> tuple[int, int]:
+    """
+    Allocate partial exits to lots first-in-first-out.
+
+    Each exit leg takes quantity from the oldest lots first. Entry commission
+    is split pro rata to the quantity taken from a lot; the (single) exit
+    commission ``total_comm`` is split pro rata to each leg's notional.
+
+    Legs are written to the preallocated ``leg_*`` arrays (``leg_lot`` holds
+    the lot's position *before* compaction). Lots with quantity left are
+    compacted in place to the front of the ``lot_*`` arrays with their entry
+    commission reduced proportionally. ``exit_qty`` is consumed.
+
+    Returns:
+        ``(n_legs, n_lots_remaining)``
+    """
+    legs = 0
+    j = 0
+    m = exit_qty.shape[0]
+    kept = 0
+    for k in range(n):
+        lq = lot_qty[k]
+        l_comm = lot_comm[k]
+        remaining = lq
+        while j < m and remaining > 0:
+            take = min(exit_qty[j], remaining)
+            if take > 0:
+                notional = exit_price[j] * take
+                leg_lot[legs] = k
+                leg_exit[legs] = j
+                leg_qty[legs] = take
+                leg_entry_comm[legs] = l_comm * (take / lq) if lq > 0 else 0.0
+                leg_exit_comm[legs] = (
+                    (notional / total_notional) * total_comm
+                    if total_notional > 0
+                    else 0.0
+                )
+                leg_notional[legs] = notional
+                legs += 1
+                remaining -= take
+                exit_qty[j] -= take
+            if exit_qty[j] <= 0:
+                j += 1
+        if remaining > 0:
+            lot_bar[kept] = lot_bar[k]
+            lot_price[kept] = lot_price[k]
+            lot_stop[kept] = lot_stop[k]
+            lot_qty[kept] = remaining
+            lot_comm[kept] = l_comm * (remaining / lq) if lq > 0 else 0.0
+            kept += 1
+    return legs, kept
+
+
+class LotBook:
+    """
+    Lots of the currently open position, stored column-wise.
+
+    Slots are preallocated for ``capacity`` lots (the strategy's pyramiding
+    limit) and grow on demand. ``stop`` is NaN for lots without a stop.
+    """
+
+    __slots__ = ("bar", "price", "qty", "comm", "stop", "size", "entry_signal_reason")
+
+    def __init__(self, capacity: int = 1):
+        capacity = max(int(capacity), 1)
+        self.bar = np.zeros(capacity, dtype=np.int64)
+        self.price = np.zeros(capacity, dtype=np.float64)
+        self.qty = np.zeros(capacity, dtype=np.int64)
+        self.comm = np.zeros(capacity, dtype=np.float64)
+        self.stop = np.full(capacity, np.nan, dtype=np.float64)
+        self.size = 0
+        self.entry_signal_reason: Any = ""
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _grow(self) -> None:
+        extra = len(self.bar)
+        self.bar = np.concatenate([self.bar, np.zeros(extra, dtype=np.int64)])
+        self.price = np.concatenate([self.price, np.zeros(extra)])
+        self.qty = np.concatenate([self.qty, np.zeros(extra, dtype=np.int64)])
+        self.comm = np.concatenate([self.comm, np.zeros(extra)])
+        self.stop = np.concatenate([self.stop, np.full(extra, np.nan)])
+
+    def add(
+        self, bar: int, price: float, qty: int, comm: float, stop: Optional[float]
+    ) -> None:
+        """Append a lot filled at bar position ``bar``."""
+        if self.size == len(self.bar):
+            self._grow()
+        k = self.size
+        self.bar[k] = bar
+        self.price[k] = price
+        self.qty[k] = qty
+        self.comm[k] = comm
+        self.stop[k] = np.nan if stop is None else stop
+        self.size = k + 1
+
+    def copy(self) -> LotBook:
+        out = LotBook(capacity=len(self.bar))
+        out.bar[:] = self.bar
+        out.price[:] = self.price
+        out.qty[:] = self.qty
+        out.comm[:] = self.comm
+        out.stop[:] = self.stop
+        out.size = self.size
+        out.entry_signal_reason = self.entry_signal_reason
+        return out
+
+    def set_stop(self, k: int, stop: Optional[float]) -> None:
+        self.stop[k] = np.nan if stop is None else stop
+
+    def clear(self) -> None:
+        self.size = 0
+        self.entry_signal_reason = ""
+
+    def total_qty(self) -> int:
+        return int(self.qty[: self.size].sum())
+
+    def raise_stops(self, new_stop: float) -> None:
+        raise_stops(self.stop, self.size, new_stop)
+
+    def min_stop(self) -> Optional[float]:
+        """Tightest stop across lots, or None when no lot has a stop."""
+        s = min_stop(self.stop, self.size)
+        return None if np.isnan(s) else float(s)
+
+    def lots(self) -> list[tuple[int, float, int, float, Optional[float]]]:
+        """``(bar, price, qty, comm, stop)`` per lot as Python scalars."""
+        n = self.size
+        stops = [None if np.isnan(s) else s for s in self.stop[:n].tolist()]
+        return list(
+            zip(
+                self.bar[:n].tolist(),
+                self.price[:n].tolist(),
+                self.qty[:n].tolist(),
+                self.comm[:n].tolist(),
+                stops,
+            )
+        )
+
+    def allocate_exits(
+        self,
+        exit_qty: list[int],
+        exit_price: list[float],
+        total_notional: float,
+        total_comm: float,
+    ) -> list[tuple[int, float, Optional[float], int, int, float, float, float]]:
+        """
+        Apply partial exits (see :func:`allocate_exits`) and drop emptied lots.
+
+        Returns:
+            One ``(bar, entry_price, stop, exit_index, qty, entry_comm,
+            exit_comm, notional)`` tuple per leg, in execution order.
+        """
+        before = self.lots()
+        cap = self.size + len(exit_qty)
+        leg_lot = np.zeros(cap, dtype=np.int64)
+        leg_exit = np.zeros(cap, dtype=np.int64)
+        leg_qty = np.zeros(cap, dtype=np.int64)
+        leg_entry_comm = np.zeros(cap)
+        leg_exit_comm = np.zeros(cap)
+        leg_notional = np.zeros(cap)
+        legs, kept = allocate_exits(
+            self.bar,
+            self.price,
+            self.qty,
+            self.comm,
+            self.stop,
+            self.size,
+            np.asarray(exit_qty, dtype=np.int64),
+            np.asarray(exit_price, dtype=np.float64),
+            float(total_notional),
+            float(total_comm),
+            leg_lot,
+            leg_exit,
+            leg_qty,
+            leg_entry_comm,
+            leg_exit_comm,
+            leg_notional,
+        )
+        self.size = kept
+        out = []
+        for k, j, q, ec, xc, notional in zip(
+            leg_lot[:legs].tolist(),
+            leg_exit[:legs].tolist(),
+            leg_qty[:legs].tolist(),
+            leg_entry_comm[:legs].tolist(),
+            leg_exit_comm[:legs].tolist(),
+            leg_notional[:legs].tolist(),
+        ):
+            bar, price, _, _, stop = before[k]
+            out.append((bar, price, stop, j, q, ec, xc, notional))
+        return out
@@ -0,0 +1,204 @@
+"""Compact trade records and preallocated per-bar buffers for the engine.
+
+``BacktestEngine`` used to append a dict per trade to ``tr_rows`` and a dict per
+bar to ``eq_rows``/``sig_rows``; on intraday data that is millions of short-lived
+dicts per run. Instead:
+
+- :class:`TradeLog` holds one ``__slots__`` :class:`TradeRecord` per trade row
+- :class:`BarBuffers` preallocates one NumPy column per equity/signal field
+
+Both convert to the same DataFrames as the dict-based rows in one step.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Field order of each kind of trade row. The resulting DataFrame's column order
+# follows the order in which layouts first appear, exactly as
+# ``pd.DataFrame(list_of_dicts)`` would.
+STOP_EXIT = (
+    "entry_time",
+    "entry_price",
+    "entry_qty",
+    "exit_time",
+    "exit_price",
+    "commission_entry",
+    "commission_exit",
+    "gross_pnl",
+    "net_pnl",
+    "exit_reason",
+    "entry_signal_reason",
+    "exit_signal_reason",
+    "stop_price",
+)
+PARTIAL_EXIT = STOP_EXIT + ("exit_qty", "trade_status")
+SIGNAL_EXIT = (
+    "entry_time",
+    "entry_price",
+    "entry_qty",
+    "exit_time",
+    "exit_price",
+    "exit_reason",
+    "entry_signal_reason",
+    "exit_signal_reason",
+    "stop_price",
+    "commission_entry",
+    "commission_exit",
+    "gross_pnl",
+    "net_pnl",
+)
+OPEN_TRADE = (
+    "entry_time",
+    "exit_time",
+    "entry_price",
+    "exit_price",
+    "entry_qty",
+    "exit_qty",
+    "commission_entry",
+    "commission_exit",
+    "gross_pnl",
+    "net_pnl",
+    "trade_status",
+    "stop_price",
+)
+
+TRADE_FIELDS = PARTIAL_EXIT
+
+# Exported with object dtype, as the dict-row trade frames had it (pandas would
+# otherwise infer a string dtype)
+OBJECT_FIELDS = ("trade_status",)
+
+
+class TradeRecord:
+    """One trade row; only the fields of its ``layout`` are set."""
+
+    __slots__ = TRADE_FIELDS + ("layout",)
+
+    def __init__(self, layout: tuple[str, ...], *values: Any):
+        self.layout = layout
+        for name, value in zip(layout, values):
+            setattr(self, name, value)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return getattr(self, name, default)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.layout}
+
+    def __repr__(self) -> str:
+        return f"TradeRecord({self.to_dict()!r})"
+
+
+class TradeLog:
+    """Append-only list of :class:`TradeRecord` with a one-step DataFrame export."""
+
+    __slots__ = ("records", "_columns", "_layouts")
+
+    def __init__(self) -> None:
+        self.records: list[TradeRecord] = []
+        self._columns: list[str] = []
+        self._layouts: set[tuple[str, ...]] = set()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def append(self, layout: tuple[str, ...], *values: Any) -> None:
+        if layout not in self._layouts:
+            self._layouts.add(layout)
+            self._columns.extend(c for c in layout if c not in self._columns)
+        self.records.append(TradeRecord(layout, *values))
+
+    def copy(self) -> TradeLog:
+        """Copy of the log; records are never modified after they are appended."""
+        out = TradeLog()
+        out.records = list(self.records)
+        out._columns = list(self._columns)
+        out._layouts = set(self._layouts)
+        return out
+
+    def to_frame(self) -> pd.DataFrame:
+        """Columns missing from a record's layout are NaN, as with dict rows."""
+        data = {}
+        for col in self._columns:
+            values = [getattr(r, col, np.nan) for r in self.records]
+            data[col] = (
+                pd.Series(values, dtype=object) if col in OBJECT_FIELDS else values
+            )
+        return pd.DataFrame(data)
+
+
+class BarBuffers:
+    """
+    Preallocated equity and signal columns, one slot per bar.
+
+    Every bar gets an equity row; bars with a missing close get no signal row
+    (``valid`` stays False), matching the engine's per-bar output.
+    """
+
+    __slots__ = (
+        "equity",
+        "cash",
+        "qty",
+        "price",
+        "valid",
+        "enter_long",
+        "exit_long",
+        "did_entry",
+        "did_exit",
+    )
+
+    def __init__(self, n: int):
+        self.equity = np.empty(n, dtype=np.float64)
+        self.cash = np.empty(n, dtype=np.float64)
+        self.qty = np.zeros(n, dtype=np.int64)
+        self.price = np.empty(n, dtype=np.float64)
+        self.valid = np.zeros(n, dtype=bool)
+        self.enter_long = np.zeros(n, dtype=bool)
+        self.exit_long = np.zeros(n, dtype=bool)
+        self.did_entry = np.zeros(n, dtype=bool)
+        self.did_exit = np.zeros(n, dtype=bool)
+
+    def head(self, k: int) -> BarBuffers:
+        """Copy of the first ``k`` bars."""
+        out = BarBuffers(k)
+        for field in self.__slots__:
+            getattr(out, field)[:] = getattr(self, field)[:k]
+        return out
+
+    def extend(self, n: int) -> BarBuffers:
+        """Buffers for ``n`` bars whose leading bars are copied from this one."""
+        out = BarBuffers(n)
+        k = len(self.equity)
+        for field in self.__slots__:
+            getattr(out, field)[:k] = getattr(self, field)
+        return out
+
+    def to_frames(
+        self, index: Sequence[Any], name: Optional[str] = "time"
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Return ``(equity_df, signals_df)`` indexed by bar time."""
+        time_index = pd.Index(list(index), name=name)
+        equity_df = pd.DataFrame(
+            {
+                "equity": self.equity,
+                "cash": self.cash,
+                "qty": self.qty,
+                "price": self.price,
+            },
+            index=time_index,
+        )
+        valid = self.valid
+        signals_df = pd.DataFrame(
+            {
+                "enter_long": self.enter_long[valid],
+                "exit_long": self.exit_long[valid],
+                "did_entry": self.did_entry[valid],
+                "did_exit": self.did_exit[valid],
+            },
+            index=time_index[valid],
+        )
+        return equity_df, signals_df
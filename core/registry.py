@@ -52,6 +52,20 @@ _REG = {
 }
 
 
+def register_strategy(name: str, strategy_cls) -> None:
+    """Make ``strategy_cls`` available to :func:`make_strategy` as ``name``.
+
+    The runners build strategies through :func:`make_strategy`, so they accept
+    ``name`` too. Spec strategies from :func:`core.dsl.spec_strategy` are
+    registered the same way.
+    """
+    if _REG.get(name, strategy_cls) is not strategy_cls:
+        raise ValueError(
+            f"Strategy '{name}' is already registered to {_REG[name].__name__}"
+        )
+    _REG[name] = strategy_cls
+
+
 def make_strategy(name: str, params_json: str = "{}"):
     if name not in _REG:
         raise ValueError(f"Unknown strategy '{name}'. Available: {list(_REG.keys())}")
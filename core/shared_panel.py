@@ -0,0 +1,218 @@
+"""Shared-memory OHLCV panel for the multiprocessing runners.
+
+With the ``spawn`` context every DataFrame a task carries is pickled into the
+worker (and again on the way back when the result includes it). The panel
+packs a loaded basket once into a single :mod:`multiprocessing.shared_memory`
+block, one contiguous array per index and column::
+
+    | time SYM1 | close SYM1 | ... | time SYM2 | close SYM2 | ...
+
+with a per-symbol offsets index. A task carries only a :class:`PanelRef`
+(a few hundred bytes); the worker attaches the block once and builds the frame
+on read-only views of it, without copying:
+
+    >>> with SharedPanel(ohlcv_map) as panel:
+    ...     tasks = [(sym, panel.ref(sym), ...) for sym in panel.symbols]
+    ...     pool.map(worker, tasks)      # worker: df = attach_frame(ref)
+
+The frames handed out are shallow copies of a base frame kept per worker, so
+under copy-on-write a strategy that writes to its data copies the touched
+column instead of failing on (or changing) the shared block.
+
+Only numeric and boolean columns with a DatetimeIndex can be packed;
+:class:`SharedPanel` raises ValueError for anything else, and OSError when the
+block cannot be created (``/dev/shm`` missing or too small, descriptor limits).
+Callers fall back to passing the frames in both cases.
+"""
+
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+_ALIGN = 64  # each array starts on a cache line
+_SHM_DIR = "/dev/shm"
+
+# Worker side: block name -> SharedMemory, (block name, symbol) -> base frame
+_ATTACHED: dict[str, shared_memory.SharedMemory] = {}
+_FRAMES: dict[tuple[str, str], pd.DataFrame] = {}
+
+
+@dataclass(frozen=True)
+class PanelRef:
+    """Where one symbol's frame lives in a panel block (what a task pickles)."""
+
+    name: str  # shared memory block
+    symbol: str
+    rows: int
+    index: Any  # index name
+    unit: str
+    tz: Optional[str]
+    time: int  # byte offset of the int64 timestamps
+    columns: tuple[tuple[Any, int, str], ...]  # (column, byte offset, dtype)
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def _arrays(sym: str, df: pd.DataFrame) -> tuple[np.ndarray, list[tuple]]:
+    index = df.index
+    if not isinstance(index, pd.DatetimeIndex):
+        raise ValueError(f"{sym}: the panel needs a DatetimeIndex")
+    columns = []
+    for col, values in df.items():
+        values = values.to_numpy()
+        if values.dtype.kind not in "biuf":
+            raise ValueError(f"{sym}: column {col!r} is not numeric ({values.dtype})")
+        columns.append((col, values))
+    return index.asi8, columns  # asi8 is UTC for a tz-aware index
+
+
+def _check_space(size: int) -> None:
+    """Raise OSError when ``size`` bytes do not fit in ``/dev/shm``.
+
+    tmpfs only allocates pages when they are written, so an oversized block is
+    created fine and then kills the process with SIGBUS while it is filled.
+    """
+    if not os.path.isdir(_SHM_DIR):
+        return  # not a tmpfs-backed platform
+    free = shutil.disk_usage(_SHM_DIR).free
+    if size > free:
+        raise OSError(
+            errno.ENOSPC,
+            f"panel needs {size / 1e6:.1f} MB, {_SHM_DIR} has {free / 1e6:.1f} MB",
+        )
+
+
+class SharedPanel:
+    """Frames of a basket packed into one shared memory block (parent side).
+
+    The block lives until :meth:`close` (or the end of a ``with`` block),
+    which must come after the workers are done with it.
+    """
+
+    def __init__(self, frames: dict[str, pd.DataFrame]):
+        layout, size = [], 0
+        for sym, df in frames.items():
+            time, columns = _arrays(sym, df)
+            time_offset = _aligned(size)
+            size = time_offset + time.nbytes
+            placed = []
+            for col, values in columns:
+                offset = _aligned(size)
+                size = offset + values.nbytes
+                placed.append((col, offset, values))
+            layout.append((sym, df, time, time_offset, placed))
+
+        _check_space(size)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self.refs: dict[str, PanelRef] = {}
+        try:
+            for sym, df, time, time_offset, placed in layout:
+                self._put(time, time_offset)
+                for _, offset, values in placed:
+                    self._put(values, offset)
+                self.refs[sym] = PanelRef(
+                    name=self.shm.name,
+                    symbol=sym,
+                    rows=len(df),
+                    index=df.index.name,
+                    unit=df.index.unit,
+                    tz=None if df.index.tz is None else str(df.index.tz),
+                    time=time_offset,
+                    columns=tuple(
+                        (col, offset, values.dtype.str)
+                        for col, offset, values in placed
+                    ),
+                )
+        except BaseException:
+            self.close()
+            raise
+
+    def _put(self, values: np.ndarray, offset: int) -> None:
+        view = np.ndarray(values.shape, values.dtype, self.shm.buf, offset)
+        view[:] = values
+
+    @property
+    def nbytes(self) -> int:
+        return self.shm.size
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self.refs)
+
+    def ref(self, sym: str) -> PanelRef:
+        return self.refs[sym]
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+    def __repr__(self) -> str:
+        return (
+            f"SharedPanel({self.shm.name!r}, symbols={len(self)}, bytes={self.nbytes})"
+        )
+
+    def close(self) -> None:
+        """Release and remove the block (idempotent)."""
+        if self.shm is None:
+            return
+        _release(self.shm.name)  # a sequential fallback may have attached here
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+        self.shm = None
+
+    def __enter__(self) -> SharedPanel:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_frame(ref: PanelRef) -> pd.DataFrame:
+    """The frame of ``ref`` on read-only views of the shared block.
+
+    The block is attached once per process and the base frame built once per
+    symbol; each call returns a shallow copy of it.
+    """
+    key = (ref.name, ref.symbol)
+    base = _FRAMES.get(key)
+    if base is None:
+        shm = _ATTACHED.get(ref.name)
+        if shm is None:
+            shm = _ATTACHED[ref.name] = shared_memory.SharedMemory(name=ref.name)
+
+        def view(offset: int, dtype: str) -> np.ndarray:
+            values = np.ndarray((ref.rows,), np.dtype(dtype), shm.buf, offset)
+            values.flags.writeable = False
+            return values
+
+        time = pd.DatetimeIndex(view(ref.time, "<i8").view(f"M8[{ref.unit}]"))
+        if ref.tz is not None:
+            time = time.tz_localize("UTC").tz_convert(ref.tz)
+        data = {col: view(offset, dtype) for col, offset, dtype in ref.columns}
+        base = _FRAMES[key] = pd.DataFrame(
+            data, index=pd.Index(time, name=ref.index), copy=False
+        )
+    return base.copy(deep=False)
+
+
+def _release(name: str) -> None:
+    for key in [k for k in _FRAMES if k[0] == name]:
+        del _FRAMES[key]
+    shm = _ATTACHED.pop(name, None)
+    if shm is not None:
+        try:
+            shm.close()
+        except BufferError:
+            pass  # frames handed out still view it; freed with the process
@@ -0,0 +1,184 @@
+"""Persisted engine state for resumable, incremental backtests.
+
+A daily refresh only appends a bar or two to each symbol's history, yet a full
+``BacktestEngine.run`` replays the whole history bar by bar. With
+``run(snapshot=True)`` the engine records an :class:`EngineSnapshot` of its
+state at the start of the last bar: cash, quantity, open lots, entries count,
+``persistent_state``, the strategy's per-bar state, and the trades and
+equity/signal rows produced so far. ``run(resume_from=snapshot)`` on the
+extended history restores that state and only replays the bars from the
+snapshot onwards, producing exactly the output of a full run.
+
+The snapshot is taken *before* the last bar because a signal on the last bar
+cannot fill until the next bar's open exists; that bar is replayed on resume.
+
+Indicators are still computed by ``strategy.prepare()`` over the full history
+(vectorized, so cheap next to the per-bar loop). The strategy state saved is
+every plain attribute (numbers, strings, timestamps and containers of them)
+that changed between ``prepare()`` and the snapshot bar, i.e. state the
+strategy carries from bar to bar. Resuming requires indicators that only look
+backwards: a strategy whose values for old bars change when bars are appended
+would not match a full run either way.
+
+A snapshot is only used if the OHLC history up to the snapshot bar, the broker
+configuration, the strategy class and its parameters are unchanged; otherwise
+the engine warns and runs from the start.
+
+Example:
+    >>> trades, equity, signals = engine.run(snapshot=True)
+    >>> engine.last_snapshot.save("snapshots/RELIANCE.pkl")
+    >>> # next day, with the new bar appended
+    >>> snap = EngineSnapshot.load("snapshots/RELIANCE.pkl")
+    >>> trades, equity, signals = BacktestEngine(df, strategy, cfg).run(resume_from=snap)
+"""
+
+from __future__ import annotations
+
+import copy
+import datetime as dt
+import hashlib
+import os
+import pickle
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .positions import LotBook
+from .records import BarBuffers, TradeLog
+
+SNAPSHOT_VERSION = 1
+
+_SCALARS = (
+    type(None),
+    bool,
+    int,
+    float,
+    complex,
+    str,
+    bytes,
+    np.generic,
+    dt.date,
+    dt.timedelta,
+)
+
+
+def _is_plain(value: Any) -> bool:
+    """Numbers, strings, timestamps and (nested) containers of them."""
+    if isinstance(value, _SCALARS):
+        return True
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return all(_is_plain(v) for v in value)
+    if isinstance(value, dict):
+        return all(_is_plain(k) and _is_plain(v) for k, v in value.items())
+    return False
+
+
+def _same(a: Any, b: Any) -> bool:
+    try:
+        return type(a) is type(b) and bool(a == b)
+    except Exception:
+        return False
+
+
+def strategy_state(strategy: Any) -> dict[str, Any]:
+    """Deep copy of the strategy's plain instance attributes."""
+    return {k: copy.deepcopy(v) for k, v in vars(strategy).items() if _is_plain(v)}
+
+
+def changed_state(strategy: Any, baseline: dict[str, Any]) -> dict[str, Any]:
+    """Plain attributes added or changed since ``baseline`` was taken."""
+    return {
+        k: v
+        for k, v in strategy_state(strategy).items()
+        if k not in baseline or not _same(baseline[k], v)
+    }
+
+
+def strategy_params(strategy: Any) -> dict[str, Any]:
+    """Public plain class-level parameters with the instance's current values."""
+    params = {}
+    for klass in reversed(type(strategy).__mro__):
+        for name, value in vars(klass).items():
+            if name.startswith("_") or callable(value) or not _is_plain(value):
+                continue
+            current = getattr(strategy, name, value)
+            if _is_plain(current):
+                params[name] = current
+    return params
+
+
+def history_hash(df: pd.DataFrame, n: int) -> str:
+    """Hash of the index and OHLC values of the first ``n`` bars."""
+    head = df.iloc[:n]
+    h = hashlib.sha256()
+    h.update(pd.util.hash_pandas_object(head.index, index=False).to_numpy().tobytes())
+    for col in ("open", "high", "low", "close"):
+        h.update(np.ascontiguousarray(head[col].to_numpy(dtype=float)).tobytes())
+    return h.hexdigest()
+
+
+@dataclass
+class EngineSnapshot:
+    """Engine state at the start of bar ``bar`` (see module docstring)."""
+
+    bar: int
+    bar_time: Any
+    history_hash: str
+    symbol: str
+    strategy: str
+    params: dict[str, Any]
+    cfg: dict[str, Any]
+    cash: float
+    equity: float
+    qty: int
+    entries_count: int
+    persistent_state: dict[str, Any]
+    lots: LotBook
+    trades: TradeLog
+    bars: BarBuffers
+    strategy_state: dict[str, Any] = field(default_factory=dict)
+    version: int = SNAPSHOT_VERSION
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the snapshot (atomically) with pickle."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> EngineSnapshot:
+        with open(path, "rb") as f:
+            snap = pickle.load(f)
+        if not isinstance(snap, cls):
+            raise TypeError(f"{path} does not contain an EngineSnapshot")
+        return snap
+
+    def mismatch(self, engine: Any) -> Optional[str]:
+        """Why the snapshot cannot resume ``engine`` (None if it can).
+
+        Call right after ``strategy.prepare()``, where the parameters were
+        recorded.
+        """
+        df = engine.df
+        if self.version != SNAPSHOT_VERSION:
+            return f"snapshot version {self.version} != {SNAPSHOT_VERSION}"
+        if self.symbol != engine.symbol:
+            return f"symbol {self.symbol} != {engine.symbol}"
+        if self.strategy != type(engine.strategy).__qualname__:
+            return f"strategy {self.strategy} != {type(engine.strategy).__qualname__}"
+        if self.params != strategy_params(engine.strategy):
+            return "strategy parameters changed"
+        if self.cfg != asdict(engine.cfg):
+            return "broker configuration changed"
+        if self.bar >= len(df) or df.index[self.bar] != self.bar_time:
+            return "data does not extend the snapshot history"
+        if history_hash(df, self.bar) != self.history_hash:
+            return "history before the snapshot bar changed"
+        return None
@@ -11,6 +11,8 @@ from typing import Any
 import numpy as np
 import pandas as pd
 
+from utils.indicator_cache import cached_call
+
 
 def _as_str(value) -> str:
     """Convert value to string representation for parameter formatting."""
@@ -146,9 +148,9 @@ class Strategy:
                 f"Unexpected `name=` type {type(name)}; expected str or Sequence[str]"
             )
 
-        # Calculate indicator values
+        # Calculate indicator values (memoized for utils.indicators functions)
         try:
-            value = func(*args, **kwargs)
+            value = cached_call(func, *args, **kwargs)
         except Exception as e:
             raise RuntimeError(f"Indicator '{name}' error. See traceback above.") from e
 
@@ -237,7 +239,9 @@ class Strategy:
         """
         Process each bar/candle of data.
 
-        Override this method to implement trading logic.
+        Override this method (or :meth:`on_bar_idx`) to implement trading logic.
+        For strategies that override ``on_bar_idx``, this looks up the bar's
+        position from ``ts`` and delegates to it.
 
         Args:
             ts: Timestamp of current bar
@@ -247,8 +251,97 @@ class Strategy:
         Returns:
             Dictionary with trading signals (enter_long, exit_long, etc.)
         """
+        if type(self).on_bar_idx is not Strategy.on_bar_idx:
+            try:
+                i = self.bar_index(ts)
+            except (KeyError, AttributeError, TypeError):
+                return {"enter_long": False, "exit_long": False, "signal_reason": ""}
+            return self.on_bar_idx(i, ts, row, state)
         return {"enter_long": False, "exit_long": False}
 
+    def on_bar_idx(self, i: int, ts, row, state: dict[str, Any]) -> dict[str, Any]:
+        """
+        Process bar ``i`` (its integer position in the prepared data).
+
+        ``BacktestEngine`` calls this with the position it is iterating, so
+        strategies indexing precomputed indicator arrays can override it instead
+        of ``on_bar`` and skip the per-bar ``index.get_loc(ts)`` lookup. The
+        default delegates to :meth:`on_bar`.
+
+        Args:
+            i: Position of the bar in the DataFrame passed to ``prepare()``
+            ts: Timestamp of current bar
+            row: Current bar data (OHLCV)
+            state: Current strategy state
+
+        Returns:
+            Dictionary with trading signals (enter_long, exit_long, etc.)
+        """
+        if type(self).on_bar is Strategy.on_bar:
+            return {"enter_long": False, "exit_long": False}
+        return self.on_bar(ts, row, state)
+
+    def bar_index(self, ts) -> int:
+        """
+        Position of ``ts`` in the prepared data (first match if duplicated).
+
+        Raises:
+            KeyError: If ``ts`` is not in the index
+        """
+        data = getattr(self, "data", None)
+        if data is None:
+            data = self._data
+        loc = data.index.get_loc(ts)
+        if isinstance(loc, slice):
+            return loc.start
+        if isinstance(loc, np.ndarray):
+            return int(np.flatnonzero(loc)[0])
+        return int(loc)
+
+    def signals(self, df: pd.DataFrame):
+        """
+        Optional vectorized signal API.
+
+        Strategies whose ``on_bar`` only compares indicators precomputed in
+        ``prepare()`` can override this to return whole-history signal arrays.
+        ``BacktestEngine`` (``mode="auto"`` or ``"vectorized"``) then simulates
+        fills in bulk instead of calling ``on_bar`` per bar.
+
+        Contract (must match what ``on_bar`` would return):
+            - ``enter_long[i]``: entry signal on bar i when flat at the start of bar i
+            - ``exit_long[i]``: exit signal on bar i when in a position
+            - ``stop[i]``: absolute stop for an entry signalled on bar i (NaN = none),
+              or None. ``on_entry()`` is still called once per fill and may override it.
+            - ``signal_reason[i]``: reason recorded for an entry/exit on bar i, or None
+
+        Args:
+            df: The prepared OHLCV DataFrame
+
+        Returns:
+            Tuple ``(enter_long, exit_long, stop, signal_reason)`` of arrays with
+            ``len(df)`` elements, or None if the strategy only supports ``on_bar``.
+        """
+        return None
+
+    @classmethod
+    def sweep_signals(cls, df: pd.DataFrame, grid: pd.DataFrame):
+        """
+        Optional parameter-sweep API (see :mod:`core.sweep`).
+
+        Computes the indicators once per distinct parameter value in ``grid``
+        and returns the signals of every grid row as 2-D ``(len(grid), len(df))``
+        matrices, following the same contract as :meth:`signals`.
+
+        Args:
+            df: OHLCV DataFrame
+            grid: One row per parameter set; columns are strategy attributes
+
+        Returns:
+            :class:`core.vectorized.SweepSignals`, or None if unsupported (the
+            sweep then runs one backtest per grid row)
+        """
+        return None
+
     def size(self, equity: float, price: float, cfg) -> int:
         """
         Calculate position size for trades.
@@ -279,8 +372,26 @@ class Strategy:
         Returns:
             Dictionary with optional trade metadata (stop, take_profit, etc.)
         """
+        if type(self).on_entry_idx is not Strategy.on_entry_idx:
+            try:
+                i = self.bar_index(entry_time)
+            except (KeyError, AttributeError, TypeError):
+                return {}
+            return self.on_entry_idx(i, entry_time, entry_price, state)
         return {}
 
+    def on_entry_idx(
+        self, i: int, entry_time, entry_price: float, state: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        Position-aware variant of :meth:`on_entry`; ``i`` is the fill bar.
+
+        The default delegates to :meth:`on_entry`.
+        """
+        if type(self).on_entry is Strategy.on_entry:
+            return {}
+        return self.on_entry(entry_time, entry_price, state)
+
     @property
     def indicators(self):
         """Get list of declared indicators."""
@@ -291,6 +402,42 @@ class Strategy:
         return cls
 
 
+def _overrides_first(cls: type, name: str, other: str) -> bool:
+    """True if ``name`` is defined before ``other`` in ``cls``'s MRO."""
+    for klass in cls.__mro__:
+        if name in vars(klass):
+            return True
+        if other in vars(klass):
+            return False
+    return False
+
+
+def indexed_hooks(strategy) -> tuple[Callable, Callable]:
+    """
+    Return ``(on_bar, on_entry)`` callables that take the bar position first.
+
+    Strategies overriding :meth:`Strategy.on_bar_idx` / ``on_entry_idx`` get
+    them directly; the timestamp-only hooks of any other strategy (including a
+    subclass that overrides ``on_bar`` of a position-aware parent) are wrapped.
+    """
+    cls = type(strategy)
+    if _overrides_first(cls, "on_bar_idx", "on_bar"):
+        on_bar = strategy.on_bar_idx
+    else:
+
+        def on_bar(i, ts, row, state):
+            return strategy.on_bar(ts, row, state)
+
+    if _overrides_first(cls, "on_entry_idx", "on_entry"):
+        on_entry = strategy.on_entry_idx
+    else:
+
+        def on_entry(i, entry_time, entry_price, state):
+            return strategy.on_entry(entry_time, entry_price, state)
+
+    return on_bar, on_entry
+
+
 # Utility functions for common indicator operations
 def crossover(series1: np.ndarray, series2: np.ndarray) -> np.ndarray:
     """
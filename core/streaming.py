@@ -0,0 +1,164 @@
+"""Streaming backtest output with bounded memory.
+
+``BacktestEngine.run`` keeps every equity/signal row and trade until the end and
+returns three full DataFrames; on multi-year 1-minute data (for instance bars
+from :func:`core.multi_timeframe.aggregate_to_timeframe`) the output alone can
+dominate memory. ``BacktestEngine.stream(checkpoint_every=N)`` runs the same
+per-bar loop as a generator instead and yields:
+
+- each :class:`~core.records.TradeRecord` as soon as it is closed (open trades
+  at the end of the data come last, as ``run`` exports them), and
+- an :class:`EquityCheckpoint` every ``N`` bars carrying the equity and signal
+  rows of those bars, after which the engine drops them.
+
+Only one chunk of rows is held at a time. Pass a :class:`ColumnarSink` to spill
+the rows to disk as they are produced; :meth:`ColumnarSink.read` loads a table
+back (memory-mapped) once the run is done.
+
+Trade records are the raw legs the engine records: a partially exited trade
+arrives as one record per exit leg. :func:`trades_frame` builds the same trades
+DataFrame as ``run`` from the collected records.
+
+Example:
+    >>> sink = ColumnarSink("reports/minute_run")
+    >>> for event in engine.stream(checkpoint_every=50_000, sink=sink):
+    ...     if isinstance(event, EquityCheckpoint):
+    ...         print(event.time, event.equity)
+    >>> equity_df = ColumnarSink.read("reports/minute_run", "equity")
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .records import TradeLog, TradeRecord
+
+
+@dataclass
+class EquityCheckpoint:
+    """Account state after bar ``bar`` and the rows of the bars since the last one."""
+
+    bar: int
+    time: Any
+    equity: float
+    cash: float
+    qty: int
+    equity_rows: pd.DataFrame
+    signal_rows: pd.DataFrame
+
+
+def trades_frame(records: Iterable[TradeRecord]) -> pd.DataFrame:
+    """Trades DataFrame of streamed records, as ``run`` returns it.
+
+    Partial exits are consolidated into one row per entry, like ``run`` does.
+    """
+    from .engine import BacktestEngine
+
+    log = TradeLog()
+    for record in records:
+        log.append(record.layout, *(getattr(record, f) for f in record.layout))
+    trades_df = log.to_frame()
+    if trades_df.empty:
+        return trades_df
+    return BacktestEngine._consolidate_partial_exits(trades_df)
+
+
+class ColumnarSink:
+    """
+    Append-only on-disk tables with one raw binary file per column.
+
+    ``write(equity_rows, signal_rows)`` appends a chunk to the ``equity`` and
+    ``signals`` tables under ``path``; the index is stored as an int64 ``time``
+    column (epoch nanoseconds, UTC for tz-aware data). Column dtypes are
+    recorded in ``schema.json`` on the first write. Only NumPy is needed, and
+    :meth:`read` memory-maps the columns.
+
+    A new sink replaces the tables of an earlier sink at ``path``; other files
+    there are left alone, and a ``schema.json`` that is not a sink's raises
+    FileExistsError instead of being overwritten.
+    """
+
+    TABLES = ("equity", "signals")
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.schema: dict[str, Any] = {}
+        schema_file = self.path / "schema.json"
+        if schema_file.exists():
+            try:
+                with open(schema_file) as f:
+                    previous = json.load(f)
+            except ValueError:
+                previous = None
+            if not isinstance(previous, dict) or not set(previous) <= set(self.TABLES):
+                raise FileExistsError(
+                    f"{schema_file} was not written by a ColumnarSink"
+                )
+            schema_file.unlink()
+        for table in self.TABLES:
+            for stale in self.path.glob(f"{table}.*.bin"):
+                stale.unlink()
+
+    def write(self, equity_rows: pd.DataFrame, signal_rows: pd.DataFrame) -> None:
+        self._append("equity", equity_rows)
+        self._append("signals", signal_rows)
+
+    def _append(self, table: str, frame: pd.DataFrame) -> None:
+        index = frame.index
+        if table not in self.schema:
+            tz = getattr(index, "tz", None)
+            self.schema[table] = {
+                "index": index.name,
+                "tz": str(tz) if tz is not None else None,
+                "unit": getattr(index, "unit", "ns"),
+                "columns": {c: frame[c].dtype.str for c in frame.columns},
+            }
+            with open(self.path / "schema.json", "w") as f:
+                json.dump(self.schema, f, indent=2)
+        columns = {"time": _epoch_ns(index)}
+        for col, dtype in self.schema[table]["columns"].items():
+            columns[col] = frame[col].to_numpy(dtype=np.dtype(dtype))
+        for col, values in columns.items():
+            with open(self.path / f"{table}.{col}.bin", "ab") as f:
+                f.write(np.ascontiguousarray(values).tobytes())
+
+    @staticmethod
+    def read(
+        path: Union[str, Path], table: str = "equity", columns: Optional[list] = None
+    ) -> pd.DataFrame:
+        """Load ``table`` ("equity" or "signals") written by a sink at ``path``."""
+        path = Path(path)
+        with open(path / "schema.json") as f:
+            spec = json.load(f)[table]
+        names = columns or list(spec["columns"])
+        data = {
+            col: _column(path / f"{table}.{col}.bin", spec["columns"][col])
+            for col in names
+        }
+        time = pd.to_datetime(_column(path / f"{table}.time.bin", "<i8"), unit="ns")
+        time = time.as_unit(spec["unit"])
+        if spec["tz"] is not None:
+            time = time.tz_localize("UTC").tz_convert(spec["tz"])
+        return pd.DataFrame(data, index=pd.Index(time, name=spec["index"]))
+
+
+def _epoch_ns(index: pd.Index) -> np.ndarray:
+    if not isinstance(index, pd.DatetimeIndex):
+        index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+def _column(file: Path, dtype: str) -> np.ndarray:
+    if os.path.getsize(file) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(file, dtype=np.dtype(dtype), mode="r")
@@ -0,0 +1,185 @@
+"""Parameter sweeps that share indicator arrays across a grid of parameter sets.
+
+Tuning a strategy by running one ``BacktestEngine`` per parameter combination
+recomputes every indicator for every combination. Strategies implementing
+``Strategy.sweep_signals(df, grid)`` instead compute each indicator once per
+distinct parameter value and return the signals of the whole grid as 2-D
+``(params x bars)`` matrices (threshold filters become broadcast comparisons).
+Each row is then simulated with the bulk next-open simulator in
+:mod:`core.vectorized`, so a symbol is loaded, validated and prepared once.
+
+Strategies without ``sweep_signals`` (or configurations the bulk simulator does
+not support) fall back to one engine run per grid row; results are identical
+either way.
+
+Example:
+    >>> grid = param_grid(fast_length=[20, 25], slow_length=[80, 100])
+    >>> results = sweep_basket(ohlcv_map, "tema_lsma_crossover", grid)
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import BrokerConfig
+from .engine import BacktestEngine
+from .registry import _REG, make_strategy
+from .vectorized import normalize_signals, simulate_next_open, supports_vectorized
+
+RESULT_COLUMNS = [
+    "trades",
+    "win_rate_pct",
+    "net_pnl",
+    "net_pnl_pct",
+    "profit_factor",
+    "max_drawdown_pct",
+    "exposure_pct",
+    "final_equity",
+]
+
+
+def param_grid(**axes: Any) -> pd.DataFrame:
+    """Cartesian product of parameter values, one row per parameter set.
+
+    Example:
+        >>> param_grid(fast_length=[20, 25], atr_14_min=[0.0, 3.5])
+    """
+    names = list(axes)
+    values = [
+        list(v) if np.iterable(v) and not isinstance(v, str) else [v]
+        for v in axes.values()
+    ]
+    return pd.DataFrame(list(itertools.product(*values)), columns=names)
+
+
+def _strategy_for(name: str, params: dict[str, Any]):
+    strategy = make_strategy(name)
+    for key, value in params.items():
+        if not hasattr(strategy, key):
+            raise ValueError(f"{type(strategy).__name__} has no parameter '{key}'")
+        setattr(strategy, key, value)
+    return strategy
+
+
+def summarize_run(
+    trades: pd.DataFrame, equity: pd.DataFrame, cfg: BrokerConfig
+) -> dict[str, float]:
+    """Headline metrics of one backtest for the sweep results table."""
+    if "net_pnl" in trades.columns:
+        # Open trades have no net P&L yet
+        pnl = pd.to_numeric(trades["net_pnl"], errors="coerce").dropna()
+    else:
+        pnl = pd.Series(dtype=float)
+    wins = float(pnl[pnl > 0].sum())
+    losses = float(-pnl[pnl < 0].sum())
+    if losses > 0:
+        profit_factor = wins / losses
+    else:
+        profit_factor = np.inf if wins > 0 else 0.0
+
+    curve = equity["equity"].to_numpy(dtype=float)
+    if len(curve):
+        peak = np.maximum.accumulate(curve)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = np.where(peak > 0, (peak - curve) / peak, 0.0)
+        max_dd = float(np.nanmax(drawdown)) * 100
+        final_equity = float(curve[-1])
+        exposure = float((equity["qty"].to_numpy() > 0).mean()) * 100
+    else:
+        max_dd, final_equity, exposure = 0.0, cfg.initial_capital, 0.0
+
+    net = float(pnl.sum())
+    return {
+        "trades": int(len(pnl)),
+        "win_rate_pct": float((pnl > 0).mean() * 100) if len(pnl) else 0.0,
+        "net_pnl": net,
+        "net_pnl_pct": net / cfg.initial_capital * 100 if cfg.initial_capital else 0.0,
+        "profit_factor": profit_factor,
+        "max_drawdown_pct": max_dd,
+        "exposure_pct": exposure,
+        "final_equity": final_equity,
+    }
+
+
+def sweep_symbol(
+    df: pd.DataFrame,
+    strategy_name: str,
+    grid: pd.DataFrame,
+    cfg: Optional[BrokerConfig] = None,
+    symbol: Optional[str] = None,
+) -> pd.DataFrame:
+    """Evaluate every row of ``grid`` on one symbol.
+
+    Returns:
+        One row per parameter set: the grid columns followed by
+        :data:`RESULT_COLUMNS`.
+    """
+    if strategy_name not in _REG:
+        raise ValueError(
+            f"Unknown strategy '{strategy_name}'. Available: {list(_REG.keys())}"
+        )
+    cfg = cfg or BrokerConfig()
+    grid = grid.reset_index(drop=True)
+    params = grid.to_dict("records")
+
+    # One validated copy of the data serves every parameter set (this also
+    # checks the parameter names against the strategy)
+    first = _strategy_for(strategy_name, params[0] if params else {})
+    engine = BacktestEngine(df, first, cfg, symbol=symbol, mode="auto")
+    plan = _REG[strategy_name].sweep_signals(engine.df, grid) if params else None
+
+    rows = []
+    for p, row in enumerate(params):
+        if plan is not None:
+            engine.strategy = plan.strategies[p]
+        if plan is not None and supports_vectorized(engine):
+            signals = normalize_signals(plan.row(p), len(engine.df))
+            trades, equity, _ = simulate_next_open(engine, signals)
+            trades = trades.to_frame()
+        else:
+            engine.strategy = _strategy_for(strategy_name, row)
+            trades, equity, _ = engine.run()
+        rows.append({**row, **summarize_run(trades, equity, cfg)})
+    return pd.DataFrame(rows, columns=list(grid.columns) + RESULT_COLUMNS)
+
+
+def sweep_basket(
+    ohlcv_map: dict[str, pd.DataFrame],
+    strategy_name: str,
+    grid: pd.DataFrame,
+    cfg: Optional[BrokerConfig] = None,
+) -> pd.DataFrame:
+    """Run :func:`sweep_symbol` for every symbol into one tidy results table.
+
+    Returns:
+        Columns ``symbol``, the grid columns and :data:`RESULT_COLUMNS`; one row
+        per (symbol, parameter set).
+    """
+    frames = []
+    for symbol, df in ohlcv_map.items():
+        if df is None or df.empty:
+            continue
+        result = sweep_symbol(df, strategy_name, grid, cfg, symbol=symbol)
+        result.insert(0, "symbol", symbol)
+        frames.append(result)
+    if not frames:
+        return pd.DataFrame(columns=["symbol"] + list(grid.columns) + RESULT_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def rank_params(results: pd.DataFrame, by: str = "net_pnl") -> pd.DataFrame:
+    """Aggregate a basket sweep per parameter set, best first.
+
+    Sums ``trades``/``net_pnl`` across symbols and averages the other metrics.
+    """
+    param_cols = [
+        c for c in results.columns if c != "symbol" and c not in RESULT_COLUMNS
+    ]
+    agg = {c: "mean" for c in RESULT_COLUMNS}
+    agg.update(trades="sum", net_pnl="sum", net_pnl_pct="sum")
+    ranked = results.groupby(param_cols, sort=False).agg(agg).reset_index()
+    return ranked.sort_values(by, ascending=False, ignore_index=True)
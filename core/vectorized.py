@@ -0,0 +1,330 @@
+"""Vectorized next-open fill simulator for strategies that emit signal arrays.
+
+Strategies implementing ``Strategy.signals(df)`` return whole-history entry/exit
+arrays. This module turns those arrays into trades and equity identical to what
+``BacktestEngine``'s per-bar loop produces for the same strategy, without calling
+Python per bar: the simulator jumps from one candidate event to the next using
+``searchsorted`` over the signal indices, and the equity curve is rebuilt from the
+piecewise-constant cash/qty state in one pass.
+
+The signal rows are position-aware: ``enter_long`` is only reported on bars that
+start flat and ``exit_long`` only while in a position. They match the per-bar
+loop for strategies whose ``on_bar`` checks the position, but not for those that
+return raw conditions (``EMAcrossoverStrategy`` flags add-on entries while long,
+which can never fill at ``pyramiding=1``).
+
+Supported configuration (anything else falls back to the per-bar loop):
+- ``cfg.execute_on_next_open = True``
+- ``strategy.pyramiding == 1``
+- no trailing-stop updates or partial exits (these need ``on_bar``)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from .records import OPEN_TRADE, SIGNAL_EXIT, STOP_EXIT, BarBuffers, TradeLog
+from .strategy import indexed_hooks
+
+if TYPE_CHECKING:
+    from .engine import BacktestEngine
+
+
+@dataclass
+class SweepSignals:
+    """Signals for a grid of parameter sets (see ``Strategy.sweep_signals``).
+
+    Row ``p`` of each matrix holds the signals of grid row ``p``.
+    ``strategies[p]`` is configured with that row's parameters and has its
+    indicator attributes bound to the shared arrays, so ``size()`` and
+    ``on_entry()`` work without calling ``prepare()`` again.
+    """
+
+    enter_long: np.ndarray  # (n_params, n_bars) bool
+    exit_long: np.ndarray  # (n_params, n_bars) bool
+    strategies: list[Any]
+    entry_reason: str = ""
+    exit_reason: str = ""
+
+    def row(self, p: int) -> tuple[np.ndarray, np.ndarray, None, np.ndarray]:
+        """``Strategy.signals()``-style tuple for grid row ``p``."""
+        enter, exit_ = self.enter_long[p], self.exit_long[p]
+        reason = np.where(
+            exit_, self.exit_reason, np.where(enter, self.entry_reason, "")
+        ).astype(object)
+        return enter, exit_, None, reason
+
+
+def supports_vectorized(engine: BacktestEngine) -> bool:
+    """Whether the engine configuration can be simulated from signal arrays."""
+    return bool(engine.cfg.execute_on_next_open) and (
+        int(getattr(engine.strategy, "pyramiding", 1)) == 1
+    )
+
+
+def normalize_signals(
+    sig: tuple, n: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Validate ``Strategy.signals()`` output and coerce it to fixed dtypes.
+
+    Returns:
+        ``(enter_long, exit_long, stop, signal_reason)`` as bool, bool, float
+        (NaN = no stop) and object arrays of length ``n``.
+    """
+    if not isinstance(sig, tuple) or len(sig) != 4:
+        raise ValueError(
+            "Strategy.signals() must return (enter_long, exit_long, stop, signal_reason)"
+        )
+    enter, exit_, stop, reason = sig
+    enter = np.asarray(enter, dtype=bool)
+    exit_ = np.asarray(exit_, dtype=bool)
+    stop = np.full(n, np.nan) if stop is None else np.asarray(stop, dtype=float)
+    reason = (
+        np.full(n, "", dtype=object)
+        if reason is None
+        else np.asarray(reason, dtype=object)
+    )
+    for name, arr in (
+        ("enter_long", enter),
+        ("exit_long", exit_),
+        ("stop", stop),
+        ("signal_reason", reason),
+    ):
+        if arr.shape != (n,):
+            raise ValueError(
+                f"signals(): '{name}' has shape {arr.shape}, expected ({n},)"
+            )
+    return enter, exit_, stop, reason
+
+
+def simulate_next_open(
+    engine: BacktestEngine,
+    signals: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    trades_only: bool = False,
+) -> tuple[TradeLog, Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+    """Simulate next-open fills for ``pyramiding=1`` from signal arrays.
+
+    Mirrors ``BacktestEngine.run`` bar for bar:
+    - bars with NaN close are skipped (no signals, equity carried forward)
+    - a lot's stop is checked from the bar after the entry signal; a hit exits
+      at the stop price on that bar and takes precedence over a signal exit
+    - a signal exit on bar i fills at bar i+1's open; signals on the last bar
+      cannot be filled and are ignored
+    - entries are only taken on bars that start flat (so never on the bar of
+      an exit), sized from the equity at the end of the previous valid bar
+
+    Returns:
+        ``(trades, equity_df, signals_df)``; trade records use the same layouts
+        as the per-bar loop so the engine can consolidate them identically.
+        With ``trades_only`` the equity curve is not built and both frames are
+        None.
+    """
+    enter, exit_, stop, reason = signals
+    cfg = engine.cfg
+    strategy = engine.strategy
+    _, on_entry = indexed_hooks(strategy)
+    data = engine.df
+    idx = data.index
+    n = len(idx)
+    comm = cfg.commission_pct / 100.0
+    initial_capital = cfg.initial_capital
+
+    opens = data["open"].to_numpy(dtype=float, na_value=np.nan)
+    lows = data["low"].to_numpy(dtype=float, na_value=np.nan)
+    closes = data["close"].to_numpy(dtype=float, na_value=np.nan)
+    valid = ~np.isnan(closes)
+    closes_list = closes.tolist()
+
+    # prev_valid[i] = last bar < i with a valid close (-1 if none)
+    positions = np.where(valid, np.arange(n), -1)
+    prev_valid = np.empty(n, dtype=np.int64)
+    if n:
+        prev_valid[0] = -1
+        prev_valid[1:] = np.maximum.accumulate(positions)[:-1]
+
+    enter = enter & valid
+    exit_ = exit_ & valid
+    # Fills need a next bar
+    entry_cand = np.flatnonzero(enter[: n - 1]) if n else np.empty(0, dtype=np.int64)
+    exit_cand = np.flatnonzero(exit_[: n - 1]) if n else np.empty(0, dtype=np.int64)
+
+    out = BarBuffers(n)
+    did_entry = out.did_entry
+    did_exit = out.did_exit
+    # State changes: after processing bar change_bars[k] the account holds
+    # change_cash[k] cash and change_qty[k] shares
+    change_bars: list[int] = []
+    change_cash: list[float] = []
+    change_qty: list[int] = []
+    trades = TradeLog()
+
+    def equity_at(bar: int) -> float:
+        """Equity the per-bar loop would hold after processing ``bar``."""
+        if bar < 0:
+            return initial_capital
+        k = int(np.searchsorted(change_bars, bar, side="right")) - 1
+        if k < 0:
+            return float(initial_capital)
+        return change_cash[k] + change_qty[k] * closes_list[bar]
+
+    cash = initial_capital
+    pos = 0
+    while True:
+        t = int(np.searchsorted(entry_cand, pos))
+        if t >= len(entry_cand):
+            break
+        e = int(entry_cand[t])
+        pos = e + 1
+
+        # ===== ENTRY (signal on bar e, fill at bar e+1 open) =====
+        equity = equity_at(int(prev_valid[e]))
+        buy_fill = engine._fills(float(opens[e + 1]))[0]
+        sizing_equity = equity if cfg.compounding else initial_capital
+        shares = strategy.size(equity=sizing_equity, price=buy_fill, cfg=cfg)
+        if shares <= 0:
+            continue
+        notional = buy_fill * shares
+        fee = notional * comm
+        total = notional + fee
+        if total > cash:
+            continue
+
+        state = {
+            "qty": 0,
+            "cash": cash,
+            "equity": equity,
+            "symbol": engine.symbol,
+            "position": 0,
+        }
+        cash -= total
+        entry_time = idx[e + 1]
+        stop_price: Optional[float] = None if np.isnan(stop[e]) else float(stop[e])
+        try:
+            meta = on_entry(e + 1, entry_time, buy_fill, state)
+            if isinstance(meta, dict) and meta.get("stop") is not None:
+                try:
+                    stop_price = float(meta.get("stop"))
+                except Exception:
+                    pass
+        except Exception:
+            pass
+        entry_reason = reason[e]
+        did_entry[e] = True
+        change_bars.append(e)
+        change_cash.append(cash)
+        change_qty.append(shares)
+
+        # ===== EXIT (first stop hit or exit signal from bar e+1 onwards) =====
+        a = e + 1
+        u = int(np.searchsorted(exit_cand, a))
+        x = int(exit_cand[u]) if u < len(exit_cand) else None
+        s = None
+        if stop_price is not None:
+            end = x + 1 if x is not None else n
+            hits = np.flatnonzero(valid[a:end] & (lows[a:end] <= stop_price))
+            if hits.size:
+                s = a + int(hits[0])
+
+        if s is not None:
+            sell_fill = engine._fills(stop_price)[1]
+            lot_gross = (sell_fill - buy_fill) * shares
+            exit_comm = (sell_fill * shares) * comm
+            trades.append(
+                STOP_EXIT,
+                entry_time,
+                buy_fill,
+                shares,
+                idx[s],
+                sell_fill,
+                fee,
+                exit_comm,
+                lot_gross,
+                lot_gross - fee - exit_comm,
+                "stop",
+                entry_reason,
+                "Stop Loss",
+                stop_price,
+            )
+            # NOTE: the per-bar loop does not credit stop-exit proceeds to cash;
+            # mirrored here so both paths stay identical.
+            did_exit[s] = True
+            change_bars.append(s)
+            change_cash.append(cash)
+            change_qty.append(0)
+            pos = s + 1
+        elif x is not None:
+            sell_fill = engine._fills(float(opens[x + 1]))[1]
+            notional = sell_fill * shares
+            cash += notional - notional * comm
+            lot_gross = (sell_fill - buy_fill) * shares
+            exit_comm = (sell_fill * shares) * comm
+            trades.append(
+                SIGNAL_EXIT,
+                entry_time,
+                buy_fill,
+                shares,
+                idx[x + 1],
+                sell_fill,
+                "signal",
+                entry_reason,
+                reason[x],
+                stop_price,
+                fee,
+                exit_comm,
+                lot_gross,
+                lot_gross - fee - exit_comm,
+            )
+            did_exit[x] = True
+            change_bars.append(x)
+            change_cash.append(cash)
+            change_qty.append(0)
+            pos = x + 1
+        else:
+            # Position is still open at the end of the data
+            trades.append(
+                OPEN_TRADE,
+                entry_time,
+                None,
+                float(buy_fill),
+                None,
+                int(shares),
+                None,
+                fee,
+                0,
+                None,
+                None,
+                "OPEN",
+                stop_price,
+            )
+            break
+
+    if trades_only:
+        return trades, None, None
+
+    # ===== EQUITY CURVE (piecewise-constant cash/qty state) =====
+    bars = np.arange(n)
+    k = np.searchsorted(np.asarray(change_bars, dtype=np.int64), bars, side="right") - 1
+    cash_hist = np.asarray([initial_capital] + change_cash, dtype=float)
+    qty_hist = np.asarray([0] + change_qty, dtype=np.int64)
+    cash_arr = cash_hist[k + 1]
+    qty_arr = qty_hist[k + 1]
+    equity = cash_arr + qty_arr * closes
+    # NaN-close bars carry the equity of the previous valid bar forward
+    carry = np.where(valid, bars, prev_valid)
+    equity = np.where(carry >= 0, equity[np.maximum(carry, 0)], float(initial_capital))
+
+    out.equity[:] = equity
+    out.cash[:] = cash_arr
+    out.qty[:] = qty_arr
+    out.price[:] = closes
+    out.valid[:] = valid
+    # Report signals the way a position-aware on_bar() would have returned them
+    flat_at_start = np.concatenate(([True], qty_arr[:-1] == 0))
+    out.enter_long[:] = enter & flat_at_start
+    out.exit_long[:] = exit_ & ~flat_at_start
+    equity_df, signals_df = out.to_frames(idx)
+    return trades, equity_df, signals_df
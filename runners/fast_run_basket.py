@@ -43,7 +43,9 @@ from core.engine import BacktestEngine
 from core.metrics import compute_portfolio_trade_metrics, compute_trade_metrics_table
 from core.monitoring import optimize_window_processing
 from core.registry import make_strategy
-from core.loaders import load_many_india, load_india_vix
+from core.loaders import load_many_india
+from core.market_context import market_series
+from core.shared_panel import PanelRef, SharedPanel, attach_frame
 
 # Configure logging
 logging.basicConfig(
@@ -63,23 +65,20 @@ WINDOW_LABELS = {1: "1Y", 3: "3Y", 5: "5Y", None: "MAX"}
 
 
 def _process_symbol_for_backtest(args: tuple) -> dict:
-    """Module-level function for multiprocessing - processes a single symbol."""
-    symbol, df_full, strategy_name, cfg = args
+    """Module-level function for multiprocessing - processes a single symbol.
+
+    The data is a PanelRef into the shared OHLCV panel (or the DataFrame
+    itself); only the trades are sent back, the parent already has the data.
+    """
+    symbol, data, strategy_name, cfg = args
 
     try:
+        df_full = attach_frame(data) if isinstance(data, PanelRef) else data
         strat = make_strategy(strategy_name)
-        engine = BacktestEngine(df_full, strat, cfg, symbol=symbol)
-        trades_full, equity_full, _ = engine.run()
-
-        return (
-            symbol,
-            {
-                "trades": trades_full,
-                "equity": equity_full,
-                "data": df_full,
-            },
-            None,
-        )
+        engine = BacktestEngine(df_full, strat, cfg, symbol=symbol, mode="auto")
+        trades_full, _, _ = engine.run(trades_only=True)
+
+        return (symbol, {"trades": trades_full}, None)
     except Exception as e:
         return (symbol, None, f"Error: {str(e)[:50]}")
 
@@ -410,8 +409,8 @@ def backtest_symbol(args: tuple) -> dict:
 
     try:
         strat = make_strategy(strategy_name)
-        engine = BacktestEngine(df_full, strat, cfg, symbol=symbol)
-        trades_full, equity_full, _ = engine.run()
+        engine = BacktestEngine(df_full, strat, cfg, symbol=symbol, mode="auto")
+        trades_full, _, _ = engine.run(trades_only=True)
 
         return {
             "symbol": symbol,
@@ -455,25 +454,37 @@ def run_fast_backtest(
         logger.error(f"❌ Strategy not found: {strategy_name}")
         sys.exit(1)
 
-    # Load all OHLCV data
+    num_workers = num_workers or max(2, cpu_count() - 1)
+
+    # Load all OHLCV data; reads and parsing overlap on up to one thread per core
+    # (a single core loads sequentially: threads only add overhead there)
     logger.info("📥 Loading OHLCV data...")
-    ohlcv_map = load_many_india(symbols, interval=interval)
+    load_timings: dict[str, float] = {}
+    load_start = time.time()
+    ohlcv_map = load_many_india(
+        symbols,
+        interval=interval,
+        max_workers=min(num_workers, cpu_count()),
+        timings=load_timings,
+    )
+    if load_timings:
+        slowest = max(load_timings, key=load_timings.get)
+        logger.info(
+            f"   Loaded {len(ohlcv_map)} symbols in {time.time() - load_start:.2f}s"
+            f" (slowest: {slowest} {load_timings[slowest]:.3f}s)"
+        )
 
     # Load India VIX for strategies that use it (e.g., stoch_rsi_pyramid_long)
     logger.info("📥 Loading India VIX...")
     try:
-        vix_df = load_india_vix()
-        # Normalize VIX index to tz-naive to match stock data index
-        if vix_df.index.tz is not None:
-            vix_df.index = vix_df.index.tz_localize(None)
+        vix = market_series("india_vix")
         
-        # Join VIX to each symbol's dataframe
+        # Join VIX to each symbol's dataframe (VIX compared on tz-naive wall time,
+        # like the stock data index)
         for symbol in ohlcv_map:
             df = ohlcv_map[symbol]
-            df = df.join(vix_df[['close']].rename(columns={'close': 'vix_value'}), how='left')
-            df['vix_value'] = df['vix_value'].ffill().bfill()
-            df['india_vix'] = df['vix_value']
-            ohlcv_map[symbol] = df
+            vix_value = pd.Series(vix.align(df.index, naive=True), index=df.index).ffill().bfill()
+            ohlcv_map[symbol] = df.assign(vix_value=vix_value, india_vix=vix_value)
         logger.info("✅ India VIX loaded and joined to all symbols")
     except Exception as e:
         logger.warning(f"⚠️  Failed to load India VIX: {e}. VIX-dependent strategies may not work.")
@@ -482,12 +493,21 @@ def run_fast_backtest(
     valid_symbols = [s for s in symbols if s in ohlcv_map and len(ohlcv_map[s]) > 0]
     logger.info(f"🔄 Backtesting {len(valid_symbols)} symbols (1Y, 3Y, 5Y, MAX windows)...")
 
-    # Prepare backtest tasks
+    # Prepare backtest tasks: workers read the frames from one shared memory
+    # panel, so a task pickles a small PanelRef instead of a DataFrame
     cfg = BrokerConfig()
-    tasks = [(symbol, ohlcv_map[symbol], strategy_name, cfg) for symbol in valid_symbols]
+    try:
+        panel = SharedPanel({symbol: ohlcv_map[symbol] for symbol in valid_symbols})
+        logger.info(f"   Shared OHLCV panel: {panel.nbytes / 1e6:.1f} MB")
+    except (ValueError, OSError) as e:
+        logger.warning(f"⚠️  Passing DataFrames to workers: {e}")
+        panel = None
+    tasks = [
+        (symbol, panel.ref(symbol) if panel else ohlcv_map[symbol], strategy_name, cfg)
+        for symbol in valid_symbols
+    ]
 
     # Run backtests in parallel using module-level function
-    num_workers = num_workers or max(2, cpu_count() - 1)
     logger.info(f"   Using {num_workers} workers")
 
     symbol_results = {}
@@ -501,25 +521,28 @@ def run_fast_backtest(
                     logger.debug(f"Error for {symbol}: {error}")
                     errors += 1
                 else:
-                    symbol_results[symbol] = result
+                    symbol_results[symbol] = {**result, "data": ohlcv_map[symbol]}
                     if i % max(1, len(valid_symbols) // 10) == 0 or i == len(valid_symbols):
                         logger.info(f"   ✅ {i}/{len(valid_symbols)}")
     except Exception as e:
         logger.warning(f"Parallel processing failed, falling back to sequential: {e}")
         # Fallback to sequential
-        for symbol, df_full, strategy_name, cfg in tasks:
+        for symbol in valid_symbols:
+            df_full = ohlcv_map[symbol]
             try:
                 strat = make_strategy(strategy_name)
-                engine = BacktestEngine(df_full, strat, cfg, symbol=symbol)
-                trades_full, equity_full, _ = engine.run()
+                engine = BacktestEngine(df_full, strat, cfg, symbol=symbol, mode="auto")
+                trades_full, _, _ = engine.run(trades_only=True)
                 symbol_results[symbol] = {
                     "trades": trades_full,
-                    "equity": equity_full,
                     "data": df_full,
                 }
             except Exception as e:
                 logger.debug(f"Error for {symbol}: {e}")
                 errors += 1
+    finally:
+        if panel is not None:
+            panel.close()
 
     logger.info(f"✅ Parallel backtests complete: {len(symbol_results)} successful, {errors} errors")
 
@@ -718,9 +741,20 @@ if __name__ == "__main__":
         default=None,
         help="Number of workers (default: cpu_count - 1)",
     )
+    parser.add_argument(
+        "--indicator_cache",
+        default=None,
+        help="Reuse indicator results stored in this directory across runs "
+        "(memory-mapped, size-capped; e.g. data/cache/indicators)",
+    )
 
     args = parser.parse_args()
 
+    if args.indicator_cache:
+        from utils.indicator_cache import set_indicator_disk_cache
+
+        set_indicator_disk_cache(args.indicator_cache)
+
     run_fast_backtest(
         strategy_name=args.strategy,
         basket_file=args.basket_file,
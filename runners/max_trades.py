@@ -45,10 +45,13 @@ from multiprocessing import cpu_count, get_context
 import numpy as np
 import pandas as pd
 
+from core.cache_manifest import get_manifest
 from core.config import BrokerConfig
 from core.engine import BacktestEngine
+from core.instrument_master import get_instrument_master
 from core.registry import make_strategy
-from core.loaders import load_many_india, load_india_vix, load_nifty200, aggregate_to_weekly
+from core.loaders import load_many_india, aggregate_to_weekly
+from core.market_context import market_series
 from core.report import make_run_dir
 
 # Configure logging
@@ -119,7 +122,7 @@ def _load_weekly_nifty50_indicators() -> pd.DataFrame | None:
         df.index = pd.to_datetime(df.index).normalize()
         df = df.sort_index()
         
-        from utils import EMA
+        from utils.cached_indicators import EMA
         close_arr = df['close'].astype(float).values
         
         ema5 = EMA(close_arr, 5)
@@ -156,13 +159,11 @@ def _load_weekly_data_for_symbol(symbol: str, daily_df: pd.DataFrame) -> pd.Data
     clean_symbol = symbol.replace("NSE:", "").replace(":", "_").replace("/", "_").strip()
     
     # Try Groww weekly cache first
-    import glob
-    pattern = str(_WEEKLY_DATA_DIR / f"groww_*_{clean_symbol}_1w.csv")
-    matches = glob.glob(pattern)
+    weekly = get_manifest().entry(clean_symbol, "1w")
     
-    if matches:
+    if weekly is not None and weekly["location"] == "groww_weekly":
         try:
-            df = pd.read_csv(matches[0], parse_dates=['time'], index_col='time')
+            df = pd.read_csv(weekly["path"], parse_dates=['time'], index_col='time')
             df.index = pd.to_datetime(df.index).normalize()
             df = df.sort_index()
             # CRITICAL: Exclude incomplete current week to avoid lookahead bias
@@ -196,8 +197,8 @@ def _calculate_weekly_indicators(weekly_df: pd.DataFrame) -> pd.DataFrame:
         return pd.DataFrame()
     
     import math
-    from utils import EMA, RSI, SMA, MACD, BollingerBands, ATR
-    from utils.indicators import ADX, CCI, MFI, CMF, Aroon, TrendClassification, kaufman_efficiency_ratio
+    from utils.cached_indicators import EMA, RSI, SMA, MACD, BollingerBands, ATR
+    from utils.cached_indicators import ADX, CCI, MFI, CMF, Aroon, TrendClassification, kaufman_efficiency_ratio
     
     close_arr = weekly_df['close'].astype(float).values
     high_arr = weekly_df['high'].astype(float).values
@@ -380,32 +381,30 @@ def _read_symbols_from_txt(txt_path: str) -> list[str]:
     return lines
 
 
+def _map_weekly_vix(dates) -> np.ndarray:
+    """Weekly India VIX of the last completed week for each date (NaN before the first).
+    
+    Weekly VIX time is week START (Sunday 18:30 IST); adding 7 days gives the week
+    END, so each daily bar sees only the VIX of weeks that have closed.
+    """
+    vix_weekly_df = _load_weekly_vix()
+    if vix_weekly_df is None or vix_weekly_df.empty:
+        return np.full(len(dates), np.nan)
+    daily_dates = pd.to_datetime(dates).normalize()
+    week_end_dates = (vix_weekly_df.index + pd.Timedelta(days=7)).normalize()
+    vix_values = vix_weekly_df['close'].to_numpy(dtype=float)
+    week_indices = np.searchsorted(week_end_dates, daily_dates, side='right') - 1
+    return np.where(week_indices >= 0, vix_values[np.maximum(week_indices, 0)], np.nan)
+
+
 def _enrich_with_vix(df: pd.DataFrame) -> pd.DataFrame:
     """Add india_vix column to DataFrame for VIX filter in strategies.
     
     Uses weekly VIX data mapped to daily bars (daily VIX file may not exist).
     """
     try:
-        vix_weekly_df = _load_weekly_vix()
-        if vix_weekly_df is not None and not vix_weekly_df.empty:
-            # Weekly VIX time is week START (Sunday 18:30 IST)
-            # Add 7 days to get week END, then map daily bars to completed weeks
-            daily_dates = pd.to_datetime(df.index).normalize()
-            week_end_dates = (vix_weekly_df.index + pd.Timedelta(days=7)).normalize()
-            vix_values = vix_weekly_df['close'].values
-            
-            # Map each daily date to the most recent completed weekly VIX
-            week_indices = np.searchsorted(week_end_dates, daily_dates, side='right') - 1
-            
-            india_vix_mapped = np.full(len(df), np.nan)
-            for i, week_idx in enumerate(week_indices):
-                if 0 <= week_idx < len(vix_values):
-                    india_vix_mapped[i] = vix_values[week_idx]
-            
-            df['india_vix'] = india_vix_mapped
-            df['india_vix'] = df['india_vix'].infer_objects(copy=False).ffill()  # Forward fill for holidays
-        else:
-            df['india_vix'] = np.nan
+        df['india_vix'] = _map_weekly_vix(df.index)
+        df['india_vix'] = df['india_vix'].ffill()  # Forward fill for holidays
     except Exception:
         df['india_vix'] = np.nan
     return df
@@ -413,14 +412,12 @@ def _enrich_with_vix(df: pd.DataFrame) -> pd.DataFrame:
 
 def _enrich_with_nifty200_ema(df: pd.DataFrame) -> pd.DataFrame:
     """Add nifty200_above_ema50 indicator to DataFrame for market regime filter."""
-    from utils import EMA
     try:
-        nifty200_df = load_nifty200()
-        nifty200_close = nifty200_df['close'].values
-        nifty200_ema50 = EMA(nifty200_close, 50)
-        nifty200_above_50 = pd.Series(nifty200_close > nifty200_ema50, index=nifty200_df.index)
-        df = df.join(nifty200_above_50.rename('nifty200_above_ema50'), how='left')
-        df['nifty200_above_ema50'] = df['nifty200_above_ema50'].infer_objects(copy=False).ffill().fillna(True).astype(bool)
+        nifty200 = market_series("nifty200")
+        above_50 = nifty200.align(df.index, nifty200.above_ema(50))
+        df = df.assign(
+            nifty200_above_ema50=pd.Series(above_50, index=df.index).ffill().fillna(1.0).astype(bool)
+        )
     except Exception:
         df['nifty200_above_ema50'] = True
     return df
@@ -431,8 +428,8 @@ def _process_symbol(args: tuple) -> tuple:
     symbol, df_full, strategy_name, cfg = args
     try:
         strat = make_strategy(strategy_name)
-        engine = BacktestEngine(df_full, strat, cfg, symbol=symbol)
-        trades_full, equity_full, _ = engine.run()
+        engine = BacktestEngine(df_full, strat, cfg, symbol=symbol, mode="auto")
+        trades_full, _, _ = engine.run(trades_only=True)
         return (symbol, {"trades": trades_full, "data": df_full}, None)
     except Exception as e:
         return (symbol, None, f"Error: {str(e)[:50]}")
@@ -462,8 +459,8 @@ def _calculate_all_indicators(
     volume_arr = df["volume"].astype(float).values if "volume" in df.columns else np.ones(len(close_arr))
     
     # Import indicator functions
-    from utils import ATR, EMA, MACD, RSI, SMA, BollingerBands, Stochastic
-    from utils.indicators import (
+    from utils.cached_indicators import ATR, EMA, MACD, RSI, SMA, BollingerBands, Stochastic
+    from utils.cached_indicators import (
         ADX, CCI, MFI, CMF, Aroon, StochasticRSI,
         TrendClassification, VolatilityClassification,
         kaufman_efficiency_ratio,
@@ -471,67 +468,26 @@ def _calculate_all_indicators(
     
     # ========== REGIME FILTERS ==========
     
-    # Store daily dates as normalized timestamps for joining
-    daily_dates = pd.to_datetime(result_df.index).normalize()
-    
     # India VIX - use weekly VIX and map to daily (daily VIX file may not exist)
     try:
-        vix_weekly_df = _load_weekly_vix()
-        if vix_weekly_df is not None and not vix_weekly_df.empty:
-            # Weekly VIX time is week START (Sunday 18:30 IST)
-            # Add 7 days to get week END, then map daily bars to completed weeks
-            week_end_dates = (vix_weekly_df.index + pd.Timedelta(days=7)).normalize()
-            vix_values = vix_weekly_df['close'].values
-            
-            # Map each daily date to the most recent completed weekly VIX
-            # searchsorted gives index where daily_date would be inserted
-            # -1 gives the last completed week
-            week_indices = np.searchsorted(week_end_dates, daily_dates, side='right') - 1
-            
-            india_vix_mapped = np.full(len(result_df), np.nan)
-            for i, week_idx in enumerate(week_indices):
-                if 0 <= week_idx < len(vix_values):
-                    india_vix_mapped[i] = vix_values[week_idx]
-            
-            result_df['india_vix'] = india_vix_mapped
-            result_df['india_vix'] = result_df['india_vix'].infer_objects(copy=False).ffill()  # Forward fill for holidays
-        else:
-            result_df['india_vix'] = np.nan
+        result_df['india_vix'] = _map_weekly_vix(result_df.index)
+        result_df['india_vix'] = result_df['india_vix'].ffill()  # Forward fill for holidays
     except Exception:
         result_df['india_vix'] = np.nan
     
-    # NIFTY200 EMA comparisons
+    # NIFTY200 EMA comparisons, mapped by date
+    nifty200_cols = {
+        f'nifty200_above_ema{period}': period for period in (5, 20, 50, 100, 200)
+    }
     try:
-        nifty200_df = load_nifty200()
-        nifty200_close = nifty200_df['close'].values
-        nifty200_ema5 = EMA(nifty200_close, 5)
-        nifty200_ema20 = EMA(nifty200_close, 20)
-        nifty200_ema50 = EMA(nifty200_close, 50)
-        nifty200_ema100 = EMA(nifty200_close, 100)
-        nifty200_ema200 = EMA(nifty200_close, 200)
-        
-        nifty200_dates = pd.to_datetime(nifty200_df.index).normalize()
-        
-        nifty200_above_5 = pd.Series(nifty200_close > nifty200_ema5, index=nifty200_dates)
-        nifty200_above_20 = pd.Series(nifty200_close > nifty200_ema20, index=nifty200_dates)
-        nifty200_above_50 = pd.Series(nifty200_close > nifty200_ema50, index=nifty200_dates)
-        nifty200_above_100 = pd.Series(nifty200_close > nifty200_ema100, index=nifty200_dates)
-        nifty200_above_200 = pd.Series(nifty200_close > nifty200_ema200, index=nifty200_dates)
-        
-        result_dates = pd.to_datetime(result_df.index).normalize()
-        
-        result_df['nifty200_above_ema5'] = result_dates.map(lambda d: nifty200_above_5.get(d, pd.NA))
-        result_df['nifty200_above_ema20'] = result_dates.map(lambda d: nifty200_above_20.get(d, pd.NA))
-        result_df['nifty200_above_ema50'] = result_dates.map(lambda d: nifty200_above_50.get(d, pd.NA))
-        result_df['nifty200_above_ema100'] = result_dates.map(lambda d: nifty200_above_100.get(d, pd.NA))
-        result_df['nifty200_above_ema200'] = result_dates.map(lambda d: nifty200_above_200.get(d, pd.NA))
-        
-        for col in ['nifty200_above_ema5', 'nifty200_above_ema20', 'nifty200_above_ema50', 
-                    'nifty200_above_ema100', 'nifty200_above_ema200']:
-            result_df[col] = result_df[col].infer_objects(copy=False).ffill().fillna(True).astype(bool)
+        nifty200 = market_series("nifty200")
+        for col, period in nifty200_cols.items():
+            above = nifty200.align(
+                result_df.index, nifty200.above_ema(period), normalize=True, strict=False
+            )
+            result_df[col] = pd.Series(above, index=result_df.index).ffill().fillna(1.0).astype(bool)
     except Exception:
-        for col in ['nifty200_above_ema5', 'nifty200_above_ema20', 'nifty200_above_ema50',
-                    'nifty200_above_ema100', 'nifty200_above_ema200']:
+        for col in nifty200_cols:
             result_df[col] = np.nan  # Return NaN instead of defaulting to True
     
     # Aroon Trend Classification (25, 50, 100)
@@ -691,25 +647,8 @@ def _calculate_all_indicators(
     
     # Weekly VIX (from weekly VIX cache, same as india_vix but for output column)
     try:
-        vix_weekly_df = _load_weekly_vix()
-        if vix_weekly_df is not None and not vix_weekly_df.empty:
-            # Weekly VIX time is week START (Sunday 18:30 IST)
-            # Add 7 days to get week END, then map daily bars to completed weeks
-            week_end_dates = (vix_weekly_df.index + pd.Timedelta(days=7)).normalize()
-            vix_values = vix_weekly_df['close'].values
-            
-            # Map each daily date to the most recent completed weekly VIX
-            week_indices = np.searchsorted(week_end_dates, daily_dates, side='right') - 1
-            
-            weekly_vix_mapped = np.full(len(result_df), np.nan)
-            for i, week_idx in enumerate(week_indices):
-                if 0 <= week_idx < len(vix_values):
-                    weekly_vix_mapped[i] = vix_values[week_idx]
-            
-            result_df['Weekly_India_VIX'] = weekly_vix_mapped
-            result_df['Weekly_India_VIX'] = result_df['Weekly_India_VIX'].infer_objects(copy=False).ffill()  # Forward fill for holidays
-        else:
-            result_df['Weekly_India_VIX'] = np.nan
+        result_df['Weekly_India_VIX'] = _map_weekly_vix(result_df.index)
+        result_df['Weekly_India_VIX'] = result_df['Weekly_India_VIX'].ffill()  # Forward fill for holidays
     except Exception:
         result_df['Weekly_India_VIX'] = np.nan
     
@@ -780,13 +719,12 @@ def run_fast_max_trades(
     data_map = {}
     try:
         inst_csv = os.path.join("data", "dhan-scrip-master-detailed.csv")
-        if os.path.exists(inst_csv):
-            inst_df = pd.read_csv(inst_csv, low_memory=False)
+        master = get_instrument_master(inst_csv)
+        if master is not None:
             for sym in symbols:
                 base = sym.replace("NSE:", "").replace(".NS", "").split(".")[0]
-                cand = inst_df[(inst_df["SYMBOL_NAME"] == base) | (inst_df["UNDERLYING_SYMBOL"] == base)]
-                if not cand.empty:
-                    secid = int(cand.iloc[0]["SECURITY_ID"])
+                secid = master.security_id(base)
+                if secid is not None:
                     csv_path = os.path.join("data", "cache", f"dhan_historical_{secid}.csv")
                     if os.path.exists(csv_path):
                         try:
@@ -840,8 +778,10 @@ def run_fast_max_trades(
                 logger.info(f"   ✅ {i+1}/{len(valid_symbols)}")
             try:
                 strat = make_strategy(strategy_name)
-                engine = BacktestEngine(data_map[sym], strat, cfg, symbol=sym)
-                trades_full, _, _ = engine.run()
+                engine = BacktestEngine(
+                    data_map[sym], strat, cfg, symbol=sym, mode="auto"
+                )
+                trades_full, _, _ = engine.run(trades_only=True)
                 symbol_results[sym] = {"trades": trades_full, "data": data_map[sym]}
             except Exception as e:
                 logger.debug(f"⚠️ {sym}: {e}")
@@ -1365,8 +1305,14 @@ if __name__ == "__main__":
     ap.add_argument("--basket_file", required=True, help="Path to basket file")
     ap.add_argument("--interval", default="1d", help="Timeframe interval (default: 1d)")
     ap.add_argument("--workers", type=int, default=None, help="Number of parallel workers")
+    ap.add_argument("--indicator_cache", default=None, help="Reuse indicator results stored in this directory across runs")
     
     args = ap.parse_args()
+
+    if args.indicator_cache:
+        from utils.indicator_cache import set_indicator_disk_cache
+
+        set_indicator_disk_cache(args.indicator_cache)
     
     run_fast_max_trades(
         basket_file=args.basket_file,
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+param_sweep.py - Parameter-grid sweep over a basket in one pass per symbol
+
+Evaluates every combination of a parameter grid for each symbol with
+core.sweep: indicators are computed once per distinct parameter value and the
+grid's signals are simulated in bulk. Writes one tidy results table.
+
+Usage:
+    PYTHONPATH=. python runners/param_sweep.py --strategy tema_lsma_crossover \\
+        --basket_file data/baskets/basket_main.txt \\
+        --grid '{"fast_length": [20, 25, 30], "slow_length": [80, 100], "atr_14_min": [0, 3.5]}'
+
+Output:
+    reports/MMDD-HHMM-sweep-<strategy>-<basket>-<interval>/
+        ├── SWEEP_RESULTS.csv   (one row per symbol x parameter set)
+        └── SWEEP_RANKED.csv    (parameter sets aggregated over the basket)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+# ============================================================================
+# CRITICAL: Prevent Python bytecode cache (.pyc) files
+# ============================================================================
+os.environ["PYTHONDONTWRITEBYTECODE"] = "1"
+sys.dont_write_bytecode = True
+# ============================================================================
+
+import time
+from datetime import datetime
+from multiprocessing import cpu_count, get_context
+
+import pandas as pd
+
+from core.config import BrokerConfig
+from core.loaders import load_many_india
+from core.sweep import param_grid, rank_params, sweep_symbol
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def _sweep_one(args: tuple) -> tuple:
+    """Module-level function for multiprocessing - sweeps a single symbol."""
+    symbol, df, strategy_name, grid, cfg = args
+    try:
+        result = sweep_symbol(df, strategy_name, grid, cfg, symbol=symbol)
+        result.insert(0, "symbol", symbol)
+        return symbol, result, None
+    except Exception as e:
+        return symbol, None, f"Error: {str(e)[:80]}"
+
+
+def run_param_sweep(
+    strategy_name: str,
+    basket_file: str,
+    grid_spec: dict,
+    interval: str = "1d",
+    num_workers: int | None = None,
+) -> pd.DataFrame:
+    """Sweep ``grid_spec`` (parameter -> list of values) over a basket."""
+    start_time = time.time()
+    grid = param_grid(**grid_spec)
+    logger.info(f"🚀 PARAMETER SWEEP: {strategy_name} ({len(grid)} parameter sets)")
+
+    with open(basket_file) as f:
+        symbols = [
+            line.strip() for line in f if line.strip() and not line.startswith("#")
+        ]
+    logger.info(f"📊 {len(symbols)} symbols loaded")
+
+    logger.info("📥 Loading OHLCV data...")
+    ohlcv_map = load_many_india(symbols, interval=interval)
+    valid_symbols = [s for s in symbols if s in ohlcv_map and len(ohlcv_map[s]) > 0]
+
+    cfg = BrokerConfig()
+    tasks = [(s, ohlcv_map[s], strategy_name, grid, cfg) for s in valid_symbols]
+    num_workers = num_workers or max(2, cpu_count() - 1)
+    logger.info(f"🔄 Sweeping {len(valid_symbols)} symbols with {num_workers} workers")
+
+    frames = {}
+    errors = 0
+    if num_workers > 1 and len(tasks) > 1:
+        ctx = get_context("spawn")
+        with ctx.Pool(num_workers) as pool:
+            outcomes = list(pool.imap_unordered(_sweep_one, tasks))
+    else:
+        outcomes = [_sweep_one(task) for task in tasks]
+    for symbol, result, error in outcomes:
+        if error:
+            logger.debug(f"{symbol}: {error}")
+            errors += 1
+        else:
+            frames[symbol] = result
+
+    logger.info(f"✅ Sweep complete: {len(frames)} symbols, {errors} errors")
+    if not frames:
+        return pd.DataFrame()
+
+    # Deterministic row order: basket order, then grid order
+    results = pd.concat(
+        [frames[s] for s in valid_symbols if s in frames], ignore_index=True
+    )
+    ranked = rank_params(results)
+    _save_sweep(results, ranked, strategy_name, basket_file, interval)
+
+    logger.info(f"🏆 Best parameters:\n{ranked.head(5).to_string(index=False)}")
+    logger.info(f"⏱️  Total time: {time.time() - start_time:.1f}s")
+    return results
+
+
+def _save_sweep(
+    results: pd.DataFrame,
+    ranked: pd.DataFrame,
+    strategy_name: str,
+    basket_file: str,
+    interval: str,
+) -> None:
+    """Save results to reports/MMDD-HHMM-sweep-<strategy>-<basket>-<interval>/."""
+    try:
+        basket_name = (
+            os.path.basename(basket_file).replace("basket_", "").replace(".txt", "")
+        )
+        now = datetime.now()
+        folder_name = f"{now.strftime('%m%d-%H%M')}-sweep-{strategy_name}-{basket_name}-{interval}"
+        out_dir = os.path.join("reports", folder_name)
+        os.makedirs(out_dir, exist_ok=True)
+
+        results.to_csv(os.path.join(out_dir, "SWEEP_RESULTS.csv"), index=False)
+        ranked.to_csv(os.path.join(out_dir, "SWEEP_RANKED.csv"), index=False)
+        logger.info(f"✅ Saved sweep results to: {out_dir}")
+    except Exception as e:
+        logger.warning(f"Failed to save sweep results: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Parameter sweep runner - one pass per symbol over a parameter grid"
+    )
+    parser.add_argument("--strategy", required=True, help="Strategy name")
+    parser.add_argument("--basket_file", required=True, help="Path to basket file")
+    parser.add_argument(
+        "--grid",
+        required=True,
+        help="JSON object of parameter -> list of values, e.g. '{\"fast_length\": [20, 25]}'",
+    )
+    parser.add_argument("--interval", default="1d", help="Interval (1d, 125m, 75m)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of workers (default: cpu_count - 1)",
+    )
+    args = parser.parse_args()
+
+    run_param_sweep(
+        strategy_name=args.strategy,
+        basket_file=args.basket_file,
+        grid_spec=json.loads(args.grid),
+        interval=args.interval,
+        num_workers=args.workers,
+    )
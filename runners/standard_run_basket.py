@@ -54,8 +54,11 @@ import pandas as pd
 # Suppress misleading FutureWarning for infer_objects + ffill/fillna
 warnings.filterwarnings("ignore", message=".*Downcasting object dtype arrays.*")
 
+from core.cache_manifest import get_manifest
 from core.config import BrokerConfig
 from core.engine import BacktestEngine
+from core.instrument_master import get_instrument_master
+from core.snapshot import EngineSnapshot
 from core.metrics import (
     compute_comprehensive_metrics,
     compute_portfolio_trade_metrics,
@@ -67,6 +70,8 @@ from core.monitoring import BacktestMonitor, optimize_window_processing
 from core.registry import make_strategy
 from core.report import make_run_dir, save_summary
 from core.loaders import load_many_india
+from core.market_context import market_series
+from core.shared_panel import SharedPanel, attach_frame
 
 # Configure logging
 logging.basicConfig(
@@ -216,23 +221,15 @@ def _enrich_with_nifty200_ema(df: pd.DataFrame) -> pd.DataFrame:
     filters that check if NIFTY200 > EMA 50.
     NIFTY200 is a broader market representation than NIFTY50.
     """
-    import numpy as np
-    from utils import EMA
-    from core.loaders import load_nifty200
-    
     try:
-        nifty200_df = load_nifty200()
-        nifty200_close = nifty200_df['close'].values
-        nifty200_ema50 = EMA(nifty200_close, 50)
-        
-        # Create series aligned with nifty200 index
-        nifty200_above_50 = pd.Series(nifty200_close > nifty200_ema50, index=nifty200_df.index)
-        
-        # Join with stock data
-        df = df.join(nifty200_above_50.rename('nifty200_above_ema50'), how='left')
+        # NIFTY200 is loaded (and its EMA computed) once per process
+        nifty200 = market_series("nifty200")
+        above_50 = nifty200.align(df.index, nifty200.above_ema(50))
         
         # Forward fill for alignment, fill missing with True (graceful degradation)
-        df['nifty200_above_ema50'] = df['nifty200_above_ema50'].infer_objects(copy=False).ffill().fillna(True).astype(bool)
+        df = df.assign(
+            nifty200_above_ema50=pd.Series(above_50, index=df.index).ffill().fillna(1.0).astype(bool)
+        )
     except Exception:
         # If NIFTY200 data not available, default to True (allow trades)
         df['nifty200_above_ema50'] = True
@@ -246,13 +243,45 @@ _enrich_with_nifty50_ema = _enrich_with_nifty200_ema
 
 # ===== MODULE-LEVEL FUNCTION FOR MULTIPROCESSING =====
 # This must be at module level (not nested) to be pickleable for multiprocessing
+def _run_symbol(sym, df_full, strategy_name, params_json, cfg, snapshot_dir=None):
+    """
+    Run the strategy on one symbol and return the engine and its results.
+
+    With ``snapshot_dir``, the run resumes from ``<snapshot_dir>/<strategy>/<sym>.pkl``
+    when it is still valid for this data (only new bars are simulated) and saves
+    a fresh snapshot for the next refresh.
+    """
+    strat = make_strategy(strategy_name, params_json)
+    engine = BacktestEngine(df_full, strat, cfg, symbol=sym, mode="auto")
+    if snapshot_dir is None:
+        trades_full, equity_full, _ = engine.run()
+        return engine, trades_full, equity_full
+
+    snap_path = os.path.join(snapshot_dir, strategy_name, f"{_sanitize_symbol(sym)}.pkl")
+    snap = None
+    if os.path.exists(snap_path):
+        try:
+            snap = EngineSnapshot.load(snap_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable snapshot {snap_path}: {e}")
+    trades_full, equity_full, _ = engine.run(resume_from=snap, snapshot=True)
+    if engine.last_snapshot is not None:
+        engine.last_snapshot.save(snap_path)
+    return engine, trades_full, equity_full
+
+
 def _process_symbol_for_backtest(args):
     """
     Process a single symbol for parallel execution.
     This function is module-level to be pickleable with multiprocessing.
-    To avoid pickling large dataframes, we only pass symbol info and rebuild data in worker.
+    To avoid pickling large dataframes, the data comes from the shared OHLCV
+    panel (``panel_ref``), or is loaded again in the worker when the parent could
+    not build one. Data read from the panel is not sent back: the parent has it.
     """
-    sym, sym_idx, total_syms, strategy_name, params_json, cache_dir, interval, period, compounding = args
+    (
+        sym, sym_idx, total_syms, strategy_name, params_json, cache_dir, interval,
+        period, compounding, snapshot_dir, panel_ref,
+    ) = args
     try:
         import sys
         print(f"[WORKER {sym_idx}/{total_syms}] Processing {sym}...", flush=True)
@@ -264,18 +293,22 @@ def _process_symbol_for_backtest(args):
         if period is None:
             period = "max"
             
-        # Load data in worker process (avoid pickling large dicts with spawn)
-        print(f"[WORKER {sym_idx}/{total_syms}] Loading data for {sym} from {cache_dir}...", flush=True)
-        sys.stdout.flush()
-        
-        data_map = load_many_india(
-            [sym],
-            interval=interval,
-            period=period,
-            cache=True,
-            cache_dir=cache_dir,
-            use_cache_only=True,
-        )
+        if panel_ref is not None:
+            # Zero-copy views of the frame the parent loaded
+            data_map = {sym: attach_frame(panel_ref)}
+        else:
+            # Load data in worker process (avoid pickling large dicts with spawn)
+            print(f"[WORKER {sym_idx}/{total_syms}] Loading data for {sym} from {cache_dir}...", flush=True)
+            sys.stdout.flush()
+
+            data_map = load_many_india(
+                [sym],
+                interval=interval,
+                period=period,
+                cache=True,
+                cache_dir=cache_dir,
+                use_cache_only=True,
+            )
         
         if sym not in data_map or data_map[sym] is None or data_map[sym].empty:
             print(f"[WORKER {sym_idx}/{total_syms}] No data for {sym}", flush=True)
@@ -290,26 +323,23 @@ def _process_symbol_for_backtest(args):
         print(f"[WORKER {sym_idx}/{total_syms}] Running backtest for {sym}...", flush=True)
         sys.stdout.flush()
         
-        strat = make_strategy(strategy_name, params_json)
-        engine = BacktestEngine(
-            df_full, strat, BrokerConfig(compounding=compounding), symbol=sym
+        engine, trades_full, equity_full = _run_symbol(
+            sym, df_full, strategy_name, params_json,
+            BrokerConfig(compounding=compounding), snapshot_dir,
         )
-        trades_full, equity_full, _ = engine.run()
 
         print(f"[WORKER {sym_idx}/{total_syms}] ✅ Completed {sym}", flush=True)
         sys.stdout.flush()
         
-        return (
-            sym,
-            {
-                "trades": trades_full,
-                "equity": equity_full,
-                "data": df_full,
-                "fingerprint": getattr(engine, "data_fingerprint", None),
-                "validation": getattr(engine, "validation_results", None),
-            },
-            None,
-        )
+        result = {
+            "trades": trades_full,
+            "equity": equity_full,
+            "fingerprint": getattr(engine, "data_fingerprint", None),
+            "validation": getattr(engine, "validation_results", None),
+        }
+        if panel_ref is None:
+            result["data"] = df_full  # the parent has not got this frame
+        return sym, result, None
     except Exception as e:
         import traceback
         print(f"[WORKER {sym_idx}/{total_syms}] ❌ Error for {sym}: {e}", flush=True)
@@ -385,27 +415,21 @@ def _calculate_all_indicators_for_consolidated(df: pd.DataFrame, symbol: str = N
     volume_arr = df["volume"].astype(float).values
     
     # Import all indicator functions
-    from utils import ATR, EMA, MACD, RSI, SMA, BollingerBands, Stochastic
-    from utils.indicators import (
+    from utils.cached_indicators import ATR, EMA, MACD, RSI, SMA, BollingerBands, Stochastic
+    from utils.cached_indicators import (
         ADX, CCI, MFI, CMF, Aroon, BullBearPower, StochasticRSI,
         TrendClassification, VolatilityClassification,
         calculate_stochastic_slow, extract_ichimoku_base_line,
         kaufman_efficiency_ratio,
     )
-    from core.loaders import load_india_vix, load_nifty200
     
     # ========== REGIME FILTERS ==========
     
-    # India VIX
+    # India VIX (result_df index is tz-naive; compare on VIX wall-clock time)
     try:
-        vix_df = load_india_vix()
-        # Normalize VIX index to tz-naive to match stock data index
-        # This fixes "Cannot join tz-naive with tz-aware DatetimeIndex" error
-        if vix_df.index.tz is not None:
-            vix_df.index = vix_df.index.tz_localize(None)
-        # Align VIX with stock data
-        result_df = result_df.join(vix_df[['close']].rename(columns={'close': 'vix_value'}), how='left')
-        result_df['vix_value'] = result_df['vix_value'].infer_objects(copy=False).ffill().bfill()
+        vix = market_series("india_vix")
+        result_df['vix_value'] = vix.align(result_df.index, naive=True)
+        result_df['vix_value'] = result_df['vix_value'].ffill().bfill()
         
         # Use current VIX value as-is (no classification)
         result_df['india_vix'] = result_df['vix_value']
@@ -413,54 +437,24 @@ def _calculate_all_indicators_for_consolidated(df: pd.DataFrame, symbol: str = N
         logging.warning(f"Failed to load India VIX: {e}")
         result_df['india_vix'] = np.nan
     
-    # NIFTY200 EMA comparisons (broader market representation than NIFTY50)
+    # NIFTY200 EMA comparisons (broader market representation than NIFTY50), mapped by date
+    nifty200_cols = {
+        f'nifty200_above_ema{period}': period for period in (5, 20, 50, 100, 200)
+    }
     try:
-        nifty200_df = load_nifty200()
-        nifty200_close = nifty200_df['close'].values
-        nifty200_ema5 = EMA(nifty200_close, 5)
-        nifty200_ema20 = EMA(nifty200_close, 20)
-        nifty200_ema50 = EMA(nifty200_close, 50)
-        nifty200_ema100 = EMA(nifty200_close, 100)
-        nifty200_ema200 = EMA(nifty200_close, 200)
-        
-        # Normalize NIFTY200 index to date-only (remove time component)
-        nifty200_dates = nifty200_df.index.normalize()  # Don't call pd.to_datetime(), just normalize directly
-        
-        # Create series aligned with normalized nifty200 dates
-        nifty200_above_5 = pd.Series(nifty200_close > nifty200_ema5, index=nifty200_dates)
-        nifty200_above_20 = pd.Series(nifty200_close > nifty200_ema20, index=nifty200_dates)
-        nifty200_above_50 = pd.Series(nifty200_close > nifty200_ema50, index=nifty200_dates)
-        nifty200_above_100 = pd.Series(nifty200_close > nifty200_ema100, index=nifty200_dates)
-        nifty200_above_200 = pd.Series(nifty200_close > nifty200_ema200, index=nifty200_dates)
-        
-        # DROP any existing NIFTY200 columns to avoid join suffix issues
-        for col in ['nifty200_above_ema5', 'nifty200_above_ema20', 'nifty200_above_ema50', 'nifty200_above_ema100', 'nifty200_above_ema200']:
-            if col in result_df.columns:
-                result_df = result_df.drop(columns=[col])
-        
-        # Normalize result_df index to date-only for proper alignment
-        result_dates = result_df.index.normalize()  # Don't call pd.to_datetime(), just normalize directly
-        
-        # Map NIFTY200 values to result_df using normalized dates
-        result_df['nifty200_above_ema5'] = result_dates.map(lambda d: nifty200_above_5.get(d, pd.NA))
-        result_df['nifty200_above_ema20'] = result_dates.map(lambda d: nifty200_above_20.get(d, pd.NA))
-        result_df['nifty200_above_ema50'] = result_dates.map(lambda d: nifty200_above_50.get(d, pd.NA))
-        result_df['nifty200_above_ema100'] = result_dates.map(lambda d: nifty200_above_100.get(d, pd.NA))
-        result_df['nifty200_above_ema200'] = result_dates.map(lambda d: nifty200_above_200.get(d, pd.NA))
-        
-        # Forward fill for alignment, then fill remaining NaN with True (skip filter on missing data)
-        result_df['nifty200_above_ema5'] = result_df['nifty200_above_ema5'].infer_objects(copy=False).ffill().fillna(True).astype(bool)
-        result_df['nifty200_above_ema20'] = result_df['nifty200_above_ema20'].infer_objects(copy=False).ffill().fillna(True).astype(bool)
-        result_df['nifty200_above_ema50'] = result_df['nifty200_above_ema50'].infer_objects(copy=False).ffill().fillna(True).astype(bool)
-        result_df['nifty200_above_ema100'] = result_df['nifty200_above_ema100'].infer_objects(copy=False).ffill().fillna(True).astype(bool)
-        result_df['nifty200_above_ema200'] = result_df['nifty200_above_ema200'].infer_objects(copy=False).ffill().fillna(True).astype(bool)
+        nifty200 = market_series("nifty200")
+        # DROP any existing NIFTY200 columns so the new ones are appended in order
+        result_df = result_df.drop(columns=[c for c in nifty200_cols if c in result_df.columns])
+        for col, period in nifty200_cols.items():
+            above = nifty200.align(
+                result_df.index, nifty200.above_ema(period), normalize=True, strict=False
+            )
+            # Forward fill for alignment, then fill remaining NaN with True (skip filter on missing data)
+            result_df[col] = pd.Series(above, index=result_df.index).ffill().fillna(1.0).astype(bool)
     except Exception:
         # Match strategy behavior: skip filter on error (return True)
-        result_df['nifty200_above_ema5'] = True
-        result_df['nifty200_above_ema20'] = True
-        result_df['nifty200_above_ema50'] = True
-        result_df['nifty200_above_ema100'] = True
-        result_df['nifty200_above_ema200'] = True
+        for col in nifty200_cols:
+            result_df[col] = True
     
     # Aroon Trend Classification (25, 50, 100)
     aroon_25 = Aroon(high_arr, low_arr, 25)
@@ -688,15 +682,11 @@ def _calculate_all_indicators_for_consolidated(df: pd.DataFrame, symbol: str = N
     
     if symbol:
         try:
-            # Try to load weekly data from cache using absolute path
-            import glob
-            from pathlib import Path
-            project_root = Path(__file__).parent.parent
-            weekly_pattern = project_root / 'data' / 'cache' / 'groww' / 'weekly' / f'groww_*_{symbol}_1w.csv'
-            weekly_files = glob.glob(str(weekly_pattern))
+            # Try to load weekly data from the Groww weekly cache
+            weekly = get_manifest().entry(symbol, "1w")
             
-            if weekly_files:
-                weekly_df = pd.read_csv(weekly_files[0])
+            if weekly is not None and weekly["location"] == "groww_weekly":
+                weekly_df = pd.read_csv(weekly["path"])
                 # Parse time - handle both string datetime and Unix timestamp
                 if weekly_df['time'].dtype == 'int64':
                     weekly_df['time'] = pd.to_datetime(weekly_df['time'], unit='s')
@@ -715,7 +705,7 @@ def _calculate_all_indicators_for_consolidated(df: pd.DataFrame, symbol: str = N
                     weekly_volume = weekly_df['volume'].values if 'volume' in weekly_df.columns else None
                     
                     # Import additional indicators for weekly calculations
-                    from utils.indicators import CCI, MFI, CMF, Aroon, TrendClassification, kaufman_efficiency_ratio
+                    from utils.cached_indicators import CCI, MFI, CMF, Aroon, TrendClassification, kaufman_efficiency_ratio
                     
                     # Weekly RSI (14-period on weekly close)
                     weekly_rsi_14 = RSI(weekly_close, 14)
@@ -930,7 +920,6 @@ def _calculate_all_indicators_for_consolidated(df: pd.DataFrame, symbol: str = N
     
     try:
         from pathlib import Path as PathLib
-        import glob
         project_root = PathLib(__file__).parent.parent
         
         # Load NIFTY50 weekly from Groww (no resampling)
@@ -1023,8 +1012,8 @@ def _pre_calculate_trade_indicators_cached(
     close_arr = df["close"].astype(float).values
 
     # Import all indicator functions once
-    from utils import ATR, EMA, MACD, RSI, SMA, BollingerBands, Stochastic
-    from utils.indicators import (
+    from utils.cached_indicators import ATR, EMA, MACD, RSI, SMA, BollingerBands, Stochastic
+    from utils.cached_indicators import (
         ADX,
         CCI,
         HMA,
@@ -1871,7 +1860,7 @@ def _calculate_trade_indicators(
         volume = entry_data.get("volume", pd.Series([0] * len(close))).astype(float)
 
         # Calculate ATR (14-period) using centralized function
-        from utils import ATR
+        from utils.cached_indicators import ATR
 
         atr_values = ATR(high.values, low.values, close.values, 14)
         atr = pd.Series(atr_values, index=close.index)
@@ -1886,7 +1875,7 @@ def _calculate_trade_indicators(
         mae_atr = 0  # Placeholder for MAE_ATR column
 
         # Calculate Bollinger Bands (20, 2) using centralized function
-        from utils import BollingerBands
+        from utils.cached_indicators import BollingerBands
 
         bb = BollingerBands(close.values, 20, 2)
         price = close.iloc[-1] if not close.empty else entry_price
@@ -1900,7 +1889,7 @@ def _calculate_trade_indicators(
             bb_pos = "Middle"
 
         # Stochastic Oscillator (14, 3) using centralized function
-        from utils import Stochastic
+        from utils.cached_indicators import Stochastic
 
         stoch = Stochastic(high.values, low.values, close.values, 14, 3)
         k_value = (
@@ -1929,7 +1918,7 @@ def _calculate_trade_indicators(
             holding_days = (exit_dt - entry_dt).days
 
         # Calculate ADX and DI using centralized function
-        from utils.indicators import ADX
+        from utils.cached_indicators import ADX
 
         adx_result = ADX(high.values, low.values, close.values, 14)
         adx = pd.Series(adx_result["adx"], index=close.index)
@@ -1937,12 +1926,12 @@ def _calculate_trade_indicators(
         minus_di = pd.Series(adx_result["di_minus"], index=close.index)
 
         # Calculate RSI using centralized function
-        from utils import RSI
+        from utils.cached_indicators import RSI
 
         rsi = RSI(close, 14)
 
         # Calculate multiple EMAs using centralized function
-        from utils import EMA
+        from utils.cached_indicators import EMA
 
         ema_5 = pd.Series(EMA(close.values, 5), index=close.index)
         ema_20 = pd.Series(EMA(close.values, 20), index=close.index)
@@ -1950,7 +1939,7 @@ def _calculate_trade_indicators(
         ema_200 = pd.Series(EMA(close.values, 200), index=close.index)
 
         # Calculate multiple SMAs using centralized function
-        from utils import SMA
+        from utils.cached_indicators import SMA
 
         sma_5 = pd.Series(SMA(close, 5), index=close.index)
         sma_20 = pd.Series(SMA(close, 20), index=close.index)
@@ -1958,26 +1947,26 @@ def _calculate_trade_indicators(
         sma_200 = pd.Series(SMA(close, 200), index=close.index)
 
         # Calculate MACD using centralized function
-        from utils import MACD
+        from utils.cached_indicators import MACD
 
         macd_result = MACD(close.values, 12, 26, 9)
         macd_line = pd.Series(macd_result["macd"], index=close.index)
         macd_signal = pd.Series(macd_result["signal"], index=close.index)
 
         # Calculate CCI (20-period)
-        from utils.indicators import CCI
+        from utils.cached_indicators import CCI
 
         cci = CCI(high.values, low.values, close.values, period=20)
 
         # Calculate Stochastic Slow (5, 3, 3)
-        from utils.indicators import calculate_stochastic_slow
+        from utils.cached_indicators import calculate_stochastic_slow
 
         stoch_slow = calculate_stochastic_slow(
             high.values, low.values, close.values, 5, 3, 3
         )
 
         # Calculate Ichimoku Base Line (26-period) and Tenkan Line (9-period)
-        from utils.indicators import extract_ichimoku_base_line
+        from utils.cached_indicators import extract_ichimoku_base_line
 
         ichimoku_base = extract_ichimoku_base_line(high.values, low.values, 26)
         ichimoku_tenkan = extract_ichimoku_base_line(
@@ -1985,43 +1974,43 @@ def _calculate_trade_indicators(
         )  # Tenkan uses 9-period
 
         # Calculate VWMA (14-period)
-        from utils.indicators import VWMA
+        from utils.cached_indicators import VWMA
 
         vwma_14 = VWMA(close.values, volume.values, 14)
 
         # Calculate HMA (14-period)
-        from utils.indicators import HMA
+        from utils.cached_indicators import HMA
 
         hma_14 = HMA(close.values, 14)
 
         # Calculate Williams %R (14-period)
-        from utils.indicators import WilliamsR
+        from utils.cached_indicators import WilliamsR
 
         williams_r = WilliamsR(high.values, low.values, close.values, 14)
 
         # Calculate Momentum Oscillator (14-period)
-        from utils.indicators import MomentumOscillator
+        from utils.cached_indicators import MomentumOscillator
 
         momentum = MomentumOscillator(close.values, 14)
 
         # Calculate Ultimate Oscillator (7, 14, 28)
-        from utils.indicators import UltimateOscillator
+        from utils.cached_indicators import UltimateOscillator
 
         uo = UltimateOscillator(high.values, low.values, close.values, 7, 14, 28)
 
         # Calculate Bull/Bear Power (13-period)
-        from utils.indicators import BullBearPower
+        from utils.cached_indicators import BullBearPower
 
         bb_power = BullBearPower(high.values, low.values, close.values, 13)
 
         # Calculate Stochastic RSI (14-period) from pre-computed RSI
-        from utils.indicators import StochasticRSI_from_RSI
+        from utils.cached_indicators import StochasticRSI_from_RSI
 
         # rsi is already a numpy array from RSI calculation
         stoch_rsi = StochasticRSI_from_RSI(rsi, stoch_length=14, k_smooth=3, d_smooth=3)
 
         # Calculate Aroon (25-period)
-        from utils.indicators import (
+        from utils.cached_indicators import (
             Aroon,
             TrendClassification,
             VolatilityClassification,
@@ -2244,6 +2233,7 @@ def run_basket(
     use_portfolio_csv=False,
     basket_size=None,
     compounding=False,
+    snapshot_dir=None,
 ) -> None:
     """
     Run backtest on a basket of stocks.
@@ -2260,6 +2250,9 @@ def run_basket(
         cache_dir: Cache directory
         use_portfolio_csv: Generate portfolio CSV
         compounding: Use compounding position sizing (% of current equity vs initial capital)
+        snapshot_dir: Directory of per-symbol engine snapshots; when set, each symbol
+            resumes from its snapshot and only simulates bars added since (see
+            core.snapshot), then saves a new snapshot
     """
     from config import DEFAULT_BASKET_SIZE, get_basket_file
 
@@ -2286,18 +2279,13 @@ def run_basket(
     with timer.measure("Data Loading"):
         try:
             inst_csv = os.path.join("data", "dhan-scrip-master-detailed.csv")
-            if os.path.exists(inst_csv):
-                # avoid mixed-type low_memory warnings by reading with low_memory=False
-                inst_df = pd.read_csv(inst_csv, low_memory=False)
+            master = get_instrument_master(inst_csv)
+            if master is not None:
                 for sym in bare:
                     # normalize symbol name
                     base = sym.replace("NSE:", "").replace(".NS", "").split(".")[0]
-                    cand = inst_df[
-                        (inst_df["SYMBOL_NAME"] == base)
-                        | (inst_df["UNDERLYING_SYMBOL"] == base)
-                    ]
-                    if not cand.empty:
-                        secid = int(cand.iloc[0]["SECURITY_ID"])
+                    secid = master.security_id(base)
+                    if secid is not None:
                         csv_path = os.path.join(
                             "data", "cache", f"dhan_historical_{secid}.csv"
                         )
@@ -2377,9 +2365,21 @@ def run_basket(
         print(
             f"⚡ Using {num_processes} processes for {len(symbols_to_process)} symbols"
         )
-        # Pass symbol metadata only, not data (to avoid pickling huge dataframes with spawn)
+        # Pack the loaded frames once into shared memory: workers attach views of
+        # them by symbol instead of loading the data again, and a task pickles
+        # only symbol metadata plus a small PanelRef
+        try:
+            panel = SharedPanel({sym: data_map_full[sym] for sym in symbols_to_process})
+            logger.info(f"📦 Shared OHLCV panel: {panel.nbytes / 1e6:.1f} MB")
+        except (ValueError, OSError) as e:
+            logger.info(f"ℹ️ Workers load their own data (no shared panel: {e})")
+            panel = None
         task_args = [
-            (sym, i, len(symbols_to_process), strategy_name, params_json, cache_dir, interval, period, compounding)
+            (
+                sym, i, len(symbols_to_process), strategy_name, params_json, cache_dir,
+                interval, period, compounding, snapshot_dir,
+                panel.ref(sym) if panel is not None else None,
+            )
             for i, sym in enumerate(symbols_to_process)
         ]
 
@@ -2409,6 +2409,9 @@ def run_basket(
                         monitor.log_progress(sym, "error")
                     failed += 1
                 else:
+                    if "data" not in result:
+                        # Panel run: the worker enriched views of this frame
+                        result["data"] = _enrich_with_nifty200_ema(data_map_full[sym])
                     symbol_results[sym] = result
                     if sym not in monitor.completed_symbols:
                         monitor.log_progress(sym, "completed")
@@ -2434,11 +2437,9 @@ def run_basket(
                         )
 
                         df_full = data_map_full[sym]
-                        strat = make_strategy(strategy_name, params_json)
-                        engine = BacktestEngine(
-                            df_full, strat, cfg, symbol=sym
+                        engine, trades_full, equity_full = _run_symbol(
+                            sym, df_full, strategy_name, params_json, cfg, snapshot_dir
                         )
-                        trades_full, equity_full, _ = engine.run()
 
                         symbol_results[sym] = {
                             "trades": trades_full,
@@ -2469,6 +2470,9 @@ def run_basket(
                     print(
                         f"💾 Memory: {resources['memory_percent']:.1f}%, CPU: {resources['cpu_percent']:.1f}%"
                     )
+        finally:
+            if panel is not None:
+                panel.close()
     else:
         # Sequential processing for single symbol or insufficient CPU cores
         logger.info("ℹ️ Using sequential processing (limited CPU or few symbols)")
@@ -2487,11 +2491,9 @@ def run_basket(
                     df_full = data_map_full[sym]
 
                     # Run strategy ONCE on full data
-                    strat = make_strategy(strategy_name, params_json)
-                    engine = BacktestEngine(
-                        df_full, strat, cfg, symbol=sym
+                    engine, trades_full, equity_full = _run_symbol(
+                        sym, df_full, strategy_name, params_json, cfg, snapshot_dir
                     )
-                    trades_full, equity_full, _ = engine.run()
 
                     # Store results for window processing
                     symbol_results[sym] = {
@@ -3397,7 +3399,7 @@ def run_basket(
                             indicators["holding_days"] = holding_days
                             
                             # Add ATR metrics for compatibility
-                            from utils import ATR
+                            from utils.cached_indicators import ATR
                             high = symbol_df["high"].astype(float)
                             low = symbol_df["low"].astype(float)
                             close = symbol_df["close"].astype(float)
@@ -4600,8 +4602,25 @@ if __name__ == "__main__":
         default=False,
         help="Disable compounding (use fixed % of initial capital)",
     )
+    ap.add_argument(
+        "--snapshot_dir",
+        default=None,
+        help="Resume each symbol from engine snapshots in this directory and refresh them "
+        "(incremental nightly runs: only new bars are simulated)",
+    )
+    ap.add_argument(
+        "--indicator_cache",
+        default=None,
+        help="Reuse indicator results stored in this directory across runs "
+        "(memory-mapped, size-capped; e.g. data/cache/indicators)",
+    )
     args = ap.parse_args()
 
+    if args.indicator_cache:
+        from utils.indicator_cache import set_indicator_disk_cache
+
+        set_indicator_disk_cache(args.indicator_cache)
+
     # Resolve compounding: --no-compounding overrides --compounding
     compounding_enabled = args.compounding and not getattr(args, 'no_compounding', False)
 
@@ -4626,6 +4645,7 @@ if __name__ == "__main__":
             use_cache_only=args.use_cache_only,
             cache_dir=args.cache_dir,
             compounding=compounding_enabled,
+            snapshot_dir=args.snapshot_dir,
             timeout_seconds=TOTAL_TIMEOUT,
             operation_name="basket backtest",
         )
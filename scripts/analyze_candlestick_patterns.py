@@ -17,7 +17,6 @@ import sys
 import glob
 from pathlib import Path
 import pandas as pd
-import numpy as np
 from datetime import datetime
 from typing import Optional
 import warnings
@@ -28,6 +27,7 @@ PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from config import DATA_DIR, CACHE_DIR
+from utils.candlestick import candle_patterns, pack_patterns, unpack_patterns
 
 
 def load_basket_symbols(basket_name: str = "basket_large.txt") -> list[str]:
@@ -86,149 +86,50 @@ def load_symbol_data(symbol: str, cache_dir: Optional[str] = None) -> Optional[p
 # CANDLESTICK PATTERN DETECTION
 # ============================================================================
 
+# Script column name -> utils.candlestick pattern, in report order
+PATTERN_COLUMNS = {
+    'bearish_marubozu': 'bearish_marubozu',
+    'bearish_engulfing': 'bearish_engulfing_strict',
+    'shooting_star': 'shooting_star',
+    'hanging_man': 'hanging_man',
+    'doji': 'doji',
+    'gap_down': 'gap_down',
+    'large_gap_down': 'large_gap_down',
+    'filled_gap_down': 'filled_gap_down',
+    'unfilled_gap_down': 'unfilled_gap_down',
+    'hammer': 'long_lower_shadow',
+    'long_red_candle': 'long_red_candle',
+    'very_long_red': 'very_long_red',
+    'lower_close': 'lower_close',
+    'upper_close': 'upper_close',
+    'dark_cloud': 'dark_cloud',
+    'evening_star': 'evening_star',
+}
+
+
 def detect_candlestick_patterns(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Detect various candlestick patterns and add pattern columns to dataframe.
-    Returns dataframe with pattern detection columns.
+    Detect the drop-day candlestick patterns of every bar in one vectorized pass.
+    Returns dataframe with 'return_pct' and a packed 'pattern_mask' column
+    (one bit per PATTERN_COLUMNS entry, see utils.candlestick).
     """
     df = df.copy()
     
-    # Basic candlestick components
-    df['body'] = df['Close'] - df['Open']
-    df['body_abs'] = abs(df['body'])
-    df['upper_shadow'] = df['High'] - df[['Open', 'Close']].max(axis=1)
-    df['lower_shadow'] = df[['Open', 'Close']].min(axis=1) - df['Low']
-    df['range'] = df['High'] - df['Low']
-    df['is_bearish'] = df['Close'] < df['Open']
-    df['is_bullish'] = df['Close'] > df['Open']
-    
-    # Previous day values
-    df['prev_open'] = df['Open'].shift(1)
-    df['prev_close'] = df['Close'].shift(1)
-    df['prev_high'] = df['High'].shift(1)
-    df['prev_low'] = df['Low'].shift(1)
-    df['prev_body'] = df['body'].shift(1)
-    df['prev_body_abs'] = df['body_abs'].shift(1)
-    df['prev_is_bullish'] = df['is_bullish'].shift(1)
-    
-    # Average body size for relative comparisons
-    df['avg_body'] = df['body_abs'].rolling(20).mean()
-    df['avg_range'] = df['range'].rolling(20).mean()
+    flags = candle_patterns(df['Open'], df['High'], df['Low'], df['Close'])
+    df['pattern_mask'] = pack_patterns(
+        {col: flags[name] for col, name in PATTERN_COLUMNS.items()},
+        names=list(PATTERN_COLUMNS),
+    )
     
     # Daily return
     df['return_pct'] = df['Close'].pct_change() * 100
     
-    # ---- PATTERN DETECTION ----
-    
-    # 1. Bearish Marubozu - Large bearish body with minimal shadows
-    df['bearish_marubozu'] = (
-        df['is_bearish'] & 
-        (df['body_abs'] > df['avg_body'] * 1.5) &
-        (df['upper_shadow'] < df['body_abs'] * 0.1) &
-        (df['lower_shadow'] < df['body_abs'] * 0.1)
-    )
-    
-    # 2. Bearish Engulfing - Bearish candle engulfs previous bullish
-    df['bearish_engulfing'] = (
-        df['is_bearish'] & 
-        df['prev_is_bullish'] &
-        (df['Open'] > df['prev_close']) &
-        (df['Close'] < df['prev_open']) &
-        (df['body_abs'] > df['prev_body_abs'])
-    )
-    
-    # 3. Shooting Star (at potential top) - Small body at top, long upper shadow
-    df['shooting_star'] = (
-        (df['upper_shadow'] > df['body_abs'] * 2) &
-        (df['lower_shadow'] < df['body_abs'] * 0.5) &
-        (df['body_abs'] > 0) &
-        (df['Close'] < df['prev_close'])  # Down day
-    )
-    
-    # 4. Hanging Man - Small body at top, long lower shadow (bearish signal)
-    df['hanging_man'] = (
-        (df['lower_shadow'] > df['body_abs'] * 2) &
-        (df['upper_shadow'] < df['body_abs'] * 0.5) &
-        (df['body_abs'] > 0) &
-        (df['is_bearish'])
-    )
-    
-    # 5. Doji - Very small body relative to range
-    df['doji'] = (
-        (df['body_abs'] < df['range'] * 0.1) &
-        (df['range'] > 0)
-    )
-    
-    # 6. Gap Down - Open significantly lower than previous close
-    df['gap_down'] = (df['prev_close'] - df['Open']) / df['prev_close'] * 100 > 0.5
-    
-    # 7. Large Gap Down (>1%)
-    df['large_gap_down'] = (df['prev_close'] - df['Open']) / df['prev_close'] * 100 > 1.0
-    
-    # 8. Filled Gap Down - Gap down but recovered during day (close > open)
-    df['filled_gap_down'] = df['gap_down'] & df['is_bullish']
-    
-    # 9. Unfilled Gap Down - Gap down and continued selling
-    df['unfilled_gap_down'] = df['gap_down'] & df['is_bearish']
-    
-    # 10. Hammer (potential reversal) - Long lower shadow, small body at top
-    df['hammer'] = (
-        (df['lower_shadow'] > df['body_abs'] * 2) &
-        (df['upper_shadow'] < df['body_abs'] * 0.5) &
-        (df['body_abs'] > 0) &
-        (df['is_bullish'])  # Bullish variant
-    )
-    
-    # 11. Long Red Candle - Significant bearish candle
-    df['long_red_candle'] = (
-        df['is_bearish'] & 
-        (df['body_abs'] > df['avg_body'] * 1.5)
-    )
-    
-    # 12. Very Long Red Candle (extreme)
-    df['very_long_red'] = (
-        df['is_bearish'] & 
-        (df['body_abs'] > df['avg_body'] * 2.5)
-    )
-    
-    # 13. Lower Close - Closed near the low of the day
-    df['lower_close'] = (df['Close'] - df['Low']) / df['range'].replace(0, np.nan) < 0.2
-    
-    # 14. Upper Close - Closed near the high (potential recovery sign)
-    df['upper_close'] = (df['High'] - df['Close']) / df['range'].replace(0, np.nan) < 0.2
-    
-    # 15. Dark Cloud Cover - Bearish reversal
-    df['dark_cloud'] = (
-        df['prev_is_bullish'] &
-        df['is_bearish'] &
-        (df['Open'] > df['prev_high']) &
-        (df['Close'] < (df['prev_open'] + df['prev_close']) / 2) &
-        (df['Close'] > df['prev_open'])
-    )
-    
-    # 16. Evening Star setup (simplified) - Gap up then bearish
-    df['evening_star'] = (
-        df['is_bearish'] &
-        (df['Open'] > df['prev_close']) &
-        (df['Close'] < df['prev_open'])
-    )
-    
     return df
 
 
-def get_pattern_name(row: pd.Series) -> list[str]:
-    """Get list of pattern names detected for a row."""
-    patterns = []
-    pattern_cols = [
-        'bearish_marubozu', 'bearish_engulfing', 'shooting_star', 
-        'hanging_man', 'doji', 'gap_down', 'large_gap_down',
-        'filled_gap_down', 'unfilled_gap_down', 'hammer',
-        'long_red_candle', 'very_long_red', 'lower_close', 
-        'upper_close', 'dark_cloud', 'evening_star'
-    ]
-    for col in pattern_cols:
-        if col in row and row[col]:
-            patterns.append(col)
+def get_pattern_name(mask: int) -> list[str]:
+    """Get list of pattern names set in a bar's pattern mask."""
+    patterns = unpack_patterns(mask, names=PATTERN_COLUMNS)
     return patterns if patterns else ['no_pattern']
 
 
@@ -295,8 +196,7 @@ def analyze_with_candlestick_patterns(
                 continue
                 
             # Get pattern info for this candle
-            row = all_data[sym].loc[current_date]
-            patterns = get_pattern_name(row)
+            patterns = get_pattern_name(all_data[sym].at[current_date, 'pattern_mask'])
             
             result = {
                 'date': current_date,
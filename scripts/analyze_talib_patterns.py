@@ -28,6 +28,7 @@ PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from config import DATA_DIR, CACHE_DIR
+from utils.candlestick import pack_patterns, pattern_bits
 
 # TA-Lib for candlestick patterns
 try:
@@ -90,10 +91,64 @@ def load_symbol_data(symbol: str, cache_dir: Optional[str] = None) -> Optional[p
     return df[['Open', 'High', 'Low', 'Close', 'Volume']] if 'Volume' in df.columns else df[['Open', 'High', 'Low', 'Close']]
 
 
+# (column, TA-Lib function, signal kept): +1 bullish only, -1 bearish only, 0 any
+TALIB_PATTERNS = [
+    # ========== BULLISH PATTERNS ==========
+    ('CDL_HAMMER', 'CDLHAMMER', +1),
+    ('CDL_INVERTEDHAMMER', 'CDLINVERTEDHAMMER', +1),
+    ('CDL_ENGULFING_BULL', 'CDLENGULFING', +1),
+    ('CDL_MORNINGSTAR', 'CDLMORNINGSTAR', +1),
+    ('CDL_3WHITESOLDIERS', 'CDL3WHITESOLDIERS', +1),
+    ('CDL_PIERCING', 'CDLPIERCING', +1),
+    ('CDL_DRAGONFLYDOJI', 'CDLDRAGONFLYDOJI', +1),
+    ('CDL_MORNINGDOJISTAR', 'CDLMORNINGDOJISTAR', +1),
+    ('CDL_ABANDONEDBABY_BULL', 'CDLABANDONEDBABY', +1),
+    ('CDL_HARAMI_BULL', 'CDLHARAMI', +1),
+    ('CDL_HARAMICROSS_BULL', 'CDLHARAMICROSS', +1),
+    ('CDL_HOMINGPIGEON', 'CDLHOMINGPIGEON', +1),
+    ('CDL_MATCHINGLOW', 'CDLMATCHINGLOW', +1),
+    ('CDL_STICKSANDWICH', 'CDLSTICKSANDWICH', +1),
+    ('CDL_TAKURI', 'CDLTAKURI', +1),
+    # ========== BEARISH PATTERNS ==========
+    ('CDL_HANGINGMAN', 'CDLHANGINGMAN', 0),
+    ('CDL_SHOOTINGSTAR', 'CDLSHOOTINGSTAR', 0),
+    ('CDL_ENGULFING_BEAR', 'CDLENGULFING', -1),
+    ('CDL_EVENINGSTAR', 'CDLEVENINGSTAR', 0),
+    ('CDL_3BLACKCROWS', 'CDL3BLACKCROWS', 0),
+    ('CDL_DARKCLOUDCOVER', 'CDLDARKCLOUDCOVER', 0),
+    ('CDL_GRAVESTONEDOJI', 'CDLGRAVESTONEDOJI', 0),
+    ('CDL_EVENINGDOJISTAR', 'CDLEVENINGDOJISTAR', 0),
+    ('CDL_ABANDONEDBABY_BEAR', 'CDLABANDONEDBABY', -1),
+    ('CDL_HARAMI_BEAR', 'CDLHARAMI', -1),
+    ('CDL_HARAMICROSS_BEAR', 'CDLHARAMICROSS', -1),
+    ('CDL_ADVANCEBLOCK', 'CDLADVANCEBLOCK', 0),
+    ('CDL_BELTHOLD_BEAR', 'CDLBELTHOLD', -1),
+    ('CDL_COUNTERATTACK_BEAR', 'CDLCOUNTERATTACK', -1),
+    # ========== NEUTRAL/CONTINUATION PATTERNS ==========
+    ('CDL_DOJI', 'CDLDOJI', +1),
+    ('CDL_DOJISTAR', 'CDLDOJISTAR', +1),
+    ('CDL_LONGLEGGEDDOJI', 'CDLLONGLEGGEDDOJI', +1),
+    ('CDL_SPINNINGTOP', 'CDLSPINNINGTOP', +1),
+    ('CDL_HIGHWAVE', 'CDLHIGHWAVE', +1),
+    ('CDL_MARUBOZU', 'CDLMARUBOZU', +1),
+    ('CDL_LONGLINE', 'CDLLONGLINE', +1),
+    ('CDL_SHORTLINE', 'CDLSHORTLINE', +1),
+]
+PATTERN_NAMES = [col for col, _, _ in TALIB_PATTERNS]
+
+
+def has_pattern(df: pd.DataFrame, col: str) -> pd.Series:
+    """Rows of a detect_talib_patterns() frame where the pattern fired."""
+    bit = np.uint64(pattern_bits(col, names=PATTERN_NAMES))
+    return (df['pattern_mask'] & bit) != 0
+
+
 def detect_talib_patterns(df: pd.DataFrame) -> pd.DataFrame:
     """
     Detect candlestick patterns using TA-Lib.
-    Returns dataframe with pattern columns (values are -100, 0, or 100).
+    Returns dataframe with a packed 'pattern_mask' column: one bit per
+    TALIB_PATTERNS entry, set where TA-Lib reported the pattern in the
+    listed direction. Each TA-Lib function runs once per symbol.
     """
     if not TALIB_AVAILABLE:
         raise ImportError("TA-Lib is required for pattern detection")
@@ -111,48 +166,13 @@ def detect_talib_patterns(df: pd.DataFrame) -> pd.DataFrame:
     df['next_positive'] = df['next_return'] > 0
     df['next_negative'] = df['next_return'] < 0
     
-    # ========== BULLISH PATTERNS ==========
-    df['CDL_HAMMER'] = talib.CDLHAMMER(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_INVERTEDHAMMER'] = talib.CDLINVERTEDHAMMER(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_ENGULFING_BULL'] = np.where(talib.CDLENGULFING(open_arr, high_arr, low_arr, close_arr) > 0, 100, 0)
-    df['CDL_MORNINGSTAR'] = talib.CDLMORNINGSTAR(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_3WHITESOLDIERS'] = talib.CDL3WHITESOLDIERS(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_PIERCING'] = talib.CDLPIERCING(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_DRAGONFLYDOJI'] = talib.CDLDRAGONFLYDOJI(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_MORNINGDOJISTAR'] = talib.CDLMORNINGDOJISTAR(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_ABANDONEDBABY_BULL'] = np.where(talib.CDLABANDONEDBABY(open_arr, high_arr, low_arr, close_arr) > 0, 100, 0)
-    df['CDL_HARAMI_BULL'] = np.where(talib.CDLHARAMI(open_arr, high_arr, low_arr, close_arr) > 0, 100, 0)
-    df['CDL_HARAMICROSS_BULL'] = np.where(talib.CDLHARAMICROSS(open_arr, high_arr, low_arr, close_arr) > 0, 100, 0)
-    df['CDL_HOMINGPIGEON'] = talib.CDLHOMINGPIGEON(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_MATCHINGLOW'] = talib.CDLMATCHINGLOW(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_STICKSANDWICH'] = talib.CDLSTICKSANDWICH(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_TAKURI'] = talib.CDLTAKURI(open_arr, high_arr, low_arr, close_arr)
-    
-    # ========== BEARISH PATTERNS ==========
-    df['CDL_HANGINGMAN'] = talib.CDLHANGINGMAN(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_SHOOTINGSTAR'] = talib.CDLSHOOTINGSTAR(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_ENGULFING_BEAR'] = np.where(talib.CDLENGULFING(open_arr, high_arr, low_arr, close_arr) < 0, -100, 0)
-    df['CDL_EVENINGSTAR'] = talib.CDLEVENINGSTAR(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_3BLACKCROWS'] = talib.CDL3BLACKCROWS(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_DARKCLOUDCOVER'] = talib.CDLDARKCLOUDCOVER(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_GRAVESTONEDOJI'] = talib.CDLGRAVESTONEDOJI(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_EVENINGDOJISTAR'] = talib.CDLEVENINGDOJISTAR(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_ABANDONEDBABY_BEAR'] = np.where(talib.CDLABANDONEDBABY(open_arr, high_arr, low_arr, close_arr) < 0, -100, 0)
-    df['CDL_HARAMI_BEAR'] = np.where(talib.CDLHARAMI(open_arr, high_arr, low_arr, close_arr) < 0, -100, 0)
-    df['CDL_HARAMICROSS_BEAR'] = np.where(talib.CDLHARAMICROSS(open_arr, high_arr, low_arr, close_arr) < 0, -100, 0)
-    df['CDL_ADVANCEBLOCK'] = talib.CDLADVANCEBLOCK(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_BELTHOLD_BEAR'] = np.where(talib.CDLBELTHOLD(open_arr, high_arr, low_arr, close_arr) < 0, -100, 0)
-    df['CDL_COUNTERATTACK_BEAR'] = np.where(talib.CDLCOUNTERATTACK(open_arr, high_arr, low_arr, close_arr) < 0, -100, 0)
-    
-    # ========== NEUTRAL/CONTINUATION PATTERNS ==========
-    df['CDL_DOJI'] = talib.CDLDOJI(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_DOJISTAR'] = talib.CDLDOJISTAR(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_LONGLEGGEDDOJI'] = talib.CDLLONGLEGGEDDOJI(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_SPINNINGTOP'] = talib.CDLSPINNINGTOP(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_HIGHWAVE'] = talib.CDLHIGHWAVE(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_MARUBOZU'] = talib.CDLMARUBOZU(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_LONGLINE'] = talib.CDLLONGLINE(open_arr, high_arr, low_arr, close_arr)
-    df['CDL_SHORTLINE'] = talib.CDLSHORTLINE(open_arr, high_arr, low_arr, close_arr)
+    signals = {}
+    flags = {}
+    for col, func, sign in TALIB_PATTERNS:
+        if func not in signals:
+            signals[func] = getattr(talib, func)(open_arr, high_arr, low_arr, close_arr)
+        flags[col] = signals[func] * sign > 0 if sign else signals[func] != 0
+    df['pattern_mask'] = pack_patterns(flags, names=PATTERN_NAMES)
     
     return df
 
@@ -278,14 +298,11 @@ def analyze_pattern_predictive_power(
         print("-"*90)
         
         for col, name in patterns:
-            if col not in combined_df.columns:
+            if col not in PATTERN_NAMES:
                 continue
             
-            # Filter where pattern occurred (non-zero)
-            if expected_direction in ['up', 'neutral']:
-                subset = combined_df[combined_df[col] > 0]
-            else:
-                subset = combined_df[combined_df[col] < 0] if combined_df[col].min() < 0 else combined_df[combined_df[col] != 0]
+            # Filter where pattern occurred
+            subset = combined_df[has_pattern(combined_df, col)]
             
             if len(subset) < 20:  # Min sample size
                 continue
@@ -463,10 +480,10 @@ def main():
         
         # Check Hammer pattern by day of week
         for col, name in [('CDL_HAMMER', 'Hammer'), ('CDL_ENGULFING_BULL', 'Bullish Engulfing')]:
-            if col in df.columns:
+            if col in PATTERN_NAMES:
                 print(f"\n{name} by Day of Week:")
                 for day_num, day_name in enumerate(day_names):
-                    subset = df[(df[col] > 0) & (df['day_of_week'] == day_num)]
+                    subset = df[has_pattern(df, col) & (df['day_of_week'] == day_num)]
                     if len(subset) >= 10:
                         hr = subset['next_positive'].mean() * 100
                         print(f"   {day_name}: {hr:.1f}% (n={len(subset)})")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Feature Plan Benchmark
+======================
+Times the trade-enrichment indicator list (the daily indicators that
+runners/standard_run_basket.py and runners/max_trades.py attach to every
+trade) computed by direct utils.indicators calls versus one FeaturePlan that
+shares true range, EMA chains, rolling extrema and RSI between them.
+
+Usage:
+    python scripts/benchmark_feature_plan.py
+    python scripts/benchmark_feature_plan.py --bars 5000 --repeats 7
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from tests.conftest import generate_ohlcv_data  # noqa: E402
+from utils import indicators  # noqa: E402
+from utils.feature_plan import FeaturePlan  # noqa: E402
+
+# (indicator, price columns, params)
+ENRICHMENT = {
+    "atr_14": ("ATR", "hlc", 14),
+    "atr_28": ("ATR", "hlc", 28),
+    "adx_14": ("ADX", "hlc", 14),
+    "adx_28": ("ADX", "hlc", 28),
+    "aroon_25": ("Aroon", "hl", 25),
+    "aroon_50": ("Aroon", "hl", 50),
+    "aroon_100": ("Aroon", "hl", 100),
+    "rsi_14": ("RSI", "c", 14),
+    "rsi_28": ("RSI", "c", 28),
+    "macd_12_26_9": ("MACD", "c", 12, 26, 9),
+    "macd_24_52_18": ("MACD", "c", 24, 52, 18),
+    "ema_5": ("EMA", "c", 5),
+    "ema_20": ("EMA", "c", 20),
+    "ema_50": ("EMA", "c", 50),
+    "ema_100": ("EMA", "c", 100),
+    "ema_200": ("EMA", "c", 200),
+    "sma_5": ("SMA", "c", 5),
+    "sma_20": ("SMA", "c", 20),
+    "sma_50": ("SMA", "c", 50),
+    "sma_200": ("SMA", "c", 200),
+    "bb_20": ("BollingerBands", "c", 20, 2),
+    "bb_40": ("BollingerBands", "c", 40, 2),
+    "stoch_14_3": ("Stochastic", "hlc", 14, 1, 3),
+    "stoch_28_3": ("Stochastic", "hlc", 28, 1, 3),
+    "stoch_slow_5_3_3": ("calculate_stochastic_slow", "hlc", 5, 3, 3),
+    "stoch_slow_10_3_3": ("calculate_stochastic_slow", "hlc", 10, 3, 3),
+    "stoch_rsi_14_5_3_3": ("StochasticRSI", "c", 14, 5, 3, 3),
+    "stoch_rsi_14_10_5_5": ("StochasticRSI", "c", 14, 10, 5, 5),
+    "stoch_rsi_14_14_3_3": ("StochasticRSI", "c", 14, 14, 3, 3),
+    "stoch_rsi_28_20_10_10": ("StochasticRSI", "c", 28, 20, 10, 10),
+    "stoch_rsi_28_28_3_3": ("StochasticRSI", "c", 28, 28, 3, 3),
+    "stoch_rsi_28_5_3_3": ("StochasticRSI", "c", 28, 5, 3, 3),
+    "cci_20": ("CCI", "hlc", 20),
+    "cci_40": ("CCI", "hlc", 40),
+    "mfi_20": ("MFI", "hlcv", 20),
+    "cmf_20": ("CMF", "hlcv", 20),
+    "bbp_13": ("BullBearPower", "hlc", 13),
+    "bbp_26": ("BullBearPower", "hlc", 26),
+    "ker_10": ("kaufman_efficiency_ratio", "c", 10),
+    "kijun_26": ("extract_ichimoku_base_line", "hl", 26),
+    "williams_14": ("WilliamsR", "hlc", 14),
+    "hma_14": ("HMA", "c", 14),
+    "chop_20": ("CHOP", "hlc", 20),
+    "chop_50": ("CHOP", "hlc", 50),
+    "volume_sma_20": ("SMA", "v", 20),
+}
+COLUMNS = {"h": "high", "l": "low", "c": "close", "v": "volume"}
+
+
+# No intermediates to share (and the slowest of the list): timed separately
+STANDALONE = ("Aroon", "CCI")
+
+
+def run_direct(arrays, specs):
+    out = {}
+    for name, (indicator, columns, *params) in specs.items():
+        func = getattr(indicators, indicator)
+        out[name] = func(*(arrays[COLUMNS[c]] for c in columns), *params)
+    return out
+
+
+def build_plan(specs):
+    plan = FeaturePlan()
+    for name, (indicator, columns, *params) in specs.items():
+        source = "volume" if columns == "v" else "close"
+        plan.add(name, indicator, *params, source=source)
+    return plan
+
+
+def best_of(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--bars", type=int, default=2500, help="Bars per symbol")
+    ap.add_argument("--repeats", type=int, default=5, help="Timing repeats (best of)")
+    args = ap.parse_args()
+
+    df = generate_ohlcv_data(n_days=args.bars, seed=7)
+    arrays = {c: df[c].to_numpy(dtype=float) for c in COLUMNS.values()}
+    shared = {k: v for k, v in ENRICHMENT.items() if v[0] not in STANDALONE}
+
+    warnings.simplefilter("ignore")
+    print(f"{len(ENRICHMENT)} enrichment indicators on {args.bars} bars")
+    for label, specs in (("full list", ENRICHMENT), ("without Aroon/CCI", shared)):
+        plan = build_plan(specs)
+        with np.errstate(all="ignore"):
+            direct = run_direct(arrays, specs)
+            planned = plan.compute(df)
+            for name, expected in direct.items():
+                got = planned[name]
+                if not isinstance(expected, dict):
+                    expected, got = {None: expected}, {None: got}
+                for key, values in expected.items():
+                    np.testing.assert_array_equal(got[key], values, err_msg=name)
+
+            t_direct = best_of(lambda: run_direct(arrays, specs), args.repeats)
+            t_plan = best_of(lambda: plan.compute(df), args.repeats)
+
+        print(f"\n   {label} ({len(specs)} indicators, outputs identical)")
+        print(f"   direct calls : {t_direct * 1000:8.1f} ms")
+        print(f"   feature plan : {t_plan * 1000:8.1f} ms")
+        print(f"   nodes        : {len(plan.intermediates)}")
+        print(f"   speedup      : {t_direct / t_plan:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,12 @@ import requests
 import urllib3
 from dotenv import load_dotenv
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.cache_manifest import record_file  # noqa: E402
+from core.instrument_master import get_instrument_master  # noqa: E402
+
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 load_dotenv()
@@ -110,14 +116,10 @@ def load_master_data():
         return {}
 
     try:
-        df = pd.read_csv(MASTER_FILE, low_memory=False)
-        # Filter for NSE equity only
-        nse_eq = df[(df['SEM_EXM_EXCH_ID'] == 'NSE') & (df['SEM_SEGMENT'] == 'E')]
-        mapping = {}
-        for _, row in nse_eq.iterrows():
-            symbol = row["SEM_TRADING_SYMBOL"]
-            secid = int(row["SEM_SMST_SECURITY_ID"])
-            mapping[symbol] = secid
+        # NSE equity only; the parsed master is cached until the file changes
+        mapping = get_instrument_master(MASTER_FILE).symbol_map(
+            exchange="NSE", segment="E"
+        )
         print(f"📊 Loaded {len(mapping)} NSE equity symbols from master")
         return mapping
     except Exception as e:
@@ -367,6 +369,7 @@ def save_candles(df, sec_id, symbol, timeframe):
             df_save["time"] = df_save["time"].dt.tz_localize(None)
 
         df_save.set_index("time").to_csv(output_file)
+        record_file(output_file)
 
         return True
 
@@ -20,6 +20,11 @@ import pandas as pd
 import requests
 from dotenv import load_dotenv
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.cache_manifest import record_file  # noqa: E402
+
 load_dotenv()
 
 CACHE_DIR = Path("data/cache/groww/weekly")
@@ -311,6 +316,7 @@ def save_weekly_data(df: pd.DataFrame, exchange_token: str, symbol: str) -> bool
         
         # Save with time as index
         df_save.set_index('time').to_csv(output_file)
+        record_file(output_file)
         
         return True
         
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Migrate OHLCV Cache to the Columnar Store
+=========================================
+Converts the Dhan daily (data/cache/dhan/daily/dhan_<SECID>_<SYMBOL>_1d.csv)
+and Groww weekly (data/cache/groww/weekly/groww_<TOKEN>_<SYMBOL>_1w.csv) CSV
+cache into the columnar store read by core.loaders.load_many_india
+(core/ohlcv_store.py). Symbols already migrated whose CSV has not changed are
+left alone, so the script can be re-run after every fetch.
+
+Usage:
+    python scripts/migrate_ohlcv_store.py
+    python scripts/migrate_ohlcv_store.py --interval 1d --symbols RELIANCE SBIN
+    python scripts/migrate_ohlcv_store.py --force
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core import ohlcv_store  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--interval",
+        choices=sorted(ohlcv_store.CSV_LAYOUT),
+        action="append",
+        help="Interval(s) to migrate (default: all)",
+    )
+    parser.add_argument("--symbols", nargs="+", help="Only these symbols")
+    parser.add_argument(
+        "--force", action="store_true", help="Rewrite partitions that are current"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = ohlcv_store.migrate_csv_cache(
+        intervals=args.interval or tuple(ohlcv_store.CSV_LAYOUT),
+        symbols=args.symbols,
+        force=args.force,
+    )
+    elapsed = time.perf_counter() - start
+
+    for key, reason in report["skipped"]:
+        print(f"⚠️  {key}: kept on CSV ({reason})")
+    print(
+        f"✅ {len(report['written'])} written, {len(report['current'])} current, "
+        f"{len(report['skipped'])} skipped in {elapsed:.1f}s "
+        f"→ {ohlcv_store.STORE_DIR}"
+    )
+
+
+if __name__ == "__main__":
+    main()
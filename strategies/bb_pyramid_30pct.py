@@ -26,7 +26,7 @@ from typing import Dict, Any
 
 from core.strategy import Strategy
 from utils.indicators import BollingerBands
-from core.loaders import load_nifty200
+from core.market_context import market_series
 
 
 class BBPyramid30Pct(Strategy):
@@ -72,33 +72,17 @@ class BBPyramid30Pct(Strategy):
     def _calculate_nifty200_filter(self):
         """Calculate NIFTY200 > 200 EMA filter."""
         try:
-            nifty200_df = load_nifty200()
+            nifty200 = market_series("nifty200")
             
-            if nifty200_df is None or nifty200_df.empty:
+            if len(nifty200) == 0:
                 self.data['nifty200_above_ema200'] = True
                 return
             
-            # Calculate 200 EMA
-            from utils.indicators import EMA
-            nifty200_close = nifty200_df['close'].values
-            ema200 = EMA(nifty200_close, 200)
-            nifty200_df['ema200'] = ema200
-            nifty200_df['above_ema200'] = nifty200_close > ema200
-            
-            # Create mapping: both indices should be timezone-naive date-only
-            # NIFTY200 index is already timezone-naive from loader
-            # Stock data index from backtesting.py is also timezone-naive
-            nifty200_series = pd.Series(
-                nifty200_df['above_ema200'].values,
-                index=nifty200_df.index
-            )
-            
-            # Map NIFTY200 values to stock dates (forward fill for weekends/holidays)
-            mapped_values = self.data.index.map(lambda d: nifty200_series.get(d, pd.NA))
-            temp_series = pd.Series(mapped_values, index=self.data.index)
-            temp_series = temp_series.infer_objects(copy=False)  # Handle FutureWarning before operations
-            temp_series = temp_series.ffill()
-            temp_series = temp_series.fillna(True)  # Default to True if no data
+            # Map NIFTY200 > EMA200 to stock dates (exact timestamps), then forward fill
+            # for weekends/holidays (no lookahead)
+            mapped = nifty200.align(self.data.index, nifty200.above_ema(200), strict=False)
+            temp_series = pd.Series(mapped, index=self.data.index).ffill()
+            temp_series = temp_series.fillna(1.0)  # Default to True if no data
             self.data['nifty200_above_ema200'] = temp_series.astype(bool)
             
         except Exception as e:
@@ -188,7 +172,7 @@ class BBPyramid30Pct(Strategy):
         self._scale_fill_price = None
         return {}
 
-    def on_bar(self, ts, row, state) -> Dict[str, Any]:
+    def on_bar_idx(self, idx, ts, row, state) -> Dict[str, Any]:
         """Trading logic executed on each bar."""
         result = {
             "enter_long": False,
@@ -207,9 +191,6 @@ class BBPyramid30Pct(Strategy):
             self._scale_fill_price = None
         
         # Get previous day's data (no lookahead)
-        idx = self.data.index.get_loc(ts)
-        if isinstance(idx, slice):
-            idx = idx.start
         if idx == 0:
             return result
         
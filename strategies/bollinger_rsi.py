@@ -114,7 +114,7 @@ class BollingerRSIStrategy(Strategy):
 
         return {"limit": tp_level, "stop": sl_level}
 
-    def on_bar(self, ts, row, state):
+    def on_bar_idx(self, idx, ts, row, state):
         """
         Execute trading logic on each bar.
 
@@ -125,6 +125,7 @@ class BollingerRSIStrategy(Strategy):
         Exit: RSI > 70
 
         Args:
+            idx: Bar position in the prepared data
             ts: Timestamp
             row: Current bar data (high, low, close, open, volume, etc.)
             state: Trading state dict
@@ -132,15 +133,6 @@ class BollingerRSIStrategy(Strategy):
         Returns:
             Dictionary with entry/exit signals and reasons
         """
-        try:
-            idx_result = self.data.index.get_loc(ts)
-            if isinstance(idx_result, slice):
-                idx = idx_result.start
-            else:
-                idx = idx_result
-        except (KeyError, AttributeError):
-            return {"enter_long": False, "exit_long": False, "signal_reason": ""}
-
         # Need enough bars for all indicators
         min_bars = max(self.rsi_period, self.bb_length)
 
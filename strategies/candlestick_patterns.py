@@ -55,6 +55,7 @@ import numpy as np
 import pandas as pd
 
 from core.strategy import Strategy
+from utils.candlestick import pattern_bits, pattern_mask
 from utils.indicators import ADX, ATR, EMA, MFI, RSI, VWAP
 
 
@@ -83,6 +84,28 @@ class CandlestickPatternsStrategy(Strategy):
     use_vwap_filter = True  # Close > VWAP (price above average value)
     use_mfi_filter = True  # MFI (20-80) (money flow)
 
+    # Entry patterns in detection order: (utils.candlestick name, signal reason)
+    ENTRY_PATTERNS = (
+        ("engulfing", "Engulfing"),
+        ("harami", "Harami"),
+        ("piercing", "Piercing"),
+        ("morning_star", "Morning Star"),
+        ("morning_doji_star", "Morning Doji Star"),
+        ("hammer", "Hammer"),
+        ("inverted_hammer", "Inverted Hammer"),
+        ("dragonfly_doji", "Dragonfly Doji"),
+        ("gravestone_doji", "Gravestone Doji"),
+        ("abandoned_baby", "Abandoned Baby"),
+        ("kicker", "Kicker"),
+        ("belt_hold", "Belt Hold"),
+        ("homing_pigeon", "Homing Pigeon"),
+        ("matching_low", "Matching Low"),
+    )
+    EXIT_PATTERNS = (
+        ("bearish_engulfing", "Bearish Engulfing"),
+        ("bearish_harami", "Bearish Harami"),
+    )
+
     def prepare(self, df: pd.DataFrame) -> pd.DataFrame:
         """Setup data and initialize indicators."""
         self.data = df
@@ -101,6 +124,17 @@ class CandlestickPatternsStrategy(Strategy):
             overlay=False,
         )
 
+        # Every candlestick pattern of every bar, packed one bit per pattern
+        self.pattern_mask = pattern_mask(
+            self.data.open,
+            self.data.high,
+            self.data.low,
+            self.data.close,
+            small_body_pct=self.small_body_pct,
+            long_body_pct=self.long_body_pct,
+            doji_pct=self.doji_pct,
+        )
+
         # ADX for trend strength (>20 = strong trend)
         adx_result = ADX(
             self.data.high.values.astype(float),
@@ -151,16 +185,6 @@ class CandlestickPatternsStrategy(Strategy):
             else np.zeros(len(self.data))
         )
 
-    def _get_idx(self, ts):
-        """Get bar index from timestamp."""
-        try:
-            idx_result = self.data.index.get_loc(ts)
-            if isinstance(idx_result, slice):
-                return idx_result.start
-            return idx_result
-        except (KeyError, AttributeError):
-            return None
-
     def _check_confluence_filters(self, idx):
         """Check all confluence filters for entry.
 
@@ -245,258 +269,26 @@ class CandlestickPatternsStrategy(Strategy):
         except (IndexError, KeyError, ValueError, TypeError):
             return False
 
-    def _candle(self, idx):
-        """Extract candle properties."""
-        if idx < 0 or idx >= len(self.data):
-            return None
-
-        try:
-            row = self.data.iloc[idx]
-            o, h, l, c = (
-                float(row["open"]),
-                float(row["high"]),
-                float(row["low"]),
-                float(row["close"]),
-            )
-
-            if not all(np.isfinite([o, h, l, c])):
-                return None
-
-            rng = h - l
-            if rng <= 0:
-                return None
-
-            body = abs(c - o)
-            body_hi = max(c, o)
-            body_lo = min(c, o)
-            up_shadow = h - body_hi
-            dn_shadow = body_lo - l
-
-            return {
-                "o": o,
-                "h": h,
-                "l": l,
-                "c": c,
-                "rng": rng,
-                "body": body,
-                "body_hi": body_hi,
-                "body_lo": body_lo,
-                "up_shadow": up_shadow,
-                "dn_shadow": dn_shadow,
-                "is_white": c > o,
-                "is_black": c < o,
-                "is_small": body < rng * self.small_body_pct,
-                "is_long": body > rng * self.long_body_pct,
-                "is_doji": body < rng * (self.doji_pct / 100),
-            }
-        except (IndexError, KeyError, ValueError, TypeError):
-            return None
+    def _pattern_at(self, idx, patterns):
+        """Reason of the first of ``patterns`` set in bar ``idx``'s mask, or None."""
+        mask = int(self.pattern_mask[idx])
+        if mask:
+            for name, reason in patterns:
+                if mask & pattern_bits(name):
+                    return reason
+        return None
 
     def _detect_pattern(self, idx):
         """Detect any bullish candlestick pattern."""
         if idx < 4:
             return None
+        return self._pattern_at(idx, self.ENTRY_PATTERNS)
 
-        patterns = [
-            ("Engulfing", self._engulfing),
-            ("Harami", self._harami),
-            ("Piercing", self._piercing),
-            ("Morning Star", self._morning_star),
-            ("Morning Doji Star", self._morning_doji_star),
-            ("Hammer", self._hammer),
-            ("Inverted Hammer", self._inverted_hammer),
-            ("Dragonfly Doji", self._dragonfly_doji),
-            ("Gravestone Doji", self._gravestone_doji),
-            ("Abandoned Baby", self._abandoned_baby),
-            ("Kicker", self._kicker),
-            ("Belt Hold", self._belt_hold),
-            ("Homing Pigeon", self._homing_pigeon),
-            ("Matching Low", self._matching_low),
-        ]
-
-        for name, detector in patterns:
-            if detector(idx):
-                return name
-        return None
-
-    def _hammer(self, idx):
-        """1 candle: small white body, long lower shadow."""
-        c = self._candle(idx)
-        if not c or not c["is_white"] or not c["is_small"]:
-            return False
-        return c["dn_shadow"] >= c["body"] * 2 and c["up_shadow"] < c["body"] * 0.5
-
-    def _inverted_hammer(self, idx):
-        """1 candle: small white body, long upper shadow."""
-        c = self._candle(idx)
-        if not c or not c["is_white"] or not c["is_small"]:
-            return False
-        return c["up_shadow"] >= c["body"] * 2 and c["dn_shadow"] < c["body"] * 0.5
-
-    def _belt_hold(self, idx):
-        """1 candle: small white body at high."""
-        c = self._candle(idx)
-        if not c or not c["is_white"] or not c["is_small"]:
-            return False
-        return c["dn_shadow"] >= c["body"] * 2 and c["up_shadow"] < c["body"] * 0.5
-
-    def _dragonfly_doji(self, idx):
-        """1 candle: doji with long lower shadow."""
-        c = self._candle(idx)
-        if not c or not c["is_doji"]:
-            return False
-        return c["dn_shadow"] > c["rng"] * 0.5 and c["up_shadow"] < c["rng"] * 0.1
-
-    def _gravestone_doji(self, idx):
-        """1 candle: doji with long upper shadow."""
-        c = self._candle(idx)
-        if not c or not c["is_doji"]:
-            return False
-        return c["up_shadow"] > c["rng"] * 0.5 and c["dn_shadow"] < c["rng"] * 0.1
-
-    def _engulfing(self, idx):
-        """2 candles: white engulfs black."""
-        if idx < 1:
-            return False
-        c1 = self._candle(idx - 1)
-        c2 = self._candle(idx)
-        if not c1 or not c2:
-            return False
-        if c1["is_black"] and c2["is_white"]:
-            return c2["o"] <= c1["c"] and c2["c"] >= c1["o"]
-        return False
-
-    def _harami(self, idx):
-        """2 candles: small white inside large black."""
-        if idx < 1:
-            return False
-        c1 = self._candle(idx - 1)
-        c2 = self._candle(idx)
-        if not c1 or not c2:
-            return False
-        if c1["is_black"] and c1["is_long"] and c2["is_white"] and c2["is_small"]:
-            return c2["h"] <= c1["body_hi"] and c2["l"] >= c1["body_lo"]
-        return False
-
-    def _piercing(self, idx):
-        """2 candles: black long, white opens gap down, closes >50% body."""
-        if idx < 1:
-            return False
-        c1 = self._candle(idx - 1)
-        c2 = self._candle(idx)
-        if not c1 or not c2:
-            return False
-        if c1["is_black"] and c1["is_long"] and c2["is_white"]:
-            body_mid = c1["body_lo"] + c1["body"] / 2
-            return c2["o"] < c1["l"] and c2["c"] > body_mid and c2["c"] < c1["o"]
-        return False
-
-    def _kicker(self, idx):
-        """2 candles: black to white with gap up."""
-        if idx < 1:
-            return False
-        c1 = self._candle(idx - 1)
-        c2 = self._candle(idx)
-        if not c1 or not c2:
-            return False
-        if c1["is_black"] and c2["is_white"]:
-            return c2["l"] > c1["h"]
-        return False
-
-    def _homing_pigeon(self, idx):
-        """2 candles: both black, second inside first."""
-        if idx < 1:
-            return False
-        c1 = self._candle(idx - 1)
-        c2 = self._candle(idx)
-        if not c1 or not c2:
-            return False
-        if c1["is_black"] and c2["is_black"]:
-            return c2["h"] < c1["body_hi"] and c2["l"] > c1["body_lo"]
-        return False
-
-    def _matching_low(self, idx):
-        """2 candles: similar close price."""
-        if idx < 1:
-            return False
-        c1 = self._candle(idx - 1)
-        c2 = self._candle(idx)
-        if not c1 or not c2:
-            return False
-        if c1["is_black"] and c2["is_white"]:
-            return abs(c1["c"] - c2["c"]) < c1["rng"] * 0.05
-        return False
-
-    def _morning_star(self, idx):
-        """3 candles: black long, small, white closes above mid."""
-        if idx < 2:
-            return False
-        c1 = self._candle(idx - 2)
-        c2 = self._candle(idx - 1)
-        c3 = self._candle(idx)
-        if not all([c1, c2, c3]):
-            return False
-        if c1["is_black"] and c1["is_long"] and c2["is_small"] and c3["is_white"]:
-            body_mid = c1["body_lo"] + c1["body"] / 2
-            return c2["h"] < c1["l"] and c3["c"] > body_mid
-        return False
-
-    def _morning_doji_star(self, idx):
-        """3 candles: black, doji gaps down, white."""
-        if idx < 2:
-            return False
-        c1 = self._candle(idx - 2)
-        c2 = self._candle(idx - 1)
-        c3 = self._candle(idx)
-        if not all([c1, c2, c3]):
-            return False
-        if c1["is_black"] and c2["is_doji"] and c3["is_white"]:
-            return c2["h"] < c1["l"] and c3["c"] > c1["body_lo"] + c1["body"] / 2
-        return False
-
-    def _abandoned_baby(self, idx):
-        """3 candles: black, doji gaps down, white gaps up."""
-        if idx < 2:
-            return False
-        c1 = self._candle(idx - 2)
-        c2 = self._candle(idx - 1)
-        c3 = self._candle(idx)
-        if not all([c1, c2, c3]):
-            return False
-        if c1["is_black"] and c2["is_doji"] and c3["is_white"]:
-            return c2["h"] < c1["l"] and c3["l"] > c2["h"]
-        return False
-
-    def _bearish_engulfing(self, idx):
-        """2 candles: black engulfs white."""
-        if idx < 1:
-            return False
-        c1 = self._candle(idx - 1)
-        c2 = self._candle(idx)
-        if not c1 or not c2:
-            return False
-        if c1["is_white"] and c2["is_black"]:
-            return c2["o"] >= c1["c"] and c2["c"] <= c1["o"]
-        return False
-
-    def _bearish_harami(self, idx):
-        """2 candles: small black inside large white."""
-        if idx < 1:
-            return False
-        c1 = self._candle(idx - 1)
-        c2 = self._candle(idx)
-        if not c1 or not c2:
-            return False
-        if c1["is_white"] and c1["is_long"] and c2["is_black"] and c2["is_small"]:
-            return c2["h"] <= c1["body_hi"] and c2["l"] >= c1["body_lo"]
-        return False
-
-    def on_entry(self, entry_time, entry_price, state):
+    def on_entry_idx(self, idx, entry_time, entry_price, state):
         """
         Calculate stop loss and take profit on entry.
         Called when a trade is executed.
         """
-        idx = self._get_idx(entry_time)
         if idx is None or idx < 0 or idx >= len(self.atr):
             return {}
 
@@ -520,7 +312,7 @@ class CandlestickPatternsStrategy(Strategy):
             "take_profit": take_profit,
         }
 
-    def on_bar(self, ts, row, state):
+    def on_bar_idx(self, idx, ts, row, state):
         """
         Execute trading logic each bar (daily).
 
@@ -532,7 +324,6 @@ class CandlestickPatternsStrategy(Strategy):
         - TSL can only move up (never down)
         - Next day's open will check if TSL was breached
         """
-        idx = self._get_idx(ts)
         if idx is None or idx < 4:
             return {"enter_long": False, "exit_long": False, "signal_reason": ""}
 
@@ -578,17 +369,12 @@ class CandlestickPatternsStrategy(Strategy):
         # ===== EXIT LOGIC (if in position) =====
         if state.get("qty", 0) > 0:
             # Check for bearish patterns (exit signals)
-            if self._bearish_engulfing(idx):
-                return {
-                    "enter_long": False,
-                    "exit_long": True,
-                    "signal_reason": "Bearish Engulfing",
-                }
-            if self._bearish_harami(idx):
+            reason = self._pattern_at(idx, self.EXIT_PATTERNS)
+            if reason:
                 return {
                     "enter_long": False,
                     "exit_long": True,
-                    "signal_reason": "Bearish Harami",
+                    "signal_reason": reason,
                 }
 
             # Return TSL update (if any) or continue holding
@@ -232,7 +232,7 @@ class DailyGreenBBStrategy(Strategy):
         stop_loss = entry_price * (1 - self.sl_pct)
         return {"stop": stop_loss}
 
-    def on_bar(self, ts, row, state) -> Dict[str, Any]:
+    def on_bar_idx(self, idx, ts, row, state) -> Dict[str, Any]:
         """Trading logic executed on each bar."""
         result = {
             "enter_long": False,
@@ -251,9 +251,6 @@ class DailyGreenBBStrategy(Strategy):
                 return result
             
             # Get previous day's data (no lookahead - using completed bar)
-            idx = self.data.index.get_loc(ts)
-            if isinstance(idx, slice):
-                idx = idx.start
             if idx == 0:
                 return result
             
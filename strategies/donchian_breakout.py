@@ -86,14 +86,32 @@ class DonchianBreakout(Strategy):
 
         return super().prepare(df)
 
-    def on_bar(self, ts, row, state):
-        """Trading logic - Donchian breakout."""
-        try:
-            idx_result = self.data.index.get_loc(ts)
-            idx = idx_result.start if isinstance(idx_result, slice) else idx_result
-        except (KeyError, AttributeError, TypeError):
-            return {"enter_long": False, "exit_long": False, "signal_reason": ""}
+    def signals(self, df: pd.DataFrame):
+        """Vectorized equivalent of on_bar() for the bulk engine path."""
+        close_now = df.close.to_numpy(dtype=float)
+        close_prev, upper_prev, lower_prev, basis_prev = (
+            np.concatenate(([np.nan], values[:-1]))
+            for values in (close_now, self.upper_vals, self.lower_vals, self.basis_vals)
+        )
+        ready = np.arange(len(close_now)) >= self.length
+        for values in (close_now, close_prev, upper_prev, lower_prev, basis_prev):
+            ready &= ~np.isnan(values)
+
+        enter_long = ready & (close_prev <= upper_prev) & (close_now > upper_prev)
+        if self.exit_option == 1:
+            exit_long = ready & (close_prev >= lower_prev) & (close_now < lower_prev)
+            exit_reason = "Exit Lower"
+        else:
+            exit_long = ready & (close_prev >= basis_prev) & (close_now < basis_prev)
+            exit_reason = "Exit Basis"
+
+        signal_reason = np.where(
+            exit_long, exit_reason, np.where(enter_long, "Donchian BO", "")
+        )
+        return enter_long, exit_long, None, signal_reason
 
+    def on_bar_idx(self, idx, ts, row, state):
+        """Trading logic - Donchian breakout."""
         # Need at least length bars to have valid Donchian
         if idx < self.length:
             return {"enter_long": False, "exit_long": False, "signal_reason": ""}
@@ -215,7 +215,7 @@ class DualTemaLsmaStrategy(Strategy):
         sl_level = entry_price * (1 - self.long_sl_pct)
         return {"stop": sl_level}
 
-    def on_bar(self, ts, row, state):
+    def on_bar_idx(self, idx, ts, row, state):
         """
         Execute trading logic on each bar.
 
@@ -232,6 +232,7 @@ class DualTemaLsmaStrategy(Strategy):
         - Close price falls below trailing stop (stop loss hit)
 
         Args:
+            idx: Bar position in the prepared data
             ts: Timestamp
             row: Current bar data (high, low, close, open, volume, etc.)
             state: Trading state dict
@@ -239,15 +240,6 @@ class DualTemaLsmaStrategy(Strategy):
         Returns:
             Dictionary with entry/exit signals and reasons
         """
-        try:
-            idx_result = self.data.index.get_loc(ts)
-            if isinstance(idx_result, slice):
-                idx = idx_result.start
-            else:
-                idx = idx_result
-        except (KeyError, AttributeError):
-            return {"enter_long": False, "exit_long": False, "signal_reason": ""}
-
         # Need enough bars for all indicators
         min_bars = max(
             self.trend_type1_length,
@@ -31,7 +31,7 @@ This ensures no future leak and realistic trading simulation.
 import numpy as np
 import pandas as pd
 
-from core.strategy import Strategy
+from core.strategy import Strategy, crossover, crossunder
 from utils.indicators import ATR, EMA, RSI
 
 
@@ -107,7 +107,7 @@ class EMAcrossoverStrategy(Strategy):
             overlay=False,
         )
 
-    def on_entry(self, entry_time, entry_price, state):
+    def on_entry_idx(self, idx, entry_time, entry_price, state):
         """
         Calculate ATR-based stop loss when entering a trade.
 
@@ -118,12 +118,6 @@ class EMAcrossoverStrategy(Strategy):
             return {}
 
         try:
-            idx_result = self.data.index.get_loc(entry_time)
-            if isinstance(idx_result, slice):
-                idx = idx_result.start
-            else:
-                idx = idx_result
-
             if idx is not None and idx >= 0 and idx < len(self.atr):
                 atr_value = self.atr[idx]
                 if atr_value is not None and not np.isnan(atr_value) and atr_value > 0:
@@ -134,7 +128,35 @@ class EMAcrossoverStrategy(Strategy):
 
         return {}
 
-    def on_bar(self, ts, row, state):
+    def signals(self, df: pd.DataFrame):
+        """
+        Vectorized equivalent of on_bar() for the bulk engine path.
+
+        Only used with pyramiding=1, where the RSI dip branch never adds a lot
+        (so RSI dips are not reported as entry signals here).
+        """
+        min_bars = max(
+            self.ema_fast_period,
+            self.ema_slow_period,
+            self.rsi_period,
+            self.atr_period,
+        )
+        ready = (np.arange(len(df)) >= min_bars) & ~np.isnan(self.rsi)
+        bullish_crossover = ready & np.concatenate(
+            ([False], crossover(self.ema_fast, self.ema_slow))
+        )
+        bearish_crossover = ready & np.concatenate(
+            ([False], crossunder(self.ema_fast, self.ema_slow))
+        )
+
+        signal_reason = np.where(
+            bearish_crossover,
+            "EMA Crossunder",
+            np.where(bullish_crossover, "EMA Crossover", ""),
+        )
+        return bullish_crossover, bearish_crossover, None, signal_reason
+
+    def on_bar_idx(self, idx, ts, row, state):
         """
         Execute trading logic on each bar.
 
@@ -145,6 +167,7 @@ class EMAcrossoverStrategy(Strategy):
         Exit: EMA(89) crosses below EMA(144)
 
         Args:
+            idx: Bar position in the prepared data
             ts: Timestamp
             row: Current bar data
             state: Trading state
@@ -152,15 +175,6 @@ class EMAcrossoverStrategy(Strategy):
         Returns:
             Dictionary with entry/exit signals and reasons
         """
-        try:
-            idx_result = self.data.index.get_loc(ts)
-            if isinstance(idx_result, slice):
-                idx = idx_result.start
-            else:
-                idx = idx_result
-        except (KeyError, AttributeError):
-            return {"enter_long": False, "exit_long": False, "signal_reason": ""}
-
         # Need enough bars for all indicators
         min_bars = max(
             self.ema_fast_period,
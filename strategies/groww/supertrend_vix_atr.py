@@ -26,14 +26,19 @@ Position Sizing: 5% of 1,00,000 = ₹5,000 per position
 
 import json
 import os
+import sys
 import time
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Optional, Any
 
-import numpy as np
 import pyotp
 from growwapi import GrowwAPI
 
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+from utils.incremental import ATR, IndicatorSet, Supertrend
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONFIGURATION (TOTP Flow - No daily expiry, expires 2055)
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -69,6 +74,7 @@ HOME_DIR = os.path.expanduser("~")
 if HOME_DIR == "/" or not HOME_DIR:
     HOME_DIR = "/tmp"
 POSITIONS_FILE = os.path.join(HOME_DIR, ".groww_supertrend_positions.json")
+INDICATORS_FILE = os.path.join(HOME_DIR, ".groww_supertrend_indicators.json")
 SIGNALS_LOG_FILE = os.path.join(HOME_DIR, f".groww_supertrend_log_{datetime.now().strftime('%Y-%m-%d')}.json")
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -472,114 +478,17 @@ def calc_qty(price: float) -> int:
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
-def calculate_atr(highs: List[float], lows: List[float], closes: List[float], period: int = 12) -> List[float]:
-    """
-    Calculate Average True Range (ATR) using Wilder's smoothing.
-    
-    Returns list of ATR values (same length as input, NaN for early bars).
+def new_indicators() -> IndicatorSet:
     """
-    n = len(closes)
-    if n < 2:
-        return [np.nan] * n
-    
-    # Calculate True Range
-    tr = [highs[0] - lows[0]]  # First TR is just H-L
-    for i in range(1, n):
-        tr.append(max(
-            highs[i] - lows[i],
-            abs(highs[i] - closes[i - 1]),
-            abs(lows[i] - closes[i - 1])
-        ))
-    
-    # Calculate ATR with Wilder's smoothing
-    atr = [np.nan] * n
-    if n >= period:
-        # First ATR is SMA of first 'period' TRs
-        atr[period - 1] = sum(tr[:period]) / period
-        
-        # Subsequent ATRs use Wilder's smoothing: ATR = (prev_ATR * (period-1) + TR) / period
-        for i in range(period, n):
-            atr[i] = (atr[i - 1] * (period - 1) + tr[i]) / period
-    
-    return atr
-
+    Streaming Supertrend and ATR, the same implementations as the backtest.
 
-def calculate_supertrend(
-    highs: List[float],
-    lows: List[float],
-    closes: List[float],
-    period: int = 12,
-    factor: float = 3.0
-) -> Dict[str, List[float]]:
+    State is saved per symbol in INDICATORS_FILE, so each run only feeds the
+    candles that closed since the previous run.
     """
-    Calculate Supertrend indicator.
-    
-    Returns:
-        dict with 'supertrend' and 'direction' lists
-        direction: -1 = uptrend (green/bullish), +1 = downtrend (red/bearish)
-    """
-    n = len(closes)
-    atr = calculate_atr(highs, lows, closes, period)
-    
-    supertrend = [np.nan] * n
-    direction = [np.nan] * n
-    
-    # Upper and lower bands
-    final_upper = [np.nan] * n
-    final_lower = [np.nan] * n
-    
-    for i in range(n):
-        if np.isnan(atr[i]):
-            continue
-        
-        hl2 = (highs[i] + lows[i]) / 2
-        basic_upper = hl2 + factor * atr[i]
-        basic_lower = hl2 - factor * atr[i]
-        
-        # First valid bar
-        if i == 0 or np.isnan(final_upper[i - 1]):
-            final_upper[i] = basic_upper
-            final_lower[i] = basic_lower
-            # Initialize direction based on close vs bands
-            if closes[i] > basic_lower:
-                direction[i] = -1  # Uptrend
-                supertrend[i] = basic_lower
-            else:
-                direction[i] = 1  # Downtrend
-                supertrend[i] = basic_upper
-            continue
-        
-        # Adjust upper band: can only move down or stay same
-        if basic_upper < final_upper[i - 1] or closes[i - 1] > final_upper[i - 1]:
-            final_upper[i] = basic_upper
-        else:
-            final_upper[i] = final_upper[i - 1]
-        
-        # Adjust lower band: can only move up or stay same
-        if basic_lower > final_lower[i - 1] or closes[i - 1] < final_lower[i - 1]:
-            final_lower[i] = basic_lower
-        else:
-            final_lower[i] = final_lower[i - 1]
-        
-        # Determine direction based on previous direction and close vs bands
-        prev_dir = direction[i - 1] if not np.isnan(direction[i - 1]) else -1
-        
-        if prev_dir == -1:  # Was uptrend
-            if closes[i] < final_lower[i]:
-                direction[i] = 1  # Flip to downtrend
-                supertrend[i] = final_upper[i]
-            else:
-                direction[i] = -1  # Stay uptrend
-                supertrend[i] = final_lower[i]
-        else:  # Was downtrend
-            if closes[i] > final_upper[i]:
-                direction[i] = -1  # Flip to uptrend
-                supertrend[i] = final_lower[i]
-            else:
-                direction[i] = 1  # Stay downtrend
-                supertrend[i] = final_upper[i]
-    
-    return {"supertrend": supertrend, "direction": direction}
+    return IndicatorSet({
+        "supertrend": Supertrend(SUPERTREND_PERIOD, SUPERTREND_FACTOR),
+        "atr": ATR(SUPERTREND_PERIOD),
+    })
 
 
 def analyze_stock(symbol: str, vix: Optional[float]) -> Dict[str, Any]:
@@ -597,30 +506,16 @@ def analyze_stock(symbol: str, vix: Optional[float]) -> Dict[str, Any]:
     if len(candles) < 15:  # Need at least 15 bars for reliable Supertrend
         return {"action": None, "reason": "Insufficient data", "data": {}}
     
-    # Extract OHLC from candles
-    highs = [c["high"] for c in candles]
-    lows = [c["low"] for c in candles]
-    closes = [c["close"] for c in candles]
-    
-    # Calculate Supertrend
-    st = calculate_supertrend(highs, lows, closes, SUPERTREND_PERIOD, SUPERTREND_FACTOR)
-    directions = st["direction"]
-    supertrends = st["supertrend"]
-    
-    # Find last two valid direction values (yesterday and day before)
-    valid_indices = [i for i, d in enumerate(directions) if not np.isnan(d)]
-    
-    if len(valid_indices) < 2:
-        return {"action": None, "reason": "Insufficient Supertrend data", "data": {}}
+    # Update indicators with the candles closed since the last run
+    book = new_indicators().resume(indicator_state.get(symbol))
+    prev, yesterday = book.sync(candles, key="timestamp")
+    indicator_state[symbol] = book.state()
     
     # Yesterday = last completed bar
-    idx_yesterday = valid_indices[-1]
-    idx_prev = valid_indices[-2]
-    
-    dir_yesterday = directions[idx_yesterday]
-    dir_prev = directions[idx_prev]
-    st_yesterday = supertrends[idx_yesterday]
-    close_yesterday = closes[idx_yesterday]
+    dir_yesterday = yesterday["supertrend"]["direction"]
+    dir_prev = prev["supertrend"]["direction"]
+    st_yesterday = yesterday["supertrend"]["supertrend"]
+    close_yesterday = candles[-1]["close"]
     
     # Check for trend flips
     flip_to_uptrend = dir_prev > 0 and dir_yesterday < 0  # Red to Green
@@ -659,8 +554,7 @@ def analyze_stock(symbol: str, vix: Optional[float]) -> Dict[str, Any]:
             print(f"   ⚠️ {symbol}: VIX unavailable, allowing entry")
         
         # Check ATR% filter
-        atr = calculate_atr(highs, lows, closes, SUPERTREND_PERIOD)
-        atr_yesterday = atr[idx_yesterday] if not np.isnan(atr[idx_yesterday]) else 0
+        atr_yesterday = yesterday["atr"]
         atr_pct = (atr_yesterday / close_yesterday * 100) if close_yesterday > 0 else 0
         
         data["atr_pct"] = atr_pct
@@ -739,6 +633,7 @@ else:
 print("\n📁 Fetching current holdings...")
 holdings = get_holdings()
 tracked = load_json(POSITIONS_FILE, {})
+indicator_state = load_json(INDICATORS_FILE, {})
 
 # Filter holdings to only our strategy symbols
 strategy_holdings = {s: h for s, h in holdings.items() if s in SYMBOLS}
@@ -905,6 +800,7 @@ log_data = {
     "entries": entry_log,
     "positions_count": len(tracked),
 }
+save_json(INDICATORS_FILE, indicator_state)
 save_json(SIGNALS_LOG_FILE, log_data)
 
 # ═══════════════════════════════════════════════════════════════════════════════
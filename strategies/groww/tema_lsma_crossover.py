@@ -32,14 +32,20 @@ Position Sizing: 5% of 1,00,000 = ₹5,000 per position
 
 import json
 import os
+import sys
 import time
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Optional, Any
 
 import numpy as np
 import pyotp
 from growwapi import GrowwAPI
 
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+from utils.incremental import ADX, ATR, LSMA, TEMA, IndicatorSet
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONFIGURATION (TOTP Flow - No daily expiry, expires 2055)
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -73,6 +79,7 @@ HOME_DIR = os.path.expanduser("~")
 if HOME_DIR == "/" or not HOME_DIR:
     HOME_DIR = "/tmp"
 POSITIONS_FILE = os.path.join(HOME_DIR, ".groww_tema_lsma_positions.json")
+INDICATORS_FILE = os.path.join(HOME_DIR, ".groww_tema_lsma_indicators.json")
 SIGNALS_LOG_FILE = os.path.join(HOME_DIR, f".groww_tema_lsma_log_{datetime.now().strftime('%Y-%m-%d')}.json")
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -453,156 +460,19 @@ def calc_qty(price: float) -> int:
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
-def calculate_ema(values: List[float], period: int) -> List[float]:
-    """Calculate EMA using standard formula."""
-    n = len(values)
-    ema = [np.nan] * n
-    if n < period:
-        return ema
-    
-    # First EMA is SMA
-    ema[period - 1] = sum(values[:period]) / period
-    
-    # EMA formula: EMA = (Close - prev_EMA) * multiplier + prev_EMA
-    multiplier = 2 / (period + 1)
-    for i in range(period, n):
-        ema[i] = (values[i] - ema[i - 1]) * multiplier + ema[i - 1]
-    
-    return ema
-
-
-def calculate_tema(closes: List[float], period: int) -> List[float]:
-    """Calculate Triple EMA: 3*EMA1 - 3*EMA2 + EMA3."""
-    ema1 = calculate_ema(closes, period)
-    
-    # EMA of EMA1 (filter out NaN)
-    ema1_valid = [v if not np.isnan(v) else 0.0 for v in ema1]
-    ema2 = calculate_ema(ema1_valid, period)
-    
-    # EMA of EMA2
-    ema2_valid = [v if not np.isnan(v) else 0.0 for v in ema2]
-    ema3 = calculate_ema(ema2_valid, period)
-    
-    # TEMA = 3*EMA1 - 3*EMA2 + EMA3
-    n = len(closes)
-    tema = [np.nan] * n
-    for i in range(n):
-        if not np.isnan(ema1[i]) and not np.isnan(ema2[i]) and not np.isnan(ema3[i]):
-            tema[i] = 3 * ema1[i] - 3 * ema2[i] + ema3[i]
-    
-    return tema
-
-
-def calculate_lsma(closes: List[float], period: int) -> List[float]:
-    """Calculate Least Squares Moving Average (Linear Regression)."""
-    n = len(closes)
-    lsma = [np.nan] * n
-    if n < period:
-        return lsma
-    
-    # Precompute x statistics
-    x = np.arange(period, dtype=float)
-    x_mean = (period - 1) / 2.0
-    x_var = np.sum((x - x_mean) ** 2)
-    
-    for i in range(period - 1, n):
-        y = closes[i - period + 1:i + 1]
-        y_mean = np.mean(y)
-        slope = np.sum((x - x_mean) * (np.array(y) - y_mean)) / x_var
-        lsma[i] = slope * (period - 1) + (y_mean - slope * x_mean)
-    
-    return lsma
-
-
-def calculate_atr(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> List[float]:
-    """Calculate ATR using Wilder's smoothing."""
-    n = len(closes)
-    if n < 2:
-        return [np.nan] * n
-    
-    # Calculate True Range
-    tr = [highs[0] - lows[0]]
-    for i in range(1, n):
-        tr.append(max(
-            highs[i] - lows[i],
-            abs(highs[i] - closes[i - 1]),
-            abs(lows[i] - closes[i - 1])
-        ))
-    
-    # Calculate ATR with Wilder's smoothing
-    atr = [np.nan] * n
-    if n >= period:
-        atr[period - 1] = sum(tr[:period]) / period
-        for i in range(period, n):
-            atr[i] = (atr[i - 1] * (period - 1) + tr[i]) / period
-    
-    return atr
-
+def new_indicators() -> IndicatorSet:
+    """
+    Streaming TEMA/LSMA/ATR/ADX, the same implementations as the backtest.
 
-def calculate_adx(highs: List[float], lows: List[float], closes: List[float], period: int = 28) -> List[float]:
-    """Calculate ADX (Average Directional Index)."""
-    n = len(closes)
-    if n < period + 1:
-        return [np.nan] * n
-    
-    # Calculate +DM, -DM
-    plus_dm = [0.0] * n
-    minus_dm = [0.0] * n
-    
-    for i in range(1, n):
-        up_move = highs[i] - highs[i - 1]
-        down_move = lows[i - 1] - lows[i]
-        
-        if up_move > down_move and up_move > 0:
-            plus_dm[i] = up_move
-        if down_move > up_move and down_move > 0:
-            minus_dm[i] = down_move
-    
-    # Calculate ATR for TR smoothing
-    atr = calculate_atr(highs, lows, closes, period)
-    
-    # Smooth +DM and -DM with Wilder's
-    smooth_plus_dm = [np.nan] * n
-    smooth_minus_dm = [np.nan] * n
-    
-    if n >= period:
-        smooth_plus_dm[period - 1] = sum(plus_dm[:period])
-        smooth_minus_dm[period - 1] = sum(minus_dm[:period])
-        
-        for i in range(period, n):
-            smooth_plus_dm[i] = smooth_plus_dm[i - 1] - (smooth_plus_dm[i - 1] / period) + plus_dm[i]
-            smooth_minus_dm[i] = smooth_minus_dm[i - 1] - (smooth_minus_dm[i - 1] / period) + minus_dm[i]
-    
-    # Calculate +DI, -DI
-    plus_di = [np.nan] * n
-    minus_di = [np.nan] * n
-    
-    for i in range(n):
-        if not np.isnan(smooth_plus_dm[i]) and not np.isnan(atr[i]) and atr[i] > 0:
-            plus_di[i] = (smooth_plus_dm[i] / atr[i]) * 100
-            minus_di[i] = (smooth_minus_dm[i] / atr[i]) * 100
-    
-    # Calculate DX
-    dx = [np.nan] * n
-    for i in range(n):
-        if not np.isnan(plus_di[i]) and not np.isnan(minus_di[i]):
-            di_sum = plus_di[i] + minus_di[i]
-            if di_sum > 0:
-                dx[i] = abs(plus_di[i] - minus_di[i]) / di_sum * 100
-    
-    # Smooth DX to get ADX
-    adx = [np.nan] * n
-    valid_dx = [i for i in range(n) if not np.isnan(dx[i])]
-    
-    if len(valid_dx) >= period:
-        first_adx_idx = valid_dx[period - 1]
-        adx[first_adx_idx] = np.mean([dx[valid_dx[j]] for j in range(period)])
-        
-        for i in range(first_adx_idx + 1, n):
-            if not np.isnan(dx[i]) and not np.isnan(adx[i - 1]):
-                adx[i] = (adx[i - 1] * (period - 1) + dx[i]) / period
-    
-    return adx
+    State is saved per symbol in INDICATORS_FILE, so each run only feeds the
+    candles that closed since the previous run.
+    """
+    return IndicatorSet({
+        "tema": TEMA(TEMA_PERIOD),
+        "lsma": LSMA(LSMA_PERIOD),
+        "atr": ATR(ATR_PERIOD),
+        "adx": ADX(ADX_PERIOD),
+    })
 
 
 def analyze_stock(symbol: str) -> Dict[str, Any]:
@@ -617,30 +487,19 @@ def analyze_stock(symbol: str) -> Dict[str, Any]:
     if len(candles) < LSMA_PERIOD + 5:
         return {"action": None, "reason": "Insufficient data", "data": {}}
     
-    # Extract OHLC
-    highs = [c["high"] for c in candles]
-    lows = [c["low"] for c in candles]
-    closes = [c["close"] for c in candles]
-    
-    # Calculate indicators
-    tema = calculate_tema(closes, TEMA_PERIOD)
-    lsma = calculate_lsma(closes, LSMA_PERIOD)
-    atr = calculate_atr(highs, lows, closes, ATR_PERIOD)
-    adx = calculate_adx(highs, lows, closes, ADX_PERIOD)
-    
-    # Get last two valid bars (yesterday and day before)
-    n = len(closes)
-    idx_yesterday = n - 1
-    idx_prev = n - 2
-    
-    # Get indicator values
-    tema_yesterday = tema[idx_yesterday]
-    tema_prev = tema[idx_prev]
-    lsma_yesterday = lsma[idx_yesterday]
-    lsma_prev = lsma[idx_prev]
-    atr_yesterday = atr[idx_yesterday]
-    adx_yesterday = adx[idx_yesterday]
-    close_yesterday = closes[idx_yesterday]
+    # Update indicators with the candles closed since the last run
+    book = new_indicators().resume(indicator_state.get(symbol))
+    prev, yesterday = book.sync(candles, key="date")
+    indicator_state[symbol] = book.state()
+    
+    # Get indicator values (yesterday and day before)
+    tema_yesterday = yesterday["tema"]
+    tema_prev = prev["tema"]
+    lsma_yesterday = yesterday["lsma"]
+    lsma_prev = prev["lsma"]
+    atr_yesterday = yesterday["atr"]
+    adx_yesterday = yesterday["adx"]["adx"]
+    close_yesterday = candles[-1]["close"]
     
     # Check for valid indicators
     if any(np.isnan(v) for v in [tema_yesterday, tema_prev, lsma_yesterday, lsma_prev]):
@@ -742,6 +601,7 @@ if not is_entry_window:
 print("\n📁 Fetching current holdings...")
 holdings = get_holdings()
 tracked = load_json(POSITIONS_FILE, {})
+indicator_state = load_json(INDICATORS_FILE, {})
 
 # Filter holdings to only our strategy symbols
 strategy_holdings = {s: h for s, h in holdings.items() if s in SYMBOLS}
@@ -896,6 +756,7 @@ print(f"   Entries processed: {entries}")
 
 print("\n💾 Saving state...")
 save_json(POSITIONS_FILE, tracked)
+save_json(INDICATORS_FILE, indicator_state)
 
 # Append to daily log
 daily_log = load_json(SIGNALS_LOG_FILE, {"entries": [], "exits": []})
@@ -32,14 +32,19 @@ Backtest Results (Main Basket - 563 symbols):
 
 import json
 import os
+import sys
 import time
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import numpy as np
 import pyotp
 from growwapi import GrowwAPI
 
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+from utils.incremental import RSI, BollingerBands, IndicatorSet
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONFIGURATION (TOTP Flow - No daily expiry, expires 2055)
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -66,6 +71,7 @@ if HOME_DIR == "/" or not HOME_DIR:
     HOME_DIR = "/tmp"
 POSITIONS_FILE = os.path.join(HOME_DIR, ".groww_weekly_green_bb_positions.json")
 SIGNALS_FILE = os.path.join(HOME_DIR, ".groww_weekly_green_bb_signals.json")
+INDICATORS_FILE = os.path.join(HOME_DIR, ".groww_weekly_green_bb_indicators.json")
 
 # Main Basket - 563 symbols
 SYMBOLS = [
@@ -386,72 +392,18 @@ def get_weekly_candles(symbol: str, weeks: int = 25) -> List[Dict]:
         return []
 
 
-def calculate_bb_lower(candles: List[Dict], period: int = 20, sd: float = 2.0) -> Optional[float]:
-    """
-    Calculate Bollinger Band lower value from weekly candles.
-    Uses SMA as center line with sample std (ddof=1) to match TradingView.
-    Pure numpy implementation - no pandas required.
-    """
-    if len(candles) < period:
-        return None
-    
-    # Get last `period` closes as numpy array
-    closes = np.array([c["close"] for c in candles[-period:]])
-    sma = np.mean(closes)
-    # Use sample std (ddof=1) to match TradingView ta.stdev()
-    std = np.std(closes, ddof=1)
-    return sma - sd * std
-
-
-def calculate_weekly_sma(candles: List[Dict], period: int = 20) -> Optional[float]:
-    """
-    Calculate SMA from weekly candles (TP target).
-    Pure numpy implementation - no pandas required.
+def new_indicators() -> IndicatorSet:
     """
-    if len(candles) < period:
-        return None
-    
-    # Get last `period` closes as numpy array
-    closes = np.array([c["close"] for c in candles[-period:]])
-    return float(np.mean(closes))
-
+    Streaming weekly BB, SMA and RSI, the same implementations as the backtest.
 
-def calculate_weekly_rsi(candles: List[Dict], period: int = 14) -> Optional[float]:
-    """
-    Calculate RSI from weekly candles using Wilder's smoothing.
-    Pure numpy implementation - no pandas required.
+    State is saved per symbol in INDICATORS_FILE, so each run only feeds the
+    weeks that completed since the previous run.
     """
-    if len(candles) < period + 1:
-        return None
-    
-    closes = np.array([c["close"] for c in candles])
-    deltas = np.diff(closes)
-    
-    gains = np.where(deltas > 0, deltas, 0)
-    losses = np.where(deltas < 0, -deltas, 0)
-    
-    # Use Wilder's smoothing (EMA with alpha = 1/period)
-    alpha = 1.0 / period
-    
-    # Calculate initial average using SMA for first `period` values
-    if len(gains) < period:
-        return None
-    
-    avg_gain = np.mean(gains[:period])
-    avg_loss = np.mean(losses[:period])
-    
-    # Apply Wilder's smoothing for remaining values
-    for i in range(period, len(gains)):
-        avg_gain = alpha * gains[i] + (1 - alpha) * avg_gain
-        avg_loss = alpha * losses[i] + (1 - alpha) * avg_loss
-    
-    if avg_loss == 0:
-        return 100.0 if avg_gain > 0 else None
-    
-    rs = avg_gain / avg_loss
-    rsi = 100.0 - (100.0 / (1 + rs))
-    
-    return float(rsi) if not np.isnan(rsi) else None
+    return IndicatorSet({
+        "bb": BollingerBands(BB_PERIOD, BB_SD),
+        "sma": BollingerBands(SMA_PERIOD, BB_SD),
+        "rsi": RSI(RSI_PERIOD),
+    })
 
 
 def check_signal(symbol: str) -> Optional[Dict]:
@@ -476,12 +428,16 @@ def check_signal(symbol: str) -> Optional[Dict]:
     last_week = candles[-1]
     prev_week = candles[-2]
     
-    # Calculate indicators using all completed candles
-    bb_lower = calculate_bb_lower(candles, BB_PERIOD, BB_SD)
-    weekly_sma = calculate_weekly_sma(candles, SMA_PERIOD)
-    weekly_rsi = calculate_weekly_rsi(candles, RSI_PERIOD)
+    # Update indicators with the weeks completed since the last run
+    book = new_indicators().resume(indicator_state.get(symbol))
+    latest = book.sync(candles, key="timestamp")[-1]
+    indicator_state[symbol] = book.state()
+    
+    bb_lower = latest["bb"]["lower"]
+    weekly_sma = latest["sma"]["middle"]
+    weekly_rsi = latest["rsi"]
     
-    if bb_lower is None or weekly_sma is None or weekly_rsi is None:
+    if bb_lower != bb_lower or weekly_sma != weekly_sma:  # NaN during warm-up
         return None
     
     # Check conditions
@@ -606,6 +562,7 @@ if not is_market:
 print("\n📊 Checking existing positions...")
 
 positions = load_json(POSITIONS_FILE, {})
+indicator_state = load_json(INDICATORS_FILE, {})
 holdings = get_holdings()
 exits = []
 positions_to_remove = []
@@ -728,6 +685,7 @@ for sym in SYMBOLS:
 
 print(f"\n   Total scanned: {scanned}")
 print(f"   Signals found: {len(signals)}")
+save_json(INDICATORS_FILE, indicator_state)
 
 if signals:
     # Sort by RSI (lower is more oversold)
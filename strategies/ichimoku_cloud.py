@@ -237,7 +237,7 @@ class IchimokuCloud(Strategy):
 
         return False
 
-    def on_entry(self, entry_time, entry_price, state):
+    def on_entry_idx(self, idx, entry_time, entry_price, state):
         """
         Calculate stop loss when entering a trade.
         
@@ -248,10 +248,6 @@ class IchimokuCloud(Strategy):
             return {}
 
         try:
-            idx = self.data.index.get_loc(entry_time)
-            if isinstance(idx, slice):
-                idx = idx.start
-
             if idx is not None and idx >= 0:
                 # Get cloud boundaries
                 span_a = self._compute_senkou_span_a(idx)
@@ -275,7 +271,7 @@ class IchimokuCloud(Strategy):
 
         return {}
 
-    def on_bar(self, ts, row, state):
+    def on_bar_idx(self, idx, ts, row, state):
         """
         Main strategy logic on each bar.
 
@@ -284,13 +280,6 @@ class IchimokuCloud(Strategy):
         
         Optional filters: price above cloud, ATR, NIFTY50, EMA200
         """
-        try:
-            idx = self.data.index.get_loc(ts)
-            if isinstance(idx, slice):
-                idx = idx.start
-        except (KeyError, AttributeError):
-            return {"enter_long": False, "exit_long": False, "signal_reason": ""}
-
         if idx is None or idx < 1:
             return {"enter_long": False, "exit_long": False, "signal_reason": ""}
 
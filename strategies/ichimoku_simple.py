@@ -223,7 +223,7 @@ class IchimokuSimple(Strategy):
             color="darkgray",
         )
 
-    def on_entry(self, entry_time, entry_price, state):
+    def on_entry_idx(self, idx, entry_time, entry_price, state):
         """
         Calculate ATR-based stop loss when entering a trade.
 
@@ -234,12 +234,6 @@ class IchimokuSimple(Strategy):
             return {}
 
         try:
-            idx_result = self.data.index.get_loc(entry_time)
-            if isinstance(idx_result, slice):
-                idx = idx_result.start
-            else:
-                idx = idx_result
-
             if idx is not None and idx >= 0 and idx < len(self.atr_trailing):
                 atr_value = self.atr_trailing[idx]
                 if atr_value is not None and not np.isnan(atr_value) and atr_value > 0:
@@ -250,19 +244,8 @@ class IchimokuSimple(Strategy):
 
         return {}
 
-    def on_bar(self, ts, row, state):
+    def on_bar_idx(self, idx, ts, row, state):
         """Strategy logic using declared indicators."""
-        # Get current position in the data
-        try:
-            idx_result = self.data.index.get_loc(ts)
-            # Handle case where get_loc returns a slice (duplicate index)
-            if isinstance(idx_result, slice):
-                idx = idx_result.start
-            else:
-                idx = idx_result
-        except (KeyError, AttributeError):
-            return {"enter_long": False, "exit_long": False, "signal_reason": ""}
-
         if idx is None or idx < 2 or len(self.conversion_line) < 2:
             return {"enter_long": False, "exit_long": False, "signal_reason": ""}
 
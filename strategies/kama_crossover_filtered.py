@@ -201,14 +201,8 @@ class KAMACrossoverFiltered(Strategy):
                 return x[i]
         return x
 
-    def on_entry(self, entry_time, entry_price, state):
+    def on_entry_idx(self, idx, entry_time, entry_price, state):
         """Configure entry stop loss."""
-        try:
-            idx_result = self.data.index.get_loc(entry_time)
-            idx = idx_result.start if isinstance(idx_result, slice) else idx_result
-        except (KeyError, AttributeError):
-            return {}
-
         if idx is None or idx < 1:
             return {}
             
@@ -219,14 +213,8 @@ class KAMACrossoverFiltered(Strategy):
         fixed_stop = entry_price - (self.atr_multiplier * atr_value)
         return {"stop": fixed_stop}
 
-    def on_bar(self, ts, row, state):
+    def on_bar_idx(self, idx, ts, row, state):
         """Execute trading logic on each bar."""
-        try:
-            idx_result = self.data.index.get_loc(ts)
-            idx = idx_result.start if isinstance(idx_result, slice) else idx_result
-        except (KeyError, AttributeError):
-            return {"enter_long": False, "exit_long": False, "signal_reason": ""}
-
         if idx is None or idx < 1:
             return {"enter_long": False, "exit_long": False, "signal_reason": ""}
 
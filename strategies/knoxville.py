@@ -190,7 +190,7 @@ class KnoxvilleStrategy(Strategy):
             overlay=True,
         )
 
-    def on_entry(self, entry_time, entry_price, state):
+    def on_entry_idx(self, idx, entry_time, entry_price, state):
         """
         Calculate ATR-based stop loss when entering a trade.
 
@@ -202,12 +202,6 @@ class KnoxvilleStrategy(Strategy):
             return {}
 
         try:
-            idx_result = self.data.index.get_loc(entry_time)
-            if isinstance(idx_result, slice):
-                idx = idx_result.start
-            else:
-                idx = idx_result
-
             if idx is not None and idx >= 0 and idx < len(self.atr):
                 atr_value = self.atr[idx]
                 if atr_value is not None and not np.isnan(atr_value) and atr_value > 0:
@@ -218,7 +212,7 @@ class KnoxvilleStrategy(Strategy):
 
         return {}
 
-    def on_bar(self, ts, row, state):
+    def on_bar_idx(self, idx, ts, row, state):
         """
         Execute trading logic on each bar.
 
@@ -228,6 +222,7 @@ class KnoxvilleStrategy(Strategy):
         Exit: Bearish KD or Sell Reversal Tab
 
         Args:
+            idx: Bar position in the prepared data
             ts: Timestamp
             row: Current bar data
             state: Trading state
@@ -235,15 +230,6 @@ class KnoxvilleStrategy(Strategy):
         Returns:
             Dictionary with entry/exit signals
         """
-        try:
-            idx_result = self.data.index.get_loc(ts)
-            if isinstance(idx_result, slice):
-                idx = idx_result.start
-            else:
-                idx = idx_result
-        except (KeyError, AttributeError):
-            return {"enter_long": False, "exit_long": False, "signal_reason": ""}
-
         # Need enough bars for all indicators
         min_bars = max(
             self.knox_rsi_period,
@@ -141,21 +141,11 @@ class StochRSIPyramidLongStrategy(Strategy):
         """Accessor: safely get element at index i from Series or array."""
         return x.iloc[i] if hasattr(x, "iloc") else x[i]
 
-    def on_bar(self, ts, row, state):
+    def on_bar_idx(self, idx, ts, row, state):
         """Generate signals on each bar using exact Pine Script v6 logic.
         
         EXACT REPLICA of Pine Script logic - follows sections 2-6 from the script.
         """
-        # Get index of current bar
-        try:
-            idx_result = self.data.index.get_loc(ts)
-            if isinstance(idx_result, slice):
-                idx = idx_result.start
-            else:
-                idx = idx_result
-        except (KeyError, AttributeError):
-            return {"enter_long": False, "exit_long": False, "signal_reason": ""}
-
         # Need at least 4 bars for proper lookback (decision made on idx-1)
         if idx is None or idx < 3:
             return {"enter_long": False, "exit_long": False, "signal_reason": ""}
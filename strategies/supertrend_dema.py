@@ -22,9 +22,9 @@ EXIT CONDITIONS (ONLY on flips, independent of DEMA):
 import numpy as np
 import pandas as pd
 
-from core.loaders import load_india_vix, load_nifty200
+from core.market_context import market_series
 from core.strategy import Strategy
-from utils import EMA, RSI
+from utils import RSI
 from utils.indicators import ATR, CHOP, DEMA, Supertrend
 
 
@@ -158,35 +158,25 @@ class SupertrendDEMAStrategy(Strategy):
             overlay=False,
         )
 
-        # Load India VIX for sentiment filter
+        # Load India VIX for sentiment filter, aligned by date using forward-fill
         try:
-            vix_df = load_india_vix()
-            # Get VIX close values
-            vix_close = vix_df['close'] if 'close' in vix_df.columns else vix_df['Close']
-            vix_series = pd.Series(vix_close.values, index=pd.to_datetime(vix_df.index).normalize())
-            # Align VIX with stock data by date using forward-fill
-            stock_dates = pd.to_datetime(self.data.index).normalize()
-            self.vix_aligned = vix_series.reindex(stock_dates, method='ffill')
+            vix = market_series("india_vix")
+            self.vix_aligned = vix.align(self.data.index, how="asof", normalize=True)
         except Exception:
             # If VIX data not available, VIX filter will return None and be skipped
             self.vix_aligned = None
 
         # Load NIFTY200 > EMA50 for market regime filter
         try:
-            nifty200_df = load_nifty200()
-            nifty200_close = nifty200_df['close'].values
-            nifty200_ema50 = EMA(nifty200_close, 50)
-            nifty200_above_ema50 = pd.Series(
-                nifty200_close > nifty200_ema50,
-                index=pd.to_datetime(nifty200_df.index).normalize()
+            nifty200 = market_series("nifty200")
+            self.nifty200_above_ema50 = nifty200.align(
+                self.data.index, nifty200.above_ema(50), how="asof", normalize=True
             )
-            stock_dates = pd.to_datetime(self.data.index).normalize()
-            self.nifty200_above_ema50 = nifty200_above_ema50.reindex(stock_dates, method='ffill')
         except Exception:
             # If NIFTY200 data not available, filter will be skipped
             self.nifty200_above_ema50 = None
 
-    def on_entry(self, entry_time, entry_price, state):
+    def on_entry_idx(self, idx, entry_time, entry_price, state):
         """
         Calculate ATR-based stop loss when entering a trade.
 
@@ -199,12 +189,6 @@ class SupertrendDEMAStrategy(Strategy):
             return {}
 
         try:
-            idx_result = self.data.index.get_loc(entry_time)
-            if isinstance(idx_result, slice):
-                idx = idx_result.start
-            else:
-                idx = idx_result
-
             # Use previous bar's ATR for decision (avoid look-ahead)
             decision_idx = idx - 1 if idx > 0 else idx
             if decision_idx >= 0 and decision_idx < len(self.atr):
@@ -233,7 +217,7 @@ class SupertrendDEMAStrategy(Strategy):
             return None
         
         try:
-            val = self.vix_aligned.iloc[idx]
+            val = self.vix_aligned[idx]
             return val if not np.isnan(val) else None
         except (IndexError, KeyError):
             return None
@@ -248,24 +232,13 @@ class SupertrendDEMAStrategy(Strategy):
         """Accessor: safely get element at index i from Series or array."""
         return x.iloc[i] if hasattr(x, "iloc") else x[i]
 
-    def on_bar(self, ts, row, state):
+    def on_bar_idx(self, idx, ts, row, state):
         """
         Generate signals on each bar.
         
         Entry: ANY bar where trend + filter conditions are met.
         Exit: ONLY on trend flips (independent of DEMA).
         """
-        # Get index of current bar
-        try:
-            idx_result = self.data.index.get_loc(ts)
-            if isinstance(idx_result, slice):
-                idx = idx_result.start
-            else:
-                idx = idx_result
-        except (KeyError, AttributeError):
-            return {"enter_long": False, "exit_long": False, 
-                    "enter_short": False, "exit_short": False, "signal_reason": ""}
-
         # Need at least 2 bars for flip detection
         if idx is None or idx < 1:
             return {"enter_long": False, "exit_long": False,
@@ -345,7 +318,7 @@ class SupertrendDEMAStrategy(Strategy):
         if self.use_nifty200_ema_filter:
             if self.nifty200_above_ema50 is not None:
                 try:
-                    nifty200_above = self.nifty200_above_ema50.iloc[idx]
+                    nifty200_above = self.nifty200_above_ema50[idx]
                     nifty200_filter_ok = bool(nifty200_above) if not pd.isna(nifty200_above) else False
                 except (IndexError, KeyError):
                     nifty200_filter_ok = False
@@ -23,7 +23,7 @@ KEY DESIGN DECISIONS:
 import numpy as np
 import pandas as pd
 
-from core.loaders import load_india_vix
+from core.market_context import market_series
 from core.strategy import Strategy
 from utils.indicators import ATR, Supertrend
 
@@ -114,14 +114,8 @@ class SupertrendVixAtrStrategy(Strategy):
     def _load_vix_data(self):
         """Load India VIX and align with stock data dates."""
         try:
-            vix_df = load_india_vix()
-            vix_close = vix_df['close'] if 'close' in vix_df.columns else vix_df['Close']
-            vix_series = pd.Series(
-                vix_close.values, 
-                index=pd.to_datetime(vix_df.index).normalize()
-            )
-            stock_dates = pd.to_datetime(self.data.index).normalize()
-            return vix_series.reindex(stock_dates, method='ffill')
+            vix = market_series("india_vix")
+            return vix.align(self.data.index, how="asof", normalize=True)
         except Exception:
             return None
 
@@ -130,7 +124,7 @@ class SupertrendVixAtrStrategy(Strategy):
         if self.vix_aligned is None:
             return None
         try:
-            val = self.vix_aligned.iloc[idx]
+            val = self.vix_aligned[idx]
             return float(val) if not np.isnan(val) else None
         except (IndexError, KeyError):
             return None
@@ -147,7 +141,7 @@ class SupertrendVixAtrStrategy(Strategy):
         except (IndexError, KeyError):
             return 0.0
 
-    def on_entry(self, entry_time, entry_price, state):
+    def on_entry_idx(self, idx, entry_time, entry_price, state):
         """
         Calculate ATR-based stop loss when entering a trade.
         Uses signal bar ATR (bar before entry bar).
@@ -156,10 +150,6 @@ class SupertrendVixAtrStrategy(Strategy):
             return {}
 
         try:
-            idx = self.data.index.get_loc(entry_time)
-            if isinstance(idx, slice):
-                idx = idx.start
-            
             # Signal bar = entry bar - 1
             signal_idx = max(0, idx - 1)
             atr_val = self.atr[signal_idx]
@@ -172,21 +162,13 @@ class SupertrendVixAtrStrategy(Strategy):
 
         return {}
 
-    def on_bar(self, ts, row, state):
+    def on_bar_idx(self, idx, ts, row, state):
         """
         Generate trading signals on each bar.
         
         Signal bar (idx): Where decision is made at bar close
         Entry bar (idx+1): Where entry happens at open
         """
-        # Get bar index
-        try:
-            idx = self.data.index.get_loc(ts)
-            if isinstance(idx, slice):
-                idx = idx.start
-        except (KeyError, AttributeError):
-            return self._no_signal()
-
         # Need at least 2 bars for trend flip detection
         if idx < 1:
             return self._no_signal()
@@ -14,7 +14,8 @@ No lookahead bias - all indicators use current bar data only.
 import numpy as np
 import pandas as pd
 
-from core.strategy import Strategy
+from core.strategy import Strategy, crossover, crossunder
+from core.vectorized import SweepSignals
 from utils.indicators import ATR, ADX, TEMA, LSMA
 
 
@@ -60,16 +61,12 @@ class TemaLsmaCrossover(Strategy):
 
         return super().prepare(df)
 
-    def on_entry(self, entry_time, entry_price, state):
+    def on_entry_idx(self, idx, entry_time, entry_price, state):
         """Calculate ATR-based stop loss at entry."""
         if not self.use_atr_stop:
             return {}
         
         try:
-            idx = self.data.index.get_loc(entry_time)
-            if isinstance(idx, slice):
-                idx = idx.start
-            
             if idx is not None and idx >= 0 and self.atr is not None:
                 atr_val = self.atr[idx]
                 if atr_val is not None and not np.isnan(atr_val) and atr_val > 0:
@@ -80,14 +77,93 @@ class TemaLsmaCrossover(Strategy):
         
         return {}
 
-    def on_bar(self, ts, row, state):
-        """Trading logic."""
-        try:
-            idx_result = self.data.index.get_loc(ts)
-            idx = idx_result.start if isinstance(idx_result, slice) else idx_result
-        except (KeyError, AttributeError):
-            return {"enter_long": False, "exit_long": False, "signal_reason": ""}
+    def signals(self, df: pd.DataFrame):
+        """Vectorized equivalent of on_bar() for the bulk engine path."""
+        close = df.close.to_numpy(dtype=float)
+        ready = np.arange(len(close)) >= self.slow_length
+        bull_cross = ready & np.concatenate(
+            ([False], crossover(self.fast_line, self.slow_line))
+        )
+        bear_cross = ready & np.concatenate(
+            ([False], crossunder(self.fast_line, self.slow_line))
+        )
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            atr_pct = np.where(np.isnan(self.atr), 0.0, (self.atr / close) * 100)
+        enter_long = (
+            bull_cross
+            & (close > 0)
+            & (atr_pct >= self.atr_14_min)
+            & (self.adx_28 >= self.adx_28_min)
+        )
+        signal_reason = np.where(
+            bear_cross, "XDN", np.where(enter_long, "Bull Cross", "")
+        )
+        return enter_long, bear_cross, None, signal_reason
+
+    @classmethod
+    def sweep_signals(cls, df: pd.DataFrame, grid: pd.DataFrame) -> SweepSignals:
+        """signals() for a whole parameter grid; indicators computed once per value."""
+        close = df.close.to_numpy(dtype=float)
+        high = df.high.to_numpy(dtype=float)
+        low = df.low.to_numpy(dtype=float)
+        n = len(close)
+
+        def column(name):
+            values = grid[name] if name in grid else [getattr(cls, name)] * len(grid)
+            return np.asarray(values)
+
+        fast_len = column("fast_length").astype(int)
+        slow_len = column("slow_length").astype(int)
+        fast = {k: TEMA(close, k) for k in np.unique(fast_len).tolist()}
+        slow = {k: LSMA(close, k) for k in np.unique(slow_len).tolist()}
+        atr = ATR(high, low, close, 14)
+        adx_28 = ADX(high, low, close, 28)["adx"]
+
+        # One crossover pair per distinct (fast, slow) combination
+        pairs, pair_of_row = np.unique(
+            np.stack([fast_len, slow_len], axis=1), axis=0, return_inverse=True
+        )
+        bull = np.zeros((len(pairs), n), dtype=bool)
+        bear = np.zeros((len(pairs), n), dtype=bool)
+        for k, (f, sl) in enumerate(pairs.tolist()):
+            bull[k, 1:] = crossover(fast[f], slow[sl])
+            bear[k, 1:] = crossunder(fast[f], slow[sl])
+
+        # Threshold filters broadcast over the (params x bars) matrix
+        ready = np.arange(n)[None, :] >= slow_len[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            atr_pct = np.where(np.isnan(atr), 0.0, (atr / close) * 100)
+        exit_long = ready & bear[pair_of_row.ravel()]
+        enter_long = (
+            ready
+            & bull[pair_of_row.ravel()]
+            & (close > 0)[None, :]
+            & (atr_pct[None, :] >= column("atr_14_min").astype(float)[:, None])
+            & (adx_28[None, :] >= column("adx_28_min").astype(float)[:, None])
+        )
 
+        strategies = []
+        for params, f, sl in zip(grid.to_dict("records"), fast_len, slow_len):
+            strategy = cls()
+            for key, value in params.items():
+                setattr(strategy, key, value)
+            strategy.data = df
+            strategy.fast_line = fast[int(f)]
+            strategy.slow_line = slow[int(sl)]
+            strategy.atr = atr
+            strategy.adx_28 = adx_28
+            strategies.append(strategy)
+        return SweepSignals(
+            enter_long,
+            exit_long,
+            strategies,
+            entry_reason="Bull Cross",
+            exit_reason="XDN",
+        )
+
+    def on_bar_idx(self, idx, ts, row, state):
+        """Trading logic."""
         if idx < self.slow_length:
             return {"enter_long": False, "exit_long": False, "signal_reason": ""}
 
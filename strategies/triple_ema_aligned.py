@@ -96,7 +96,7 @@ class TripleEMAAlignedStrategy(Strategy):
             overlay=False,
         )
 
-    def on_entry(self, entry_time, entry_price, state):
+    def on_entry_idx(self, idx, entry_time, entry_price, state):
         """
         Calculate ATR-based stop loss when entering a trade.
 
@@ -106,12 +106,6 @@ class TripleEMAAlignedStrategy(Strategy):
             return {}
 
         try:
-            idx_result = self.data.index.get_loc(entry_time)
-            if isinstance(idx_result, slice):
-                idx = idx_result.start
-            else:
-                idx = idx_result
-
             if idx is not None and idx >= 0 and idx < len(self.atr):
                 atr_value = self.atr[idx]
                 if atr_value is not None and not np.isnan(atr_value) and atr_value > 0:
@@ -122,7 +116,7 @@ class TripleEMAAlignedStrategy(Strategy):
 
         return {}
 
-    def on_bar(self, ts, row, state):
+    def on_bar_idx(self, idx, ts, row, state):
         """
         Execute trading logic on each bar.
 
@@ -130,6 +124,7 @@ class TripleEMAAlignedStrategy(Strategy):
         Exit: Price > EMA(20) > EMA(50) > EMA(200) (bearish alignment)
 
         Args:
+            idx: Bar position in the prepared data
             ts: Timestamp
             row: Current bar data
             state: Trading state
@@ -137,15 +132,6 @@ class TripleEMAAlignedStrategy(Strategy):
         Returns:
             Dictionary with entry/exit signals and reasons
         """
-        try:
-            idx_result = self.data.index.get_loc(ts)
-            if isinstance(idx_result, slice):
-                idx = idx_result.start
-            else:
-                idx = idx_result
-        except (KeyError, AttributeError):
-            return {"enter_long": False, "exit_long": False, "signal_reason": ""}
-
         # Need enough bars for all indicators
         min_bars = max(
             self.ema_fast_period,
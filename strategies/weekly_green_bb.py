@@ -267,17 +267,14 @@ class WeeklyGreenBBStrategy(Strategy):
         
         return False
 
-    def _is_first_day_of_week(self, current_date) -> bool:
-        """Check if this is the first trading day of the week."""
+    def _is_first_day_of_week(self, idx: int) -> bool:
+        """Check if bar ``idx`` is the first trading day of the week."""
         # Get previous trading day
         try:
-            idx = self.data.index.get_loc(current_date)
-            # Handle case where get_loc returns a slice (duplicate dates)
-            if isinstance(idx, slice):
-                idx = idx.start
             if idx == 0:
                 return True
             
+            current_date = self.data.index[idx]
             prev_date = self.data.index[idx - 1]
             
             # Check if previous day was in a different week
@@ -296,7 +293,7 @@ class WeeklyGreenBBStrategy(Strategy):
         stop_loss = entry_price * (1 - self.sl_pct)
         return {"stop": stop_loss}
 
-    def on_bar(self, ts, row, state) -> Dict[str, Any]:
+    def on_bar_idx(self, idx, ts, row, state) -> Dict[str, Any]:
         """Trading logic executed on each bar."""
         result = {
             "enter_long": False,
@@ -309,7 +306,7 @@ class WeeklyGreenBBStrategy(Strategy):
         # ===== ENTRY LOGIC =====
         if not in_position:
             # Check if this is first day of week and previous week had signal
-            if self._is_first_day_of_week(ts) and self._was_signal_previous_week(ts):
+            if self._is_first_day_of_week(idx) and self._was_signal_previous_week(ts):
                 result["enter_long"] = True
                 result["signal_reason"] = "Weekly Green BB Signal"
         
@@ -222,16 +222,6 @@ class WeeklyRotationStrategy(Strategy):
         
         return True
     
-    def _get_idx(self, ts) -> Optional[int]:
-        """Get index for timestamp."""
-        try:
-            idx = self.data.index.get_loc(ts)
-            if isinstance(idx, slice):
-                idx = idx.start
-            return idx
-        except (KeyError, AttributeError):
-            return None
-    
     def on_entry(self, entry_time, entry_price, state) -> Dict[str, Any]:
         """
         Calculate initial stop loss on entry.
@@ -250,7 +240,7 @@ class WeeklyRotationStrategy(Strategy):
         # Initial stop is the fixed stop (trailing stop will be updated in on_bar)
         return {"stop": fixed_stop}
     
-    def on_bar(self, ts, row, state) -> Dict[str, Any]:
+    def on_bar_idx(self, idx, ts, row, state) -> Dict[str, Any]:
         """
         Generate entry/exit signals on each bar.
         
@@ -278,13 +268,6 @@ class WeeklyRotationStrategy(Strategy):
             self._weeks_entered = set()
             self._weeks_exited = set()
         
-        try:
-            idx = self.data.index.get_loc(ts)
-            if isinstance(idx, slice):
-                idx = idx.start
-        except (KeyError, AttributeError):
-            return result
-        
         if idx is None or idx < 1:
             return result
         
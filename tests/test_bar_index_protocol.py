@@ -0,0 +1,131 @@
+"""
+Tests for the position-aware strategy hooks (``on_bar_idx`` / ``on_entry_idx``).
+
+The engine passes each bar's integer position; strategies written against the
+timestamp-only ``on_bar`` / ``on_entry`` keep working through the default
+adapters, in both directions.
+"""
+
+import warnings
+
+import pandas as pd
+import pytest
+
+from core.config import BrokerConfig
+from core.engine import BacktestEngine
+from core.registry import make_strategy
+from core.strategy import Strategy, indexed_hooks
+from tests.conftest import generate_ohlcv_data
+
+
+def _run(df, strategy, mode="array"):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return BacktestEngine(
+            df, strategy, BrokerConfig(), symbol="TEST", mode=mode
+        ).run()
+
+
+@pytest.fixture(scope="module")
+def df():
+    return generate_ohlcv_data(n_days=600, volatility=0.03, seed=5)
+
+
+class Recorder(Strategy):
+    """Enters every fifth bar and exits two bars later, recording positions."""
+
+    def prepare(self, df):
+        self.data = df
+        self.bars = []
+        self.entries = []
+        return super().prepare(df)
+
+    def on_bar_idx(self, i, ts, row, state):
+        self.bars.append((i, ts))
+        return {"enter_long": i % 5 == 0, "exit_long": i % 5 == 2}
+
+    def on_entry_idx(self, i, entry_time, entry_price, state):
+        self.entries.append((i, entry_time))
+        return {}
+
+
+class TimestampOnly(Strategy):
+    def on_bar(self, ts, row, state):
+        return {"enter_long": state["qty"] == 0, "exit_long": state["qty"] > 0}
+
+
+class RecorderWithOverride(Recorder):
+    """A timestamp-only ``on_bar`` in a subclass wins over the parent's hook."""
+
+    def on_bar(self, ts, row, state):
+        return {"enter_long": False, "exit_long": False}
+
+
+@pytest.mark.parametrize("mode", ["series", "array"])
+def test_engine_passes_bar_positions(df, mode):
+    strategy = Recorder()
+    trades, _, _ = _run(df, strategy, mode)
+
+    assert [i for i, _ in strategy.bars] == list(range(len(df)))
+    assert all(df.index[i] == ts for i, ts in strategy.bars)
+    assert strategy.entries
+    assert all(df.index[i] == t for i, t in strategy.entries)
+    assert [t for _, t in strategy.entries] == list(trades["entry_time"])
+
+
+def test_timestamp_hooks_still_supported(df):
+    trades, _, _ = _run(df, TimestampOnly())
+    assert len(trades) > 0
+
+    strategy = TimestampOnly()
+    on_bar, _ = indexed_hooks(strategy)
+    assert on_bar(0, df.index[0], df.iloc[0], {"qty": 0})["enter_long"]
+
+
+def test_subclass_on_bar_overrides_indexed_parent(df):
+    trades, _, _ = _run(df, RecorderWithOverride())
+    assert trades.empty
+
+
+def test_on_bar_looks_up_position_for_indexed_strategies(df):
+    strategy = Recorder()
+    strategy.prepare(df)
+    act = strategy.on_bar(df.index[10], df.iloc[10], {"qty": 0})
+    assert act["enter_long"] and strategy.bars == [(10, df.index[10])]
+
+    strategy.on_entry(df.index[11], 100.0, {})
+    assert strategy.entries == [(11, df.index[11])]
+
+    missing = strategy.on_bar(pd.Timestamp("1990-01-01"), df.iloc[0], {"qty": 0})
+    assert not missing["enter_long"] and not missing["exit_long"]
+
+
+def test_bar_index_uses_first_duplicate():
+    index = pd.DatetimeIndex(["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-03"])
+    strategy = Strategy()
+    strategy.prepare(pd.DataFrame({"close": [1.0, 2.0, 3.0, 4.0]}, index=index))
+    assert strategy.bar_index(index[1]) == 1
+    assert strategy.bar_index(index[3]) == 3
+    with pytest.raises(KeyError):
+        strategy.bar_index(pd.Timestamp("2023-12-31"))
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["tema_lsma_crossover", "ichimoku_simple", "kama_crossover_filtered"],
+)
+def test_builtin_strategies_match_timestamp_lookup(df, name):
+    """Migrated strategies give the same results when driven through ``on_bar``."""
+    base = type(make_strategy(name))
+
+    class ViaTimestamp(base):
+        def on_bar(self, ts, row, state):
+            return super().on_bar(ts, row, state)
+
+        def on_entry(self, entry_time, entry_price, state):
+            return super().on_entry(entry_time, entry_price, state)
+
+    expected = _run(df, make_strategy(name))
+    actual = _run(df, ViaTimestamp())
+    for exp, act in zip(expected, actual):
+        pd.testing.assert_frame_equal(exp, act, check_exact=True)
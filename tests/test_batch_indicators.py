@@ -0,0 +1,153 @@
+"""
+Tests for the batched panel indicators (utils/batch.py).
+
+Every row of a batched result must match the 1-D indicator run on that
+symbol's own series, for ragged panels with late listings, delistings, gaps
+and empty rows.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.conftest import generate_ohlcv_data
+from utils import batch, indicators
+
+RTOL = 1e-12
+
+
+@pytest.fixture(scope="module")
+def frames():
+    data = {}
+    # (start offset, bars): full history, late listings, an early delisting
+    for k, (offset, bars) in enumerate([(0, 900), (150, 750), (600, 300), (0, 500)]):
+        df = generate_ohlcv_data(n_days=bars, volatility=0.02 + 0.005 * k, seed=k)
+        df.index = pd.bdate_range("2020-01-01", periods=900)[offset : offset + bars]
+        data[f"SYM{k}"] = df
+    data["SYM1"].iloc[300, data["SYM1"].columns.get_loc("close")] = np.nan
+    data["SYM4"] = generate_ohlcv_data(n_days=10, seed=9).iloc[:0]
+    return data
+
+
+@pytest.fixture(scope="module")
+def panels(frames):
+    return {
+        col: batch.panel_from_frames(frames, col) for col in ("high", "low", "close")
+    }
+
+
+def _rows(frames, symbols, index, column="close"):
+    """Each symbol's own 1-D series and its column positions in the panel."""
+    for row, symbol in enumerate(symbols):
+        df = frames[symbol]
+        yield row, df, index.get_indexer(df.index)
+
+
+def _assert_rows(result, frames, symbols, index, single):
+    assert result.shape == (len(symbols), len(index))
+    for row, df, cols in _rows(frames, symbols, index):
+        expected = np.full(len(index), np.nan)
+        expected[cols] = single(df)
+        np.testing.assert_array_equal(np.isnan(result[row]), np.isnan(expected))
+        np.testing.assert_allclose(result[row], expected, rtol=RTOL, atol=1e-9)
+
+
+def test_panel_from_frames(frames, panels):
+    closes, symbols, index = panels["close"]
+    assert symbols == ["SYM0", "SYM1", "SYM2", "SYM3"]
+    assert len(index) == 900 and index.is_monotonic_increasing
+    assert np.isnan(closes[2, :600]).all() and np.isnan(closes[3, 500:]).all()
+    np.testing.assert_array_equal(closes[2, 600:], frames["SYM2"]["close"].to_numpy())
+
+
+@pytest.mark.parametrize(
+    "name, args",
+    [
+        ("SMA", (20,)),
+        ("EMA", (1,)),
+        ("EMA", (50,)),
+        ("DEMA", (30,)),
+        ("TEMA", (25,)),
+        ("WMA", (10,)),
+        ("LSMA", (100,)),
+        ("LSMA", (400,)),
+        ("RSI", (14,)),
+        ("Momentum", (10,)),
+    ],
+)
+def test_batched_matches_single_series(frames, panels, name, args):
+    closes, symbols, index = panels["close"]
+    single = getattr(indicators, name)
+    _assert_rows(
+        getattr(batch, name)(closes, *args),
+        frames,
+        symbols,
+        index,
+        lambda df: single(df["close"].to_numpy(dtype=float), *args),
+    )
+
+
+def test_ema_wilder_alpha_and_bands(frames, panels):
+    closes, symbols, index = panels["close"]
+    _assert_rows(
+        batch.EMA(closes, 14, alpha=1 / 14),
+        frames,
+        symbols,
+        index,
+        lambda df: indicators.EMA(df["close"].to_numpy(), 14, alpha=1 / 14),
+    )
+    bands = batch.BollingerBands(closes, 20, 2)
+    for key in ("upper", "middle", "lower"):
+        _assert_rows(
+            bands[key],
+            frames,
+            symbols,
+            index,
+            lambda df: indicators.BollingerBands(df["close"].to_numpy(), 20, 2)[key],
+        )
+
+
+def test_batched_atr(frames, panels):
+    (highs, *_), (lows, *_), (closes, symbols, index) = (
+        panels["high"],
+        panels["low"],
+        panels["close"],
+    )
+    _assert_rows(
+        batch.ATR(highs, lows, closes, 14),
+        frames,
+        symbols,
+        index,
+        lambda df: indicators.ATR(
+            df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy(), 14
+        ),
+    )
+
+
+def test_roc_and_cross_sectional_rank():
+    panel = np.array(
+        [
+            [np.nan, 10.0, 11.0, 12.1],
+            [20.0, 20.0, 18.0, 18.0],
+            [5.0, 6.0, 6.6, np.nan],
+        ]
+    )
+    roc = batch.ROC(panel, 1)
+    np.testing.assert_allclose(
+        roc,
+        [
+            [np.nan, np.nan, 10.0, 10.0],
+            [np.nan, 0.0, -10.0, 0.0],
+            [np.nan, 20.0, 10.0, np.nan],
+        ],
+    )
+    panel = np.array([[np.nan, 1.0, 3.0], [2.0, 2.0, 1.0], [5.0, 2.0, np.nan]])
+    np.testing.assert_allclose(
+        batch.cross_sectional_rank(panel),
+        [[np.nan, 100 / 3, 100.0], [50.0, 250 / 3, 50.0], [100.0, 250 / 3, np.nan]],
+    )
+
+
+def test_rejects_one_dimensional_input():
+    with pytest.raises(ValueError, match="2-D"):
+        batch.EMA(np.arange(10.0), 3)
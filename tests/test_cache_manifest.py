@@ -0,0 +1,121 @@
+"""
+Tests for the symbol -> file cache manifest (core/cache_manifest.py).
+
+Paths must resolve as the per-symbol globs did, and a basket load must scan
+the cache directories at most once.
+"""
+
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+from core import cache_manifest, loaders
+from core.cache_manifest import CacheManifest, clear_manifest_cache, get_manifest
+from tests.conftest import generate_ohlcv_data
+
+
+def _csv(folder, name, n_days=50, seed=0):
+    folder.mkdir(parents=True, exist_ok=True)
+    df = generate_ohlcv_data(n_days=n_days, seed=seed).round(2)
+    df.index = df.index.rename("time")
+    df.to_csv(folder / name)
+    return str(folder / name)
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    cache_dir = data_dir / "cache"
+    daily = cache_dir / "dhan" / "daily"
+    weekly = cache_dir / "groww" / "weekly"
+    files = {
+        "reliance": _csv(daily, "dhan_2885_RELIANCE_1d.csv", n_days=80),
+        "M_M": _csv(daily, "dhan_2031_M_M_1d.csv"),
+        "weekly": _csv(weekly, "groww_2885_RELIANCE_1w.csv"),
+        "generic": _csv(cache_dir, "dhan_2885_RELIANCE_1d.csv"),
+        "intraday": _csv(cache_dir, "dhan_2885_RELIANCE_75m.csv"),
+        "historical": _csv(data_dir, "dhan_historical_1333.csv"),
+        "historical_cache": _csv(cache_dir, "dhan_historical_1333.csv"),
+    }
+    monkeypatch.setattr(loaders, "DATA_DIR", data_dir)
+    clear_manifest_cache()
+    yield {"data_dir": data_dir, "cache_dir": cache_dir, "daily": daily, **files}
+    clear_manifest_cache()
+
+
+def test_resolves_like_the_cache_globs(dirs):
+    manifest = CacheManifest(dirs["cache_dir"], dirs["data_dir"])
+    assert manifest.resolve("RELIANCE", "1d") == dirs["reliance"]
+    assert manifest.resolve("NSE:RELIANCE", "1w") == dirs["weekly"]
+    assert manifest.resolve("RELIANCE", "75m") == dirs["intraday"]
+    assert manifest.resolve("M_M", "1d") == dirs["M_M"]
+    assert manifest.resolve("INFY", "1d") is None
+
+    assert manifest.secid_path(2885) == dirs["reliance"]
+    assert manifest.secid_path(1333) == dirs["historical"]
+    assert manifest.secid_path(1333, ["historical_cache"]) == dirs["historical_cache"]
+
+    entry = manifest.entry("RELIANCE")
+    assert entry["secid"] == "2885" and entry["source"] == "dhan"
+    assert entry["rows"] == 80 and entry["first"] < entry["last"]
+
+    # Without the organized file the generic cache_dir copy is used
+    os.remove(dirs["reliance"])
+    assert manifest.resolve("RELIANCE", "1d") == dirs["generic"]
+
+
+def test_misses_scan_only_when_the_cache_changed(dirs):
+    manifest = CacheManifest(dirs["cache_dir"], dirs["data_dir"])
+    assert manifest.scans == 1
+    for _ in range(3):
+        assert manifest.resolve("INFY") is None
+    assert manifest.scans == 1
+
+    path = _csv(dirs["daily"], "dhan_1594_INFY_1d.csv")
+    assert manifest.resolve("INFY") == path
+    assert manifest.scans == 2
+
+    # Persisted: a new process starts warm and does not scan
+    reloaded = CacheManifest(dirs["cache_dir"], dirs["data_dir"])
+    assert reloaded.scans == 0 and reloaded.resolve("INFY") == path
+
+
+def test_record_file_updates_summary(dirs):
+    manifest = get_manifest(dirs["cache_dir"], dirs["data_dir"])
+    assert manifest.entry("M_M")["rows"] == 50
+    _csv(dirs["daily"], "dhan_2031_M_M_1d.csv", n_days=60)
+    entry = cache_manifest.record_file(dirs["M_M"], dirs["cache_dir"], dirs["data_dir"])
+    assert entry["rows"] == 60 and manifest.entry("M_M") is entry
+    assert cache_manifest.record_file(dirs["data_dir"] / "notes.csv") is None
+
+
+def test_basket_load_scans_at_most_once(dirs, monkeypatch):
+    symbols = ["RELIANCE", "M_M", "NOPE1", "NOPE2"]
+    get_manifest(dirs["cache_dir"], dirs["data_dir"])  # warm manifest
+    clear_manifest_cache()
+    scans = []
+    original = CacheManifest.scan
+
+    def counting_scan(self):
+        scans.append(self)
+        original(self)
+
+    def no_glob(*args, **kwargs):
+        raise AssertionError("cache directory globbed")
+
+    monkeypatch.setattr(CacheManifest, "scan", counting_scan)
+    monkeypatch.setattr(glob, "glob", no_glob)
+
+    out = {}
+    for sym in symbols:
+        try:
+            out.update(loaders.load_many_india([sym], cache_dir=str(dirs["cache_dir"])))
+        except FileNotFoundError:
+            pass
+    assert sorted(out) == ["M_M", "RELIANCE"]
+    assert scans == []
+    pd.testing.assert_frame_equal(
+        out["RELIANCE"], loaders.read_cache_file(dirs["reliance"])
+    )
@@ -0,0 +1,117 @@
+"""
+Tests for the vectorized candlestick pattern engine (utils/candlestick.py).
+
+Patterns are checked on hand-built candles, the packed mask must agree with the
+boolean arrays, and CandlestickPatternsStrategy must take its entry patterns
+from the mask.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.candlestick_patterns import CandlestickPatternsStrategy
+from tests.conftest import generate_ohlcv_data
+from utils.candlestick import (
+    PATTERNS,
+    candle_patterns,
+    pack_patterns,
+    pattern_bits,
+    pattern_mask,
+    unpack_patterns,
+)
+
+# A neutral lead-in candle, then the pattern's candles as (open, high, low, close)
+FILLER = (100.0, 101.0, 99.0, 100.5)
+CASES = {
+    "hammer": [(100.0, 100.25, 96.0, 100.5)],
+    "inverted_hammer": [(100.0, 104.0, 99.9, 100.5)],
+    "dragonfly_doji": [(100.0, 100.1, 96.0, 100.05)],
+    "gravestone_doji": [(100.0, 104.0, 99.95, 100.05)],
+    "engulfing": [(101.0, 101.2, 99.8, 100.0), (99.9, 101.5, 99.5, 101.2)],
+    "harami": [(105.0, 105.2, 99.8, 100.0), (101.0, 101.5, 100.2, 101.3)],
+    "piercing": [(105.0, 105.2, 99.8, 100.0), (99.0, 104.0, 98.8, 103.5)],
+    "kicker": [(101.0, 101.2, 99.8, 100.0), (102.0, 104.0, 101.5, 103.5)],
+    "homing_pigeon": [(105.0, 105.2, 99.8, 100.0), (104.0, 104.5, 100.5, 101.0)],
+    "morning_star": [
+        (110.0, 110.2, 99.8, 100.0),
+        (98.0, 99.0, 97.0, 98.2),
+        (98.5, 108.0, 98.4, 107.0),
+    ],
+    "abandoned_baby": [
+        (105.0, 105.2, 99.8, 100.0),
+        (98.0, 99.0, 97.0, 98.01),
+        (99.5, 104.0, 99.2, 103.0),
+    ],
+    "bearish_engulfing": [(100.0, 101.2, 99.8, 101.0), (101.1, 101.5, 99.5, 99.8)],
+    "bearish_harami": [(100.0, 105.2, 99.8, 105.0), (103.5, 104.0, 103.0, 103.2)],
+    "gap_down": [(100.0, 101.0, 99.0, 100.0), (99.0, 99.5, 98.5, 98.8)],
+    "dark_cloud": [(100.0, 104.2, 99.8, 104.0), (105.0, 105.5, 101.0, 101.5)],
+}
+
+
+def _frame(candles):
+    rows = [FILLER] * 3 + candles
+    return pd.DataFrame(rows, columns=["open", "high", "low", "close"])
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_pattern_fires_on_its_last_candle(name):
+    df = _frame(CASES[name])
+    flags = candle_patterns(df.open, df.high, df.low, df.close)
+    assert list(flags) == list(PATTERNS)
+    assert flags[name][-1]
+    assert not flags[name][:3].any()
+
+
+def test_invalid_bars_never_form_strategy_patterns():
+    df = _frame(CASES["engulfing"])
+    df.loc[df.index[-2], "close"] = np.nan
+    assert not candle_patterns(df.open, df.high, df.low, df.close)["engulfing"].any()
+    flat = _frame([(100.0, 100.0, 100.0, 100.0)])
+    flags = candle_patterns(flat.open, flat.high, flat.low, flat.close)
+    assert not any(flags[name][-1] for name in ("hammer", "dragonfly_doji", "doji"))
+
+
+def test_body_thresholds_are_parameters():
+    df = _frame(CASES["hammer"])
+    args = (df.open, df.high, df.low, df.close)
+    assert candle_patterns(*args)["hammer"][-1]
+    assert not candle_patterns(*args, small_body_pct=0.05)["hammer"][-1]
+
+
+def test_mask_matches_boolean_arrays():
+    df = generate_ohlcv_data(n_days=500, volatility=0.03, seed=21)
+    flags = candle_patterns(df.open, df.high, df.low, df.close)
+    mask = pattern_mask(df.open, df.high, df.low, df.close)
+    assert mask.dtype == np.uint64 and len(mask) == len(df)
+    for name in PATTERNS:
+        np.testing.assert_array_equal((mask & pattern_bits(name)) != 0, flags[name])
+    i = int(np.argmax([len(unpack_patterns(m)) for m in mask]))
+    assert unpack_patterns(mask[i]) == [n for n in PATTERNS if flags[n][i]]
+
+
+def test_custom_bit_layout():
+    flags = {"a": np.array([True, False]), "b": np.array([True, True])}
+    mask = pack_patterns(flags, names=["b", "a"])
+    np.testing.assert_array_equal(mask, np.array([3, 1], dtype=np.uint64))
+    assert pattern_bits("a", names=["b", "a"]) == 2
+    assert unpack_patterns(mask[0], names=["b", "a"]) == ["b", "a"]
+    with pytest.raises(ValueError, match="Unknown pattern"):
+        pattern_bits("c", names=["b", "a"])
+
+
+def test_strategy_reads_patterns_from_mask():
+    df = generate_ohlcv_data(n_days=600, volatility=0.03, seed=5)
+    strategy = CandlestickPatternsStrategy()
+    strategy.prepare(df)
+    flags = candle_patterns(df.open, df.high, df.low, df.close)
+    entries = 0
+    for idx in range(4, len(df)):
+        expected = next(
+            (reason for name, reason in strategy.ENTRY_PATTERNS if flags[name][idx]),
+            None,
+        )
+        assert strategy._detect_pattern(idx) == expected
+        entries += expected is not None
+    assert entries > 0
@@ -0,0 +1,113 @@
+"""
+Parity tests for BacktestEngine execution modes.
+
+The "array" mode must produce exactly the same trades, equity and signals as the
+reference "series" mode, while being substantially faster per symbol.
+"""
+
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.config import BrokerConfig
+from core.engine import BacktestEngine, BarView
+from core.registry import make_strategy
+from core.strategy import Strategy
+from tests.conftest import generate_ohlcv_data
+
+PARITY_STRATEGIES = [
+    "tema_lsma_crossover",
+    "ema_crossover",
+    "donchian_breakout",
+    "ichimoku_simple",
+    "triple_ema_aligned",
+    "bollinger_rsi",
+    "daily_green_bb",
+]
+
+
+class CandleColorStrategy(Strategy):
+    """Minimal strategy that only reads the current bar (measures engine overhead)."""
+
+    def on_bar(self, ts, row, state):
+        green = row.close > row.open
+        return {
+            "enter_long": green and state["qty"] == 0,
+            "exit_long": (not green) and state["qty"] > 0,
+        }
+
+
+def _run(df, strategy, mode):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        engine = BacktestEngine(df, strategy, BrokerConfig(), symbol="TEST", mode=mode)
+        return engine.run()
+
+
+@pytest.fixture(scope="module")
+def volatile_df():
+    return generate_ohlcv_data(n_days=1500, volatility=0.03, seed=7)
+
+
+@pytest.mark.parametrize("name", PARITY_STRATEGIES)
+def test_array_mode_matches_series_mode(volatile_df, name):
+    expected = _run(volatile_df, make_strategy(name), "series")
+    actual = _run(volatile_df, make_strategy(name), "array")
+    for exp, act in zip(expected, actual):
+        pd.testing.assert_frame_equal(exp, act, check_exact=True)
+
+
+def test_array_mode_sees_columns_added_in_prepare(volatile_df):
+    seen = []
+
+    class AddsColumn(Strategy):
+        def prepare(self, df):
+            df["signal"] = np.arange(len(df)) % 2 == 0
+            return super().prepare(df)
+
+        def on_bar(self, ts, row, state):
+            seen.append(bool(row["signal"]))
+            return {"enter_long": False, "exit_long": False}
+
+    _run(volatile_df.iloc[:10], AddsColumn(), "array")
+    assert seen == [True, False] * 5
+
+
+def test_bar_view_mirrors_series_row(volatile_df):
+    columns = {col: volatile_df[col].to_numpy() for col in volatile_df.columns}
+    ts = volatile_df.index[3]
+    view = BarView(columns, volatile_df.columns, 3, ts)
+    row = volatile_df.iloc[3]
+
+    assert view.close == row.close
+    assert view["open"] == row["open"]
+    assert view.get("volume") == row.get("volume")
+    assert view.get("india_vix", np.nan) is np.nan
+    assert ("close" in view.index) and ("india_vix" not in view.index)
+    assert view.name == row.name
+    with pytest.raises(AttributeError):
+        view.india_vix
+
+
+def test_unknown_mode_rejected(volatile_df):
+    with pytest.raises(ValueError, match="Unknown engine mode"):
+        BacktestEngine(volatile_df, CandleColorStrategy(), BrokerConfig(), mode="turbo")
+
+
+@pytest.mark.slow
+def test_array_mode_is_faster():
+    df = generate_ohlcv_data(n_days=5000)
+
+    def best_of(mode, repeats=3):
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            _run(df, CandleColorStrategy(), mode)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    speedup = best_of("series") / best_of("array")
+    assert speedup >= 5.0, f"array mode only {speedup:.1f}x faster"
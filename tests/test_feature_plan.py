@@ -0,0 +1,193 @@
+"""
+Tests for the indicator feature plan (utils/feature_plan.py).
+
+Every planned output must equal the utils.indicators function of the same name,
+bit for bit, and shared intermediates must be computed once per plan.
+"""
+
+import numpy as np
+import pytest
+
+from tests.conftest import generate_ohlcv_data
+from utils import indicators
+from utils.feature_plan import FeaturePlan
+
+# Indicator declarations of the trade-enrichment code in the runners
+ENRICHMENT = {
+    "atr_14": ("ATR", 14),
+    "atr_28": ("ATR", 28),
+    "adx_14": ("ADX", 14),
+    "adx_28": ("ADX", 28),
+    "rsi_14": ("RSI", 14),
+    "rsi_28": ("RSI", 28),
+    "macd_12_26_9": ("MACD", 12, 26, 9),
+    "macd_24_52_18": ("MACD", 24, 52, 18),
+    "ema_5": ("EMA", 5),
+    "ema_20": ("EMA", 20),
+    "ema_50": ("EMA", 50),
+    "ema_100": ("EMA", 100),
+    "ema_200": ("EMA", 200),
+    "sma_5": ("SMA", 5),
+    "sma_20": ("SMA", 20),
+    "sma_50": ("SMA", 50),
+    "sma_200": ("SMA", 200),
+    "bb_20": ("BollingerBands", 20, 2),
+    "bb_40": ("BollingerBands", 40, 2),
+    "stoch_14": ("Stochastic", 14, 1, 3),
+    "stoch_28": ("Stochastic", 28, 1, 3),
+    "stoch_slow_5": ("calculate_stochastic_slow", 5, 3, 3),
+    "stoch_slow_10": ("calculate_stochastic_slow", 10, 3, 3),
+    "stoch_rsi_14_5": ("StochasticRSI", 14, 5, 3, 3),
+    "stoch_rsi_14_14": ("StochasticRSI", 14, 14, 3, 3),
+    "stoch_rsi_28_20": ("StochasticRSI", 28, 20, 10, 10),
+    "stoch_rsi_28_28": ("StochasticRSI", 28, 28, 3, 3),
+    "aroon_25": ("Aroon", 25),
+    "aroon_50": ("Aroon", 50),
+    "cci_20": ("CCI", 20),
+    "mfi_20": ("MFI", 20),
+    "cmf_20": ("CMF", 20),
+    "bbp_13": ("BullBearPower", 13),
+    "bbp_26": ("BullBearPower", 26),
+    "ker_10": ("kaufman_efficiency_ratio", 10),
+    "chop_20": ("CHOP", 20),
+    "chop_50": ("CHOP", 50),
+    "williams_14": ("WilliamsR", 14),
+    "donchian_20": ("DonchianChannels", 20),
+    "kijun_26": ("extract_ichimoku_base_line", 26),
+    "ichimoku": ("IchimokuKinkoHyo", 9, 26, 52),
+    "supertrend_10": ("Supertrend", 10, 3.0),
+    "keltner_20": ("KeltnerChannels", 20, 2.0),
+    "dema_50": ("DEMA", 50),
+    "tema_20": ("TEMA", 20),
+    "hma_14": ("HMA", 14),
+}
+
+PRICE_ARGS = {
+    "ATR": "hlc",
+    "ADX": "hlc",
+    "Stochastic": "hlc",
+    "calculate_stochastic_slow": "hlc",
+    "Aroon": "hl",
+    "CCI": "hlc",
+    "MFI": "hlcv",
+    "CMF": "hlcv",
+    "BullBearPower": "hlc",
+    "CHOP": "hlc",
+    "WilliamsR": "hlc",
+    "DonchianChannels": "hl",
+    "extract_ichimoku_base_line": "hl",
+    "IchimokuKinkoHyo": "hlc",
+    "Supertrend": "hlc",
+    "KeltnerChannels": "hlc",
+}
+COLUMNS = {"h": "high", "l": "low", "c": "close", "v": "volume"}
+
+
+def _direct(arrays, indicator, *params):
+    columns = [COLUMNS[c] for c in PRICE_ARGS.get(indicator, "c")]
+    func = getattr(indicators, indicator)
+    return func(*(arrays[c] for c in columns), *params)
+
+
+def _assert_same(actual, expected):
+    if isinstance(expected, dict):
+        assert list(actual) == list(expected)
+        for key in expected:
+            np.testing.assert_array_equal(actual[key], expected[key])
+    else:
+        np.testing.assert_array_equal(actual, expected)
+
+
+@pytest.fixture(scope="module", params=["clean", "gappy"])
+def df(request):
+    data = generate_ohlcv_data(n_days=1200, volatility=0.025, seed=13)
+    if request.param == "gappy":
+        data.iloc[[5, 300, 301], data.columns.get_loc("close")] = np.nan
+        data.iloc[700, data.columns.get_loc("high")] = np.nan
+    return data
+
+
+def _plan(specs):
+    plan = FeaturePlan()
+    for name, (indicator, *params) in specs.items():
+        plan.add(name, indicator, *params)
+    return plan
+
+
+def test_enrichment_outputs_match_direct_calls(df):
+    arrays = {c: df[c].to_numpy(dtype=float) for c in COLUMNS.values()}
+    with np.errstate(all="ignore"):
+        features = _plan(ENRICHMENT).compute(df)
+        for name, (indicator, *params) in ENRICHMENT.items():
+            _assert_same(features[name], _direct(arrays, indicator, *params))
+
+
+def test_shared_intermediates_are_computed_once(df):
+    plan = _plan(
+        {
+            "atr": ("ATR", 14),
+            "adx": ("ADX", 14),
+            "keltner": ("KeltnerChannels", 14, 2.0),
+            "supertrend": ("Supertrend", 14, 3.0),
+            "tema": ("TEMA", 20),
+            "dema": ("DEMA", 20),
+            "ema": ("EMA", 20),
+            "stoch": ("Stochastic", 20, 1, 3),
+            "donchian": ("DonchianChannels", 20),
+            "williams": ("WilliamsR", 20),
+        }
+    )
+    with np.errstate(all="ignore"):
+        plan.compute(df)
+    ops = [key[0] for key in plan.intermediates]
+    assert ops.count("tr") == 1
+    assert ops.count("atr") == 1
+    # Wilder TR smoothing is shared by ATR and ADX; close EMA(20) chain by
+    # TEMA, DEMA and EMA; plus the two DM smoothings and Keltner's EMA(14)
+    assert ops.count("ema") == 3 + 3 + 1
+    assert ops.count("rmax") == 1 and ops.count("rmin") == 1
+
+
+def test_outputs_do_not_share_memory(df):
+    plan = FeaturePlan().add("sma", "SMA", 20).add("bb", "BollingerBands", 20, 2)
+    plan.add("ema", "EMA", 20).add("keltner", "KeltnerChannels", 20, 2.0)
+    features = plan.compute(df)
+    assert not np.shares_memory(features["sma"], features["bb"]["middle"])
+    assert not np.shares_memory(features["ema"], features["keltner"]["middle"])
+
+
+def test_source_and_keyword_inputs(df):
+    volume = df["volume"].to_numpy(dtype=float)
+    plan = FeaturePlan().add("vol_sma", "SMA", 20, source="volume")
+    plan.add("vol_rsi", "RSI", 14, source="volume")
+    features = plan.compute(volume=volume)
+    np.testing.assert_array_equal(features["vol_sma"], indicators.SMA(volume, 20))
+    np.testing.assert_array_equal(features["vol_rsi"], indicators.RSI(volume, 14))
+
+
+def test_source_reaches_direct_single_series_indicators(df):
+    volume = df["volume"].to_numpy(dtype=float)
+    plan = FeaturePlan().add("vol_hma", "HMA", 14, source="volume")
+    plan.add("vol_mom", "Momentum", 10, source="volume")
+    plan.add("vol_env", "Envelope", 20, 2.5, source="volume")
+    plan.add("hma", "HMA", 14)
+    features = plan.compute(df)
+    np.testing.assert_array_equal(features["vol_hma"], indicators.HMA(volume, 14))
+    np.testing.assert_array_equal(features["vol_mom"], indicators.Momentum(volume, 10))
+    for key, values in indicators.Envelope(volume, 20, 2.5).items():
+        np.testing.assert_array_equal(features["vol_env"][key], values)
+    close = df["close"].to_numpy(dtype=float)
+    np.testing.assert_array_equal(features["hma"], indicators.HMA(close, 14))
+
+
+def test_unknown_indicator_and_source_rejected():
+    with pytest.raises(ValueError, match="Unknown indicator"):
+        FeaturePlan().add("x", "NotAnIndicator", 3)
+    with pytest.raises(ValueError, match="Unknown source"):
+        FeaturePlan().add("x", "SMA", 3, source="vwap")
+    for name in ("ATR", "OBV", "Aroon"):
+        with pytest.raises(ValueError, match="single-series"):
+            FeaturePlan().add("x", name, 14, source="volume")
+    for name in ("StochasticRSI_from_RSI", "TrendClassification"):
+        with pytest.raises(ValueError, match="does not take OHLCV inputs"):
+            FeaturePlan().add("x", name, 14)
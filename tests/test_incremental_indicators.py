@@ -0,0 +1,146 @@
+"""
+Tests for the streaming indicators (utils/incremental.py).
+
+Fed bar by bar, every streaming indicator must reproduce the batch function in
+utils/indicators.py on the same history, also across a JSON round trip of its
+state in the middle of the stream.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from tests.conftest import generate_ohlcv_data
+from utils import incremental, indicators
+
+
+@pytest.fixture(scope="module", params=["clean", "gappy"])
+def bars(request):
+    df = generate_ohlcv_data(n_days=1500, volatility=0.025, seed=17)
+    if request.param == "gappy":
+        df.iloc[[30, 700, 701], df.columns.get_loc("close")] = np.nan
+    return {c: df[c].to_numpy(dtype=float) for c in ("high", "low", "close")}
+
+
+def _stream(make, bars, split=None):
+    """Feed every bar; optionally save and restore the state at ``split``."""
+    indicator = make()
+    outputs = []
+    for i in range(len(bars["close"])):
+        if i == split:
+            state = json.loads(json.dumps(indicator.state()))
+            indicator = incremental.StreamingIndicator.from_state(state)
+        bar = {field: bars[field][i] for field in ("high", "low", "close")}
+        outputs.append(indicator.update_bar(bar))
+    if isinstance(outputs[0], dict):
+        return {key: np.array([o[key] for o in outputs]) for key in outputs[0]}
+    return np.array(outputs)
+
+
+CASES = [
+    ("EMA", (20,), lambda b: indicators.EMA(b["close"], 20)),
+    ("EMA", (14, 1 / 14), lambda b: indicators.EMA(b["close"], 14, alpha=1 / 14)),
+    ("TEMA", (25,), lambda b: indicators.TEMA(b["close"], 25)),
+    ("ATR", (14,), lambda b: indicators.ATR(b["high"], b["low"], b["close"], 14)),
+    ("ADX", (28,), lambda b: indicators.ADX(b["high"], b["low"], b["close"], 28)),
+    ("RSI", (14,), lambda b: indicators.RSI(b["close"], 14)),
+    (
+        "Supertrend",
+        (12, 3.0),
+        lambda b: indicators.Supertrend(b["high"], b["low"], b["close"], 12, 3.0),
+    ),
+]
+
+
+@pytest.mark.parametrize("name, args, batch", CASES)
+@pytest.mark.parametrize("split", [None, 1, 777])
+def test_recursive_indicators_match_batch_exactly(bars, name, args, batch, split):
+    streamed = _stream(lambda: getattr(incremental, name)(*args), bars, split)
+    expected = batch(bars)
+    if isinstance(expected, dict):
+        assert set(streamed) == set(expected)
+        for key in expected:
+            np.testing.assert_array_equal(streamed[key], expected[key])
+    else:
+        np.testing.assert_array_equal(streamed, expected)
+
+
+@pytest.mark.parametrize("length", [1, 2, 25, 100])
+@pytest.mark.parametrize("split", [None, 333])
+def test_window_indicators_match_batch(bars, length, split):
+    close = bars["close"]
+    streamed = _stream(lambda: incremental.LSMA(length), bars, split)
+    expected = indicators.LSMA(close, length)
+    np.testing.assert_array_equal(np.isnan(streamed), np.isnan(expected))
+    np.testing.assert_allclose(streamed, expected, rtol=1e-12, atol=0)
+
+    if length < 2:
+        return
+    streamed = _stream(lambda: incremental.BollingerBands(length, 2.0), bars, split)
+    expected = indicators.BollingerBands(close, length, 2.0)
+    for key in ("upper", "middle", "lower"):
+        np.testing.assert_array_equal(np.isnan(streamed[key]), np.isnan(expected[key]))
+        np.testing.assert_allclose(streamed[key], expected[key], rtol=1e-12, atol=1e-9)
+
+
+def _candles(bars, start, stop):
+    return [
+        {"date": f"d{i:05d}", **{f: bars[f][i] for f in ("high", "low", "close")}}
+        for i in range(start, stop)
+    ]
+
+
+def _book():
+    return incremental.IndicatorSet(
+        {"tema": incremental.TEMA(25), "lsma": incremental.LSMA(100)}
+    )
+
+
+def test_indicator_set_resumes_from_saved_state(bars):
+    first = _book()
+    first.sync(_candles(bars, 0, 400))
+    saved = json.loads(json.dumps(first.state()))
+
+    resumed = _book().resume(saved)
+    recent = resumed.sync(_candles(bars, 0, 430))
+
+    fresh = _book()
+    fresh.sync(_candles(bars, 0, 430))
+    assert len(recent) == 2
+    np.testing.assert_equal(recent, fresh.recent)
+    np.testing.assert_equal(recent[-1]["tema"], indicators.TEMA(bars["close"], 25)[429])
+
+    # No new bars: nothing is fed again
+    assert resumed.sync(_candles(bars, 0, 430)) == recent
+
+
+def test_indicator_set_restarts_when_history_does_not_overlap(bars):
+    book = _book()
+    book.sync(_candles(bars, 0, 200))
+    recent = book.sync(_candles(bars, 300, 450))
+    expected = indicators.TEMA(bars["close"][300:450], 25)[-1]
+    assert recent[-1]["tema"] == expected
+
+
+def test_indicator_set_restarts_when_history_is_revised(bars):
+    book = _book()
+    book.sync(_candles(bars, 0, 400))
+    saved = json.loads(json.dumps(book.state()))
+
+    # A 1:2 split adjusts every past bar; the dates stay the same
+    adjusted = {f: np.asarray(bars[f]) / 2 for f in ("high", "low", "close")}
+    recent = _book().resume(saved).sync(_candles(adjusted, 0, 430))
+    np.testing.assert_equal(
+        recent[-1]["tema"], indicators.TEMA(adjusted["close"][:430], 25)[-1]
+    )
+    np.testing.assert_allclose(
+        recent[-1]["lsma"], indicators.LSMA(adjusted["close"][:430], 100)[-1]
+    )
+
+
+def test_saved_state_for_other_parameters_is_ignored(bars):
+    book = incremental.IndicatorSet({"tema": incremental.TEMA(10)})
+    book.sync(_candles(bars, 0, 50))
+    other = _book().resume(json.loads(json.dumps(book.state())))
+    assert other.last_key is None
@@ -0,0 +1,211 @@
+"""
+Tests for the content-addressed indicator cache (utils/indicator_cache.py).
+
+Cached results must equal fresh ones, be keyed by argument contents rather than
+identity, survive a process restart through the disk store, and never be shared
+mutably between callers.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.strategy import Strategy
+from tests.conftest import generate_ohlcv_data
+from utils import cached_indicators, indicator_cache
+from utils.indicator_cache import (
+    cached_call,
+    clear_indicator_cache,
+    indicator_cache_stats,
+    indicator_key,
+    set_indicator_disk_cache,
+)
+from utils.indicators import ADX, ATR, EMA, RSI, SMA, BollingerBands
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_indicator_cache()
+    yield
+    set_indicator_disk_cache(None)
+    clear_indicator_cache()
+
+
+@pytest.fixture(scope="module")
+def ohlc():
+    df = generate_ohlcv_data(n_days=800, volatility=0.02, seed=8)
+    return {c: df[c].to_numpy(dtype=float) for c in ("high", "low", "close")}, df
+
+
+def _assert_same(a, b):
+    if isinstance(a, dict):
+        assert list(a) == list(b)
+        for k in a:
+            np.testing.assert_array_equal(a[k], b[k])
+    else:
+        np.testing.assert_array_equal(a, b)
+
+
+def test_keys_follow_contents_not_identity(ohlc):
+    arrays, _ = ohlc
+    close = arrays["close"]
+    key = indicator_key(EMA, (close, 20), {})
+    assert key == indicator_key(EMA, (close.copy(), 20), {})
+    assert key != indicator_key(EMA, (close, 21), {})
+    assert key != indicator_key(EMA, (close, 20), {"alpha": 0.1})
+    assert key != indicator_key(SMA, (close, 20), {})
+    changed = close.copy()
+    changed[-1] += 0.01
+    assert key != indicator_key(EMA, (changed, 20), {})
+    assert indicator_key(EMA, (close, 20), {}) != indicator_key(
+        EMA, (close.astype(np.float32), 20), {}
+    )
+
+
+def test_uncacheable_calls_pass_through(ohlc):
+    arrays, df = ohlc
+    assert indicator_key(lambda x: x, (arrays["close"],), {}) is None
+    assert indicator_key(np.cumsum, (arrays["close"],), {}) is None
+    assert indicator_key(EMA, (df, 20), {}) is None
+    np.testing.assert_array_equal(
+        cached_call(lambda x: x * 2, arrays["close"]), arrays["close"] * 2
+    )
+    assert indicator_cache_stats()["uncached"] == 1
+
+
+@pytest.mark.parametrize(
+    "func,args",
+    [
+        (EMA, ("close", 20)),
+        (ATR, ("high", "low", "close", 14)),
+        (ADX, ("high", "low", "close", 14)),
+        (BollingerBands, ("close", 20, 2)),
+    ],
+)
+def test_hits_equal_fresh_results(ohlc, func, args):
+    arrays, _ = ohlc
+    call_args = [arrays[a] if isinstance(a, str) else a for a in args]
+    expected = func(*call_args)
+    first = cached_call(func, *call_args)
+    second = cached_call(func, *call_args)
+    _assert_same(first, expected)
+    _assert_same(second, expected)
+    stats = indicator_cache_stats()
+    assert (stats["misses"], stats["hits"]) == (1, 1)
+
+
+def test_results_are_private_copies(ohlc):
+    arrays, _ = ohlc
+    first = cached_call(BollingerBands, arrays["close"], 20, 2)
+    first["upper"][:] = 0.0
+    second = cached_call(BollingerBands, arrays["close"], 20, 2)
+    assert not (second["upper"][19:] == 0).any()
+    second["lower"][-1] = -1.0
+    third = cached_call(BollingerBands, arrays["close"], 20, 2)
+    assert third["lower"][-1] != -1.0
+
+
+def test_series_arguments_include_index(ohlc):
+    _, df = ohlc
+    close = df["close"]
+    shifted = close.copy()
+    shifted.index = shifted.index + pd.Timedelta(days=1)
+    assert indicator_key(RSI, (close, 14), {}) != indicator_key(RSI, (shifted, 14), {})
+    _assert_same(cached_call(RSI, close, 14), RSI(close, 14))
+
+
+def test_memory_lru_is_bounded_by_bytes(ohlc, monkeypatch):
+    arrays, _ = ohlc
+    monkeypatch.setattr(indicator_cache, "INDICATOR_CACHE_BYTES", 3 * 800 * 8)
+    for n in range(2, 8):
+        cached_call(EMA, arrays["close"], n)
+    stats = indicator_cache_stats()
+    assert stats["entries"] == 3 and stats["bytes"] <= 3 * 800 * 8
+    cached_call(EMA, arrays["close"], 7)
+    assert indicator_cache_stats()["hits"] == 1
+    cached_call(EMA, arrays["close"], 2)
+    assert indicator_cache_stats()["misses"] == 7
+
+
+def test_disk_store_survives_process_restart(ohlc, tmp_path):
+    arrays, _ = ohlc
+    set_indicator_disk_cache(tmp_path)
+    expected = ADX(arrays["high"], arrays["low"], arrays["close"], 14)
+    cached_call(ADX, arrays["high"], arrays["low"], arrays["close"], 14)
+    cached_call(EMA, arrays["close"], 50)
+    assert len(list(tmp_path.glob("*.npy"))) == 2
+
+    # A new process: empty memory, same directory
+    clear_indicator_cache()
+    set_indicator_disk_cache(tmp_path)
+    adx = cached_call(ADX, arrays["high"], arrays["low"], arrays["close"], 14)
+    ema = cached_call(EMA, arrays["close"], 50)
+    _assert_same(adx, expected)
+    _assert_same(ema, EMA(arrays["close"], 50))
+    assert indicator_cache_stats()["disk_hits"] == 2
+    assert indicator_cache_stats()["misses"] == 0
+    adx["adx"][:] = 0.0
+    clear_indicator_cache()
+    _assert_same(
+        cached_call(ADX, arrays["high"], arrays["low"], arrays["close"], 14),
+        expected,
+    )
+
+
+def test_disk_store_evicts_least_recently_used(ohlc, tmp_path):
+    arrays, _ = ohlc
+    entry = 800 * 8
+    set_indicator_disk_cache(tmp_path, max_bytes=int(entry * 3.5) + 3 * 128)
+    for n in (5, 6, 7):
+        cached_call(EMA, arrays["close"], n)
+    # Touch n=5 so that n=6 is the oldest entry
+    clear_indicator_cache()
+    cached_call(EMA, arrays["close"], 5)
+    cached_call(EMA, arrays["close"], 8)
+    keys = {p.stem for p in tmp_path.glob("*.npy")}
+    assert indicator_key(EMA, (arrays["close"], 6), {}) not in keys
+    assert indicator_key(EMA, (arrays["close"], 5), {}) in keys
+    assert indicator_key(EMA, (arrays["close"], 8), {}) in keys
+    assert (
+        sum(p.stat().st_size for p in tmp_path.glob("*.npy"))
+        <= int(entry * 3.5) + 3 * 128
+    )
+
+
+def test_disk_store_ignores_incomplete_entries(ohlc, tmp_path):
+    arrays, _ = ohlc
+    set_indicator_disk_cache(tmp_path)
+    cached_call(EMA, arrays["close"], 10)
+    key = indicator_key(EMA, (arrays["close"], 10), {})
+    (tmp_path / f"{key}.json").unlink()
+    clear_indicator_cache()
+    _assert_same(cached_call(EMA, arrays["close"], 10), EMA(arrays["close"], 10))
+    assert indicator_cache_stats()["misses"] == 1
+
+
+def test_cached_indicators_module_wraps_functions(ohlc):
+    arrays, _ = ohlc
+    assert cached_indicators.EMA is cached_indicators.EMA
+    assert cached_indicators.EMA.__name__ == "EMA"
+    cached_indicators.EMA(arrays["close"], 30)
+    cached_indicators.EMA(arrays["close"], 30)
+    assert indicator_cache_stats()["hits"] == 1
+
+
+def test_strategy_indicators_are_memoized(ohlc):
+    _, df = ohlc
+
+    class TwoEMA(Strategy):
+        def prepare(self, df):
+            self._data = df
+            self.fast = self.I(EMA, df["close"].to_numpy(), 10)
+            self.custom = self.I(lambda: df["close"].to_numpy() * 0 + 1.0)
+            return df
+
+    first = TwoEMA()
+    first.prepare(df)
+    second = TwoEMA()
+    second.prepare(df)
+    np.testing.assert_array_equal(second.fast, EMA(df["close"].to_numpy(), 10))
+    stats = indicator_cache_stats()
+    assert (stats["misses"], stats["hits"], stats["uncached"]) == (1, 1, 2)
@@ -0,0 +1,317 @@
+"""
+Equivalence tests for the indicator kernels in utils/indicators.py.
+
+LSMA, WMA, KER, CHOP, percent_rank and Aroon are checked against the per-bar
+loop implementations they replaced, including NaN gaps and edge window lengths,
+and the rolling extremes against pandas. The recursive indicators (EMA chains,
+ATR, Supertrend, ParabolicSAR) must return the same values on the compiled and
+Python backends.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.conftest import generate_ohlcv_data
+from utils import indicators
+from utils.indicators import (
+    ATR,
+    CHOP,
+    Aroon,
+    DEMA,
+    EMA,
+    LSMA,
+    TEMA,
+    WMA,
+    HullMovingAverage,
+    ParabolicSAR,
+    Supertrend,
+    kaufman_efficiency_ratio,
+    percent_rank,
+    rolling_argmax,
+    rolling_argmin,
+    rolling_max,
+    rolling_min,
+)
+
+RTOL = 1e-9
+
+
+# Reference implementations (the previous per-bar loops)
+def lsma_loop(series, length):
+    n = len(series)
+    result = np.full(n, np.nan)
+    if length <= 0 or n < length:
+        return result
+    x = np.arange(length, dtype=float)
+    x_mean = (length - 1) / 2.0
+    x_var = np.sum((x - x_mean) ** 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for i in range(length - 1, n):
+            y = series[i - length + 1 : i + 1]
+            y_mean = np.mean(y)
+            slope = np.sum((x - x_mean) * (y - y_mean)) / x_var
+            result[i] = slope * (length - 1) + (y_mean - slope * x_mean)
+    return result
+
+
+def wma_loop(values, n):
+    weights = np.arange(1, n + 1, dtype=float)
+    result = np.full(len(values), np.nan)
+    for i in range(n - 1, len(values)):
+        result[i] = np.dot(values[i - n + 1 : i + 1], weights) / weights.sum()
+    return result
+
+
+def ker_loop(close, length):
+    ker = np.full(len(close), np.nan)
+    for i in range(length, len(close)):
+        direction = abs(close[i] - close[i - length])
+        volatility = 0.0
+        for j in range(i - length + 1, i + 1):
+            volatility += abs(close[j] - close[j - 1])
+        ker[i] = direction / volatility if volatility > 0 else 0.0
+    return ker
+
+
+def chop_loop(high, low, close, period):
+    chop = np.full(len(close), np.nan)
+    for i in range(period, len(close)):
+        high_max = np.max(high[i - period : i + 1])
+        low_min = np.min(low[i - period : i + 1])
+        atr_sum = 0.0
+        for j in range(i - period + 1, i + 1):
+            atr_sum += max(
+                high[j] - low[j],
+                abs(high[j] - close[j - 1]),
+                abs(low[j] - close[j - 1]),
+            )
+        if high_max > low_min and atr_sum > 0:
+            chop[i] = 100 * np.log10(atr_sum / (high_max - low_min)) / np.log10(period)
+    return chop
+
+
+def percent_rank_loop(values, n):
+    result = np.full(len(values), np.nan)
+    for i in range(n - 1, len(values)):
+        window = values[i - n + 1 : i + 1]
+        result[i] = (window < values[i]).sum() / len(window) * 100
+    return result
+
+
+def aroon_loop(high, low, period):
+    aroon_up = np.zeros(len(high))
+    aroon_down = np.zeros(len(low))
+    for i in range(period, len(high)):
+        bars_since_high = period - np.argmax(high[i - period : i])
+        bars_since_low = period - np.argmin(low[i - period : i])
+        aroon_up[i] = 100 * (period - bars_since_high) / period
+        aroon_down[i] = 100 * (period - bars_since_low) / period
+    return aroon_up, aroon_down
+
+
+def rolling_arg_loop(values, period, arg):
+    out = np.full(len(values), -1)
+    for i in range(period - 1, len(values)):
+        out[i] = i - period + 1 + arg(values[i - period + 1 : i + 1])
+    return out
+
+
+def _assert_close(actual, expected):
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual, expected, rtol=RTOL, atol=0)
+
+
+@pytest.fixture(scope="module")
+def ohlc():
+    df = generate_ohlcv_data(n_days=3000, volatility=0.03, seed=5)
+    arrays = {c: df[c].to_numpy(dtype=float) for c in ("high", "low", "close")}
+    gappy = {c: v.copy() for c, v in arrays.items()}
+    gappy["close"][[7, 400, 401, 1999]] = np.nan
+    gappy["high"][1500] = np.nan
+    gappy["low"][2500] = np.nan
+    return {"clean": arrays, "gappy": gappy}
+
+
+LENGTHS = [1, 2, 3, 10, 25, 100, 2999, 3000, 3001]
+
+
+@pytest.mark.parametrize("case", ["clean", "gappy"])
+@pytest.mark.parametrize("length", LENGTHS)
+def test_lsma_and_wma_match_loops(ohlc, case, length):
+    close = ohlc[case]["close"]
+    _assert_close(LSMA(close, length), lsma_loop(close, length))
+    _assert_close(WMA(close, length), wma_loop(close, length))
+
+
+@pytest.mark.parametrize("case", ["clean", "gappy"])
+@pytest.mark.parametrize("length", LENGTHS)
+def test_ker_matches_loop(ohlc, case, length):
+    close = ohlc[case]["close"]
+    _assert_close(kaufman_efficiency_ratio(close, length), ker_loop(close, length))
+
+
+@pytest.mark.parametrize("case", ["clean", "gappy"])
+@pytest.mark.parametrize("period", [2, 14, 50, 2999, 3000])
+def test_chop_matches_loop(ohlc, case, period):
+    arrays = ohlc[case]
+    with np.errstate(invalid="ignore"):
+        expected = chop_loop(arrays["high"], arrays["low"], arrays["close"], period)
+    _assert_close(
+        CHOP(arrays["high"], arrays["low"], arrays["close"], period), expected
+    )
+
+
+@pytest.mark.parametrize("case", ["clean", "gappy"])
+@pytest.mark.parametrize("length", LENGTHS)
+def test_percent_rank_matches_loop(ohlc, case, length):
+    close = ohlc[case]["close"]
+    np.testing.assert_array_equal(
+        percent_rank(close, length), percent_rank_loop(close, length)
+    )
+
+
+def test_flat_prices_and_ties():
+    close = np.r_[np.full(30, 100.0), np.linspace(100, 110, 30), np.full(30, 110.0)]
+    np.testing.assert_array_equal(
+        kaufman_efficiency_ratio(close, 10), ker_loop(close, 10)
+    )
+    np.testing.assert_array_equal(percent_rank(close, 10), percent_rank_loop(close, 10))
+    _assert_close(LSMA(close, 10), lsma_loop(close, 10))
+    flat = np.full(60, 50.0)
+    assert np.isnan(CHOP(flat, flat, flat, 14)).all()
+
+
+def test_long_series_keep_precision():
+    # Prices drift over orders of magnitude; block-restarted prefix sums keep
+    # every window accurate to the scale of the window itself
+    rng = np.random.default_rng(0)
+    close = 50 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, 100_000)))
+    sample = slice(-2000, None)
+    for length in (2, 100):
+        _assert_close(
+            LSMA(close, length)[sample],
+            lsma_loop(close[-2000 - length :], length)[length:],
+        )
+        _assert_close(
+            WMA(close, length)[sample],
+            wma_loop(close[-2000 - length :], length)[length:],
+        )
+
+
+@pytest.mark.parametrize("case", ["clean", "gappy", "ticks"])
+@pytest.mark.parametrize("period", [1, 2, 14, 100, 2999, 3000, 3001])
+def test_rolling_extremes_match_pandas_and_argmax(ohlc, case, period):
+    high = ohlc["gappy" if case == "gappy" else "clean"]["high"]
+    if case == "ticks":
+        high = np.round(high)  # plenty of ties
+    pd_high = pd.Series(high).rolling(period)
+    np.testing.assert_array_equal(rolling_max(high, period), pd_high.max().values)
+    np.testing.assert_array_equal(rolling_min(high, period), pd_high.min().values)
+    if period <= 100:
+        for func, arg in ((rolling_argmax, np.argmax), (rolling_argmin, np.argmin)):
+            np.testing.assert_array_equal(
+                func(high, period), rolling_arg_loop(high, period, arg)
+            )
+
+
+def test_rolling_extremes_edge_inputs():
+    values = np.array([1.0, np.inf, 2.0, 2.0, np.nan, -np.inf, 3.0, 0.0])
+    for period in (1, 2, 3):
+        window = pd.Series(values).rolling(period)
+        np.testing.assert_array_equal(rolling_max(values, period), window.max().values)
+        np.testing.assert_array_equal(rolling_min(values, period), window.min().values)
+        np.testing.assert_array_equal(
+            rolling_argmax(values, period), rolling_arg_loop(values, period, np.argmax)
+        )
+    # The deque kernel and the sparse table pick the same bars
+    x = np.round(generate_ohlcv_data(n_days=500, seed=2)["close"].to_numpy())
+    x[[10, 11, 300]] = np.nan
+    for period in (1, 3, 7, 64, 65, 500, 501):
+        np.testing.assert_array_equal(
+            indicators._rolling_arg_deque.py_func(x, period),
+            indicators._rolling_arg_table(x, period),
+        )
+    with pytest.raises(ValueError, match="period"):
+        rolling_max(values, 0)
+
+
+@pytest.mark.parametrize("case", ["clean", "gappy"])
+@pytest.mark.parametrize("period", [1, 14, 100, 2999, 3000])
+def test_aroon_matches_loop(ohlc, case, period):
+    arrays = ohlc[case]
+    result = Aroon(arrays["high"], arrays["low"], period)
+    up, down = aroon_loop(arrays["high"], arrays["low"], period)
+    np.testing.assert_array_equal(result["aroon_up"], up)
+    np.testing.assert_array_equal(result["aroon_down"], down)
+    np.testing.assert_array_equal(result["aroon_oscillator"], up - down)
+
+
+# Recursive indicators: compiled backend (lfilter / Numba) vs the Python loops
+@pytest.fixture
+def backend():
+    previous = indicators.get_indicator_backend()
+
+    def run(name, func, *args, **kwargs):
+        indicators.set_indicator_backend(name)
+        return func(*args, **kwargs)
+
+    yield run
+    indicators.set_indicator_backend(previous)
+
+
+def _both(backend, func, *args, **kwargs):
+    return (
+        backend("compiled", func, *args, **kwargs),
+        backend("python", func, *args, **kwargs),
+    )
+
+
+@pytest.mark.parametrize("case", ["clean", "gappy"])
+@pytest.mark.parametrize("length", [1, 5, 25, 200])
+def test_ema_chains_match_python_bit_for_bit(ohlc, backend, case, length):
+    close = ohlc[case]["close"]
+    for func in (EMA, DEMA, TEMA, HullMovingAverage):
+        compiled, python = _both(backend, func, close, length)
+        np.testing.assert_array_equal(compiled, python)
+    compiled, python = _both(backend, EMA, close, length, alpha=1.0 / length)
+    np.testing.assert_array_equal(compiled, python)
+    arrays = ohlc[case]
+    compiled, python = _both(
+        backend, ATR, arrays["high"], arrays["low"], arrays["close"], length
+    )
+    np.testing.assert_array_equal(compiled, python)
+
+
+def test_ema_edge_inputs(backend):
+    values = np.array([1.0, 2.0, np.inf, 3.0, -np.inf, 4.0])
+    with np.errstate(invalid="ignore"):
+        np.testing.assert_array_equal(*_both(backend, EMA, values, 3))
+    np.testing.assert_array_equal(*_both(backend, EMA, np.array([5.0]), 3))
+    ints = np.arange(1, 50)
+    np.testing.assert_array_equal(*_both(backend, EMA, ints, 10))
+
+
+@pytest.mark.parametrize("case", ["clean", "gappy"])
+def test_supertrend_and_psar_match_python(ohlc, backend, case):
+    arrays = ohlc[case]
+    args = (arrays["high"], arrays["low"], arrays["close"])
+    compiled, python = _both(backend, Supertrend, *args, 12, 3.0)
+    np.testing.assert_array_equal(compiled["supertrend"], python["supertrend"])
+    np.testing.assert_array_equal(compiled["direction"], python["direction"])
+    np.testing.assert_array_equal(*_both(backend, ParabolicSAR, *args))
+
+
+@pytest.mark.skipif(not indicators.NUMBA_AVAILABLE, reason="numba not installed")
+def test_supertrend_uses_compiled_kernel(ohlc):
+    arrays = ohlc["clean"]
+    ub, lb = arrays["high"] * 1.02, arrays["low"] * 0.98
+    compiled = indicators._supertrend_loop(arrays["close"], ub, lb)
+    python = indicators._supertrend_loop.py_func(arrays["close"], ub, lb)
+    for c, p in zip(compiled, python):
+        np.testing.assert_array_equal(c, p)
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError, match="indicator backend"):
+        indicators.set_indicator_backend("gpu")
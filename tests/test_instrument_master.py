@@ -0,0 +1,136 @@
+"""
+Tests for the indexed instrument master (core/instrument_master.py).
+
+Lookups must agree with the pandas row filters they replace, and the parsed
+index must be reused until the master file changes.
+"""
+
+import csv
+import os
+
+import pandas as pd
+import pytest
+
+from core import instrument_master, loaders
+from core.instrument_master import (
+    clear_instrument_cache,
+    get_instrument_master,
+    load_instrument_master,
+)
+from tests.conftest import generate_ohlcv_data
+
+COMPACT = [
+    # exchange, segment, secid, trading symbol, lot units
+    ("NSE", "E", 2885, "RELIANCE", 1),
+    ("BSE", "E", 500325, "RELIANCE", 1),
+    ("NSE", "E", 11536, "TCS", 1),
+    ("NSE", "D", 35001, "NIFTY24DECFUT", 75),
+    ("NSE", "E", 1594, "INFY", 1),
+    ("NSE", "E", 1595, "INFY", 1),
+]
+DETAILED = [
+    # secid, symbol name, underlying symbol
+    (2885, "RELIANCE INDUSTRIES LTD", "RELIANCE"),
+    (1333, "HDFCBANK", "HDFCBANK"),
+    (99999, "RELIANCE", ""),
+]
+
+
+def _write_compact(path, rows=COMPACT):
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(
+            [
+                "SEM_EXM_EXCH_ID",
+                "SEM_SEGMENT",
+                "SEM_SMST_SECURITY_ID",
+                "SEM_TRADING_SYMBOL",
+                "SEM_LOT_UNITS",
+            ]
+        )
+        w.writerows((e, s, i, t, f"{lot}.0") for e, s, i, t, lot in rows)
+    return path
+
+
+def _write_detailed(path):
+    pd.DataFrame(
+        DETAILED, columns=["SECURITY_ID", "SYMBOL_NAME", "UNDERLYING_SYMBOL"]
+    ).assign(EXCH_ID="NSE", SEGMENT="E", LOT_SIZE=1).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_instrument_cache()
+    yield
+    clear_instrument_cache()
+
+
+def test_compact_lookups(tmp_path):
+    master = get_instrument_master(_write_compact(tmp_path / "master.csv"))
+    assert master.layout == "compact" and len(master) == len(COMPACT)
+    assert master.security_id("RELIANCE") == 2885
+    assert master.security_id("RELIANCE", exchange="BSE") == 500325
+    assert master.security_ids("INFY") == [1594, 1595]
+    assert master.security_id("WIPRO") is None
+    assert master.symbol(11536) == "TCS" and master.exchange(500325) == "BSE"
+    assert master.lot_size(35001) == 75 and master.segment(35001) == "D"
+
+    nse_eq = master.symbol_map(exchange="NSE", segment="E")
+    assert nse_eq == {"RELIANCE": 2885, "TCS": 11536, "INFY": 1595}
+    assert master.symbol_map(with_exchange=True)["RELIANCE_BSE"] == 500325
+
+
+def test_detailed_lookups_match_the_row_filter(tmp_path):
+    path = _write_detailed(tmp_path / "master.csv")
+    master = get_instrument_master(path)
+    df = pd.read_csv(path)
+    for base in ("RELIANCE", "HDFCBANK", "RELIANCE INDUSTRIES LTD", "NOPE"):
+        rows = df[(df["SYMBOL_NAME"] == base) | (df["UNDERLYING_SYMBOL"] == base)]
+        assert master.security_ids(base) == [int(x) for x in rows["SECURITY_ID"]]
+
+
+def test_index_is_parsed_once_per_file_version(tmp_path, monkeypatch):
+    path = _write_compact(tmp_path / "master.csv")
+    first = load_instrument_master(path)
+    assert os.path.exists(tmp_path / ".instrument_index" / "master.csv.pkl")
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("master parsed again")
+
+    with monkeypatch.context() as m:
+        m.setattr(instrument_master.csv, "DictReader", no_parse)
+        assert load_instrument_master(path).columns == first.columns
+        master = get_instrument_master(path)
+        assert get_instrument_master(path) is master
+
+    _write_compact(path, COMPACT[:2])
+    os.utime(path, ns=(1, 1))
+    assert len(get_instrument_master(path)) == 2
+    assert get_instrument_master(tmp_path / "missing.csv") is None
+
+
+def test_loader_resolves_through_the_master(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    daily = data_dir / "cache" / "dhan" / "daily"
+    daily.mkdir(parents=True)
+    df = generate_ohlcv_data(n_days=30).round(2)
+    df.index = df.index.rename("time")
+    df.to_csv(daily / "dhan_2885_RELIANCE_1d.csv")
+    _write_compact(data_dir / "dhan-scrip-master-detailed.csv")
+    monkeypatch.setattr(loaders, "DATA_DIR", data_dir)
+    parses = []
+    monkeypatch.setattr(
+        instrument_master,
+        "load_instrument_master",
+        lambda path, _load=load_instrument_master: parses.append(path) or _load(path),
+    )
+
+    cache_dir = str(data_dir / "cache")
+    out = loaders.load_many_india(
+        ["RELIANCE.NS", "NSE:RELIANCE.NS"], cache_dir=cache_dir
+    )
+    assert list(out) == ["RELIANCE.NS", "NSE:RELIANCE.NS"]
+    assert len(out["RELIANCE.NS"]) == 30
+    assert loaders._symbol_to_security_id("INFY", cache_dir) == 1594
+    assert len(parses) == 1
@@ -0,0 +1,77 @@
+"""
+Tests for concurrent basket loads (max_workers in core/loaders.py).
+
+A threaded load must return the same frames, in the same order, and raise the
+same error as a sequential one.
+"""
+
+import threading
+
+import pandas as pd
+import pytest
+
+from core import loaders
+from core.cache_manifest import clear_manifest_cache
+from tests.conftest import generate_ohlcv_data
+
+SYMBOLS = [f"SYM{i:02d}" for i in range(12)]
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    daily = data_dir / "cache" / "dhan" / "daily"
+    daily.mkdir(parents=True)
+    for i, sym in enumerate(SYMBOLS):
+        df = generate_ohlcv_data(n_days=200, seed=i).round(2)
+        df.index = df.index.rename("time")
+        df.to_csv(daily / f"dhan_{1000 + i}_{sym}_1d.csv")
+    monkeypatch.setattr(loaders, "DATA_DIR", data_dir)
+    clear_manifest_cache()
+    yield str(data_dir / "cache")
+    clear_manifest_cache()
+
+
+def test_threaded_load_matches_sequential(cache_dir, monkeypatch):
+    symbols = SYMBOLS[::-1]  # not file order
+    expected = loaders.load_many_india(symbols, cache_dir=cache_dir)
+
+    threads = set()
+    read = loaders.read_cache_file
+
+    def tracking_read(path):
+        threads.add(threading.current_thread().name)
+        return read(path)
+
+    monkeypatch.setattr(loaders, "read_cache_file", tracking_read)
+    timings = {}
+    got = loaders.load_many_india(
+        symbols, cache_dir=cache_dir, max_workers=4, timings=timings
+    )
+    assert list(got) == symbols
+    for sym in symbols:
+        pd.testing.assert_frame_equal(got[sym], expected[sym])
+    assert list(timings) == symbols and all(t >= 0 for t in timings.values())
+    assert threads and all(name.startswith("load_many") for name in threads)
+
+
+def test_threaded_load_raises_the_first_failing_symbol(cache_dir):
+    symbols = SYMBOLS[:3] + ["MISSING1"] + SYMBOLS[3:] + ["MISSING2"]
+    for max_workers in (None, 4):
+        with pytest.raises(FileNotFoundError, match="MISSING1"):
+            loaders.load_many_india(
+                symbols, cache_dir=cache_dir, max_workers=max_workers
+            )
+
+
+def test_threaded_weekly_load_keeps_order(cache_dir):
+    symbols = SYMBOLS[:6] + ["MISSING"]
+    timings = {}
+    got = loaders.load_many_india_weekly(
+        symbols, cache_dir=cache_dir, max_workers=3, timings=timings
+    )
+    assert list(got) == SYMBOLS[:6] and list(timings) == symbols
+    daily = loaders.load_many_india(SYMBOLS[:6], cache_dir=cache_dir)
+    for sym in SYMBOLS[:6]:
+        expected = loaders.aggregate_to_weekly(daily[sym])
+        pd.testing.assert_frame_equal(got[sym], expected)
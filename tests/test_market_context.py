@@ -0,0 +1,120 @@
+"""
+Tests for the process-wide market series cache (core/market_context.py).
+
+Loaders are replaced through MARKET_LOADERS; alignment must agree with the
+pandas joins and forward-filled reindexes it replaces.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import market_context
+from core.market_context import MarketSeries, clear_market_cache, market_series
+from tests.conftest import generate_ohlcv_data
+from utils.indicators import EMA
+
+
+def _index_frame(tz=None, hour=0, seed=3):
+    """Index bars on ~90% of business days, stamped at ``hour``."""
+    df = generate_ohlcv_data(n_days=400, start_date="2021-01-01", seed=seed)
+    rng = np.random.default_rng(seed)
+    df = df[rng.random(len(df)) > 0.1]
+    df.index = pd.DatetimeIndex(df.index) + pd.Timedelta(hours=hour)
+    if tz:
+        df.index = df.index.tz_localize(tz)
+    return df
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_market_cache()
+    yield
+    clear_market_cache()
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    counts = {"nifty200": 0, "india_vix": 0}
+    frame = _index_frame()
+
+    def load_nifty200(interval="1d"):
+        counts["nifty200"] += 1
+        return frame
+
+    def load_india_vix(interval="1d"):
+        counts["india_vix"] += 1
+        raise FileNotFoundError("India VIX data not found.")
+
+    monkeypatch.setitem(market_context.MARKET_LOADERS, "nifty200", load_nifty200)
+    monkeypatch.setitem(market_context.MARKET_LOADERS, "india_vix", load_india_vix)
+    return counts
+
+
+def test_series_and_failures_are_loaded_once(calls):
+    nifty = market_series("nifty200")
+    assert market_series("nifty200") is nifty
+    for _ in range(3):
+        with pytest.raises(FileNotFoundError):
+            market_series("india_vix")
+    assert calls == {"nifty200": 1, "india_vix": 1}
+
+    clear_market_cache()
+    market_series("nifty200")
+    assert calls["nifty200"] == 2
+    with pytest.raises(ValueError, match="Unknown market series"):
+        market_series("sensex")
+
+
+def test_indicators_are_computed_once(calls):
+    nifty = market_series("nifty200")
+    np.testing.assert_array_equal(nifty.ema(50), EMA(nifty.close, 50))
+    assert nifty.ema(50) is nifty.ema(50)
+    np.testing.assert_array_equal(
+        nifty.above_ema(50), nifty.close > EMA(nifty.close, 50)
+    )
+
+
+def test_exact_alignment_matches_left_join():
+    market = _index_frame(seed=5)
+    stock = generate_ohlcv_data(n_days=500, start_date="2020-11-01", seed=6)
+    nifty = MarketSeries("nifty200", market)
+    expected = stock.join(market[["close"]].rename(columns={"close": "m"}), how="left")[
+        "m"
+    ]
+    np.testing.assert_array_equal(nifty.align(stock.index), expected.to_numpy())
+    above = nifty.align(stock.index, nifty.above_ema(20))
+    assert set(np.unique(above[~np.isnan(above)])) <= {0.0, 1.0}
+
+
+def test_asof_alignment_matches_ffill_reindex():
+    market = _index_frame(tz="Asia/Kolkata", hour=9, seed=7)
+    stock = generate_ohlcv_data(n_days=500, start_date="2020-11-01", seed=8)
+    stock.index = stock.index.tz_localize("Asia/Kolkata")
+    vix = MarketSeries("india_vix", market)
+    expected = pd.Series(
+        market["close"].to_numpy(), index=market.index.normalize()
+    ).reindex(stock.index.normalize(), method="ffill")
+    got = vix.align(stock.index, how="asof", normalize=True)
+    np.testing.assert_array_equal(got, expected.to_numpy())
+    # Without normalizing, the 09:00 market bar is after the midnight stock bar
+    assert np.isnan(vix.align(stock.index, normalize=False)).all()
+
+
+def test_timezone_handling():
+    vix = MarketSeries("india_vix", _index_frame(tz="Asia/Kolkata", seed=9))
+    naive_dates = pd.DatetimeIndex(_index_frame(seed=9).index)
+    with pytest.raises(TypeError, match="tz-naive and tz-aware"):
+        vix.align(naive_dates)
+    assert np.isnan(vix.align(naive_dates, strict=False)).all()
+    np.testing.assert_array_equal(vix.align(naive_dates, naive=True), vix.close)
+
+
+def test_align_validates_arguments():
+    nifty = MarketSeries("nifty200", _index_frame())
+    with pytest.raises(ValueError, match="Unknown align mode"):
+        nifty.align(nifty.index, how="nearest")
+    with pytest.raises(ValueError, match="values for"):
+        nifty.align(nifty.index, np.zeros(3))
+    empty = MarketSeries("nifty200", _index_frame().iloc[:0])
+    assert len(empty) == 0 and np.isnan(empty.align(nifty.index)).all()
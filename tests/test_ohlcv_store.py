@@ -0,0 +1,126 @@
+"""
+Tests for the columnar OHLCV store (core/ohlcv_store.py).
+
+A migrated symbol must load exactly as load_many_india loads its CSV; stale
+and unmigrated symbols fall back to the CSV.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import loaders, ohlcv_store
+from core.cache_manifest import clear_manifest_cache
+from tests.conftest import generate_ohlcv_data
+
+
+def _write_dhan_csv(folder, secid, sym, seed, tz="Asia/Kolkata"):
+    """A daily CSV as scripts/dhan_fetch_data.py saves it."""
+    df = generate_ohlcv_data(n_days=300, seed=seed).round(2)
+    df.index = (df.index + pd.Timedelta(hours=9, minutes=15)).rename("time")
+    if tz:
+        df.index = df.index.tz_localize(tz)
+    path = folder / f"dhan_{secid}_{sym}_1d.csv"
+    df.to_csv(path)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    daily = data_dir / "cache" / "dhan" / "daily"
+    daily.mkdir(parents=True)
+    monkeypatch.setattr(loaders, "DATA_DIR", data_dir)
+    monkeypatch.setattr(ohlcv_store, "DATA_DIR", data_dir)
+    monkeypatch.setattr(ohlcv_store, "STORE_DIR", data_dir / "cache" / "columnar")
+    files = {
+        "RELIANCE": _write_dhan_csv(daily, 2885, "RELIANCE", seed=1),
+        "M_M": _write_dhan_csv(daily, 2031, "M_M", seed=2, tz=None),
+    }
+    return {"cache_dir": str(data_dir / "cache"), "files": files, "daily": daily}
+
+
+def _load(cache, symbols):
+    return loaders.load_many_india(symbols, cache_dir=cache["cache_dir"])
+
+
+def test_migrated_symbols_load_like_csv(cache, monkeypatch):
+    symbols = ["RELIANCE", "M_M"]
+    expected = _load(cache, symbols)
+    report = ohlcv_store.migrate_csv_cache(intervals=["1d"])
+    assert sorted(report["written"]) == ["1d/M_M", "1d/RELIANCE"]
+
+    meta = ohlcv_store.read_meta("RELIANCE")
+    assert meta["columns"]["close"] == "<f8" and meta["rows"] == 300
+    assert np.load(ohlcv_store.store_path("RELIANCE") / "time.npy").dtype == np.int64
+
+    def no_csv(*args, **kwargs):
+        raise AssertionError("CSV read for a migrated symbol")
+
+    with monkeypatch.context() as m:
+        m.setattr(pd, "read_csv", no_csv)
+        got = _load(cache, symbols)
+    for sym in symbols:
+        pd.testing.assert_frame_equal(got[sym], expected[sym], check_exact=True)
+
+    again = ohlcv_store.migrate_csv_cache(intervals=["1d"])
+    assert again["written"] == [] and len(again["current"]) == 2
+
+
+def test_unmigrated_and_stale_symbols_fall_back_to_csv(cache):
+    ohlcv_store.migrate_csv_cache(intervals=["1d"], symbols=["RELIANCE"])
+    assert ohlcv_store.read_meta("M_M") is None
+    assert _load(cache, ["M_M"])["M_M"].index.tz is None
+
+    # A fetch rewrites the CSV: the partition is stale until migrated again
+    path = cache["files"]["RELIANCE"]
+    _write_dhan_csv(cache["daily"], 2885, "RELIANCE", seed=5)
+    os.utime(path, ns=(1, 1))
+    assert ohlcv_store.read_frame("RELIANCE") is None
+    fresh = _load(cache, ["RELIANCE"])["RELIANCE"]
+    report = ohlcv_store.migrate_csv_cache(intervals=["1d"], symbols=["RELIANCE"])
+    assert report["written"] == ["1d/RELIANCE"]
+    pd.testing.assert_frame_equal(ohlcv_store.read_frame("RELIANCE"), fresh)
+
+
+def test_partition_must_come_from_the_resolved_csv(cache, monkeypatch):
+    ohlcv_store.migrate_csv_cache(intervals=["1d"], symbols=["RELIANCE"])
+    path = cache["files"]["RELIANCE"]
+    assert ohlcv_store.read_frame("RELIANCE", source=str(path)) is not None
+    expected = _load(cache, ["RELIANCE"])["RELIANCE"]
+
+    # Same bytes and mtime under another SECURITY_ID: not the migrated file
+    moved = path.with_name("dhan_9999_RELIANCE_1d.csv")
+    os.rename(path, moved)
+    clear_manifest_cache()
+    assert ohlcv_store.read_frame("RELIANCE") is None
+    assert ohlcv_store.read_frame("RELIANCE", source=str(moved)) is None
+
+    reads = []
+    read = loaders.read_cache_file
+    monkeypatch.setattr(
+        loaders, "read_cache_file", lambda p: reads.append(p) or read(p)
+    )
+    got = _load(cache, ["RELIANCE"])["RELIANCE"]
+    assert reads == [str(moved)]
+    pd.testing.assert_frame_equal(got, expected)
+
+    # A partition with no recorded source is never used
+    ohlcv_store.write_frame("NOSRC", expected)
+    assert ohlcv_store.read_meta("NOSRC")["source"] is None
+    assert ohlcv_store.read_frame("NOSRC") is None
+
+
+def test_unstorable_frames_stay_on_csv(cache):
+    bad = cache["daily"] / "dhan_1_BAD_1d.csv"
+    pd.DataFrame(
+        {"time": ["1970-01-01 00:00:01", "1970-01-01 00:00:02"], "close": [1.0, 2.0]}
+    ).to_csv(bad, index=False)
+    report = ohlcv_store.migrate_csv_cache(intervals=["1d"], symbols=["BAD"])
+    assert report["skipped"] == [("1d/BAD", "corrupted timestamps")]
+    with pytest.raises(ValueError, match="tz-naive"):
+        ohlcv_store.write_frame(
+            "X", generate_ohlcv_data(n_days=5).tz_localize("UTC"), root=cache["daily"]
+        )
@@ -0,0 +1,137 @@
+"""
+Tests for the array-backed position state (core/positions.py).
+
+Covers the lot book kernels (trailing stops, stop scan, FIFO partial-exit
+allocation) and an end-to-end pyramided position through BacktestEngine.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import positions
+from core.config import BrokerConfig
+from core.engine import BacktestEngine
+from core.positions import LotBook
+from core.strategy import Strategy
+
+
+def _book(*lots):
+    book = LotBook(capacity=1)
+    for bar, price, qty, comm, stop in lots:
+        book.add(bar, price, qty, comm, stop)
+    return book
+
+
+def test_lot_book_grows_past_capacity():
+    book = _book(
+        (0, 10.0, 5, 0.1, None), (1, 11.0, 6, 0.2, 9.0), (2, 12.0, 7, 0.3, 8.5)
+    )
+    assert len(book) == 3
+    assert book.total_qty() == 18
+    assert book.lots()[1] == (1, 11.0, 6, 0.2, 9.0)
+    assert book.lots()[0][4] is None
+
+    book.clear()
+    assert len(book) == 0 and book.entry_signal_reason == ""
+
+
+def test_stops_only_trail_upwards():
+    book = _book(
+        (0, 10.0, 5, 0.0, 9.0), (1, 11.0, 5, 0.0, None), (2, 12.0, 5, 0.0, 9.5)
+    )
+    assert book.min_stop() == 9.0
+
+    book.raise_stops(9.2)
+    assert [lot[4] for lot in book.lots()] == [9.2, None, 9.5]
+
+    book.raise_stops(float("nan"))
+    book.raise_stops(8.0)
+    assert book.min_stop() == 9.2
+    assert _book((0, 10.0, 5, 0.0, None)).min_stop() is None
+
+
+def test_partial_exits_allocate_fifo():
+    book = _book((0, 100.0, 10, 1.0, 90.0), (1, 110.0, 10, 2.0, None))
+    total_notional = 120.0 * 4 + 130.0 * 12
+    legs = book.allocate_exits([4, 12], [120.0, 130.0], total_notional, 2.04)
+
+    # (bar, entry_price, stop, exit_index, qty, entry_comm, exit_comm, notional)
+    assert [(leg[0], leg[3], leg[4]) for leg in legs] == [
+        (0, 0, 4),
+        (0, 1, 6),
+        (1, 1, 6),
+    ]
+    assert legs[0][5] == pytest.approx(0.4)
+    assert legs[2][5] == pytest.approx(1.2)
+    assert sum(leg[6] for leg in legs) == pytest.approx(2.04)
+    assert legs[1][2] == 90.0 and legs[2][2] is None
+
+    # Second lot keeps 4 shares and 40% of its entry commission
+    assert book.lots() == [(1, 110.0, 4, pytest.approx(0.8), None)]
+
+
+@pytest.mark.skipif(not positions.NUMBA_AVAILABLE, reason="numba not installed")
+def test_compiled_kernels_match_python():
+    rng = np.random.default_rng(0)
+    stops = np.where(rng.random(8) > 0.3, rng.uniform(80, 100, 8), np.nan)
+    assert positions.min_stop(stops, 8) == positions.min_stop.py_func(stops, 8)
+
+    compiled, python = stops.copy(), stops.copy()
+    positions.raise_stops(compiled, 8, 95.0)
+    positions.raise_stops.py_func(python, 8, 95.0)
+    np.testing.assert_array_equal(compiled, python)
+
+
+class ScaleInWithTrailingStop(Strategy):
+    """Two lots, a 50% take-profit, then a trailed stop closes the rest."""
+
+    pyramiding = 2
+
+    def prepare(self, df):
+        self.bar = -1
+        return super().prepare(df)
+
+    def size(self, equity, price, cfg):
+        return 10
+
+    def on_bar(self, ts, row, state):
+        self.bar += 1
+        act = {
+            "enter_long": self.bar in (0, 1),
+            "exit_long": False,
+            "stop": 90.0,
+            "signal_reason": f"E{self.bar}",
+        }
+        if self.bar == 2:
+            act["partial_exits"] = [
+                {"qty_pct": 0.5, "fill_price": 110.0, "reason": "TP1"}
+            ]
+        if self.bar == 3:
+            act["updated_stop"] = 95.0
+        return act
+
+
+def test_engine_pyramid_partial_exit_and_trailing_stop():
+    index = pd.date_range("2024-01-01", periods=8, freq="D", name="date")
+    df = pd.DataFrame(
+        {"open": 100.0, "high": 101.0, "low": 99.0, "close": 100.0, "volume": 1000},
+        index=index,
+    )
+    df.loc[index[5], "low"] = 94.0
+    cfg = BrokerConfig(commission_pct=0.1, initial_capital=100000.0)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        trades, equity, _ = BacktestEngine(
+            df, ScaleInWithTrailingStop(), cfg, mode="array"
+        ).run()
+
+    assert list(trades["entry_time"]) == [index[1], index[2]]
+    assert list(trades["exit_reason"]) == ["TP1", "stop"]
+    assert list(trades["exit_price"]) == [110.0, 95.0]
+    assert list(trades["stop_price"]) == [90.0, 95.0]
+    assert trades["net_pnl"].tolist() == pytest.approx([97.9, -51.95])
+    assert equity["qty"].tolist() == [10, 20, 10, 10, 10, 0, 0, 0]
@@ -0,0 +1,110 @@
+"""
+Tests for the engine's compact trade records and per-bar buffers (core/records.py).
+
+The buffers must produce exactly the DataFrames the engine used to build from
+per-row dicts.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.records import (
+    OPEN_TRADE,
+    PARTIAL_EXIT,
+    SIGNAL_EXIT,
+    STOP_EXIT,
+    BarBuffers,
+    TradeLog,
+    TradeRecord,
+)
+
+
+def _values(layout, **overrides):
+    base = {
+        "entry_time": pd.Timestamp("2024-01-02"),
+        "entry_price": 100.0,
+        "entry_qty": 10,
+        "exit_time": pd.Timestamp("2024-01-09"),
+        "exit_price": 110.0,
+        "commission_entry": 1.0,
+        "commission_exit": 1.1,
+        "gross_pnl": 100.0,
+        "net_pnl": 97.9,
+        "exit_reason": "signal",
+        "entry_signal_reason": "Bull Cross",
+        "exit_signal_reason": "XDN",
+        "stop_price": None,
+        "exit_qty": 10,
+        "trade_status": "partial",
+    }
+    base.update(overrides)
+    return [base[name] for name in layout]
+
+
+def test_trade_log_matches_dict_rows():
+    rows = [
+        (STOP_EXIT, _values(STOP_EXIT, stop_price=95.0, exit_reason="stop")),
+        (SIGNAL_EXIT, _values(SIGNAL_EXIT)),
+        (PARTIAL_EXIT, _values(PARTIAL_EXIT, exit_reason="TP1")),
+        (
+            OPEN_TRADE,
+            _values(
+                OPEN_TRADE,
+                exit_time=None,
+                exit_price=None,
+                exit_qty=None,
+                commission_exit=0,
+                gross_pnl=None,
+                net_pnl=None,
+                trade_status="OPEN",
+            ),
+        ),
+    ]
+    log = TradeLog()
+    for layout, values in rows:
+        log.append(layout, *values)
+
+    expected = pd.DataFrame([dict(zip(layout, values)) for layout, values in rows])
+    # trade_status stays object, as the engine's dict-row trade frames had it
+    expected["trade_status"] = expected["trade_status"].astype(object)
+    pd.testing.assert_frame_equal(log.to_frame(), expected, check_exact=True)
+    assert log.to_frame()["exit_reason"].dtype == expected["exit_reason"].dtype
+
+
+def test_trade_log_column_order_follows_first_layout():
+    log = TradeLog()
+    log.append(SIGNAL_EXIT, *_values(SIGNAL_EXIT))
+    log.append(STOP_EXIT, *_values(STOP_EXIT))
+    assert list(log.to_frame().columns) == list(SIGNAL_EXIT)
+    assert len(log) == 2
+    assert TradeLog().to_frame().empty
+
+
+def test_trade_record_is_slotted():
+    record = TradeRecord(STOP_EXIT, *_values(STOP_EXIT))
+    assert not hasattr(record, "__dict__")
+    assert record.get("exit_qty") is None
+    assert record.to_dict()["exit_price"] == 110.0
+    with pytest.raises(AttributeError):
+        record.unknown_field = 1
+
+
+def test_bar_buffers_skip_signal_rows_for_missing_closes():
+    index = pd.date_range("2024-01-01", periods=4, freq="D")
+    bars = BarBuffers(4)
+    bars.equity[:] = [100.0, 100.0, 101.0, 102.0]
+    bars.cash[:] = 100.0
+    bars.qty[:] = [0, 0, 1, 1]
+    bars.price[:] = [10.0, np.nan, 11.0, 12.0]
+    bars.valid[:] = [True, False, True, True]
+    bars.enter_long[0] = True
+    bars.did_entry[0] = True
+
+    equity_df, signals_df = bars.to_frames(index)
+
+    assert equity_df.index.name == "time"
+    assert list(equity_df.columns) == ["equity", "cash", "qty", "price"]
+    assert len(equity_df) == 4 and equity_df["qty"].dtype == np.int64
+    assert list(signals_df.index) == [index[0], index[2], index[3]]
+    assert signals_df["did_entry"].tolist() == [True, False, False]
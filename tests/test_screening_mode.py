@@ -0,0 +1,48 @@
+"""
+Tests for the trades-only screening mode (``BacktestEngine.run(trades_only=True)``).
+
+Skipping the per-bar equity and signal rows must not change the trades, on
+either the per-bar loop or the bulk simulator.
+"""
+
+import warnings
+
+import pandas as pd
+import pytest
+
+from core.config import BrokerConfig
+from core.engine import BacktestEngine
+from core.registry import make_strategy
+from tests.conftest import generate_ohlcv_data
+
+
+@pytest.fixture(scope="module")
+def df():
+    data = generate_ohlcv_data(n_days=1500, volatility=0.03, seed=21)
+    data.iloc[40, data.columns.get_loc("close")] = float("nan")
+    return data
+
+
+def _run(df, name, mode, **kwargs):
+    engine = BacktestEngine(
+        df, make_strategy(name), BrokerConfig(), symbol="TEST", mode=mode
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return engine.run(**kwargs)
+
+
+@pytest.mark.parametrize(
+    "name", ["tema_lsma_crossover", "dual_tema_lsma", "stoch_rsi_pyramid_long"]
+)
+@pytest.mark.parametrize("mode", ["series", "array", "auto"])
+def test_trades_only_matches_full_run(df, name, mode):
+    expected, _, _ = _run(df, name, mode)
+    trades, equity, signals = _run(df, name, mode, trades_only=True)
+    assert equity is None and signals is None
+    pd.testing.assert_frame_equal(trades, expected, check_exact=True)
+
+
+def test_trades_only_rejects_snapshots(df):
+    with pytest.raises(ValueError, match="trades_only"):
+        _run(df, "tema_lsma_crossover", "array", trades_only=True, snapshot=True)
@@ -0,0 +1,93 @@
+"""
+Tests for the shared-memory OHLCV panel (core/shared_panel.py).
+
+Frames attached in a worker must equal the frames the parent packed, without
+copying the data into the task or out of the shared block.
+"""
+
+import os
+import pickle
+from collections import namedtuple
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import shared_panel
+from core.shared_panel import SharedPanel, attach_frame
+from tests.conftest import generate_ohlcv_data
+
+
+def _basket(n_symbols=4, n_days=2000):
+    frames = {}
+    for i in range(n_symbols):
+        df = generate_ohlcv_data(n_days=n_days, seed=i)
+        df["volume"] = df["volume"].astype("int64")
+        df["up"] = df["close"] > df["open"]
+        frames[f"SYM{i}"] = df.rename_axis("time")
+    frames["TZ"] = generate_ohlcv_data(n_days=30).tz_localize("Asia/Kolkata")
+    return frames
+
+
+def _column_sums(ref):
+    """Worker: sum every column of the attached frame after a local write."""
+    df = attach_frame(ref)
+    df.loc[df.index[0], "close"] = -1.0  # copy-on-write: stays in this frame
+    fresh = attach_frame(ref)
+    return {col: float(fresh[col].sum()) for col in fresh.columns}
+
+
+def test_attached_frames_equal_the_packed_frames():
+    frames = _basket()
+    with SharedPanel(frames) as panel:
+        assert panel.symbols == list(frames)
+        for sym, df in frames.items():
+            got = attach_frame(panel.ref(sym))
+            pd.testing.assert_frame_equal(got, df, check_freq=False)
+
+        got = attach_frame(panel.ref("SYM0"))
+        close = got["close"].to_numpy()
+        assert np.shares_memory(close, attach_frame(panel.ref("SYM0"))["close"])
+        assert not close.flags.writeable
+        got.loc[got.index[0], "close"] = -1.0
+        got["extra"] = 1.0
+        assert attach_frame(panel.ref("SYM0"))["close"].iloc[0] > 0
+        assert "extra" not in attach_frame(panel.ref("SYM0"))
+
+        name = panel.shm.name
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_tasks_carry_refs_not_frames():
+    frames = _basket()
+    with SharedPanel(frames) as panel:
+        refs = [panel.ref(sym) for sym in panel.symbols]
+        task_bytes = len(pickle.dumps(refs))
+        frame_bytes = len(pickle.dumps(list(frames.values())))
+        assert task_bytes * 100 < frame_bytes
+
+        with get_context("spawn").Pool(2) as pool:
+            sums = pool.map(_column_sums, refs)
+    for sym, got in zip(frames, sums):
+        expected = {col: float(frames[sym][col].sum()) for col in frames[sym]}
+        assert got == pytest.approx(expected)
+
+
+def test_unpackable_frames_raise():
+    df = generate_ohlcv_data(n_days=10).assign(name="RELIANCE")
+    with pytest.raises(ValueError, match="not numeric"):
+        SharedPanel({"RELIANCE": df})
+    with pytest.raises(ValueError, match="DatetimeIndex"):
+        SharedPanel({"X": df[["close"]].reset_index(drop=True)})
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="no /dev/shm")
+def test_panel_larger_than_dev_shm_raises(monkeypatch):
+    usage = namedtuple("usage", "total used free")
+    monkeypatch.setattr(
+        shared_panel.shutil, "disk_usage", lambda path: usage(1024, 1024, 0)
+    )
+    with pytest.raises(OSError, match="/dev/shm"):
+        SharedPanel(_basket(n_symbols=1, n_days=10))
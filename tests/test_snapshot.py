@@ -0,0 +1,141 @@
+"""
+Tests for resumable backtests (core/snapshot.py).
+
+A run resumed from a snapshot of a shorter history must produce exactly the
+trades, equity and signals of a full run over the extended history, and a
+snapshot that no longer matches the data must be ignored.
+"""
+
+import warnings
+
+import pandas as pd
+import pytest
+
+from core.config import BrokerConfig
+from core.engine import BacktestEngine
+from core.registry import make_strategy
+from core.snapshot import EngineSnapshot
+from core.strategy import Strategy
+from tests.conftest import generate_ohlcv_data
+
+
+@pytest.fixture(scope="module")
+def df():
+    return generate_ohlcv_data(n_days=1000, volatility=0.03, seed=11)
+
+
+def _engine(df, strategy, cfg=None, mode="array"):
+    return BacktestEngine(df, strategy, cfg or BrokerConfig(), symbol="TEST", mode=mode)
+
+
+def _run(engine, **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return engine.run(**kwargs)
+
+
+def _assert_same(expected, actual):
+    for exp, act in zip(expected, actual):
+        pd.testing.assert_frame_equal(exp, act, check_exact=True)
+
+
+class Counter(Strategy):
+    """Pyramids into up to three stopped lots, counting bars in instance state."""
+
+    pyramiding = 3
+    hold = 6
+
+    def prepare(self, df):
+        self.data = df
+        self.bars_in_trade = 0
+        self.history = []
+        return super().prepare(df)
+
+    def on_bar_idx(self, idx, ts, row, state):
+        self.bars_in_trade = self.bars_in_trade + 1 if state["qty"] > 0 else 0
+        self.history.append(self.bars_in_trade)
+        return {
+            "enter_long": idx % 4 == 0,
+            "exit_long": self.bars_in_trade >= self.hold,
+            "stop": row.close * 0.9,
+        }
+
+
+@pytest.mark.parametrize(
+    "name", ["tema_lsma_crossover", "ichimoku_simple", "donchian_breakout"]
+)
+@pytest.mark.parametrize("mode", ["array", "auto"])
+def test_resumed_run_matches_full_run(df, name, mode):
+    expected = _run(_engine(df, make_strategy(name), mode=mode))
+
+    engine = _engine(df.iloc[:600], make_strategy(name), mode=mode)
+    _run(engine, snapshot=True)
+    snap = engine.last_snapshot
+    assert snap.bar == 599 and snap.bar_time == df.index[599]
+
+    # Nightly refreshes: a bar at a time, then the rest in one go
+    for end in (601, 602, len(df)):
+        engine = _engine(df.iloc[:end], make_strategy(name), mode=mode)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            actual = engine.run(resume_from=snap, snapshot=True)
+        snap = engine.last_snapshot
+    _assert_same(expected, actual)
+
+
+@pytest.mark.parametrize("compounding", [True, False])
+def test_resume_restores_lots_and_strategy_state(df, compounding):
+    cfg = BrokerConfig(compounding=compounding)
+    full_strategy = Counter()
+    expected = _run(_engine(df, full_strategy, cfg))
+    assert len(expected[0]) > 10
+
+    engine = _engine(df.iloc[:503], Counter(), cfg)
+    _run(engine, snapshot=True)
+    assert "bars_in_trade" in engine.last_snapshot.strategy_state
+
+    resumed_strategy = Counter()
+    actual = _run(_engine(df, resumed_strategy, cfg), resume_from=engine.last_snapshot)
+    _assert_same(expected, actual)
+    assert resumed_strategy.history == full_strategy.history
+
+
+def test_snapshot_save_load_roundtrip(df, tmp_path):
+    engine = _engine(df.iloc[:700], make_strategy("tema_lsma_crossover"))
+    _run(engine, snapshot=True)
+    path = engine.last_snapshot.save(tmp_path / "snaps" / "TEST.pkl")
+
+    snap = EngineSnapshot.load(path)
+    assert snap.bar == 699
+    assert list(tmp_path.joinpath("snaps").iterdir()) == [path]
+
+    expected = _run(_engine(df, make_strategy("tema_lsma_crossover")))
+    actual = _run(_engine(df, make_strategy("tema_lsma_crossover")), resume_from=snap)
+    _assert_same(expected, actual)
+
+
+def test_snapshot_not_used_when_inputs_change(df):
+    engine = _engine(df.iloc[:600], make_strategy("tema_lsma_crossover"))
+    _run(engine, snapshot=True)
+    snap = engine.last_snapshot
+
+    revised = df.copy()
+    revised.iloc[100, revised.columns.get_loc("close")] *= 1.01
+
+    def tema(**params):
+        strategy = make_strategy("tema_lsma_crossover")
+        for key, value in params.items():
+            setattr(strategy, key, value)
+        return strategy
+
+    cases = [
+        (revised, {}, BrokerConfig(), "history"),
+        (df, {"fast_length": 10}, BrokerConfig(), "parameters"),
+        (df, {}, BrokerConfig(compounding=False), "configuration"),
+        (df.iloc[:500], {}, BrokerConfig(), "extend"),
+    ]
+    for data, params, cfg, reason in cases:
+        expected = _run(_engine(data, tema(**params), cfg))
+        with pytest.warns(RuntimeWarning, match=f"Snapshot not used.*{reason}"):
+            actual = _engine(data, tema(**params), cfg).run(resume_from=snap)
+        _assert_same(expected, actual)
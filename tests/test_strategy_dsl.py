@@ -0,0 +1,177 @@
+"""
+Tests for declarative spec strategies (core/dsl.py).
+
+A spec written like TemaLsmaCrossover's on_bar must trade identically to it on
+both engine paths and in parameter sweeps; text specs compile to the same
+signals as expressions.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import registry
+from core.config import BrokerConfig
+from core.dsl import (
+    ADX,
+    ATR,
+    EMA,
+    LSMA,
+    MACD,
+    RSI,
+    TEMA,
+    bar,
+    close,
+    crossover,
+    crossunder,
+    param,
+    parse,
+    spec_strategy,
+)
+from core.engine import BacktestEngine
+from core.registry import make_strategy, register_strategy
+from core.sweep import param_grid, sweep_symbol
+from tests.conftest import generate_ohlcv_data
+from utils import indicators
+
+FAST, SLOW = param("fast_length", 25), param("slow_length", 100)
+TemaLsmaSpec = spec_strategy(
+    "TemaLsmaSpec",
+    entry=(bar >= SLOW)
+    & crossover(TEMA(close, FAST), LSMA(close, SLOW))
+    & (close > 0)
+    & (ATR(14) / close * 100 >= param("atr_14_min", 3.5))
+    & (ADX(28)["adx"] >= param("adx_28_min", 25.0)),
+    exit=(bar >= SLOW) & crossunder(TEMA(close, FAST), LSMA(close, SLOW)),
+    entry_reason="Bull Cross",
+    exit_reason="XDN",
+)
+TEXT = {
+    "entry": "(bar >= slow_length) & crossover(TEMA(close, fast_length), LSMA(close, slow_length))"
+    " & (close > 0) & (ATR(14) / close * 100 >= atr_14_min) & (ADX(28)['adx'] >= adx_28_min)",
+    "exit": "(bar >= slow_length) & crossunder(TEMA(close, fast_length), LSMA(close, slow_length))",
+}
+PARAMS = [
+    {},
+    {"atr_14_min": 1.0, "adx_28_min": 10.0},
+    {"fast_length": 10, "slow_length": 50, "atr_14_min": 0.5},
+]
+
+
+@pytest.fixture(scope="module")
+def volatile_df():
+    return generate_ohlcv_data(n_days=1500, volatility=0.03, seed=7)
+
+
+def _run(df, strategy, mode):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return BacktestEngine(
+            df, strategy, BrokerConfig(), symbol="TEST", mode=mode
+        ).run()
+
+
+@pytest.mark.parametrize("mode", ["array", "vectorized"])
+@pytest.mark.parametrize("params", PARAMS)
+def test_spec_trades_like_handwritten_strategy(volatile_df, params, mode):
+    reference = make_strategy("tema_lsma_crossover")
+    for key, value in params.items():
+        setattr(reference, key, value)
+    expected = _run(volatile_df, reference, mode)
+    actual = _run(volatile_df, TemaLsmaSpec(**params), mode)
+    for exp, act in zip(expected, actual):
+        pd.testing.assert_frame_equal(exp, act, check_exact=True)
+    assert len(expected[0]) > 0 or params == {}
+
+
+def test_text_spec_matches_expressions(volatile_df):
+    defaults = {
+        "fast_length": 25,
+        "slow_length": 100,
+        "atr_14_min": 1.0,
+        "adx_28_min": 10.0,
+    }
+    text = spec_strategy(
+        "TextSpec",
+        **TEXT,
+        params=defaults,
+        entry_reason="Bull Cross",
+        exit_reason="XDN",
+    )
+    assert text.params() == defaults
+    a, b = text(), TemaLsmaSpec(atr_14_min=1.0, adx_28_min=10.0)
+    a.prepare(volatile_df)
+    b.prepare(volatile_df)
+    for x, y in zip(a.signals(volatile_df), b.signals(volatile_df)):
+        np.testing.assert_array_equal(x, y)
+
+
+def test_sweep_matches_handwritten_sweep(volatile_df, monkeypatch):
+    monkeypatch.setitem(registry._REG, "tema_lsma_spec", TemaLsmaSpec)
+    grid = param_grid(
+        fast_length=[10, 25], slow_length=[50, 100], atr_14_min=[0.5, 3.5]
+    )
+    pd.testing.assert_frame_equal(
+        sweep_symbol(volatile_df, "tema_lsma_crossover", grid),
+        sweep_symbol(volatile_df, "tema_lsma_spec", grid),
+    )
+
+
+def test_indicator_inputs_and_outputs(volatile_df):
+    c = volatile_df.close.to_numpy(dtype=float)
+    spec = spec_strategy(
+        "Inputs",
+        entry=crossover(EMA(RSI(close, 14), 9), 50),
+        exit=(EMA(20) < EMA(close, 20).shift(1)) | (MACD(12, 26, 9)["histogram"] < 0),
+    )()
+    spec.prepare(volatile_df)
+    smoothed = indicators.EMA(indicators.RSI(c, 14), 9)
+    expected = np.concatenate(([False], (smoothed[:-1] <= 50) & (smoothed[1:] > 50)))
+    np.testing.assert_array_equal(spec.enter_long, expected)
+    ema = indicators.EMA(c, 20)
+    prev = np.concatenate(([np.nan], ema[:-1]))
+    macd = indicators.MACD(c, 12, 26, 9)["histogram"]
+    np.testing.assert_array_equal(spec.exit_long, (ema < prev) | (macd < 0))
+
+    with pytest.raises(ValueError, match="select one"):
+        spec_strategy("Dict", entry=MACD(12, 26, 9) > 0, exit=close < 0)().prepare(
+            volatile_df
+        )
+    with pytest.raises(ValueError, match="boolean operands"):
+        spec_strategy("Num", entry=close & (close > 0), exit=close < 0)().prepare(
+            volatile_df
+        )
+    with pytest.raises(ValueError, match="price series"):
+        ATR(close, 14)
+
+
+def test_parse_rejects_anything_but_expressions():
+    for text in (
+        "__import__('os')",
+        "close.__class__",
+        "(lambda: 1)()",
+        "1 < close < 2",
+    ):
+        with pytest.raises(ValueError):
+            parse(text)
+    with pytest.raises(ValueError, match="not an expression"):
+        parse("1 + 2")
+    assert parse("close > level", {"level": 3}).args[1].op == "param"
+
+
+def test_register_strategy_and_params():
+    register_strategy("tema_lsma_spec_test", TemaLsmaSpec)
+    try:
+        register_strategy("tema_lsma_spec_test", TemaLsmaSpec)
+        strategy = make_strategy("tema_lsma_spec_test", '{"fast_length": 10}')
+        assert strategy.fast_length == 10 and strategy.slow_length == 100
+        with pytest.raises(ValueError, match="already registered"):
+            register_strategy(
+                "tema_lsma_spec_test", spec_strategy("Other", close > 0, close < 0)
+            )
+        with pytest.raises(ValueError, match="no parameter"):
+            TemaLsmaSpec(length=3)
+    finally:
+        registry._REG.pop("tema_lsma_spec_test", None)
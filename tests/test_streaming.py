@@ -0,0 +1,146 @@
+"""
+Tests for the streaming engine API (``BacktestEngine.stream``, core/streaming.py).
+
+The streamed trades and equity/signal chunks must reassemble into exactly the
+output of ``run()``, chunks must stay within ``checkpoint_every`` bars, and the
+on-disk sink must read back the same rows.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.config import BrokerConfig
+from core.engine import BacktestEngine
+from core.loaders import load_minute_data
+from core.multi_timeframe import aggregate_to_timeframe
+from core.records import TradeRecord
+from core.registry import make_strategy
+from core.streaming import ColumnarSink, EquityCheckpoint, trades_frame
+from tests.conftest import generate_ohlcv_data
+
+
+@pytest.fixture(scope="module")
+def df():
+    data = generate_ohlcv_data(n_days=1200, volatility=0.03, seed=3)
+    data.iloc[50, data.columns.get_loc("close")] = np.nan
+    return data
+
+
+def _engine(df, name):
+    return BacktestEngine(df, make_strategy(name), BrokerConfig(), symbol="TEST")
+
+
+def _collect(engine, **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        events = list(engine.stream(**kwargs))
+    trades = [e for e in events if isinstance(e, TradeRecord)]
+    checkpoints = [e for e in events if isinstance(e, EquityCheckpoint)]
+    assert len(trades) + len(checkpoints) == len(events)
+    return trades, checkpoints
+
+
+@pytest.mark.parametrize(
+    "name", ["tema_lsma_crossover", "stoch_rsi_pyramid_long", "dual_tema_lsma"]
+)
+@pytest.mark.parametrize("checkpoint_every", [1, 97, 5000])
+def test_stream_matches_run(df, name, checkpoint_every):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected_trades, expected_equity, expected_signals = _engine(df, name).run()
+
+    trades, checkpoints = _collect(_engine(df, name), checkpoint_every=checkpoint_every)
+
+    assert all(len(c.equity_rows) <= checkpoint_every for c in checkpoints)
+    assert [c.bar for c in checkpoints][-1] == len(df) - 1
+    equity = pd.concat([c.equity_rows for c in checkpoints])
+    signals = pd.concat([c.signal_rows for c in checkpoints])
+    pd.testing.assert_frame_equal(equity, expected_equity, check_exact=True)
+    pd.testing.assert_frame_equal(signals, expected_signals, check_exact=True)
+    pd.testing.assert_frame_equal(
+        trades_frame(trades), expected_trades, check_exact=True
+    )
+
+    last = checkpoints[-1]
+    assert last.equity == expected_equity["equity"].iloc[-1]
+    assert last.qty == expected_equity["qty"].iloc[-1]
+
+
+def test_trades_are_yielded_before_later_checkpoints(df):
+    engine = _engine(df, "tema_lsma_crossover")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        events = list(engine.stream(checkpoint_every=50))
+    seen_until = -1
+    for event in events:
+        if isinstance(event, EquityCheckpoint):
+            seen_until = event.bar
+        elif event.exit_time is not None and not pd.isna(event.exit_time):
+            # A closed trade arrives no later than the checkpoint after its exit bar
+            assert df.index.get_loc(event.exit_time) > seen_until
+
+
+def test_columnar_sink_roundtrip(df, tmp_path):
+    engine = _engine(df, "tema_lsma_crossover")
+    sink = ColumnarSink(tmp_path / "run")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        checkpoints = [
+            e
+            for e in engine.stream(checkpoint_every=256, sink=sink)
+            if isinstance(e, EquityCheckpoint)
+        ]
+    equity = ColumnarSink.read(tmp_path / "run", "equity")
+    signals = ColumnarSink.read(tmp_path / "run", "signals")
+    pd.testing.assert_frame_equal(
+        equity, pd.concat([c.equity_rows for c in checkpoints]), check_exact=True
+    )
+    pd.testing.assert_frame_equal(
+        signals, pd.concat([c.signal_rows for c in checkpoints]), check_exact=True
+    )
+    # A new sink on the same path starts empty and keeps unrelated files
+    (tmp_path / "run" / "notes.bin").write_bytes(b"keep")
+    ColumnarSink(tmp_path / "run")
+    assert [p.name for p in (tmp_path / "run").iterdir()] == ["notes.bin"]
+
+    (tmp_path / "out").mkdir()
+    (tmp_path / "out" / "schema.json").write_text('{"tables": []}')
+    with pytest.raises(FileExistsError):
+        ColumnarSink(tmp_path / "out")
+    assert (tmp_path / "out" / "schema.json").exists()
+
+
+def test_stream_on_minute_derived_bars(tmp_path):
+    minutes = pd.date_range("2024-01-01 09:15", periods=6000, freq="1min")
+    rng = np.random.default_rng(1)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, len(minutes))))
+    pd.DataFrame(
+        {
+            "open": close,
+            "high": close * 1.001,
+            "low": close * 0.999,
+            "close": close,
+            "volume": 1000,
+        },
+        index=pd.Index(minutes, name="date"),
+    ).to_csv(tmp_path / "dhan_historical_1333.csv")
+
+    # Minute candles as saved by the Dhan fetch, through the minute loader
+    raw = load_minute_data(1333, cache_dir=str(tmp_path))
+    bars = aggregate_to_timeframe(raw.tz_localize("Asia/Kolkata"), "5m")
+    sink = ColumnarSink(tmp_path / "minute")
+    engine = _engine(bars, "tema_lsma_crossover")
+    trades, checkpoints = _collect(engine, checkpoint_every=100, sink=sink)
+    assert len(checkpoints) == -(-len(bars) // 100)
+
+    equity = ColumnarSink.read(tmp_path / "minute", "equity")
+    assert str(equity.index.tz) == "Asia/Kolkata"
+    pd.testing.assert_index_equal(equity.index, bars.index, check_names=False)
+
+
+def test_stream_rejects_bad_checkpoint_interval(df):
+    with pytest.raises(ValueError, match="checkpoint_every"):
+        next(_engine(df, "tema_lsma_crossover").stream(checkpoint_every=0))
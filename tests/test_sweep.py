@@ -0,0 +1,128 @@
+"""
+Tests for parameter sweeps (core/sweep.py).
+
+Every row of a sweep must match a separate BacktestEngine run with the same
+parameters, whether it comes from the shared-indicator path
+(``Strategy.sweep_signals``) or the per-row fallback.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.config import BrokerConfig
+from core.engine import BacktestEngine
+from core.sweep import (
+    RESULT_COLUMNS,
+    _strategy_for,
+    param_grid,
+    rank_params,
+    summarize_run,
+    sweep_basket,
+    sweep_symbol,
+)
+from strategies.tema_lsma_crossover import TemaLsmaCrossover
+from tests.conftest import generate_ohlcv_data
+
+
+@pytest.fixture(scope="module")
+def df():
+    return generate_ohlcv_data(n_days=1500, volatility=0.03, seed=7)
+
+
+def _reference(df, name, grid, cfg):
+    rows = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for params in grid.to_dict("records"):
+            strategy = _strategy_for(name, params)
+            trades, equity, _ = BacktestEngine(df, strategy, cfg, mode="array").run()
+            rows.append({**params, **summarize_run(trades, equity, cfg)})
+    return pd.DataFrame(rows, columns=list(grid.columns) + RESULT_COLUMNS)
+
+
+def _sweep(*args, **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return sweep_symbol(*args, **kwargs)
+
+
+def test_param_grid_is_cartesian_product():
+    grid = param_grid(fast_length=[20, 25], slow_length=[80, 100, 120], atr_14_min=0.0)
+    assert len(grid) == 6
+    assert list(grid.columns) == ["fast_length", "slow_length", "atr_14_min"]
+    assert grid.iloc[1].to_dict() == {
+        "fast_length": 20,
+        "slow_length": 100,
+        "atr_14_min": 0.0,
+    }
+
+
+def test_sweep_signals_match_per_strategy_signals(df):
+    grid = param_grid(
+        fast_length=[10, 25], slow_length=[50, 100], atr_14_min=[0.0, 3.0]
+    )
+    plan = TemaLsmaCrossover.sweep_signals(df, grid)
+    assert plan.enter_long.shape == (len(grid), len(df))
+
+    for p, params in enumerate(grid.to_dict("records")):
+        strategy = _strategy_for("tema_lsma_crossover", params)
+        strategy.prepare(df)
+        enter, exit_, _, reason = strategy.signals(df)
+        np.testing.assert_array_equal(plan.enter_long[p], enter)
+        np.testing.assert_array_equal(plan.exit_long[p], exit_)
+        np.testing.assert_array_equal(plan.row(p)[3], reason)
+
+
+@pytest.mark.parametrize("compounding", [True, False])
+def test_tema_lsma_sweep_matches_individual_runs(df, compounding):
+    cfg = BrokerConfig(compounding=compounding)
+    grid = param_grid(
+        fast_length=[10, 25],
+        slow_length=[50, 100],
+        atr_14_min=[0.0, 3.5],
+        adx_28_min=[0.0, 25.0],
+        use_atr_stop=[False, True],
+    )
+    expected = _reference(df, "tema_lsma_crossover", grid, cfg)
+    actual = _sweep(df, "tema_lsma_crossover", grid, cfg)
+    assert actual["trades"].sum() > 0
+    pd.testing.assert_frame_equal(expected, actual, check_exact=True)
+
+
+def test_sweep_falls_back_without_sweep_signals(df):
+    grid = param_grid(length=[10, 20], exit_option=[1, 2])
+    cfg = BrokerConfig()
+    expected = _reference(df, "donchian_breakout", grid, cfg)
+    actual = _sweep(df, "donchian_breakout", grid, cfg)
+    pd.testing.assert_frame_equal(expected, actual, check_exact=True)
+
+
+def test_sweep_rejects_unknown_parameters(df):
+    with pytest.raises(ValueError, match="no parameter 'fast_len'"):
+        _sweep(df, "tema_lsma_crossover", param_grid(fast_len=[10]))
+    with pytest.raises(ValueError, match="Unknown strategy"):
+        _sweep(df, "no_such_strategy", param_grid(fast_length=[10]))
+
+
+def test_sweep_basket_is_tidy_and_rankable():
+    data = {
+        "AAA": generate_ohlcv_data(n_days=600, volatility=0.03, seed=1),
+        "BBB": generate_ohlcv_data(n_days=600, volatility=0.03, seed=2),
+    }
+    grid = param_grid(fast_length=[10, 20], slow_length=[50], atr_14_min=[0.0])
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        results = sweep_basket(data, "tema_lsma_crossover", grid)
+
+    assert list(results.columns) == ["symbol"] + list(grid.columns) + RESULT_COLUMNS
+    assert results["symbol"].tolist() == ["AAA", "AAA", "BBB", "BBB"]
+
+    ranked = rank_params(results)
+    assert len(ranked) == 2
+    assert ranked["net_pnl"].is_monotonic_decreasing
+    by_fast = results.groupby("fast_length")["net_pnl"].sum()
+    for _, row in ranked.iterrows():
+        assert row["net_pnl"] == pytest.approx(by_fast[row["fast_length"]])
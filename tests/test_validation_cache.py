@@ -0,0 +1,162 @@
+"""
+Tests for cached data validation and the engine's ``validate`` modes.
+
+``validate="cached"`` must validate each distinct data content (or cache file
+version) once per process and return the same results as a fresh
+``DataValidation``; the engine must never modify the caller's frame.
+"""
+
+import os
+import warnings
+
+import numpy as np
+import pytest
+
+from core import data_validation
+from core.config import BrokerConfig
+from core.data_validation import DataValidation, clear_validation_cache, data_key
+from core.engine import BacktestEngine
+from core.registry import make_strategy
+from core.strategy import Strategy
+from tests.conftest import generate_ohlcv_data
+
+
+@pytest.fixture
+def df():
+    return generate_ohlcv_data(n_days=800, volatility=0.03, seed=9)
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Count DataValidation.validate_all() calls, starting from an empty cache."""
+    clear_validation_cache()
+    counter = {"n": 0}
+    original = DataValidation.validate_all
+
+    def counting(self):
+        counter["n"] += 1
+        return original(self)
+
+    monkeypatch.setattr(DataValidation, "validate_all", counting)
+    yield counter
+    clear_validation_cache()
+
+
+def _engine(df, **kwargs):
+    return BacktestEngine(
+        df,
+        make_strategy("tema_lsma_crossover"),
+        BrokerConfig(),
+        symbol="TEST",
+        **kwargs,
+    )
+
+
+def test_cached_validation_runs_once_per_content(df, calls):
+    expected = DataValidation(df, "TEST").validate_all()
+    calls["n"] = 0
+
+    first = _engine(df)
+    second = _engine(df.copy())
+    assert calls["n"] == 1
+    assert second.data_fingerprint == first.data_fingerprint
+    assert second.validation_results["stats"] == first.validation_results["stats"]
+
+    assert first.validation_results["passed"] == expected["passed"]
+    assert first.validation_results["checks"] == expected["checks"]
+
+    # Results are copies: callers may modify them
+    first.validation_results["errors"].append("x")
+    assert _engine(df).validation_results["errors"] == []
+
+    changed = df.copy()
+    changed.iloc[-1, changed.columns.get_loc("close")] *= 1.001
+    _engine(changed)
+    assert calls["n"] == 2
+    # Non-OHLCV columns do not affect validation
+    _engine(df.assign(extra=1.0))
+    assert calls["n"] == 2
+
+
+def test_validate_modes(df, calls):
+    _engine(df, validate="always")
+    _engine(df, validate="always")
+    assert calls["n"] == 2
+
+    engine = _engine(df, validate="never")
+    assert calls["n"] == 2
+    assert engine.validation_results is None and engine.data_fingerprint is None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        _, equity, _ = engine.run()
+    assert len(equity) == len(df)
+
+    with pytest.raises(ValueError, match="validate mode"):
+        _engine(df, validate="sometimes")
+
+
+def test_cache_file_key_tracks_file_version(df, tmp_path, calls):
+    path = tmp_path / "TEST.csv"
+    df.to_csv(path)
+    key = data_key(df, "TEST", str(path))
+    assert key[0] == "file"
+
+    _engine(df, cache_file=str(path))
+    _engine(df, cache_file=str(path))
+    assert calls["n"] == 1
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    _engine(df, cache_file=str(path))
+    assert calls["n"] == 2
+    # A different slice of the same file is different data
+    _engine(df.iloc[50:], cache_file=str(path))
+    assert calls["n"] == 3
+
+
+def test_failed_validation_warns_on_every_cached_hit(df, calls):
+    bad = df.iloc[:30]
+    for _ in range(2):
+        with pytest.warns(RuntimeWarning, match="Data validation failed"):
+            _engine(bad)
+    assert calls["n"] == 1
+
+
+class AddsColumns(Strategy):
+    def prepare(self, df):
+        df["sma"] = df["close"].rolling(10).mean()
+        df.loc[df.index[0], "close"] = -1.0
+        return super().prepare(df)
+
+
+def test_engine_does_not_modify_callers_frame(df):
+    columns = list(df.columns)
+    values = df.to_numpy().copy()
+    engine = BacktestEngine(df, AddsColumns(), BrokerConfig(), validate="never")
+    engine.run()
+    assert "sma" in engine.df.columns and engine.df["close"].iloc[0] == -1.0
+    assert list(df.columns) == columns
+    np.testing.assert_array_equal(df.to_numpy(), values)
+
+
+def test_read_only_frame_is_accepted(df):
+    frozen = df.copy()
+    for col in frozen.columns:
+        frozen[col].to_numpy().flags.writeable = False
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = _engine(df).run()
+        actual = _engine(frozen).run()
+    for exp, act in zip(expected, actual):
+        assert exp.equals(act)
+
+
+def test_cache_is_bounded(df, monkeypatch):
+    clear_validation_cache()
+    monkeypatch.setattr(data_validation, "VALIDATION_CACHE_SIZE", 2)
+    for seed in range(4):
+        data_validation.validate_cached(
+            generate_ohlcv_data(n_days=120, seed=seed), "TEST"
+        )
+    assert len(data_validation._VALIDATION_CACHE) == 2
+    clear_validation_cache()
@@ -0,0 +1,133 @@
+"""
+Parity tests for the vectorized signal protocol (``Strategy.signals``).
+
+Strategies that implement ``signals()`` are simulated in bulk by
+``core.vectorized``; trades, equity and signals must match the per-bar loop
+exactly, including commission, stop exits and bars with missing closes.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.config import BrokerConfig
+from core.engine import BacktestEngine
+from core.registry import make_strategy
+from core.strategy import Strategy
+from tests.conftest import generate_ohlcv_data
+
+CASES = [
+    ("tema_lsma_crossover", {}),
+    (
+        "tema_lsma_crossover",
+        {"use_atr_stop": True, "atr_stop_multiplier": 1.5, "atr_14_min": 0.0},
+    ),
+    ("ema_crossover", {}),
+    (
+        "ema_crossover",
+        {"use_stop_loss": True, "ema_fast_period": 10, "ema_slow_period": 30},
+    ),
+    ("donchian_breakout", {}),
+    ("donchian_breakout", {"exit_option": 2, "length": 10}),
+]
+
+
+def _strategy(name, params):
+    strategy = make_strategy(name)
+    for key, value in params.items():
+        setattr(strategy, key, value)
+    return strategy
+
+
+def _run(df, strategy, mode, cfg=None):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        engine = BacktestEngine(
+            df, strategy, cfg or BrokerConfig(), symbol="TEST", mode=mode
+        )
+        return engine.run()
+
+
+def _assert_same(expected, actual, ignore_signal_columns=()):
+    exp_trades, exp_equity, exp_signals = expected
+    act_trades, act_equity, act_signals = actual
+    pd.testing.assert_frame_equal(exp_trades, act_trades, check_exact=True)
+    pd.testing.assert_frame_equal(exp_equity, act_equity, check_exact=True)
+    pd.testing.assert_frame_equal(
+        exp_signals.drop(columns=list(ignore_signal_columns)),
+        act_signals.drop(columns=list(ignore_signal_columns)),
+        check_exact=True,
+    )
+
+
+@pytest.fixture(scope="module")
+def volatile_df():
+    return generate_ohlcv_data(n_days=1500, volatility=0.03, seed=7)
+
+
+@pytest.mark.parametrize("compounding", [True, False])
+@pytest.mark.parametrize("name,params", CASES)
+def test_vectorized_matches_bar_loop(volatile_df, name, params, compounding):
+    cfg = BrokerConfig(compounding=compounding)
+    expected = _run(volatile_df, _strategy(name, params), "array", cfg)
+    actual = _run(volatile_df, _strategy(name, params), "vectorized", cfg)
+    # EMA crossover's on_bar also flags RSI-dip add-ons while in a position;
+    # they can never fill at pyramiding=1, so signals() does not report them
+    ignore = ("enter_long",) if name == "ema_crossover" else ()
+    _assert_same(expected, actual, ignore)
+
+
+def test_vectorized_stop_exits_match(volatile_df):
+    params = {"use_atr_stop": True, "atr_stop_multiplier": 1.0, "atr_14_min": 0.0}
+    expected = _run(volatile_df, _strategy("tema_lsma_crossover", params), "array")
+    actual = _run(volatile_df, _strategy("tema_lsma_crossover", params), "vectorized")
+    assert (actual[0]["exit_reason"] == "stop").any()
+    _assert_same(expected, actual)
+
+
+def test_vectorized_handles_missing_closes():
+    df = generate_ohlcv_data(n_days=800, volatility=0.03, seed=3)
+    df.iloc[[0, 120, 121, 500], df.columns.get_loc("close")] = np.nan
+    cfg = BrokerConfig(commission_pct=0.5, slippage_ticks=2)
+    params = {"exit_option": 2, "length": 10}
+    expected = _run(df, _strategy("donchian_breakout", params), "array", cfg)
+    actual = _run(df, _strategy("donchian_breakout", params), "vectorized", cfg)
+    assert len(actual[0]) > 0
+    _assert_same(expected, actual)
+
+
+def test_auto_mode_falls_back_without_signals(volatile_df):
+    class BarOnly(Strategy):
+        def on_bar(self, ts, row, state):
+            return {"enter_long": state["qty"] == 0, "exit_long": state["qty"] > 0}
+
+    expected = _run(volatile_df, BarOnly(), "array")
+    actual = _run(volatile_df, BarOnly(), "auto")
+    _assert_same(expected, actual)
+
+    with pytest.raises(ValueError, match="Vectorized mode unavailable"):
+        _run(volatile_df, BarOnly(), "vectorized")
+
+
+def test_auto_mode_falls_back_when_pyramiding(volatile_df):
+    strategy = _strategy("donchian_breakout", {"pyramiding": 2})
+    with pytest.raises(ValueError, match="Vectorized mode unavailable"):
+        _run(volatile_df, strategy, "vectorized")
+    expected = _run(
+        volatile_df, _strategy("donchian_breakout", {"pyramiding": 2}), "array"
+    )
+    actual = _run(
+        volatile_df, _strategy("donchian_breakout", {"pyramiding": 2}), "auto"
+    )
+    _assert_same(expected, actual)
+
+
+def test_signals_shape_is_validated(volatile_df):
+    class BadShape(Strategy):
+        def signals(self, df):
+            return np.zeros(3, dtype=bool), np.zeros(len(df), dtype=bool), None, None
+
+    with pytest.raises(ValueError, match="enter_long"):
+        _run(volatile_df, BadShape(), "auto")
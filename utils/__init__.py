@@ -46,6 +46,7 @@ from utils.indicators import (  # Core indicators; Momentum indicators; Trend in
     renko_bars,
     resample_apply,
     rolling_window,
+    set_indicator_backend,
     sharpe_ratio,
     true_range,
     volatility_adjusted_returns,
@@ -104,6 +105,7 @@ __all__ = [
     "resample_apply",
     "rolling_window",
     "sharpe_ratio",
+    "set_indicator_backend",
     "volatility_adjusted_returns",
     "apply_indicators",
     # Backward compatibility aliases
@@ -0,0 +1,281 @@
+"""Batched indicators over a symbols × bars price panel.
+
+The functions in :mod:`utils.indicators` take one 1-D series per call. The ones
+here take a 2-D panel, one row per symbol on a shared date index, and return a
+panel of the same shape from a single vectorized call:
+
+    >>> closes, symbols, index = panel_from_frames(basket_data)
+    >>> ema_50 = batch.EMA(closes, 50)
+    >>> rsi_14 = batch.RSI(closes, 14)
+    >>> strength = batch.cross_sectional_rank(batch.ROC(closes, 5))
+
+Rows are NaN-padded where a symbol has no data (listed later than the first
+symbol, or delisted). Each row of the result equals the 1-D indicator run on
+that symbol's own series, from its first to its last valid bar, and is NaN
+outside that range; NaN gaps inside the range behave as they do in 1-D.
+Recursive indicators (EMA and friends) are seeded at each row's first bar, not
+at the first column of the panel.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils import indicators
+from utils.indicators import _window_sums
+
+
+class _Layout:
+    """Valid range of every row, to left-align a panel and map results back."""
+
+    def __init__(self, panel: np.ndarray):
+        valid = ~np.isnan(panel)
+        self.shape = panel.shape
+        any_valid = valid.any(axis=1)
+        first = valid.argmax(axis=1)
+        last = panel.shape[1] - valid[:, ::-1].argmax(axis=1)
+        self.ranges = [
+            (row, first[row], last[row] - first[row])
+            for row in np.flatnonzero(any_valid)
+        ]
+
+    def align(self, panel: np.ndarray) -> np.ndarray:
+        """Shift every row to start at column 0, NaN-padding the end."""
+        out = np.full(self.shape, np.nan)
+        for row, start, length in self.ranges:
+            out[row, :length] = panel[row, start : start + length]
+        return out
+
+    def restore(self, aligned: np.ndarray) -> np.ndarray:
+        """Inverse of :meth:`align`; NaN outside each row's valid range."""
+        out = np.full(self.shape, np.nan)
+        for row, start, length in self.ranges:
+            out[row, start : start + length] = aligned[row, :length]
+        return out
+
+
+def _as_panel(values) -> np.ndarray:
+    panel = np.asarray(values, dtype=float)
+    if panel.ndim != 2:
+        raise ValueError(
+            f"Expected a 2-D symbols x bars panel, got shape {panel.shape}"
+        )
+    return panel
+
+
+def _rowwise(func, panel, *args, **kwargs) -> np.ndarray:
+    panel = _as_panel(panel)
+    layout = _Layout(panel)
+    return layout.restore(func(layout.align(panel), *args, **kwargs))
+
+
+def panel_from_frames(
+    frames: Dict[str, pd.DataFrame], column: str = "close"
+) -> Tuple[np.ndarray, list, pd.DatetimeIndex]:
+    """
+    Stack ``column`` of each symbol's DataFrame into a NaN-padded panel.
+
+    Returns ``(panel, symbols, index)``: one row per symbol in ``frames`` order
+    on the sorted union of all the frames' indexes.
+    """
+    symbols = [s for s, df in frames.items() if df is not None and not df.empty]
+    index = pd.DatetimeIndex([])
+    for symbol in symbols:
+        index = index.union(frames[symbol].index)
+    panel = np.full((len(symbols), len(index)), np.nan)
+    for row, symbol in enumerate(symbols):
+        series = frames[symbol][column]
+        panel[row, index.get_indexer(series.index)] = series.to_numpy(dtype=float)
+    return panel, symbols, index
+
+
+# Kernels on left-aligned panels (every row starts at column 0)
+def _ema(aligned: np.ndarray, n: int, alpha: Optional[float] = None) -> np.ndarray:
+    if alpha is None:
+        alpha = 2.0 / (n + 1)
+    result = np.empty_like(aligned)
+    if aligned.shape[1] == 0:
+        return result
+    result[:, 0] = aligned[:, 0]
+    if indicators.SCIPY_AVAILABLE and not np.isinf(aligned).any():
+        zi = ((1 - alpha) * aligned[:, 0])[:, None]
+        result[:, 1:], _ = indicators.lfilter(
+            [alpha], [1.0, alpha - 1.0], aligned[:, 1:], axis=1, zi=zi
+        )
+        return result
+    for i in range(1, aligned.shape[1]):
+        result[:, i] = alpha * aligned[:, i] + (1 - alpha) * result[:, i - 1]
+    return result
+
+
+def _rolling(aligned: np.ndarray, n: int):
+    return pd.DataFrame(aligned.T).rolling(window=n)
+
+
+def _window(aligned: np.ndarray, length: int, weighted: bool) -> tuple:
+    """Window sums of every row in one pass over the flattened panel."""
+    rows, width = aligned.shape
+    sums = np.full(rows * width, np.nan)
+    weighted_sums = np.full(rows * width, np.nan) if weighted else None
+    if width >= length:
+        s, w, has_nan = _window_sums(aligned.ravel(), length, weighted=weighted)
+        s[has_nan] = np.nan
+        sums[length - 1 :] = s
+        if weighted:
+            w[has_nan] = np.nan
+            weighted_sums[length - 1 :] = w
+    # Windows ending before column length - 1 run into the previous row
+    head = np.arange(width) < length - 1
+    sums = sums.reshape(rows, width)
+    sums[:, head] = np.nan
+    if weighted:
+        weighted_sums = weighted_sums.reshape(rows, width)
+        weighted_sums[:, head] = np.nan
+    return sums, weighted_sums
+
+
+def _sma(aligned, n):
+    return _rolling(aligned, n).mean().to_numpy().T
+
+
+def _wma(aligned, n):
+    if n <= 0:
+        return np.full(aligned.shape, np.nan)
+    sums, weighted_sums = _window(aligned, n, weighted=True)
+    return (weighted_sums + sums) / (n * (n + 1) / 2.0)
+
+
+def _lsma(aligned, length):
+    if length <= 0:
+        return np.full(aligned.shape, np.nan)
+    sums, weighted_sums = _window(aligned, length, weighted=True)
+    x_mean = (length - 1) / 2.0
+    x_var = length * (length**2 - 1) / 12.0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = (weighted_sums - x_mean * sums) / x_var
+    return sums / length + slope * x_mean
+
+
+def _dema(aligned, length):
+    e1 = _ema(aligned, length)
+    return 2 * e1 - _ema(e1, length)
+
+
+def _tema(aligned, length):
+    if length <= 0:
+        return np.full(aligned.shape, np.nan)
+    ema1 = _ema(aligned, length)
+    ema2 = _ema(ema1, length)
+    ema3 = _ema(ema2, length)
+    return 3 * ema1 - 3 * ema2 + ema3
+
+
+def _rsi(aligned, n):
+    delta = np.diff(aligned, axis=1, prepend=aligned[:, :1])
+    gain = np.where(delta > 0, delta, 0)
+    loss = np.where(delta < 0, -delta, 0)
+    avg_gain = _ema(gain, n, alpha=1.0 / n)
+    avg_loss = _ema(loss, n, alpha=1.0 / n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = np.where(avg_loss != 0, avg_gain / avg_loss, 0)
+    rsi = 100 - (100 / (1 + rs))
+    return np.nan_to_num(rsi, nan=50)
+
+
+def _roc(aligned, period):
+    roc = np.full(aligned.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roc[:, period:] = (aligned[:, period:] / aligned[:, :-period] - 1) * 100
+    return roc
+
+
+def _momentum(aligned, period):
+    momentum = np.diff(aligned, n=1, axis=1, prepend=np.nan)
+    momentum[:, period:] = aligned[:, period:] - aligned[:, :-period]
+    return momentum
+
+
+# Public API: each takes and returns symbols x bars panels
+def SMA(panel: np.ndarray, n: int) -> np.ndarray:
+    """Simple Moving Average of every row."""
+    return _rowwise(_sma, panel, n)
+
+
+def EMA(panel: np.ndarray, n: int, alpha: Optional[float] = None) -> np.ndarray:
+    """Exponential Moving Average of every row, seeded at each row's first bar."""
+    return _rowwise(_ema, panel, n, alpha)
+
+
+def DEMA(panel: np.ndarray, length: int = 200) -> np.ndarray:
+    """Double Exponential Moving Average of every row."""
+    return _rowwise(_dema, panel, length)
+
+
+def TEMA(panel: np.ndarray, length: int) -> np.ndarray:
+    """Triple Exponential Moving Average of every row."""
+    return _rowwise(_tema, panel, length)
+
+
+def WMA(panel: np.ndarray, n: int) -> np.ndarray:
+    """Linearly weighted moving average of every row."""
+    return _rowwise(_wma, panel, n)
+
+
+def LSMA(panel: np.ndarray, length: int) -> np.ndarray:
+    """Least Squares Moving Average (linear regression end point) of every row."""
+    return _rowwise(_lsma, panel, length)
+
+
+def RSI(panel: np.ndarray, n: int = 14) -> np.ndarray:
+    """RSI with Wilder's smoothing of every row. Range: 0-100."""
+    return _rowwise(_rsi, panel, n)
+
+
+def Momentum(panel: np.ndarray, period: int = 10) -> np.ndarray:
+    """Price change over ``period`` bars of every row."""
+    return _rowwise(_momentum, panel, period)
+
+
+def ROC(panel: np.ndarray, period: int = 1) -> np.ndarray:
+    """Percent change over ``period`` bars of every row."""
+    return _rowwise(_roc, panel, period)
+
+
+def BollingerBands(panel: np.ndarray, n: int = 20, std: float = 2) -> dict:
+    """Bollinger Bands of every row: SMA with std dev bands."""
+    panel = _as_panel(panel)
+    layout = _Layout(panel)
+    rolling = _rolling(layout.align(panel), n)
+    sma = rolling.mean().to_numpy().T
+    rolling_std = rolling.std().to_numpy().T
+    return {
+        "upper": layout.restore(sma + (rolling_std * std)),
+        "middle": layout.restore(sma),
+        "lower": layout.restore(sma - (rolling_std * std)),
+    }
+
+
+def ATR(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14
+) -> np.ndarray:
+    """Average True Range of every row; rows are laid out by ``close``."""
+    close = _as_panel(close)
+    layout = _Layout(close)
+    high, low, close = (layout.align(_as_panel(a)) for a in (high, low, close))
+    prev_close = np.concatenate((close[:, :1], close[:, :-1]), axis=1)
+    tr1 = high - low
+    tr2 = np.abs(high - prev_close)
+    tr3 = np.abs(low - prev_close)
+    tr = np.maximum(np.maximum(tr1, tr2), tr3)
+    atr = _ema(tr, period, alpha=1.0 / period)
+    return layout.restore(np.nan_to_num(atr, nan=0))
+
+
+def cross_sectional_rank(panel: np.ndarray, ascending: bool = True) -> np.ndarray:
+    """
+    Percentile rank (0-100] of every symbol among the symbols with a value on
+    the same bar; ties share their average rank and NaN stays NaN.
+    """
+    ranks = pd.DataFrame(_as_panel(panel)).rank(axis=0, pct=True, ascending=ascending)
+    return ranks.to_numpy() * 100
@@ -0,0 +1,21 @@
+"""
+:mod:`utils.indicators` with every function memoized by
+:mod:`utils.indicator_cache`:
+
+    >>> from utils.cached_indicators import ATR, EMA
+    >>> atr = ATR(high, low, close, 14)  # computed once per distinct input
+"""
+
+from utils import indicators
+from utils.indicator_cache import memoized
+
+_wrapped: dict = {}
+
+
+def __getattr__(name: str):
+    value = getattr(indicators, name)
+    if not callable(value) or isinstance(value, type):
+        return value
+    if name not in _wrapped:
+        _wrapped[name] = memoized(value)
+    return _wrapped[name]
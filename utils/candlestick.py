@@ -0,0 +1,388 @@
+"""Vectorized candlestick pattern detection.
+
+:func:`candle_patterns` evaluates every pattern in :data:`PATTERNS` over whole
+OHLC arrays in one call and returns a boolean array per pattern. Element ``i``
+is True when the pattern completes on bar ``i``; multi-bar patterns look back
+from ``i``, never forward. :func:`pattern_mask` packs the same flags into one
+``uint64`` per bar, bit ``k`` standing for ``PATTERNS[k]``:
+
+    >>> mask = pattern_mask(df.open, df.high, df.low, df.close)
+    >>> hammers = (mask & pattern_bits("hammer")) != 0
+    >>> unpack_patterns(mask[-1])
+    ['engulfing', 'gap_down']
+
+Two families share the bit layout:
+
+- The bullish entry and bearish exit patterns of
+  ``strategies/candlestick_patterns.py`` (``engulfing`` to
+  ``bearish_harami``). Their body thresholds are parameters, and a bar with a
+  non-finite price or no range never takes part in them.
+- The drop-day patterns of ``scripts/analyze_candlestick_patterns.py``
+  (``bearish_marubozu`` to ``evening_star``). Long bodies are measured against
+  the mean body of the last ``avg_period`` bars.
+"""
+
+from typing import Callable, Dict, Iterable, List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.indicators import SMA
+
+ArrayLike = Union[pd.Series, np.ndarray, Sequence[float]]
+
+_PATTERNS: Dict[str, Callable[["_Bars"], np.ndarray]] = {}
+
+
+def _pattern(func):
+    _PATTERNS[func.__name__.lstrip("_")] = func
+    return func
+
+
+class _Bars:
+    """Candle components of every bar, shifted on demand to earlier bars."""
+
+    def __init__(
+        self,
+        open_,
+        high,
+        low,
+        close,
+        small_body_pct: float,
+        long_body_pct: float,
+        doji_pct: float,
+        avg_period: int,
+    ):
+        self.o = o = np.asarray(open_, dtype=float)
+        self.h = h = np.asarray(high, dtype=float)
+        self.l = l = np.asarray(low, dtype=float)
+        self.c = c = np.asarray(close, dtype=float)
+        if not (len(o) == len(h) == len(l) == len(c)):
+            raise ValueError("open, high, low and close must have the same length")
+
+        self.rng = h - l
+        self.body = np.abs(c - o)
+        # fmax/fmin skip a NaN side, like DataFrame.max(axis=1)
+        self.body_hi = np.fmax(c, o)
+        self.body_lo = np.fmin(c, o)
+        self.up_shadow = h - self.body_hi
+        self.dn_shadow = self.body_lo - l
+        self.white = c > o
+        self.black = c < o
+        self.valid = np.isfinite(o) & np.isfinite(h) & np.isfinite(l)
+        self.valid &= np.isfinite(c) & (self.rng > 0)
+        self.small = self.body < self.rng * small_body_pct
+        self.long = self.body > self.rng * long_body_pct
+        self.doji = self.body < self.rng * (doji_pct / 100)
+        self.avg_body = SMA(self.body, avg_period)
+
+    def back(self, values: np.ndarray, k: int) -> np.ndarray:
+        """``values`` of the bar ``k`` bars earlier (False/NaN before the start)."""
+        out = np.empty_like(values)
+        out[:k] = False if values.dtype == bool else np.nan
+        out[k:] = values[: len(values) - k]
+        return out
+
+
+# ---------------------------------------------------------------------------
+# Bullish entry patterns (CandlestickPatternsStrategy), in detection order
+# ---------------------------------------------------------------------------
+
+
+@_pattern
+def _engulfing(b: _Bars) -> np.ndarray:
+    """2 candles: white engulfs black."""
+    ok = b.back(b.valid, 1) & b.valid & b.back(b.black, 1) & b.white
+    return ok & (b.o <= b.back(b.c, 1)) & (b.c >= b.back(b.o, 1))
+
+
+@_pattern
+def _harami(b: _Bars) -> np.ndarray:
+    """2 candles: small white inside large black."""
+    ok = b.back(b.valid, 1) & b.valid & b.back(b.black & b.long, 1)
+    ok &= b.white & b.small
+    return ok & (b.h <= b.back(b.body_hi, 1)) & (b.l >= b.back(b.body_lo, 1))
+
+
+@_pattern
+def _piercing(b: _Bars) -> np.ndarray:
+    """2 candles: black long, white opens below its low, closes >50% body."""
+    ok = b.back(b.valid, 1) & b.valid & b.back(b.black & b.long, 1) & b.white
+    body_mid = b.back(b.body_lo + b.body / 2, 1)
+    return ok & (b.o < b.back(b.l, 1)) & (b.c > body_mid) & (b.c < b.back(b.o, 1))
+
+
+@_pattern
+def _morning_star(b: _Bars) -> np.ndarray:
+    """3 candles: black long, small, white closes above mid."""
+    ok = b.back(b.valid, 2) & b.back(b.valid, 1) & b.valid
+    ok &= b.back(b.black & b.long, 2) & b.back(b.small, 1) & b.white
+    body_mid = b.back(b.body_lo + b.body / 2, 2)
+    return ok & (b.back(b.h, 1) < b.back(b.l, 2)) & (b.c > body_mid)
+
+
+@_pattern
+def _morning_doji_star(b: _Bars) -> np.ndarray:
+    """3 candles: black, doji gaps down, white closes above mid."""
+    ok = b.back(b.valid, 2) & b.back(b.valid, 1) & b.valid
+    ok &= b.back(b.black, 2) & b.back(b.doji, 1) & b.white
+    body_mid = b.back(b.body_lo + b.body / 2, 2)
+    return ok & (b.back(b.h, 1) < b.back(b.l, 2)) & (b.c > body_mid)
+
+
+@_pattern
+def _hammer(b: _Bars) -> np.ndarray:
+    """1 candle: small white body, long lower shadow."""
+    ok = b.valid & b.white & b.small
+    return ok & (b.dn_shadow >= b.body * 2) & (b.up_shadow < b.body * 0.5)
+
+
+@_pattern
+def _inverted_hammer(b: _Bars) -> np.ndarray:
+    """1 candle: small white body, long upper shadow."""
+    ok = b.valid & b.white & b.small
+    return ok & (b.up_shadow >= b.body * 2) & (b.dn_shadow < b.body * 0.5)
+
+
+@_pattern
+def _dragonfly_doji(b: _Bars) -> np.ndarray:
+    """1 candle: doji with long lower shadow."""
+    ok = b.valid & b.doji
+    return ok & (b.dn_shadow > b.rng * 0.5) & (b.up_shadow < b.rng * 0.1)
+
+
+@_pattern
+def _gravestone_doji(b: _Bars) -> np.ndarray:
+    """1 candle: doji with long upper shadow."""
+    ok = b.valid & b.doji
+    return ok & (b.up_shadow > b.rng * 0.5) & (b.dn_shadow < b.rng * 0.1)
+
+
+@_pattern
+def _abandoned_baby(b: _Bars) -> np.ndarray:
+    """3 candles: black, doji gaps down, white gaps up."""
+    ok = b.back(b.valid, 2) & b.back(b.valid, 1) & b.valid
+    ok &= b.back(b.black, 2) & b.back(b.doji, 1) & b.white
+    return ok & (b.back(b.h, 1) < b.back(b.l, 2)) & (b.l > b.back(b.h, 1))
+
+
+@_pattern
+def _kicker(b: _Bars) -> np.ndarray:
+    """2 candles: black to white with gap up."""
+    ok = b.back(b.valid, 1) & b.valid & b.back(b.black, 1) & b.white
+    return ok & (b.l > b.back(b.h, 1))
+
+
+@_pattern
+def _belt_hold(b: _Bars) -> np.ndarray:
+    """1 candle: small white body at high (same test as the hammer)."""
+    return _hammer(b)
+
+
+@_pattern
+def _homing_pigeon(b: _Bars) -> np.ndarray:
+    """2 candles: both black, second inside first."""
+    ok = b.back(b.valid, 1) & b.valid & b.back(b.black, 1) & b.black
+    return ok & (b.h < b.back(b.body_hi, 1)) & (b.l > b.back(b.body_lo, 1))
+
+
+@_pattern
+def _matching_low(b: _Bars) -> np.ndarray:
+    """2 candles: black then white with a similar close."""
+    ok = b.back(b.valid, 1) & b.valid & b.back(b.black, 1) & b.white
+    return ok & (np.abs(b.back(b.c, 1) - b.c) < b.back(b.rng, 1) * 0.05)
+
+
+# ---------------------------------------------------------------------------
+# Bearish exit patterns (CandlestickPatternsStrategy)
+# ---------------------------------------------------------------------------
+
+
+@_pattern
+def _bearish_engulfing(b: _Bars) -> np.ndarray:
+    """2 candles: black engulfs white."""
+    ok = b.back(b.valid, 1) & b.valid & b.back(b.white, 1) & b.black
+    return ok & (b.o >= b.back(b.c, 1)) & (b.c <= b.back(b.o, 1))
+
+
+@_pattern
+def _bearish_harami(b: _Bars) -> np.ndarray:
+    """2 candles: small black inside large white."""
+    ok = b.back(b.valid, 1) & b.valid & b.back(b.white & b.long, 1)
+    ok &= b.black & b.small
+    return ok & (b.h <= b.back(b.body_hi, 1)) & (b.l >= b.back(b.body_lo, 1))
+
+
+# ---------------------------------------------------------------------------
+# Drop-day patterns (scripts/analyze_candlestick_patterns.py)
+# ---------------------------------------------------------------------------
+
+
+@_pattern
+def _bearish_marubozu(b: _Bars) -> np.ndarray:
+    """Large black body with minimal shadows."""
+    ok = b.black & (b.body > b.avg_body * 1.5)
+    return ok & (b.up_shadow < b.body * 0.1) & (b.dn_shadow < b.body * 0.1)
+
+
+@_pattern
+def _bearish_engulfing_strict(b: _Bars) -> np.ndarray:
+    """Black candle opens above and closes below a smaller white one."""
+    ok = b.black & b.back(b.white, 1)
+    ok &= (b.o > b.back(b.c, 1)) & (b.c < b.back(b.o, 1))
+    return ok & (b.body > b.back(b.body, 1))
+
+
+@_pattern
+def _shooting_star(b: _Bars) -> np.ndarray:
+    """Long upper shadow, short lower shadow, on a down day."""
+    ok = (b.up_shadow > b.body * 2) & (b.dn_shadow < b.body * 0.5)
+    return ok & (b.body > 0) & (b.c < b.back(b.c, 1))
+
+
+@_pattern
+def _hanging_man(b: _Bars) -> np.ndarray:
+    """Black candle with a long lower shadow and short upper shadow."""
+    ok = (b.dn_shadow > b.body * 2) & (b.up_shadow < b.body * 0.5)
+    return ok & (b.body > 0) & b.black
+
+
+@_pattern
+def _doji(b: _Bars) -> np.ndarray:
+    """Body under 10% of the range."""
+    return (b.body < b.rng * 0.1) & (b.rng > 0)
+
+
+def _gap_pct(b: _Bars) -> np.ndarray:
+    prev_close = b.back(b.c, 1)
+    return (prev_close - b.o) / prev_close * 100
+
+
+@_pattern
+def _gap_down(b: _Bars) -> np.ndarray:
+    """Open more than 0.5% below the previous close."""
+    return _gap_pct(b) > 0.5
+
+
+@_pattern
+def _large_gap_down(b: _Bars) -> np.ndarray:
+    """Open more than 1% below the previous close."""
+    return _gap_pct(b) > 1.0
+
+
+@_pattern
+def _filled_gap_down(b: _Bars) -> np.ndarray:
+    """Gap down that closed above its open."""
+    return _gap_down(b) & b.white
+
+
+@_pattern
+def _unfilled_gap_down(b: _Bars) -> np.ndarray:
+    """Gap down that kept selling."""
+    return _gap_down(b) & b.black
+
+
+@_pattern
+def _long_lower_shadow(b: _Bars) -> np.ndarray:
+    """White candle with a long lower shadow (hammer-like, any body size)."""
+    ok = (b.dn_shadow > b.body * 2) & (b.up_shadow < b.body * 0.5)
+    return ok & (b.body > 0) & b.white
+
+
+@_pattern
+def _long_red_candle(b: _Bars) -> np.ndarray:
+    """Black body over 1.5x the average body."""
+    return b.black & (b.body > b.avg_body * 1.5)
+
+
+@_pattern
+def _very_long_red(b: _Bars) -> np.ndarray:
+    """Black body over 2.5x the average body."""
+    return b.black & (b.body > b.avg_body * 2.5)
+
+
+@_pattern
+def _lower_close(b: _Bars) -> np.ndarray:
+    """Close in the bottom 20% of the range."""
+    return (b.c - b.l) / np.where(b.rng == 0, np.nan, b.rng) < 0.2
+
+
+@_pattern
+def _upper_close(b: _Bars) -> np.ndarray:
+    """Close in the top 20% of the range."""
+    return (b.h - b.c) / np.where(b.rng == 0, np.nan, b.rng) < 0.2
+
+
+@_pattern
+def _dark_cloud(b: _Bars) -> np.ndarray:
+    """Black opens above a white high and closes inside its lower half."""
+    prev_o, prev_c = b.back(b.o, 1), b.back(b.c, 1)
+    ok = b.back(b.white, 1) & b.black & (b.o > b.back(b.h, 1))
+    return ok & (b.c < (prev_o + prev_c) / 2) & (b.c > prev_o)
+
+
+@_pattern
+def _evening_star(b: _Bars) -> np.ndarray:
+    """Simplified: gap up, then a black candle closing below the prior open."""
+    return b.black & (b.o > b.back(b.c, 1)) & (b.c < b.back(b.o, 1))
+
+
+#: Every supported pattern; the index of a name is its bit in a pattern mask
+PATTERNS = tuple(_PATTERNS)
+
+
+def candle_patterns(
+    open_: ArrayLike,
+    high: ArrayLike,
+    low: ArrayLike,
+    close: ArrayLike,
+    small_body_pct: float = 0.30,
+    long_body_pct: float = 0.60,
+    doji_pct: float = 5.0,
+    avg_period: int = 20,
+) -> Dict[str, np.ndarray]:
+    """Boolean array per pattern in :data:`PATTERNS`, in that order.
+
+    ``small_body_pct`` and ``long_body_pct`` are body/range fractions and
+    ``doji_pct`` a body/range percentage, as in CandlestickPatternsStrategy.
+    """
+    bars = _Bars(
+        open_, high, low, close, small_body_pct, long_body_pct, doji_pct, avg_period
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {name: func(bars) for name, func in _PATTERNS.items()}
+
+
+def pack_patterns(
+    flags: Dict[str, np.ndarray], names: Sequence[str] = PATTERNS
+) -> np.ndarray:
+    """Pack boolean arrays into one ``uint64`` per bar, bit ``k`` for ``names[k]``."""
+    if len(names) > 64:
+        raise ValueError(f"At most 64 patterns fit a mask, got {len(names)}")
+    mask = np.zeros(len(flags[names[0]]) if names else 0, dtype=np.uint64)
+    for bit, name in enumerate(names):
+        mask |= np.asarray(flags[name], dtype=np.uint64) << np.uint64(bit)
+    return mask
+
+
+def pattern_mask(
+    open_: ArrayLike, high: ArrayLike, low: ArrayLike, close: ArrayLike, **params
+) -> np.ndarray:
+    """Packed :func:`candle_patterns` of every bar (see :data:`PATTERNS`)."""
+    return pack_patterns(candle_patterns(open_, high, low, close, **params))
+
+
+def pattern_bits(*wanted: str, names: Sequence[str] = PATTERNS) -> int:
+    """Mask with the bits of the ``wanted`` pattern names set."""
+    bits = 0
+    for name in wanted:
+        if name not in names:
+            raise ValueError(f"Unknown pattern: {name!r}")
+        bits |= 1 << names.index(name)
+    return bits
+
+
+def unpack_patterns(mask: int, names: Iterable[str] = PATTERNS) -> List[str]:
+    """Names of the patterns set in one bar's mask, in ``names`` order."""
+    mask = int(mask)
+    return [name for bit, name in enumerate(names) if mask >> bit & 1]
@@ -0,0 +1,502 @@
+"""Compute a declared set of indicators, sharing their common intermediates.
+
+Many indicators rebuild the same arrays: ATR, ADX, Supertrend and Keltner all
+start from the true range (and ATR(n) is ADX(n)'s smoothed true range); DEMA,
+TEMA, MACD, Keltner and Bull/Bear Power run overlapping EMA chains; Stochastic,
+Williams %R, Donchian and Ichimoku take the same rolling highs and lows; RSI
+feeds StochasticRSI. A :class:`FeaturePlan` lists the indicators a caller needs,
+and :meth:`FeaturePlan.compute` evaluates them over a graph of intermediate
+nodes, each computed at most once:
+
+    >>> plan = FeaturePlan()
+    >>> plan.add("atr_14", "ATR", 14).add("adx_14", "ADX", 14)
+    >>> plan.add("macd", "MACD", 12, 26, 9).add("ema_26", "EMA", 26)
+    >>> plan.add("volume_sma_20", "SMA", 20, source="volume")
+    >>> features = plan.compute(df)
+
+Every output equals the :mod:`utils.indicators` function of the same name
+called on the same arrays. Indicators without a planned recipe are still
+accepted and computed by that function directly.
+"""
+
+import inspect
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils import indicators
+
+_INPUTS = ("open", "high", "low", "close", "volume")
+# Price parameters that take ``source`` when they are an indicator's only input
+_SERIES = ("close", "values", "series")
+
+# Intermediate nodes: key = (op, *args); args may themselves be node keys
+_OPS: Dict[str, Callable] = {}
+# Planned indicators: name -> recipe(graph, source, *params)
+_RECIPES: Dict[str, Callable] = {}
+
+
+def _op(func: Callable) -> Callable:
+    _OPS[func.__name__.lstrip("_")] = func
+    return func
+
+
+def _recipe(func: Callable) -> Callable:
+    _RECIPES[func.__name__.lstrip("_")] = func
+    return func
+
+
+class _Graph:
+    """Memoized evaluation of intermediate nodes for one set of inputs."""
+
+    def __init__(self, inputs: Dict[str, np.ndarray]):
+        self.inputs = inputs
+        self.memo: Dict[tuple, Any] = {}
+
+    def __call__(self, key: tuple):
+        if key not in self.memo:
+            self.memo[key] = _OPS[key[0]](self, *key[1:])
+        return self.memo[key]
+
+
+def _src(name: str) -> tuple:
+    return ("input", name)
+
+
+def _wilder(src: tuple, n: int) -> tuple:
+    return ("ema", src, n, 1.0 / n)
+
+
+# Intermediate nodes
+@_op
+def _input(g, name):
+    return g.inputs[name]
+
+
+@_op
+def _prev(g, src):
+    values = g(src)
+    return np.concatenate(([values[0]], values[:-1]))
+
+
+@_op
+def _tr(g):
+    high, low = g(_src("high")), g(_src("low"))
+    prev_close = g(("prev", _src("close")))
+    tr1 = high - low
+    tr2 = np.abs(high - prev_close)
+    tr3 = np.abs(low - prev_close)
+    return np.maximum(np.maximum(tr1, tr2), tr3)
+
+
+@_op
+def _ema(g, src, n, alpha):
+    return indicators.EMA(g(src), n, alpha=alpha)
+
+
+@_op
+def _atr(g, period):
+    return np.nan_to_num(g(_wilder(("tr",), period)), nan=0)
+
+
+@_op
+def _rmax(g, src, n):
+    return indicators.rolling_max(g(src), n)
+
+
+@_op
+def _rmin(g, src, n):
+    return indicators.rolling_min(g(src), n)
+
+
+@_op
+def _sma(g, src, n):
+    return indicators.SMA(g(src), n)
+
+
+@_op
+def _rstd(g, src, n):
+    return pd.Series(g(src)).rolling(n).std().values
+
+
+@_op
+def _delta(g, src):
+    values = g(src)
+    return np.diff(values, prepend=values[0])
+
+
+@_op
+def _gain(g, src):
+    delta = g(("delta", src))
+    return np.where(delta > 0, delta, 0)
+
+
+@_op
+def _loss(g, src):
+    delta = g(("delta", src))
+    return np.where(delta < 0, -delta, 0)
+
+
+@_op
+def _rsi(g, src, n):
+    avg_gain = g(_wilder(("gain", src), n))
+    avg_loss = g(_wilder(("loss", src), n))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = np.where(avg_loss != 0, avg_gain / avg_loss, 0)
+    rsi = 100 - (100 / (1 + rs))
+    return np.nan_to_num(rsi, nan=50)
+
+
+@_op
+def _dm(g):
+    high, low = g(_src("high")), g(_src("low"))
+    prev_high, prev_low = g(("prev", _src("high"))), g(("prev", _src("low")))
+    plus_dm = np.where(
+        (high - prev_high > prev_low - low) & (high - prev_high > 0),
+        high - prev_high,
+        0,
+    )
+    minus_dm = np.where(
+        (prev_low - low > high - prev_high) & (prev_low - low > 0), prev_low - low, 0
+    )
+    return plus_dm, minus_dm
+
+
+@_op
+def _plus_dm(g):
+    return g(("dm",))[0]
+
+
+@_op
+def _minus_dm(g):
+    return g(("dm",))[1]
+
+
+@_op
+def _macd_line(g, src, fast, slow):
+    return g(("ema", src, fast, None)) - g(("ema", src, slow, None))
+
+
+@_op
+def _chop_tr(g):
+    high, low = g(_src("high")), g(_src("low"))
+    close = g(_src("close"))
+    # True range from bar 1 on; a missing previous close falls back to high - low
+    tr = high[1:] - low[1:]
+    for gap in (np.abs(high[1:] - close[:-1]), np.abs(low[1:] - close[:-1])):
+        tr = np.where(gap > tr, gap, tr)
+    return tr
+
+
+# Planned indicators (same results as the utils.indicators function of that name)
+@_recipe
+def _SMA(g, src, n):
+    return g(("sma", src, n))
+
+
+@_recipe
+def _EMA(g, src, n, alpha=None):
+    return g(("ema", src, n, alpha))
+
+
+@_recipe
+def _DEMA(g, src, length=200):
+    e1 = ("ema", src, length, None)
+    return 2 * g(e1) - g(("ema", e1, length, None))
+
+
+@_recipe
+def _TEMA(g, src, length):
+    if length <= 0:
+        return np.full_like(g(src), np.nan, dtype=float)
+    ema1 = ("ema", src, length, None)
+    ema2 = ("ema", ema1, length, None)
+    ema3 = ("ema", ema2, length, None)
+    return 3 * g(ema1) - 3 * g(ema2) + g(ema3)
+
+
+@_recipe
+def _MACD(g, src, fast=12, slow=26, signal=9):
+    line = ("macd_line", src, fast, slow)
+    macd_line = g(line)
+    signal_line = g(("ema", line, signal, None))
+    return {
+        "macd": macd_line,
+        "signal": signal_line,
+        "histogram": macd_line - signal_line,
+    }
+
+
+@_recipe
+def _RSI(g, src, n=14):
+    return g(("rsi", src, n))
+
+
+@_recipe
+def _StochasticRSI(g, src, rsi_length=14, stoch_length=14, k_smooth=3, d_smooth=3):
+    rsi = ("rsi", src, rsi_length)
+    rsi_vals = g(rsi)
+    highest_rsi = g(("rmax", rsi, stoch_length))
+    lowest_rsi = g(("rmin", rsi, stoch_length))
+    range_val = highest_rsi - lowest_rsi
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stoch_vals = np.where(
+            range_val != 0, ((rsi_vals - lowest_rsi) / range_val) * 100, 50
+        )
+    k = indicators.SMA(stoch_vals, k_smooth)
+    return {"k": k, "d": indicators.SMA(k, d_smooth)}
+
+
+@_recipe
+def _Stochastic(g, src, period_k=14, smooth_k=1, period_d=3):
+    highest_high = g(("rmax", _src("high"), period_k))
+    lowest_low = g(("rmin", _src("low"), period_k))
+    close = g(_src("close"))
+    range_val = highest_high - lowest_low
+    stoch_raw = np.where(range_val != 0, ((close - lowest_low) / range_val) * 100, 50)
+    k = indicators.SMA(stoch_raw, smooth_k)
+    return {"k": k, "d": indicators.SMA(k, period_d)}
+
+
+@_recipe
+def _calculate_stochastic_slow(g, src, k_period=5, d_period=3, smooth_k=3):
+    lowest_low = pd.Series(g(("rmin", _src("low"), k_period)))
+    highest_high = pd.Series(g(("rmax", _src("high"), k_period)))
+    close = pd.Series(g(_src("close")))
+    fast_k = 100 * (close - lowest_low) / (highest_high - lowest_low)
+    slow_k = fast_k.rolling(smooth_k).mean()
+    slow_d = slow_k.rolling(d_period).mean()
+    return {"slow_k": slow_k.fillna(50).values, "slow_d": slow_d.fillna(50).values}
+
+
+@_recipe
+def _WilliamsR(g, src, period=14):
+    highest_high = g(("rmax", _src("high"), period))
+    lowest_low = g(("rmin", _src("low"), period))
+    range_val = highest_high - lowest_low
+    williams_r = np.where(
+        range_val != 0, -100 * (highest_high - g(_src("close"))) / range_val, -50
+    )
+    return np.nan_to_num(williams_r, nan=-50)
+
+
+def _donchian_middle(g, period):
+    high_roll = g(("rmax", _src("high"), period))
+    low_roll = g(("rmin", _src("low"), period))
+    return (high_roll + low_roll) / 2
+
+
+@_recipe
+def _DonchianChannels(g, src, period=20):
+    upper = g(("rmax", _src("high"), period))
+    lower = g(("rmin", _src("low"), period))
+    return {"upper": upper, "lower": lower, "basis": (upper + lower) / 2.0}
+
+
+@_recipe
+def _extract_ichimoku_base_line(g, src, period=26):
+    return _donchian_middle(g, period)
+
+
+@_recipe
+def _IchimokuKinkoHyo(
+    g, src, tenkan_period=9, kijun_period=26, senkou_span_b_period=52
+):
+    tenkan_sen = _donchian_middle(g, tenkan_period)
+    kijun_sen = _donchian_middle(g, kijun_period)
+    return {
+        "tenkan_sen": tenkan_sen,
+        "kijun_sen": kijun_sen,
+        "senkou_span_a": (tenkan_sen + kijun_sen) / 2,
+        "senkou_span_b": _donchian_middle(g, senkou_span_b_period),
+        "chikou_span": np.roll(g(_src("close")), -kijun_period),
+    }
+
+
+@_recipe
+def _ATR(g, src, period=14):
+    return g(("atr", period))
+
+
+@_recipe
+def _ADX(g, src, period=14):
+    tr_smooth = g(_wilder(("tr",), period))
+    plus_dm_smooth = g(_wilder(("plus_dm",), period))
+    minus_dm_smooth = g(_wilder(("minus_dm",), period))
+    di_plus = 100 * plus_dm_smooth / np.where(tr_smooth != 0, tr_smooth, 1)
+    di_minus = 100 * minus_dm_smooth / np.where(tr_smooth != 0, tr_smooth, 1)
+    dx = (
+        100
+        * np.abs(di_plus - di_minus)
+        / np.where(di_plus + di_minus != 0, di_plus + di_minus, 1)
+    )
+    adx = indicators.EMA(dx, period, alpha=1.0 / period)
+    return {
+        "adx": np.nan_to_num(adx, nan=0),
+        "di_plus": np.nan_to_num(di_plus, nan=0),
+        "di_minus": np.nan_to_num(di_minus, nan=0),
+    }
+
+
+@_recipe
+def _Supertrend(g, src, atr_period=10, factor=3.0):
+    atr_vals = g(("atr", atr_period))
+    close = g(_src("close"))
+    hl_avg = (g(_src("high")) + g(_src("low"))) / 2.0
+    basic_ub = hl_avg + factor * atr_vals
+    basic_lb = hl_avg - factor * atr_vals
+    if indicators._compiled(close, basic_ub, basic_lb):
+        loop = indicators._supertrend_loop
+    else:
+        loop = indicators._supertrend_loop.py_func
+    supertrend, direction = loop(close, basic_ub, basic_lb)
+    return {"supertrend": supertrend, "direction": direction}
+
+
+@_recipe
+def _KeltnerChannels(g, src, period=20, multiplier=2.0):
+    ema = g(("ema", _src("close"), period, None))
+    atr = g(("atr", period))
+    return {
+        "upper": ema + (multiplier * atr),
+        "middle": ema,
+        "lower": ema - (multiplier * atr),
+    }
+
+
+@_recipe
+def _BollingerBands(g, src, n=20, std=2):
+    sma = g(("sma", src, n))
+    rolling_std = g(("rstd", src, n))
+    return {
+        "upper": sma + (rolling_std * std),
+        "middle": sma,
+        "lower": sma - (rolling_std * std),
+    }
+
+
+@_recipe
+def _BullBearPower(g, src, length=13):
+    ema_val = g(("ema", _src("close"), length, None))
+    bull_power = g(_src("high")) - ema_val
+    bear_power = g(_src("low")) - ema_val
+    return {
+        "bull_power": bull_power,
+        "bear_power": bear_power,
+        "bbp": bull_power + bear_power,
+    }
+
+
+@_recipe
+def _CHOP(g, src, period=50):
+    n = len(g(_src("close")))
+    chop = np.full(n, np.nan, dtype=float)
+    if period <= 0 or n <= period:
+        return chop
+    high_max = g(("rmax", _src("high"), period + 1))[period:]
+    low_min = g(("rmin", _src("low"), period + 1))[period:]
+    atr_sum, _, has_nan = indicators._window_sums(g(("chop_tr",)), period)
+    atr_sum[has_nan] = np.nan
+    with np.errstate(invalid="ignore", divide="ignore"):
+        value = 100 * np.log10(atr_sum / (high_max - low_min)) / np.log10(period)
+    chop[period:] = np.where((high_max > low_min) & (atr_sum > 0), value, np.nan)
+    return chop
+
+
+def _price_params(func: Callable) -> list:
+    """Names of the leading parameters of ``func`` that take price arrays."""
+    names = []
+    for name in inspect.signature(func).parameters:
+        if name not in _INPUTS and name not in ("values", "series"):
+            break
+        names.append(name)
+    return names
+
+
+def _single_series(names: list) -> bool:
+    return len(names) == 1 and names[0] in _SERIES
+
+
+def _direct(func: Callable) -> Callable:
+    """Recipe that calls ``func`` with the inputs its parameters are named after
+    (``source`` for the one input of a single-series indicator)."""
+    names = _price_params(func)
+    single = _single_series(names)
+
+    def recipe(g, src, *params):
+        args = [
+            g(src) if single or name in ("values", "series") else g(_src(name))
+            for name in names
+        ]
+        return func(*args, *params)
+
+    return recipe
+
+
+class FeaturePlan:
+    """
+    A named set of indicators, computed together over one symbol's OHLCV arrays.
+
+    ``add(name, indicator, *params, source="close")`` declares an output; the
+    indicator is any :mod:`utils.indicators` function name and ``params`` follow
+    its price arguments, as in a direct call. ``source`` picks the input of
+    single-series indicators (SMA, EMA, RSI, HMA, BollingerBands, ...);
+    multi-input indicators read the columns their parameters are named after.
+    Indicators whose leading parameters are not OHLCV inputs
+    (``StochasticRSI_from_RSI``, ``TrendClassification``, ...) are rejected.
+    """
+
+    def __init__(self):
+        self.features: Dict[str, Tuple[str, str, tuple]] = {}
+        self.intermediates: list = []
+
+    def add(self, name: str, indicator: str, *params, source: str = "close"):
+        if indicator not in _RECIPES and not callable(
+            getattr(indicators, indicator, None)
+        ):
+            raise ValueError(f"Unknown indicator: {indicator}")
+        if source not in _INPUTS:
+            raise ValueError(f"Unknown source {source!r}; expected one of {_INPUTS}")
+        names = _price_params(getattr(indicators, indicator))
+        if not names:
+            raise ValueError(f"{indicator} does not take OHLCV inputs")
+        if source != "close" and not _single_series(names):
+            raise ValueError(
+                f"{indicator} reads {', '.join(names)}; source only applies to "
+                "single-series indicators"
+            )
+        self.features[name] = (indicator, source, params)
+        return self
+
+    def compute(
+        self, df: Optional[pd.DataFrame] = None, **arrays: np.ndarray
+    ) -> Dict[str, Any]:
+        """
+        Evaluate every feature on ``df`` (open/high/low/close/volume columns)
+        or on arrays passed by keyword. Returns ``{name: output}``.
+        """
+        inputs = {}
+        if df is not None:
+            for col in _INPUTS:
+                if col in df.columns:
+                    inputs[col] = df[col].to_numpy(dtype=float)
+        inputs.update(
+            {k: np.asarray(v, dtype=float) for k, v in arrays.items() if v is not None}
+        )
+        g = _Graph(inputs)
+        outputs = {}
+        for name, (indicator, source, params) in self.features.items():
+            recipe = _RECIPES.get(indicator) or _direct(getattr(indicators, indicator))
+            outputs[name] = recipe(g, _src(source), *params)
+        self.intermediates = [key for key in g.memo if key[0] != "input"]
+        # Outputs that are shared nodes get their own copy
+        shared = {id(v) for v in g.memo.values()}
+        for name, value in outputs.items():
+            if isinstance(value, dict):
+                outputs[name] = {
+                    k: np.array(v) if id(v) in shared else v for k, v in value.items()
+                }
+            elif id(value) in shared:
+                outputs[name] = np.array(value)
+        return outputs
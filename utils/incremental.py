@@ -0,0 +1,438 @@
+"""Streaming (incremental) counterparts of the :mod:`utils.indicators` functions.
+
+Each indicator is an object fed one bar at a time; ``update()`` costs O(1) and
+returns the value for that bar. Fed the same history, the outputs equal the
+batch function's: exactly for the recursive indicators (EMA, TEMA, ATR, ADX,
+RSI, Supertrend), which perform the same floating-point operations, and to
+rounding (~1e-12 relative) for the rolling windows (LSMA, BollingerBands),
+which keep running sums instead of recomputing each window.
+
+    >>> tema, lsma = TEMA(25), LSMA(100)
+    >>> for close in closes:
+    ...     fast, slow = tema.update(close), lsma.update(close)
+
+State is plain JSON-serialisable data: ``state()`` returns a dict and
+:meth:`StreamingIndicator.from_state` rebuilds the indicator, so a live script
+can persist its indicators between scheduled runs and only feed the new bars.
+:class:`IndicatorSet` does that bookkeeping for a group of indicators keyed by
+bar date.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Mapping, Optional
+
+NAN = float("nan")
+
+_REGISTRY: Dict[str, type] = {}
+
+
+def _maximum(a: float, b: float) -> float:
+    """``np.maximum`` for scalars: NaN if either side is NaN."""
+    if a != a or b != b:
+        return NAN
+    return a if a >= b else b
+
+
+class StreamingIndicator:
+    """Base class: ``update(...)`` per bar, ``state()`` / ``from_state()``."""
+
+    #: Bar fields passed to ``update`` by :meth:`update_bar`
+    inputs: tuple = ("close",)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _REGISTRY[cls.__name__] = cls
+
+    def update(self, *values: float) -> Any:
+        raise NotImplementedError
+
+    def update_bar(self, bar: Mapping[str, float]) -> Any:
+        return self.update(*(bar[field] for field in self.inputs))
+
+    def state(self) -> dict:
+        out: Dict[str, Any] = {"type": type(self).__name__}
+        for key, value in vars(self).items():
+            if isinstance(value, StreamingIndicator):
+                value = value.state()
+            elif isinstance(value, list):
+                value = list(value)
+            out[key] = value
+        return out
+
+    @staticmethod
+    def from_state(state: Mapping[str, Any]) -> StreamingIndicator:
+        """Rebuild any indicator from its ``state()``."""
+        state = dict(state)
+        indicator = object.__new__(_REGISTRY[state.pop("type")])
+        for key, value in state.items():
+            if isinstance(value, dict) and "type" in value:
+                value = StreamingIndicator.from_state(value)
+            elif isinstance(value, list):
+                value = list(value)
+            setattr(indicator, key, value)
+        return indicator
+
+
+class EMA(StreamingIndicator):
+    """Exponential Moving Average, seeded with the first value."""
+
+    def __init__(self, n: int, alpha: Optional[float] = None):
+        self.alpha = 2.0 / (n + 1) if alpha is None else float(alpha)
+        self.value: Optional[float] = None
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        if self.value is None:
+            self.value = value
+        else:
+            self.value = self.alpha * value + (1 - self.alpha) * self.value
+        return self.value
+
+
+class TEMA(StreamingIndicator):
+    """Triple Exponential Moving Average: 3*EMA1 - 3*EMA2 + EMA3."""
+
+    def __init__(self, length: int):
+        self.length = length
+        self.ema1, self.ema2, self.ema3 = EMA(length), EMA(length), EMA(length)
+
+    def update(self, value: float) -> float:
+        if self.length <= 0:
+            return NAN
+        ema1 = self.ema1.update(value)
+        ema2 = self.ema2.update(ema1)
+        ema3 = self.ema3.update(ema2)
+        return 3 * ema1 - 3 * ema2 + ema3
+
+
+class _Window(StreamingIndicator):
+    """
+    Ring buffer of the last ``length`` values with running sums.
+
+    The sums are of values centred on ``ref`` and are recomputed from the
+    buffer every ``length`` updates (amortised O(1)), so rounding never
+    accumulates beyond one window. NaNs count as missing.
+    """
+
+    def __init__(self, length: int):
+        self.length = length
+        self.ring: List[float] = []
+        self.pos = 0
+        self.missing = 0
+        self.since_anchor = 0
+        self.ref = 0.0
+        self.sums = [0.0, 0.0]
+
+    def _terms(self, value: float, k: int) -> tuple:
+        """Contribution of ``value`` at window position ``k`` to the sums."""
+        raise NotImplementedError
+
+    def _shifted(self, sums: list, old: float, new: float) -> list:
+        """Sums after ``old`` leaves a full window and ``new`` enters."""
+        raise NotImplementedError
+
+    def _push(self, value: float) -> bool:
+        """Add ``value``; True once the window is full and free of NaN."""
+        value = float(value)
+        new = 0.0 if value != value else value - self.ref
+        self.missing += value != value
+        if len(self.ring) < self.length:
+            terms = self._terms(new, len(self.ring))
+            self.sums = [s + t for s, t in zip(self.sums, terms)]
+            self.ring.append(value)
+        else:
+            old = self.ring[self.pos]
+            self.missing -= old != old
+            old = 0.0 if old != old else old - self.ref
+            self.sums = self._shifted(self.sums, old, new)
+            self.ring[self.pos] = value
+            self.pos = (self.pos + 1) % self.length
+        self.since_anchor += 1
+        if self.since_anchor >= self.length:
+            self._anchor()
+        return len(self.ring) == self.length and self.missing == 0
+
+    def _anchor(self) -> None:
+        ordered = self.ring[self.pos :] + self.ring[: self.pos]
+        finite = [v for v in ordered if v == v]
+        self.ref = math.fsum(finite) / len(finite) if finite else 0.0
+        sums = [0.0] * len(self.sums)
+        for k, value in enumerate(ordered):
+            if value == value:
+                sums = [s + t for s, t in zip(sums, self._terms(value - self.ref, k))]
+        self.sums = sums
+        self.since_anchor = 0
+
+
+class LSMA(_Window):
+    """Least Squares Moving Average: end point of the regression over the window."""
+
+    def _terms(self, value, k):
+        return value, k * value
+
+    def _shifted(self, sums, old, new):
+        # Window values move one position down: sum(k * y) loses the sum
+        total = sums[0] - old + new
+        return [total, sums[1] + self.length * new - total]
+
+    def update(self, value: float) -> float:
+        if self.length <= 0 or not self._push(value):
+            return NAN
+        n = self.length
+        x_mean = (n - 1) / 2.0
+        x_var = n * (n**2 - 1) / 12.0
+        if x_var == 0:
+            return NAN
+        total, weighted = self.sums
+        slope = (weighted - x_mean * total) / x_var
+        return total / n + self.ref + slope * x_mean
+
+
+class BollingerBands(_Window):
+    """Bollinger Bands: SMA with ``std`` sample standard deviations (ddof=1)."""
+
+    def __init__(self, n: int = 20, std: float = 2):
+        super().__init__(n)
+        self.std = std
+
+    def _terms(self, value, k):
+        return value, value * value
+
+    def _shifted(self, sums, old, new):
+        return [sums[0] - old + new, sums[1] - old * old + new * new]
+
+    def update(self, value: float) -> dict:
+        full = self._push(value)
+        if not full or self.length < 2:
+            return {
+                "upper": NAN,
+                "middle": NAN if not full else self._mean(),
+                "lower": NAN,
+            }
+        total, squares = self.sums
+        n = self.length
+        var = max((squares - total * total / n) / (n - 1), 0.0)
+        sd = math.sqrt(var)
+        middle = self._mean()
+        return {
+            "upper": middle + sd * self.std,
+            "middle": middle,
+            "lower": middle - sd * self.std,
+        }
+
+    def _mean(self) -> float:
+        return self.sums[0] / self.length + self.ref
+
+
+class ATR(StreamingIndicator):
+    """Average True Range (Wilder); 0 while undefined, like the batch version."""
+
+    inputs = ("high", "low", "close")
+
+    def __init__(self, period: int = 14):
+        self.ema = EMA(period, alpha=1.0 / period)
+        self.prev_close: Optional[float] = None
+
+    def update(self, high: float, low: float, close: float) -> float:
+        high, low, close = float(high), float(low), float(close)
+        prev_close = close if self.prev_close is None else self.prev_close
+        self.prev_close = close
+        tr = _maximum(
+            _maximum(high - low, abs(high - prev_close)), abs(low - prev_close)
+        )
+        atr = self.ema.update(tr)
+        return 0.0 if atr != atr else atr
+
+
+class ADX(StreamingIndicator):
+    """Average Directional Index; returns adx, di_plus and di_minus."""
+
+    inputs = ("high", "low", "close")
+
+    def __init__(self, period: int = 14):
+        alpha = 1.0 / period
+        self.tr = EMA(period, alpha=alpha)
+        self.plus_dm = EMA(period, alpha=alpha)
+        self.minus_dm = EMA(period, alpha=alpha)
+        self.adx = EMA(period, alpha=alpha)
+        self.prev: Optional[List[float]] = None
+
+    def update(self, high: float, low: float, close: float) -> dict:
+        high, low, close = float(high), float(low), float(close)
+        prev_high, prev_low, prev_close = self.prev or (high, low, close)
+        self.prev = [high, low, close]
+
+        tr = _maximum(
+            _maximum(high - low, abs(high - prev_close)), abs(low - prev_close)
+        )
+        up, down = high - prev_high, prev_low - low
+        plus_dm = up if up > down and up > 0 else 0.0
+        minus_dm = down if down > up and down > 0 else 0.0
+
+        tr_smooth = self.tr.update(tr)
+        tr_div = tr_smooth if tr_smooth != 0 else 1
+        di_plus = 100 * self.plus_dm.update(plus_dm) / tr_div
+        di_minus = 100 * self.minus_dm.update(minus_dm) / tr_div
+        di_sum = di_plus + di_minus
+        dx = 100 * abs(di_plus - di_minus) / (di_sum if di_sum != 0 else 1)
+        adx = self.adx.update(dx)
+        return {
+            "adx": 0.0 if adx != adx else adx,
+            "di_plus": 0.0 if di_plus != di_plus else di_plus,
+            "di_minus": 0.0 if di_minus != di_minus else di_minus,
+        }
+
+
+class RSI(StreamingIndicator):
+    """RSI with Wilder's smoothing; 50 while undefined, like the batch version."""
+
+    def __init__(self, n: int = 14):
+        self.gain = EMA(n, alpha=1.0 / n)
+        self.loss = EMA(n, alpha=1.0 / n)
+        self.prev: Optional[float] = None
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        delta = value - (value if self.prev is None else self.prev)
+        self.prev = value
+        avg_gain = self.gain.update(delta if delta > 0 else 0.0)
+        avg_loss = self.loss.update(-delta if delta < 0 else 0.0)
+        rs = avg_gain / avg_loss if avg_loss != 0 else 0
+        rsi = 100 - (100 / (1 + rs))
+        return 50.0 if rsi != rsi else rsi
+
+
+class Supertrend(StreamingIndicator):
+    """Supertrend; returns supertrend and direction (-1 uptrend, 1 downtrend)."""
+
+    inputs = ("high", "low", "close")
+
+    def __init__(self, atr_period: int = 10, factor: float = 3.0):
+        self.atr = ATR(atr_period)
+        self.factor = factor
+        self.prev: Optional[List[float]] = None  # close, final_ub, final_lb, st
+
+    def update(self, high: float, low: float, close: float) -> dict:
+        high, low, close = float(high), float(low), float(close)
+        atr = self.atr.update(high, low, close)
+        hl_avg = (high + low) / 2.0
+        basic_ub = hl_avg + self.factor * atr
+        basic_lb = hl_avg - self.factor * atr
+
+        if self.prev is None:
+            final_ub, final_lb, supertrend, direction = basic_ub, basic_lb, basic_ub, 1
+        else:
+            prev_close, prev_ub, prev_lb, prev_st = self.prev
+            if basic_ub < prev_ub or prev_close > prev_ub:
+                final_ub = basic_ub
+            else:
+                final_ub = prev_ub
+            if basic_lb > prev_lb or prev_close < prev_lb:
+                final_lb = basic_lb
+            else:
+                final_lb = prev_lb
+            if prev_st == prev_ub:
+                if close <= final_ub:
+                    supertrend, direction = final_ub, 1
+                else:
+                    supertrend, direction = final_lb, -1
+            else:
+                if close >= final_lb:
+                    supertrend, direction = final_lb, -1
+                else:
+                    supertrend, direction = final_ub, 1
+        self.prev = [close, final_ub, final_lb, supertrend]
+        return {"supertrend": supertrend, "direction": float(direction)}
+
+
+class IndicatorSet:
+    """
+    Named streaming indicators fed from the same bars, resumable across runs.
+
+    ``sync(bars)`` feeds only the bars after the last one seen (by ``key``) and
+    starts over from scratch when that bar is no longer in ``bars`` or its OHLC
+    has changed since it was fed (history revised, e.g. for a split or bonus).
+    The outputs of the last ``keep`` bars are kept, oldest first, in ``recent``.
+    """
+
+    #: Bar fields compared to detect revised history
+    checked = ("open", "high", "low", "close")
+
+    def __init__(self, indicators: Dict[str, StreamingIndicator], keep: int = 2):
+        self.indicators = indicators
+        self.keep = keep
+        self.blank = {name: ind.state() for name, ind in indicators.items()}
+        self.last_key: Any = None
+        self.last_bar: Optional[Dict[str, float]] = None
+        self.recent: List[Dict[str, Any]] = []
+
+    def _fields(self, bar: Mapping[str, Any]) -> Dict[str, float]:
+        return {f: float(bar[f]) for f in self.checked if f in bar}
+
+    def _unchanged(self, bar: Mapping[str, Any]) -> bool:
+        """Whether ``bar`` has the OHLC of the last bar fed (NaN equals NaN)."""
+        if self.last_bar is None:
+            return False
+        fields = self._fields(bar)
+        return fields.keys() == self.last_bar.keys() and all(
+            value == self.last_bar[f]
+            or (value != value and self.last_bar[f] != self.last_bar[f])
+            for f, value in fields.items()
+        )
+
+    def update_bar(self, bar: Mapping[str, Any]) -> Dict[str, Any]:
+        values = {name: ind.update_bar(bar) for name, ind in self.indicators.items()}
+        self.recent = (self.recent + [values])[-self.keep :]
+        self.last_bar = self._fields(bar)
+        return values
+
+    def sync(self, bars: List[Mapping[str, Any]], key: str = "date") -> List[Dict]:
+        keys = [bar[key] for bar in bars]
+        if self.last_key in keys and self._unchanged(bars[keys.index(self.last_key)]):
+            start = keys.index(self.last_key) + 1
+        else:
+            self.reset()
+            start = 0
+        for bar in bars[start:]:
+            self.update_bar(bar)
+        if bars:
+            self.last_key = keys[-1]
+        return self.recent
+
+    def reset(self) -> None:
+        self.indicators = {
+            name: StreamingIndicator.from_state(state)
+            for name, state in self.blank.items()
+        }
+        self.last_key = None
+        self.last_bar = None
+        self.recent = []
+
+    def state(self) -> dict:
+        return {
+            "indicators": {n: ind.state() for n, ind in self.indicators.items()},
+            "keep": self.keep,
+            "blank": self.blank,
+            "last_key": self.last_key,
+            "last_bar": self.last_bar,
+            "recent": self.recent,
+        }
+
+    def resume(self, state: Optional[Mapping[str, Any]]) -> IndicatorSet:
+        """Continue from a saved ``state()`` built with the same indicators."""
+        if (
+            not state
+            or state.get("blank") != self.blank
+            or state.get("keep") != self.keep
+        ):
+            return self
+        self.indicators = {
+            name: StreamingIndicator.from_state(s)
+            for name, s in state["indicators"].items()
+        }
+        self.last_key = state["last_key"]
+        self.last_bar = state.get("last_bar")  # older states: refeed once
+        self.recent = list(state["recent"])
+        return self
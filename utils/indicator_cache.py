@@ -0,0 +1,318 @@
+"""Content-addressed memoization of indicator results.
+
+A call ``func(*args, **kwargs)`` of a function from :mod:`utils.indicators` is
+keyed by the function, a hash of its module's source, and the contents of its
+arguments (array bytes, not object identity). Results are kept in a per-process
+LRU bounded by bytes, and optionally in an on-disk store shared by processes and
+runs, so a re-run on unchanged data reads every indicator back instead of
+computing it:
+
+    >>> from utils.indicator_cache import cached_call, set_indicator_disk_cache
+    >>> set_indicator_disk_cache("data/cache/indicators")
+    >>> atr = cached_call(ATR, high, low, close, 14)
+
+Only calls whose arguments are arrays, Series or plain scalars and whose result
+is an array, or a dict or tuple of arrays, are cached; anything else (lambdas,
+bound methods, DataFrame arguments, other modules' functions) is computed as
+usual. Callers always get their own copy of a cached result.
+
+The disk store keeps one ``<key>.npy`` per entry, loaded with ``mmap_mode="r"``,
+next to a ``<key>.json`` describing the result. When it grows past its byte cap
+the least recently used entries are deleted. ``set_indicator_disk_cache`` also
+sets ``QUANTLAB_INDICATOR_CACHE`` so worker processes open the same store.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sys
+import uuid
+from collections import OrderedDict
+from numbers import Number
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Functions whose results depend only on their arguments
+MEMOIZED_MODULES = ("utils.indicators",)
+
+INDICATOR_CACHE_BYTES = 256 * 1024 * 1024
+INDICATOR_DISK_CACHE_BYTES = 1024 * 1024 * 1024
+DISK_CACHE_ENV = "QUANTLAB_INDICATOR_CACHE"
+
+_MEMORY: "OrderedDict[str, Any]" = OrderedDict()
+_memory_bytes = 0
+_disk: Optional["_DiskStore"] = None
+_source_hashes: dict = {}
+_stats = {"hits": 0, "disk_hits": 0, "misses": 0, "uncached": 0}
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+def _source_hash(module_name: str) -> str:
+    digest = _source_hashes.get(module_name)
+    if digest is None:
+        source = inspect.getsourcefile(sys.modules[module_name])
+        digest = hashlib.sha256(Path(source).read_bytes()).hexdigest()[:16]
+        _source_hashes[module_name] = digest
+    return digest
+
+
+def _hash_array(h, values: np.ndarray) -> None:
+    if values.dtype == object:
+        raise _Uncacheable
+    h.update(f"{values.dtype.str}{values.shape}".encode())
+    h.update(np.ascontiguousarray(values).reshape(-1).view(np.uint8))
+
+
+def _hash_arg(h, value) -> None:
+    if isinstance(value, np.ndarray):
+        h.update(b"ndarray")
+        _hash_array(h, value)
+    elif isinstance(value, pd.Series):
+        h.update(b"series")
+        _hash_array(h, value.to_numpy())
+        if isinstance(value.index, pd.DatetimeIndex):
+            h.update(str(value.index.dtype).encode())
+            _hash_array(h, value.index.asi8)
+        else:
+            index = pd.util.hash_pandas_object(value.index, index=False)
+            _hash_array(h, index.to_numpy())
+    elif value is None or isinstance(value, (str, bool, Number)):
+        h.update(f"{type(value).__name__}:{value!r}".encode())
+    elif isinstance(value, (tuple, list)):
+        h.update(f"{type(value).__name__}[{len(value)}]".encode())
+        for item in value:
+            _hash_arg(h, item)
+    else:
+        raise _Uncacheable
+    h.update(b"|")
+
+
+def indicator_key(func: Callable, args: tuple, kwargs: dict) -> Optional[str]:
+    """Cache key of ``func(*args, **kwargs)``, or None if it cannot be cached."""
+    module = getattr(func, "__module__", None)
+    qualname = getattr(func, "__qualname__", "")
+    if module not in MEMOIZED_MODULES or "<" in qualname or inspect.ismethod(func):
+        return None
+    h = hashlib.sha256(f"{module}.{qualname}@{_source_hash(module)}".encode())
+    try:
+        for arg in args:
+            _hash_arg(h, arg)
+        for name in sorted(kwargs):
+            h.update(name.encode())
+            _hash_arg(h, kwargs[name])
+    except _Uncacheable:
+        return None
+    return h.hexdigest()
+
+
+def _split(value) -> Optional[tuple]:
+    """``(kind, names, arrays)`` of a cacheable result, else None."""
+    if isinstance(value, np.ndarray):
+        kind, names, parts = "array", [], [value]
+    elif isinstance(value, dict) and all(isinstance(k, str) for k in value):
+        kind, names, parts = "dict", list(value), list(value.values())
+    elif isinstance(value, tuple):
+        kind, names, parts = "tuple", [], list(value)
+    else:
+        return None
+    if not parts or not all(
+        isinstance(p, np.ndarray) and p.dtype != object for p in parts
+    ):
+        return None
+    return kind, names, parts
+
+
+def _join(kind: str, names: list, parts: list):
+    if kind == "array":
+        return parts[0]
+    if kind == "dict":
+        return dict(zip(names, parts))
+    return tuple(parts)
+
+
+def _copy(value):
+    kind, names, parts = _split(value)
+    return _join(kind, names, [np.array(p) for p in parts])
+
+
+def _remember(key: str, value) -> None:
+    global _memory_bytes
+    kind, names, parts = _split(value)
+    frozen = [np.array(p) for p in parts]
+    for part in frozen:
+        part.flags.writeable = False
+    size = sum(p.nbytes for p in frozen)
+    if size > INDICATOR_CACHE_BYTES:
+        return
+    old = _MEMORY.pop(key, None)
+    if old is not None:
+        _memory_bytes -= sum(p.nbytes for p in _split(old)[2])
+    _MEMORY[key] = _join(kind, names, frozen)
+    _memory_bytes += size
+    while _memory_bytes > INDICATOR_CACHE_BYTES:
+        _, evicted = _MEMORY.popitem(last=False)
+        _memory_bytes -= sum(p.nbytes for p in _split(evicted)[2])
+
+
+class _DiskStore:
+    """``<key>.npy`` + ``<key>.json`` entries under ``path``, LRU by mtime."""
+
+    def __init__(self, path, max_bytes: int):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.size = sum(f.stat().st_size for f in self.path.glob("*.npy"))
+
+    def get(self, key: str):
+        meta_file = self.path / f"{key}.json"
+        try:
+            meta = json.loads(meta_file.read_text())
+            stored = np.load(self.path / f"{key}.npy", mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if meta["stacked"]:
+            parts = [np.array(row) for row in stored]
+        else:
+            parts = [np.array(stored)]
+        try:
+            os.utime(meta_file)
+        except OSError:
+            pass
+        return _join(meta["kind"], meta["names"], parts)
+
+    def put(self, key: str, value) -> None:
+        kind, names, parts = _split(value)
+        stacked = kind != "array"
+        if stacked and len({(p.shape, p.dtype) for p in parts}) != 1:
+            return
+        data = np.stack(parts) if stacked else parts[0]
+        if data.nbytes > self.max_bytes:
+            return
+        meta = {"kind": kind, "names": names, "stacked": stacked}
+        tmp = f".{uuid.uuid4().hex}.tmp"
+        try:
+            with open(self.path / f"{key}{tmp}", "wb") as f:
+                np.save(f, data)
+            os.replace(self.path / f"{key}{tmp}", self.path / f"{key}.npy")
+            (self.path / f"{key}{tmp}").write_text(json.dumps(meta))
+            os.replace(self.path / f"{key}{tmp}", self.path / f"{key}.json")
+        except OSError:
+            return
+        self.size += data.nbytes
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used entries down to 90% of ``max_bytes``."""
+        entries = []
+        for npy in self.path.glob("*.npy"):
+            try:
+                meta_mtime = npy.with_suffix(".json").stat().st_mtime
+            except OSError:
+                meta_mtime = 0.0
+            try:
+                entries.append((meta_mtime, npy.stat().st_size, npy))
+            except OSError:
+                continue
+        entries.sort()
+        self.size = sum(size for _, size, _ in entries)
+        for _, size, npy in entries:
+            if self.size <= self.max_bytes * 0.9:
+                break
+            for f in (npy.with_suffix(".json"), npy):
+                try:
+                    f.unlink()
+                except OSError:
+                    pass
+            self.size -= size
+
+    def clear(self) -> None:
+        for f in [*self.path.glob("*.npy"), *self.path.glob("*.json")]:
+            try:
+                f.unlink()
+            except OSError:
+                pass
+        self.size = 0
+
+
+def set_indicator_disk_cache(
+    path=None, max_bytes: int = INDICATOR_DISK_CACHE_BYTES
+) -> None:
+    """
+    Store indicator results under ``path`` (None turns the disk store off).
+
+    Also sets ``QUANTLAB_INDICATOR_CACHE`` so that processes started from this
+    one use the same store.
+    """
+    global _disk
+    if path is None:
+        _disk = None
+        os.environ.pop(DISK_CACHE_ENV, None)
+        return
+    _disk = _DiskStore(path, max_bytes)
+    os.environ[DISK_CACHE_ENV] = str(path)
+
+
+def cached_call(func: Callable, *args, **kwargs):
+    """``func(*args, **kwargs)``, from the cache when it has been computed before."""
+    key = indicator_key(func, args, kwargs)
+    if key is None:
+        _stats["uncached"] += 1
+        return func(*args, **kwargs)
+    hit = _MEMORY.get(key)
+    if hit is not None:
+        _MEMORY.move_to_end(key)
+        _stats["hits"] += 1
+        return _copy(hit)
+    if _disk is not None:
+        hit = _disk.get(key)
+        if hit is not None:
+            _stats["disk_hits"] += 1
+            _remember(key, hit)
+            return hit
+    value = func(*args, **kwargs)
+    if _split(value) is None:
+        _stats["uncached"] += 1
+        return value
+    _stats["misses"] += 1
+    _remember(key, value)
+    if _disk is not None:
+        _disk.put(key, value)
+    return value
+
+
+def memoized(func: Callable) -> Callable:
+    """Wrap ``func`` so that every call goes through :func:`cached_call`."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return cached_call(func, *args, **kwargs)
+
+    return wrapper
+
+
+def indicator_cache_stats() -> dict:
+    return {**_stats, "entries": len(_MEMORY), "bytes": _memory_bytes}
+
+
+def clear_indicator_cache(disk: bool = False) -> None:
+    """Empty the in-process cache (and the disk store with ``disk=True``)."""
+    global _memory_bytes
+    _MEMORY.clear()
+    _memory_bytes = 0
+    for name in _stats:
+        _stats[name] = 0
+    if disk and _disk is not None:
+        _disk.clear()
+
+
+if os.environ.get(DISK_CACHE_ENV):
+    set_indicator_disk_cache(os.environ[DISK_CACHE_ENV])
@@ -11,6 +11,19 @@ Categories:
 - Oscillators: WilliamsR, CCI, BullBearPower
 - Volatility/Bands: BollingerBands, Envelope, KeltnerChannels
 - Special: ParabolicSAR, HullMovingAverage
+
+Recursive indicators have two backends, selected with
+:func:`set_indicator_backend`. ``"compiled"`` (default) runs EMA, and with it
+DEMA/TEMA/HMA/ATR, as a one-pole IIR filter through ``scipy.signal.lfilter``
+and the Supertrend/ParabolicSAR loops as Numba kernels (``pip install numba``);
+``"python"`` runs the plain per-bar loops. Both perform the same floating-point
+operations, so they return the same values. Without SciPy or Numba the
+compiled backend falls back to the Python loops.
+
+Rolling highs and lows (:func:`rolling_max`, :func:`rolling_min` and their
+``arg`` variants behind Aroon, Donchian, Stochastic, Williams %R, Ichimoku and
+CHOP) run as an O(n) monotonic-deque Numba kernel on the compiled backend and
+as an O(n log period) NumPy sparse table otherwise; both select the same bars.
 """
 
 from typing import Optional, Union
@@ -18,6 +31,42 @@ from typing import Optional, Union
 import numpy as np
 import pandas as pd
 
+from utils.jit import NUMBA_AVAILABLE, _kernel
+
+try:
+    from scipy.signal import lfilter
+
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+INDICATOR_BACKENDS = ("compiled", "python")
+_backend = "compiled"
+
+
+def set_indicator_backend(backend: str) -> str:
+    """Select the backend for recursive indicators; returns the previous one."""
+    global _backend
+    if backend not in INDICATOR_BACKENDS:
+        raise ValueError(
+            f"Unknown indicator backend {backend!r}; use one of {INDICATOR_BACKENDS}"
+        )
+    previous, _backend = _backend, backend
+    return previous
+
+
+def get_indicator_backend() -> str:
+    return _backend
+
+
+def _compiled(*arrays) -> bool:
+    """Whether the Numba kernel can take ``arrays`` as-is (float64 ndarrays)."""
+    return (
+        _backend == "compiled"
+        and NUMBA_AVAILABLE
+        and all(isinstance(a, np.ndarray) and a.dtype == np.float64 for a in arrays)
+    )
+
 
 # Moving Averages
 def SMA(series: Union[pd.Series, np.ndarray], n: int) -> np.ndarray:
@@ -33,6 +82,18 @@ def EMA(values: np.ndarray, n: int, alpha: Optional[float] = None) -> np.ndarray
     if alpha is None:
         alpha = 2.0 / (n + 1)
 
+    if _backend == "compiled" and SCIPY_AVAILABLE and len(values) > 1:
+        x = np.asarray(values, dtype=float)
+        # lfilter's zero feed-forward tap turns inf inputs into NaN; loop instead
+        if not np.isinf(x).any():
+            # y[i] = alpha * x[i] + (1 - alpha) * y[i - 1], seeded with y[0] = x[0]
+            result = np.empty_like(x)
+            result[0] = x[0]
+            result[1:], _ = lfilter(
+                [alpha], [1.0, alpha - 1.0], x[1:], zi=[(1 - alpha) * x[0]]
+            )
+            return result
+
     result = np.empty_like(values, dtype=float)
     result[0] = values[0]
 
@@ -42,14 +103,180 @@ def EMA(values: np.ndarray, n: int, alpha: Optional[float] = None) -> np.ndarray
     return result
 
 
+def _window_sums(values: np.ndarray, length: int, weighted: bool = False) -> tuple:
+    """
+    Sums over every ``length``-bar window in O(n).
+
+    Returns ``(sums, weighted_sums, has_nan)`` for the windows ending at bars
+    ``length - 1 .. n - 1``. ``weighted_sums`` is ``sum(k * values)`` with
+    ``k = 0`` for the oldest bar of the window (None unless ``weighted``), and
+    ``has_nan`` flags windows containing a NaN (their sums are meaningless).
+
+    Prefix sums restart every ``length`` bars and run on values centred on
+    their block mean, so every window is the tail of one block plus the head
+    of the next and rounding stays at the scale of a single window instead of
+    growing with the length of the series.
+    """
+    y = np.asarray(values, dtype=float)
+    n = len(y)
+    missing = np.isnan(y)
+    blocks = -(-n // length)
+    pad = blocks * length - n
+    finite = np.concatenate((~missing, np.zeros(pad, dtype=bool)))
+    finite = finite.reshape(blocks, length)
+    y = np.concatenate((np.where(missing, 0.0, y), np.zeros(pad)))
+    y = y.reshape(blocks, length)
+    count = finite.sum(axis=1)
+    ref = np.zeros(blocks)
+    np.divide(y.sum(axis=1), count, out=ref, where=count > 0)
+    z = np.where(finite, y - ref[:, None], 0.0)
+
+    # Row k holds the windows ending in block k; block -1 is a zero dummy
+    ref = np.concatenate(([0.0], ref))
+    prev_ref, cur_ref = ref[:-1, None], ref[1:, None]
+    j = np.arange(1, length + 1)  # the window starts at bar j of the previous block
+
+    def prefix(x):
+        out = np.zeros((blocks + 1, length + 1))
+        np.cumsum(x, axis=1, out=out[1:, 1:])
+        return out[:-1], out[1:]
+
+    prev, cur = prefix(z)
+    # Older part: bars j.. of the previous block (empty for aligned windows)
+    older = prev[:, length:] - prev[:, 1:] + (length - j) * prev_ref
+    # Newer part: bars 0..j-1 of the current block
+    newer = cur[:, 1:] + j * cur_ref
+    sums = (older + newer).ravel()[length - 1 : n]
+
+    weighted_sums = None
+    if weighted:
+        # sum(k * y), k from the window start: local index minus j in the older part,
+        # local index plus (length - j) in the newer part
+        prev1, cur1 = prefix(z * np.arange(length))
+        older_w = prev1[:, length:] - prev1[:, 1:]
+        older_w += (length * (length - 1) - j * (j - 1)) / 2.0 * prev_ref - j * older
+        newer_w = cur1[:, 1:] + (j * (j - 1) / 2.0) * cur_ref + (length - j) * newer
+        weighted_sums = (older_w + newer_w).ravel()[length - 1 : n]
+
+    nan_count = np.concatenate(([0], np.cumsum(missing)))
+    has_nan = nan_count[length:] > nan_count[:-length]
+    return sums, weighted_sums, has_nan
+
+
+# Rolling extremes. A NaN ranks above every number (as in np.argmax/np.argmin),
+# so a window holding one has NaN as its extreme; ties go to the earliest bar.
+@_kernel
+def _rolling_arg_deque(x, period):
+    """Monotonic-deque argmax of ``x`` over every window ending at each bar."""
+    n = len(x)
+    out = np.full(n, -1, dtype=np.int64)
+    queue = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    for i in range(n):
+        v = x[i]
+        v_nan = v != v
+        # Drop queued bars that bar i beats for the rest of their lives
+        while tail > head:
+            back = x[queue[tail - 1]]
+            if back != back or not (v_nan or v > back):
+                break
+            tail -= 1
+        queue[tail] = i
+        tail += 1
+        if queue[head] <= i - period:
+            head += 1
+        if i >= period - 1:
+            out[i] = queue[head]
+    return out
+
+
+def _rolling_arg_table(x: np.ndarray, period: int) -> np.ndarray:
+    """Sparse-table equivalent of :func:`_rolling_arg_deque` in O(n log period)."""
+    n = len(x)
+    out = np.full(n, -1, dtype=np.int64)
+    if period > n:
+        return out
+    nan = np.isnan(x)
+
+    def pick(a, b):
+        # b replaces a only if strictly better, so ties keep the earlier bar
+        xa, xb = x[a], x[b]
+        return np.where((xb > xa) | (nan[b] & ~nan[a]), b, a)
+
+    # best[i]: argmax of x[i : i + span]
+    best = np.arange(n)
+    span = 1
+    while span * 2 <= period:
+        best = pick(best[:-span], best[span:])
+        span *= 2
+    out[period - 1 :] = pick(best[: n - period + 1], best[period - span :])
+    return out
+
+
+def _rolling_arg(values, period: int, sign: float) -> np.ndarray:
+    if period < 1:
+        raise ValueError(f"period must be at least 1, got {period}")
+    x = sign * np.asarray(values, dtype=float)
+    if _compiled(x):
+        return _rolling_arg_deque(x, period)
+    return _rolling_arg_table(x, period)
+
+
+def rolling_argmax(values, period: int) -> np.ndarray:
+    """
+    Index of the highest value in each ``period``-bar window, in O(n).
+
+    Element ``i`` is the absolute bar index of the maximum of
+    ``values[i - period + 1 : i + 1]`` (the earliest one on ties), or -1 while
+    the window is incomplete. A NaN in the window counts as its maximum.
+    """
+    return _rolling_arg(values, period, 1.0)
+
+
+def rolling_argmin(values, period: int) -> np.ndarray:
+    """Index of the lowest value in each window; see :func:`rolling_argmax`."""
+    return _rolling_arg(values, period, -1.0)
+
+
+def _rolling_pick(values, period: int, sign: float) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    arg = _rolling_arg(values, period, sign)
+    out = np.full(len(values), np.nan)
+    if period <= len(values):
+        # Like pandas, a window holding NaN or +-inf has no extreme
+        bad = np.concatenate(([0], np.cumsum(~np.isfinite(values))))
+        clean = bad[period:] == bad[:-period]
+        out[period - 1 :] = np.where(clean, values[arg[period - 1 :]], np.nan)
+    return out
+
+
+def rolling_max(values, period: int) -> np.ndarray:
+    """Highest value of each ``period``-bar window, in O(n).
+
+    Equals ``pd.Series(values).rolling(period).max()``: NaN for incomplete
+    windows and for windows holding a NaN or an infinity.
+    """
+    return _rolling_pick(values, period, 1.0)
+
+
+def rolling_min(values, period: int) -> np.ndarray:
+    """Lowest value of each window; see :func:`rolling_max`."""
+    return _rolling_pick(values, period, -1.0)
+
+
 def WMA(values: np.ndarray, n: int) -> np.ndarray:
     """Weighted Moving Average - linearly weighted."""
-    weights = np.arange(1, n + 1, dtype=float)
-    result = np.full_like(values, np.nan, dtype=float)
-
-    for i in range(n - 1, len(values)):
-        result[i] = np.dot(values[i - n + 1 : i + 1], weights) / weights.sum()
+    values = np.asarray(values, dtype=float)
+    result = np.full(len(values), np.nan, dtype=float)
+    if n <= 0 or len(values) < n:
+        return result
 
+    # Weights 1..n: sum(k * y) over the window plus the plain sum
+    sums, weighted_sums, has_nan = _window_sums(values, n, weighted=True)
+    wma = (weighted_sums + sums) / (n * (n + 1) / 2.0)
+    wma[has_nan] = np.nan
+    result[n - 1 :] = wma
     return result
 
 
@@ -127,17 +354,16 @@ def LSMA(series: np.ndarray, length: int) -> np.ndarray:
     if n < length:
         return result
     
-    # Precompute x statistics (constant for all windows)
-    x = np.arange(length, dtype=float)
+    # Regression on x = 0..length-1 from the window sums of y and x * y
+    sums, weighted_sums, has_nan = _window_sums(series, length, weighted=True)
     x_mean = (length - 1) / 2.0
-    x_var = np.sum((x - x_mean) ** 2)
-    
-    for i in range(length - 1, n):
-        y = series[i - length + 1:i + 1]
-        y_mean = np.mean(y)
-        slope = np.sum((x - x_mean) * (y - y_mean)) / x_var
-        result[i] = slope * (length - 1) + (y_mean - slope * x_mean)
-    
+    x_var = length * (length**2 - 1) / 12.0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = (weighted_sums - x_mean * sums) / x_var
+    lsma = sums / length + slope * x_mean
+    lsma[has_nan] = np.nan
+    result[length - 1 :] = lsma
+
     return result
 
 
@@ -184,8 +410,8 @@ def Stochastic(
     period_d: int = 3,
 ) -> dict:
     """Stochastic Oscillator - returns k and d lines. Range: 0-100."""
-    highest_high = pd.Series(high).rolling(window=period_k).max().values
-    lowest_low = pd.Series(low).rolling(window=period_k).min().values
+    highest_high = rolling_max(high, period_k)
+    lowest_low = rolling_min(low, period_k)
 
     range_val = highest_high - lowest_low
     stoch_raw = np.where(range_val != 0, ((close - lowest_low) / range_val) * 100, 50)
@@ -207,8 +433,8 @@ def StochasticRSI(
     rsi_vals = RSI(close, rsi_length)
 
     rsi_series = pd.Series(rsi_vals)
-    highest_rsi = rsi_series.rolling(window=stoch_length).max().values
-    lowest_rsi = rsi_series.rolling(window=stoch_length).min().values
+    highest_rsi = rolling_max(rsi_series, stoch_length)
+    lowest_rsi = rolling_min(rsi_series, stoch_length)
 
     range_val = highest_rsi - lowest_rsi
     with np.errstate(divide='ignore', invalid='ignore'):
@@ -243,8 +469,8 @@ def StochasticRSI_from_RSI(
         Dictionary with 'k' and 'd' values
     """
     rsi_series = pd.Series(rsi)
-    highest_rsi = rsi_series.rolling(window=stoch_length).max().values
-    lowest_rsi = rsi_series.rolling(window=stoch_length).min().values
+    highest_rsi = rolling_max(rsi_series, stoch_length)
+    lowest_rsi = rolling_min(rsi_series, stoch_length)
 
     range_val = highest_rsi - lowest_rsi
     with np.errstate(divide='ignore', invalid='ignore'):
@@ -377,15 +603,14 @@ def Aroon(high: np.ndarray, low: np.ndarray, period: int = 14) -> dict:
     aroon_up = np.zeros(len(high))
     aroon_down = np.zeros(len(low))
 
-    for i in range(period, len(high)):
-        highest_idx = np.argmax(high[i - period : i])
-        bars_since_high = i - (i - period + highest_idx)
+    if len(high) > period:
+        # Extremes of the `period` bars before bar i: the window ending at i - 1
+        bars = np.arange(period, len(high))
+        bars_since_high = bars - rolling_argmax(high, period)[period - 1 : -1]
+        bars_since_low = bars - rolling_argmin(low, period)[period - 1 : -1]
 
-        lowest_idx = np.argmin(low[i - period : i])
-        bars_since_low = i - (i - period + lowest_idx)
-
-        aroon_up[i] = 100 * (period - bars_since_high) / period
-        aroon_down[i] = 100 * (period - bars_since_low) / period
+        aroon_up[period:] = 100 * (period - bars_since_high) / period
+        aroon_down[period:] = 100 * (period - bars_since_low) / period
 
     aroon_oscillator = aroon_up - aroon_down
 
@@ -398,27 +623,16 @@ def Aroon(high: np.ndarray, low: np.ndarray, period: int = 14) -> dict:
 
 def DonchianChannels(high: np.ndarray, low: np.ndarray, period: int = 20) -> dict:
     """Donchian Channels - highest/lowest levels. Returns upper, lower, basis."""
-    upper = pd.Series(high).rolling(window=period).max().values
-    lower = pd.Series(low).rolling(window=period).min().values
+    upper = rolling_max(high, period)
+    lower = rolling_min(low, period)
     basis = (upper + lower) / 2.0
 
     return {"upper": upper, "lower": lower, "basis": basis}
 
 
-def Supertrend(
-    high: np.ndarray,
-    low: np.ndarray,
-    close: np.ndarray,
-    atr_period: int = 10,
-    factor: float = 3.0,
-) -> dict:
-    """Supertrend - ATR-based trend indicator. Returns supertrend and direction."""
-    atr_vals = ATR(high, low, close, atr_period)
-
-    hl_avg = (high + low) / 2.0
-    basic_ub = hl_avg + factor * atr_vals
-    basic_lb = hl_avg - factor * atr_vals
-
+@_kernel
+def _supertrend_loop(close, basic_ub, basic_lb):
+    """Final bands and trend of :func:`Supertrend`."""
     final_ub = np.zeros(len(close))
     final_lb = np.zeros(len(close))
     supertrend = np.zeros(len(close))
@@ -455,6 +669,27 @@ def Supertrend(
                 supertrend[i] = final_ub[i]
                 direction[i] = 1
 
+    return supertrend, direction
+
+
+def Supertrend(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    atr_period: int = 10,
+    factor: float = 3.0,
+) -> dict:
+    """Supertrend - ATR-based trend indicator. Returns supertrend and direction."""
+    atr_vals = ATR(high, low, close, atr_period)
+
+    hl_avg = (high + low) / 2.0
+    basic_ub = hl_avg + factor * atr_vals
+    basic_lb = hl_avg - factor * atr_vals
+
+    if _compiled(close, basic_ub, basic_lb):
+        supertrend, direction = _supertrend_loop(close, basic_ub, basic_lb)
+    else:
+        supertrend, direction = _supertrend_loop.py_func(close, basic_ub, basic_lb)
     return {"supertrend": supertrend, "direction": direction}
 
 
@@ -469,8 +704,8 @@ def IchimokuKinkoHyo(
     """Ichimoku Cloud - returns all 5 components."""
 
     def donchian_middle(h, l, period):
-        high_roll = pd.Series(h).rolling(period).max().values
-        low_roll = pd.Series(l).rolling(period).min().values
+        high_roll = rolling_max(h, period)
+        low_roll = rolling_min(l, period)
         return (high_roll + low_roll) / 2
 
     tenkan_sen = donchian_middle(high, low, tenkan_period)
@@ -572,8 +807,8 @@ def WilliamsR(
     high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14
 ) -> np.ndarray:
     """Williams %R - overbought/oversold. Range: -100 to 0."""
-    highest_high = pd.Series(high).rolling(window=period).max().values
-    lowest_low = pd.Series(low).rolling(window=period).min().values
+    highest_high = rolling_max(high, period)
+    lowest_low = rolling_min(low, period)
 
     range_val = highest_high - lowest_low
 
@@ -660,15 +895,9 @@ def KeltnerChannels(
 
 
 # Special/Advanced
-def ParabolicSAR(
-    high: np.ndarray,
-    low: np.ndarray,
-    close: np.ndarray,
-    start: float = 0.02,
-    increment: float = 0.02,
-    maximum: float = 0.2,
-) -> np.ndarray:
-    """Parabolic SAR - Stop and Reversal indicator."""
+@_kernel
+def _psar_loop(high, low, start, increment, maximum):
+    """SAR values of :func:`ParabolicSAR`."""
     sar = np.zeros_like(high)
     trend = np.ones_like(high)
     af = start
@@ -710,6 +939,20 @@ def ParabolicSAR(
     return sar
 
 
+def ParabolicSAR(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    start: float = 0.02,
+    increment: float = 0.02,
+    maximum: float = 0.2,
+) -> np.ndarray:
+    """Parabolic SAR - Stop and Reversal indicator."""
+    if _compiled(high, low):
+        return _psar_loop(high, low, float(start), float(increment), float(maximum))
+    return _psar_loop.py_func(high, low, start, increment, maximum)
+
+
 # Utilities
 def crossover(series1: np.ndarray, series2) -> np.ndarray:
     """Return True where series1 crosses over series2."""
@@ -778,13 +1021,19 @@ def percent_rank(values: np.ndarray, n: int) -> np.ndarray:
     Returns:
         Percentile rank array (0-100)
     """
-    result = np.full_like(values, np.nan, dtype=float)
+    values = np.asarray(values, dtype=float)
+    result = np.full(len(values), np.nan, dtype=float)
+    if n <= 0 or len(values) < n:
+        return result
 
-    for i in range(n - 1, len(values)):
-        window = values[i - n + 1 : i + 1]
-        current = values[i]
-        rank = (window < current).sum() / len(window) * 100
-        result[i] = rank
+    # Counts are not prefix-decomposable; compare each window against its last
+    # value in bounded chunks instead of looping bar by bar
+    windows = np.lib.stride_tricks.sliding_window_view(values, n)
+    step = max(1, 2**20 // n)
+    for start in range(0, len(windows), step):
+        chunk = windows[start : start + step]
+        below = (chunk < chunk[:, -1:]).sum(axis=1)
+        result[n - 1 + start : n - 1 + start + len(chunk)] = below / n * 100
 
     return result
 
@@ -1011,15 +1260,10 @@ def extract_ichimoku_base_line(
     Returns:
         Ichimoku Base Line values
     """
-    high_series = pd.Series(high)
-    low_series = pd.Series(low)
-
-    highest_high = high_series.rolling(period).max()
-    lowest_low = low_series.rolling(period).min()
-
-    base_line = (highest_high + lowest_low) / 2
+    highest_high = rolling_max(high, period)
+    lowest_low = rolling_min(low, period)
 
-    return base_line.values
+    return (highest_high + lowest_low) / 2
 
 
 def calculate_stochastic_slow(
@@ -1049,8 +1293,10 @@ def calculate_stochastic_slow(
     low_series = pd.Series(low)
     close_series = pd.Series(close)
 
-    lowest_low = low_series.rolling(k_period).min()
-    highest_high = high_series.rolling(k_period).max()
+    lowest_low = pd.Series(rolling_min(low_series, k_period), index=low_series.index)
+    highest_high = pd.Series(
+        rolling_max(high_series, k_period), index=high_series.index
+    )
 
     fast_k = 100 * (close_series - lowest_low) / (highest_high - lowest_low)
 
@@ -1211,26 +1457,21 @@ def kaufman_efficiency_ratio(close: np.ndarray, length: int) -> np.ndarray:
     close = np.asarray(close, dtype=float)
     n = len(close)
     ker = np.full(n, np.nan, dtype=float)
-
-    for i in range(length, n):
-        # Direction: absolute change from length bars ago to current
-        # Window: [i-length, i] = exactly length+1 points, length bars of change
-        direction = abs(close[i] - close[i - length])
-
-        # Volatility (noise): sum of ALL bar-to-bar absolute changes in window
-        # Sum from bar i-length+1 to bar i (exactly length changes)
-        volatility = 0.0
-        for j in range(i - length + 1, i + 1):
-            volatility += abs(close[j] - close[j - 1])
-
-        # Calculate KER
-        if volatility > 0:
-            ker[i] = direction / volatility
-        else:
-            ker[i] = 0.0
+    if length <= 0 or n <= length:
+        return ker
+
+    # Direction: absolute change from length bars ago to current
+    direction = np.abs(close[length:] - close[:-length])
+    # Volatility (noise): window sums of the bar-to-bar absolute changes,
+    # exactly `length` changes ending at each bar
+    volatility, _, has_nan = _window_sums(np.abs(np.diff(close)), length)
+    volatility[has_nan] = np.nan
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ker[length:] = np.where(volatility > 0, direction / volatility, 0.0)
 
     return ker
 
+
 def CHOP(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 50) -> np.ndarray:
     """
     Choppiness Index (CHOP).
@@ -1260,24 +1501,27 @@ def CHOP(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 50)
     Returns:
         CHOP array (range 0-100). NaN for first `period` bars.
     """
-    chop = np.full(len(close), np.nan, dtype=float)
-    
-    for i in range(period, len(close)):
-        high_max = np.max(high[i - period:i + 1])
-        low_min = np.min(low[i - period:i + 1])
-        atr_sum = 0.0
-        
-        # Calculate sum of true ranges
-        for j in range(i - period + 1, i + 1):
-            tr = max(
-                high[j] - low[j],
-                abs(high[j] - close[j - 1]),
-                abs(low[j] - close[j - 1])
-            )
-            atr_sum += tr
-        
-        # Calculate CHOP
-        if high_max > low_min and atr_sum > 0:
-            chop[i] = 100 * np.log10(atr_sum / (high_max - low_min)) / np.log10(period)
-    
-    return chop
\ No newline at end of file
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    n = len(close)
+    chop = np.full(n, np.nan, dtype=float)
+    if period <= 0 or n <= period:
+        return chop
+
+    # Highest high / lowest low over [i - period, i] (period + 1 bars)
+    high_max = rolling_max(high, period + 1)[period:]
+    low_min = rolling_min(low, period + 1)[period:]
+
+    # True range from bar 1 on; a missing previous close falls back to high - low
+    tr = high[1:] - low[1:]
+    for gap in (np.abs(high[1:] - close[:-1]), np.abs(low[1:] - close[:-1])):
+        tr = np.where(gap > tr, gap, tr)
+    atr_sum, _, has_nan = _window_sums(tr, period)
+    atr_sum[has_nan] = np.nan
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        value = 100 * np.log10(atr_sum / (high_max - low_min)) / np.log10(period)
+    chop[period:] = np.where((high_max > low_min) & (atr_sum > 0), value, np.nan)
+
+    return chop
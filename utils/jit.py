@@ -0,0 +1,25 @@
+"""Optional Numba JIT compilation shared by the array kernels.
+
+:func:`_kernel` compiles a function with ``numba.njit`` when Numba is installed
+(``pip install numba``) and otherwise returns it unchanged, so the same kernel
+runs as plain Python. Set ``NUMBA_DISABLE_JIT=1`` to force the fallback.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _kernel(func: Callable) -> Callable:
+    """JIT-compile ``func`` when Numba is available; ``.py_func`` is always set."""
+    if NUMBA_AVAILABLE:
+        return njit(cache=True)(func)
+    func.py_func = func  # type: ignore[attr-defined]
+    return func
@@ -10,6 +10,13 @@ import csv
 from typing import Optional, Dict, Any
 from dhanhq import DhanContext, dhanhq
 
+try:
+    # Shared instrument index when running from the repository checkout
+    from core.instrument_master import get_instrument_master
+except ImportError:
+    # The service image ships without the core package
+    get_instrument_master = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -114,6 +121,16 @@ class DhanClient:
             logger.warning(f"Security ID list not found at {csv_path}")
             return security_map
         
+        if get_instrument_master is not None:
+            try:
+                security_map = get_instrument_master(csv_path).symbol_map(
+                    with_exchange=True
+                )
+                logger.info(f"Loaded {len(security_map)} security IDs from index")
+                return security_map
+            except Exception as e:
+                logger.warning(f"Instrument index unavailable, reading CSV: {e}")
+        
         try:
             with open(csv_path, 'r') as f:
                 reader = csv.DictReader(f)